@@ -14,10 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import sys, os, shutil, json, traceback, math, time
+import sys, os, shutil, json, traceback, math, time, zlib, mmap, collections
+from concurrent.futures import ThreadPoolExecutor
 
 from .objects import flip_fluid_map
 from .objects import flip_fluid_geometry_database
+from .objects import flip_fluid_stats_store
+from .objects.flip_fluid_bake_profiler import BakeFrameProfile, BakeLoopProfiler
+from .objects.flip_fluid_mesh_frame_cache import MeshFrameCache
+from .objects.flip_fluid_output_writer import OutputWriter, FrameOutputData, write_file_data
 from .operators import bake_operators
 from .filesystem import filesystem_protection_layer as fpl
 
@@ -42,6 +47,8 @@ FLUIDSIM_OBJECT = None
 SIMULATION_DATA = None
 CACHE_DIRECTORY = ""
 GEOMETRY_DATABASE = None
+MESH_FRAME_CACHE = None
+BAKE_PROFILE = None
 
 
 class LibraryVersionError(Exception):
@@ -91,6 +98,26 @@ def __get_geometry_database():
     return GEOMETRY_DATABASE
 
 
+def __set_mesh_frame_cache(mesh_frame_cache):
+    global MESH_FRAME_CACHE
+    MESH_FRAME_CACHE = mesh_frame_cache
+
+
+def __get_mesh_frame_cache():
+    global MESH_FRAME_CACHE
+    return MESH_FRAME_CACHE
+
+
+def __set_bake_profile(bake_profile):
+    global BAKE_PROFILE
+    BAKE_PROFILE = bake_profile
+
+
+def __get_bake_profile():
+    global BAKE_PROFILE
+    return BAKE_PROFILE
+
+
 def __get_export_directory():
     return os.path.join(CACHE_DIRECTORY, "export")
 
@@ -123,21 +150,22 @@ def __get_frame_id():
 
 
 def __extract_static_mesh(object_name):
-    name_slug = __get_name_slug(object_name)
-    geometry_database = __get_geometry_database()
-    bobj_data = geometry_database.get_mesh_static(name_slug)
-    if bobj_data is None:
-        msg = "Error extracting mesh data. Exported object not found: <" + object_name + ">"
-        raise Exception(msg)
-
-    data = __get_simulation_data()
-    scale = data.domain_data.initialize.scale
-    bbox = data.domain_data.initialize.bbox
-    tmesh = TriangleMesh.from_bobj(bobj_data)
-    tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
-    tmesh.scale(scale)
+    with __get_bake_profile().phase("mesh_extraction"):
+        name_slug = __get_name_slug(object_name)
+        geometry_database = __get_geometry_database()
+        bobj_data = geometry_database.get_mesh_static(name_slug)
+        if bobj_data is None:
+            msg = "Error extracting mesh data. Exported object not found: <" + object_name + ">"
+            raise Exception(msg)
+
+        data = __get_simulation_data()
+        scale = data.domain_data.initialize.scale
+        bbox = data.domain_data.initialize.bbox
+        tmesh = TriangleMesh.from_bobj(bobj_data)
+        tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
+        tmesh.scale(scale)
 
-    return tmesh
+        return tmesh
 
 
 def __extract_transform_data(object_name, frameno):
@@ -152,39 +180,41 @@ def __extract_transform_data(object_name, frameno):
 
 
 def __extract_keyframed_mesh(object_name, frameno):
-    name_slug = __get_name_slug(object_name)
-    geometry_database = __get_geometry_database()
-    bobj_data = geometry_database.get_mesh_static(name_slug)
-    if bobj_data is None:
-        msg = "Error extracting mesh data. Exported object not found: <" + object_name + ">"
-        raise Exception(msg)
+    with __get_bake_profile().phase("mesh_extraction"):
+        name_slug = __get_name_slug(object_name)
+        geometry_database = __get_geometry_database()
+        bobj_data = geometry_database.get_mesh_static(name_slug)
+        if bobj_data is None:
+            msg = "Error extracting mesh data. Exported object not found: <" + object_name + ">"
+            raise Exception(msg)
 
-    tmesh = TriangleMesh.from_bobj(bobj_data)
-    transform_data = __extract_transform_data(object_name, frameno)
-    tmesh.apply_transform(transform_data)
+        tmesh = TriangleMesh.from_bobj(bobj_data)
+        transform_data = __extract_transform_data(object_name, frameno)
+        tmesh.apply_transform(transform_data)
 
-    data = __get_simulation_data()
-    scale = data.domain_data.initialize.scale
-    bbox = data.domain_data.initialize.bbox
-    tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
-    tmesh.scale(scale)
+        data = __get_simulation_data()
+        scale = data.domain_data.initialize.scale
+        bbox = data.domain_data.initialize.bbox
+        tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
+        tmesh.scale(scale)
 
-    return tmesh
+        return tmesh
 
 
 def __extract_animated_mesh(object_name, frameno):
-    name_slug = __get_name_slug(object_name)
-    geometry_database = __get_geometry_database()
-    bobj_data = geometry_database.get_mesh_animated(name_slug, frameno)
+    with __get_bake_profile().phase("mesh_extraction"):
+        name_slug = __get_name_slug(object_name)
+        geometry_database = __get_geometry_database()
+        bobj_data = geometry_database.get_mesh_animated(name_slug, frameno)
 
-    data = __get_simulation_data()
-    scale = data.domain_data.initialize.scale
-    bbox = data.domain_data.initialize.bbox
-    tmesh = TriangleMesh.from_bobj(bobj_data)
-    tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
-    tmesh.scale(scale)
+        data = __get_simulation_data()
+        scale = data.domain_data.initialize.scale
+        bbox = data.domain_data.initialize.bbox
+        tmesh = TriangleMesh.from_bobj(bobj_data)
+        tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
+        tmesh.scale(scale)
 
-    return tmesh
+        return tmesh
 
 
 def __extract_mesh(object_name, frameno):
@@ -220,31 +250,21 @@ def __extract_force_field_mesh(object_name, frame_id=0):
 
 
 def __extract_keyframed_frame_meshes(object_name, frameno):
-    mesh_current = __extract_keyframed_mesh(object_name, frameno)
-    if frameno - 1 < 0 or not __keyframed_mesh_exists(object_name, frameno - 1):
-        mesh_previous = mesh_current
-    else:
-        mesh_previous = __extract_keyframed_mesh(object_name, frameno - 1)
-
-    if not __keyframed_mesh_exists(object_name, frameno + 1):
-        mesh_next = mesh_current
-    else:
-        mesh_next = __extract_keyframed_mesh(object_name, frameno + 1)
-    return mesh_previous, mesh_current, mesh_next
+    mesh_cache = __get_mesh_frame_cache()
+    return mesh_cache.get_frame_meshes(
+            __get_name_slug(object_name), frameno,
+            lambda f: __extract_keyframed_mesh(object_name, f),
+            lambda f: __keyframed_mesh_exists(object_name, f)
+            )
 
 
 def __extract_animated_frame_meshes(object_name, frameno):
-    mesh_current = __extract_animated_mesh(object_name, frameno)
-    if frameno - 1 < 0 or not __animated_mesh_exists(object_name, frameno - 1):
-        mesh_previous = mesh_current
-    else:
-        mesh_previous = __extract_animated_mesh(object_name, frameno - 1)
-
-    if not __animated_mesh_exists(object_name, frameno + 1):
-        mesh_next = mesh_current
-    else:
-        mesh_next = __extract_animated_mesh(object_name, frameno + 1)
-    return mesh_previous, mesh_current, mesh_next
+    mesh_cache = __get_mesh_frame_cache()
+    return mesh_cache.get_frame_meshes(
+            __get_name_slug(object_name), frameno,
+            lambda f: __extract_animated_mesh(object_name, f),
+            lambda f: __animated_mesh_exists(object_name, f)
+            )
 
 
 def __extract_keyframed_frame_centroid_meshes(object_name, frameno):
@@ -407,29 +427,30 @@ def __animated_curve_exists(object_name, frameno):
 
 
 def __extract_curve_mesh(object_name, frameno=0):
-    name_slug = __get_name_slug(object_name)
-    geometry_database = __get_geometry_database()
-    motion_type = geometry_database.get_object_motion_export_type(name_slug)
+    with __get_bake_profile().phase("mesh_extraction"):
+        name_slug = __get_name_slug(object_name)
+        geometry_database = __get_geometry_database()
+        motion_type = geometry_database.get_object_motion_export_type(name_slug)
 
-    if motion_type == 'STATIC':
-        bobj_data = geometry_database.get_curve_static(name_slug)
-    elif motion_type == 'KEYFRAMED': 
-        bobj_data = geometry_database.get_curve_static(name_slug)
-        matrix_coefficients = geometry_database.get_curve_keyframed_transform(name_slug, frameno)
-    elif motion_type == 'ANIMATED':
-        bobj_data = geometry_database.get_curve_animated(name_slug, frameno)
+        if motion_type == 'STATIC':
+            bobj_data = geometry_database.get_curve_static(name_slug)
+        elif motion_type == 'KEYFRAMED': 
+            bobj_data = geometry_database.get_curve_static(name_slug)
+            matrix_coefficients = geometry_database.get_curve_keyframed_transform(name_slug, frameno)
+        elif motion_type == 'ANIMATED':
+            bobj_data = geometry_database.get_curve_animated(name_slug, frameno)
 
-    data = __get_simulation_data()
-    scale = data.domain_data.initialize.scale
-    bbox = data.domain_data.initialize.bbox
-    curve_tmesh = TriangleMesh.from_bobj(bobj_data)
-    if motion_type == 'KEYFRAMED': 
-        curve_tmesh.apply_transform(matrix_coefficients)
+        data = __get_simulation_data()
+        scale = data.domain_data.initialize.scale
+        bbox = data.domain_data.initialize.bbox
+        curve_tmesh = TriangleMesh.from_bobj(bobj_data)
+        if motion_type == 'KEYFRAMED': 
+            curve_tmesh.apply_transform(matrix_coefficients)
 
-    curve_tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
-    curve_tmesh.scale(scale)
+        curve_tmesh.translate(-bbox.x, -bbox.y, -bbox.z)
+        curve_tmesh.scale(scale)
 
-    return curve_tmesh
+        return curve_tmesh
 
 
 def __extract_data(data_filepath):
@@ -534,11 +555,132 @@ def __get_surface_tension_value(world_data, frameno):
     return max(value, 0.0)
 
 
-def __read_save_state_file_data(file_data_path, start_byte, end_byte):
-    with open(file_data_path, 'rb') as f:
-        f.seek(start_byte)
-        data = f.read(end_byte - start_byte)
-    return data
+def __get_save_state_chunk_table(file_data_path, autosave_info):
+    if not autosave_info or not autosave_info.get('compression'):
+        return None
+    filename = os.path.basename(file_data_path)
+    return autosave_info['compressed_chunks'].get(filename)
+
+
+def __map_save_state_file(file_data_path):
+    f = open(file_data_path, 'rb')
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be memory-mapped
+            return f, None
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except:
+        f.close()
+        raise
+
+
+# Runs on a loader thread. Compressed data is decompressed and returned.
+# Uncompressed data is read ahead into the page cache and sliced from the
+# mapping when it is loaded.
+def __prefetch_save_state_chunk(mapped_data, start_byte, end_byte, chunk_table):
+    if mapped_data is None or end_byte <= start_byte:
+        return b""
+
+    if chunk_table is None:
+        if hasattr(mapped_data, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+            aligned_start_byte = start_byte - (start_byte % mmap.ALLOCATIONGRANULARITY)
+            mapped_data.madvise(mmap.MADV_WILLNEED, aligned_start_byte, end_byte - aligned_start_byte)
+        return None
+
+    # Compressed files are a sequence of zlib streams. Chunk table entries
+    # are [uncompressed_start, uncompressed_size, file_offset, compressed_size]
+    data = bytearray()
+    for chunk_start, chunk_size, file_offset, compressed_size in chunk_table:
+        if chunk_start + chunk_size <= start_byte or chunk_start >= end_byte:
+            continue
+        chunk_data = zlib.decompress(mapped_data[file_offset:file_offset + compressed_size])
+        data += chunk_data[max(start_byte - chunk_start, 0):end_byte - chunk_start]
+    return bytes(data)
+
+
+def __get_save_state_loader_thread_count(data):
+    num_threads = data.domain_data.advanced.num_output_writer_threads
+    if num_threads is None:
+        # Simulation data exported by an older addon version
+        return 4
+    return max(__get_parameter_data(num_threads), 1)
+
+
+# load_groups is a list of (load_func, [(file_data_path, bytes_per_particle), ...]).
+# Each attribute file is memory-mapped once. Chunks are read ahead and
+# decompressed on a thread pool and passed in order to
+# load_func(particle_count, *chunk_data) on the calling thread.
+def __load_save_state_particle_data(load_groups, num_particles, autosave_info, num_threads, label):
+    particles_per_read = 2**21
+    max_chunks_in_flight = 2
+
+    start_time = time.time()
+    num_bytes = 0
+
+    mapped_files = {}
+    executor = ThreadPoolExecutor(max_workers=num_threads)
+    try:
+        for load_func, file_list in load_groups:
+            for file_data_path, bytes_per_particle in file_list:
+                if file_data_path not in mapped_files:
+                    mapped_files[file_data_path] = __map_save_state_file(file_data_path)
+
+        def submit_chunk(chunk_idx):
+            start_idx = chunk_idx * particles_per_read
+            end_idx = min((chunk_idx + 1) * particles_per_read, num_particles)
+            chunk_futures = []
+            for load_func, file_list in load_groups:
+                for file_data_path, bytes_per_particle in file_list:
+                    mapped_data = mapped_files[file_data_path][1]
+                    chunk_table = __get_save_state_chunk_table(file_data_path, autosave_info)
+                    start_byte = start_idx * bytes_per_particle
+                    end_byte = end_idx * bytes_per_particle
+                    future = executor.submit(__prefetch_save_state_chunk, mapped_data, start_byte, end_byte, chunk_table)
+                    chunk_futures.append((future, mapped_data, start_byte, end_byte))
+            return end_idx - start_idx, chunk_futures
+
+        num_chunks = (num_particles + particles_per_read - 1) // particles_per_read
+        pending_chunks = collections.deque()
+        next_chunk_idx = 0
+        for chunk_idx in range(num_chunks):
+            while next_chunk_idx < num_chunks and len(pending_chunks) < max_chunks_in_flight:
+                pending_chunks.append(submit_chunk(next_chunk_idx))
+                next_chunk_idx += 1
+
+            particle_count, chunk_futures = pending_chunks.popleft()
+            chunk_views = []
+            try:
+                chunk_data = []
+                for future, mapped_data, start_byte, end_byte in chunk_futures:
+                    data = future.result()
+                    if data is None:
+                        view = memoryview(mapped_data)[start_byte:end_byte]
+                        chunk_views.append(view)
+                        data = view
+                    chunk_data.append(data)
+                    num_bytes += end_byte - start_byte
+
+                data_idx = 0
+                for load_func, file_list in load_groups:
+                    load_func(particle_count, *chunk_data[data_idx:data_idx + len(file_list)])
+                    data_idx += len(file_list)
+            finally:
+                for view in chunk_views:
+                    view.release()
+    finally:
+        executor.shutdown(wait=True)
+        for f, mapped_data in mapped_files.values():
+            if mapped_data is not None:
+                mapped_data.close()
+            f.close()
+
+    elapsed_time = max(time.time() - start_time, 1e-6)
+    num_megabytes = num_bytes / (1024 * 1024)
+    print("Loaded savestate " + label + " data: " + 
+          str(num_particles) + " particles, " + 
+          str(round(num_megabytes, 1)) + " MB in " + 
+          str(round(elapsed_time, 2)) + "s (" + 
+          str(round(num_megabytes / elapsed_time, 1)) + " MB/s)")
 
 
 def __write_save_state_file_data(file_data_path, data, is_appending_data=False):
@@ -549,6 +691,39 @@ def __write_save_state_file_data(file_data_path, data, is_appending_data=False):
         f.write(data)
 
 
+def __write_compressed_save_state_file_data(file_data_path, chunks):
+    chunk_table = []
+    chunk_start = 0
+    with open(file_data_path, 'wb') as f:
+        for data in chunks:
+            compressed_data = zlib.compress(data, 1)
+            chunk_table.append([chunk_start, len(data), f.tell(), len(compressed_data)])
+            f.write(compressed_data)
+            chunk_start += len(data)
+    return chunk_table
+
+
+# Savestate files are never modified in place (autosave files are written to a
+# temporary file and renamed), so savestates can share file data with the
+# autosave through hardlinks. Falls back to copying on filesystems that do not
+# support hardlinks.
+def __link_save_state_files(src_directory, dst_directory):
+    if not os.path.exists(dst_directory):
+        os.makedirs(dst_directory)
+
+    for filename in __get_autosave_filenames():
+        src_filepath = os.path.join(src_directory, filename)
+        if not os.path.isfile(src_filepath):
+            continue
+        dst_filepath = os.path.join(dst_directory, filename)
+        if os.path.isfile(dst_filepath):
+            fpl.delete_file(dst_filepath, display_popup_on_error=False)
+        try:
+            os.link(src_filepath, dst_filepath)
+        except OSError:
+            shutil.copy2(src_filepath, dst_filepath)
+
+
 def __load_save_state_marker_particle_data(fluidsim, save_state_directory, autosave_info, data):
     num_particles = autosave_info['num_marker_particles']
     if num_particles == 0:
@@ -633,63 +808,36 @@ def __load_save_state_marker_particle_data(fluidsim, save_state_directory, autos
             id_data_file = os.path.join(d, autosave_info['marker_particle_id_filedata'])
             load_id_data = True
 
-    particles_per_read = 2**21
     bytes_per_vector = 12
     bytes_per_float = 4
     bytes_per_int = 4
     bytes_per_short = 2
-    max_vector_byte = bytes_per_vector * num_particles
-    max_float_byte = bytes_per_float * num_particles
-    max_int_byte = bytes_per_int * num_particles
-    max_short_byte = bytes_per_short * num_particles
-    num_reads = int((num_particles // particles_per_read) + 1)
-    for i in range(num_reads):
-        start_vector_byte = i * bytes_per_vector * particles_per_read
-        start_float_byte = i * bytes_per_float * particles_per_read
-        start_int_byte = i * bytes_per_int * particles_per_read
-        start_short_byte = i * bytes_per_short * particles_per_read
-        end_vector_byte = min((i + 1) * bytes_per_vector * particles_per_read, max_vector_byte)
-        end_float_byte = min((i + 1) * bytes_per_float * particles_per_read, max_float_byte)
-        end_int_byte = min((i + 1) * bytes_per_int * particles_per_read, max_int_byte)
-        end_short_byte = min((i + 1) * bytes_per_short * particles_per_read, max_short_byte)
-        particle_count = int((end_vector_byte - start_vector_byte) // bytes_per_vector)
-
-        position_data = __read_save_state_file_data(position_data_file, start_vector_byte, end_vector_byte)
-        velocity_data = __read_save_state_file_data(velocity_data_file, start_vector_byte, end_vector_byte)
-        fluidsim.load_marker_particle_data(particle_count, position_data, velocity_data)
-
-        if load_apic_data:
-            affinex_data = __read_save_state_file_data(affinex_data_file, start_vector_byte, end_vector_byte)
-            affiney_data = __read_save_state_file_data(affiney_data_file, start_vector_byte, end_vector_byte)
-            affinez_data = __read_save_state_file_data(affinez_data_file, start_vector_byte, end_vector_byte)
-            fluidsim.load_marker_particle_affine_data(particle_count, affinex_data, affiney_data, affinez_data)
-
-        if load_age_data:
-            age_data = __read_save_state_file_data(age_data_file, start_float_byte, end_float_byte)
-            fluidsim.load_marker_particle_age_data(particle_count, age_data)
-
-        if load_lifetime_data:
-            lifetime_data = __read_save_state_file_data(lifetime_data_file, start_float_byte, end_float_byte)
-            fluidsim.load_marker_particle_lifetime_data(particle_count, lifetime_data)
-
-        if load_color_data:
-            color_data = __read_save_state_file_data(color_data_file, start_vector_byte, end_vector_byte)
-            fluidsim.load_marker_particle_color_data(particle_count, color_data)
-
-        if load_source_id_data:
-            source_id_data = __read_save_state_file_data(source_id_data_file, start_int_byte, end_int_byte)
-            fluidsim.load_marker_particle_source_id_data(particle_count, source_id_data)
-
-        if load_viscosity_data:
-            viscosity_data = __read_save_state_file_data(viscosity_data_file, start_float_byte, end_float_byte)
-            fluidsim.load_marker_particle_viscosity_data(particle_count, viscosity_data)
-
-        if load_id_data:
-            id_data = __read_save_state_file_data(id_data_file, start_short_byte, end_short_byte)
-            fluidsim.load_marker_particle_id_data(particle_count, id_data)
-
-
-def __load_save_state_diffuse_particle_data(fluidsim, save_state_directory, autosave_info):
+
+    load_groups = [(fluidsim.load_marker_particle_data, 
+                    [(position_data_file, bytes_per_vector), (velocity_data_file, bytes_per_vector)])]
+    if load_apic_data:
+        load_groups.append((fluidsim.load_marker_particle_affine_data, 
+                            [(affinex_data_file, bytes_per_vector), 
+                             (affiney_data_file, bytes_per_vector), 
+                             (affinez_data_file, bytes_per_vector)]))
+    if load_age_data:
+        load_groups.append((fluidsim.load_marker_particle_age_data, [(age_data_file, bytes_per_float)]))
+    if load_lifetime_data:
+        load_groups.append((fluidsim.load_marker_particle_lifetime_data, [(lifetime_data_file, bytes_per_float)]))
+    if load_color_data:
+        load_groups.append((fluidsim.load_marker_particle_color_data, [(color_data_file, bytes_per_vector)]))
+    if load_source_id_data:
+        load_groups.append((fluidsim.load_marker_particle_source_id_data, [(source_id_data_file, bytes_per_int)]))
+    if load_viscosity_data:
+        load_groups.append((fluidsim.load_marker_particle_viscosity_data, [(viscosity_data_file, bytes_per_float)]))
+    if load_id_data:
+        load_groups.append((fluidsim.load_marker_particle_id_data, [(id_data_file, bytes_per_short)]))
+
+    num_threads = __get_save_state_loader_thread_count(data)
+    __load_save_state_particle_data(load_groups, num_particles, autosave_info, num_threads, "marker particle")
+
+
+def __load_save_state_diffuse_particle_data(fluidsim, save_state_directory, autosave_info, data):
     num_particles = autosave_info['num_diffuse_particles']
     if num_particles == 0:
         return
@@ -701,39 +849,20 @@ def __load_save_state_diffuse_particle_data(fluidsim, save_state_directory, auto
     type_data_file = os.path.join(d, autosave_info['diffuse_particle_type_filedata'])
     id_data_file = os.path.join(d, autosave_info['diffuse_particle_id_filedata'])
 
-
-    particles_per_read = 2**21
     bytes_per_vector = 12
     bytes_per_lifetime = 4
     bytes_per_type = 1
     bytes_per_id = 1
-    max_byte_vector = bytes_per_vector * num_particles
-    max_byte_lifetime = bytes_per_lifetime * num_particles
-    max_byte_type = bytes_per_type * num_particles
-    max_byte_id = bytes_per_id * num_particles
-    num_reads = int((num_particles // particles_per_read) + 1)
-    for i in range(num_reads):
-        start_byte = i * bytes_per_vector * particles_per_read
-        end_byte = min((i + 1) * bytes_per_vector * particles_per_read, max_byte_vector)
-        particle_count = int((end_byte - start_byte) // bytes_per_vector)
-
-        position_data = __read_save_state_file_data(position_data_file, start_byte, end_byte)
-        velocity_data = __read_save_state_file_data(velocity_data_file, start_byte, end_byte)
-
-        start_byte = i * bytes_per_lifetime * particles_per_read
-        end_byte = min((i + 1) * bytes_per_lifetime * particles_per_read, max_byte_lifetime)
-        lifetime_data = __read_save_state_file_data(lifetime_data_file, start_byte, end_byte)
-
-        start_byte = i * bytes_per_type * particles_per_read
-        end_byte = min((i + 1) * bytes_per_type * particles_per_read, max_byte_type)
-        type_data = __read_save_state_file_data(type_data_file, start_byte, end_byte)
 
-        start_byte = i * bytes_per_id * particles_per_read
-        end_byte = min((i + 1) * bytes_per_id * particles_per_read, max_byte_id)
-        id_data = __read_save_state_file_data(id_data_file, start_byte, end_byte)
+    load_groups = [(fluidsim.load_diffuse_particle_data, 
+                    [(position_data_file, bytes_per_vector), 
+                     (velocity_data_file, bytes_per_vector), 
+                     (lifetime_data_file, bytes_per_lifetime), 
+                     (type_data_file, bytes_per_type), 
+                     (id_data_file, bytes_per_id)])]
 
-        fluidsim.load_diffuse_particle_data(particle_count, position_data, velocity_data,
-                                            lifetime_data, type_data, id_data)
+    num_threads = __get_save_state_loader_thread_count(data)
+    __load_save_state_particle_data(load_groups, num_particles, autosave_info, num_threads, "diffuse particle")
 
 
 def __load_save_state_simulator_data(fluidsim, autosave_info):
@@ -786,16 +915,8 @@ def __delete_outdated_meshes(cache_directory, savestate_id):
                 print("Error: unable to delete file <" + path + "> (skipping)")
 
     stats_filepath = os.path.join(cache_directory, "flipstats.data")
-    with open(stats_filepath, 'r', encoding='utf-8') as f:
-        stats_info = json.loads(f.read())
-
-    for key in stats_info.copy().keys():
-        if int(key) > savestate_id:
-            del stats_info[key]
-
-    stats_json = json.dumps(stats_info, sort_keys=True, indent=4)
-    with open(stats_filepath, 'w', encoding='utf-8') as f:
-        f.write(stats_json)
+    stats_store = flip_fluid_stats_store.get_stats_store(stats_filepath)
+    stats_store.delete_frames_after(savestate_id)
 
 
 def __load_save_state_data(fluidsim, data, cache_directory, savestate_id):
@@ -820,7 +941,7 @@ def __load_save_state_data(fluidsim, data, cache_directory, savestate_id):
         autosave_info = json.loads(f.read())
 
     __load_save_state_marker_particle_data(fluidsim, autosave_directory, autosave_info, data)
-    __load_save_state_diffuse_particle_data(fluidsim, autosave_directory, autosave_info)
+    __load_save_state_diffuse_particle_data(fluidsim, autosave_directory, autosave_info, data)
     __load_save_state_simulator_data(fluidsim, autosave_info)
 
     init_data = data.domain_data.initialize
@@ -842,7 +963,7 @@ def __load_save_state_data(fluidsim, data, cache_directory, savestate_id):
             try:
                 old_directory = autosave_directory
                 new_directory = os.path.join(savestate_directory, "autosave")
-                shutil.copytree(old_directory, new_directory, dirs_exist_ok=True)
+                __link_save_state_files(old_directory, new_directory)
                 fpl.delete_files_in_directory(
                         backup_autosave_directory, [".state", ".data"], 
                         remove_directory=True, 
@@ -1269,6 +1390,22 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
     fluidsim.viscosity_solver_max_iterations = \
         __get_parameter_data(advanced.viscosity_solver_max_iterations, frameno)
 
+    pressure_solver_method = 'PRESSURE_SOLVER_METHOD_PCG'
+    if advanced.pressure_solver_method is not None:
+        # Not set in simulation data exported by an older addon version
+        pressure_solver_method = __get_parameter_data(advanced.pressure_solver_method, frameno)
+    if pressure_solver_method == 'PRESSURE_SOLVER_METHOD_PCG':
+        fluidsim.set_pressure_solver_method_PCG()
+    elif pressure_solver_method == 'PRESSURE_SOLVER_METHOD_PARALLEL_PCG':
+        fluidsim.set_pressure_solver_method_parallel_PCG()
+    elif pressure_solver_method == 'PRESSURE_SOLVER_METHOD_MGPCG':
+        fluidsim.set_pressure_solver_method_MGPCG()
+
+    if advanced.enable_solver_warm_start is not None:
+        # Not set in simulation data exported by an older addon version
+        fluidsim.enable_solver_warm_start = \
+            __get_parameter_data(advanced.enable_solver_warm_start, frameno)
+
     velocity_transfer_method = __get_parameter_data(advanced.velocity_transfer_method, frameno)
     if velocity_transfer_method == 'VELOCITY_TRANSFER_METHOD_FLIP':
         fluidsim.set_velocity_transfer_method_FLIP()
@@ -1322,6 +1459,11 @@ def __initialize_fluid_simulation_settings(fluidsim, data):
         fluidsim.enable_force_field_debug_output = \
             __get_parameter_data(dprops.debug.export_force_field, frameno)
 
+    if dprops.debug.export_frame_trace is not None:
+        # Not set in simulation data exported by an older addon version
+        fluidsim.enable_frame_trace_output = \
+            __get_parameter_data(dprops.debug.export_frame_trace, frameno)
+
     # Internal Settings
 
     fluidsim.set_mesh_output_format_as_bobj()
@@ -1810,21 +1952,12 @@ def __update_animatable_meshing_volume_properties(data, frameid):
         volume_object.update_mesh_animated(mesh_previous, mesh_current, mesh_next)
 
 
-def __set_property(obj, pname, value, value_min=None, value_max=None):
+def __set_parameter(parameters, pname, value, value_min=None, value_max=None):
     if value_min is not None:
         value = max(value, value_min)
     if value_max is not None:
         value = min(value, value_max)
-
-    eps = 1e-6
-    old_value = getattr(obj, pname)
-    if isinstance(value, list):
-        for i, v in enumerate(value):
-            if v != old_value[i]:
-                setattr(obj, pname, value)
-                break
-    elif abs(value - old_value) > eps:
-        setattr(obj, pname, value)
+    parameters[pname] = value
 
 
 def __set_body_force_property(fluidsim, body_force):
@@ -1876,79 +2009,80 @@ def __set_meshing_volume_object(fluidsim, data, frameid=0):
 
 def __update_animatable_domain_properties(fluidsim, data, frameno):
     dprops = data.domain_data
+    parameters = {}
 
     # Simulation Settings
     fluid_boundary_collisions = __get_parameter_data(dprops.simulation.fluid_boundary_collisions, frameno)
-    __set_property(fluidsim, 'fluid_boundary_collisions', fluid_boundary_collisions)
+    __set_parameter(parameters, 'fluid_boundary_collisions', fluid_boundary_collisions)
 
     open_boundary_width = __get_parameter_data(dprops.simulation.fluid_open_boundary_width, frameno)
-    __set_property(fluidsim, 'fluid_open_boundary_width', open_boundary_width)
+    __set_parameter(parameters, 'fluid_open_boundary_width', open_boundary_width)
 
     # Whitewater Simulation Settings
     whitewater = dprops.whitewater
     if __get_parameter_data(whitewater.enable_whitewater_simulation):
         is_generating_whitewater = __get_parameter_data(whitewater.enable_whitewater_emission, frameno)
-        __set_property(fluidsim, 'enable_diffuse_particle_emission', is_generating_whitewater)
+        __set_parameter(parameters, 'enable_diffuse_particle_emission', is_generating_whitewater)
 
         is_foam_enabled = __get_parameter_data(whitewater.enable_foam, frameno)
         is_bubbles_enabled = __get_parameter_data(whitewater.enable_bubbles, frameno)
         is_spray_enabled = __get_parameter_data(whitewater.enable_spray, frameno)
         is_dust_enabled = __get_parameter_data(whitewater.enable_dust, frameno)
         is_dust_boundary_emission_enabled = __get_parameter_data(whitewater.enable_dust_emission_near_boundary, frameno)
-        __set_property(fluidsim, 'enable_diffuse_foam', is_foam_enabled)
-        __set_property(fluidsim, 'enable_diffuse_bubbles', is_bubbles_enabled)
-        __set_property(fluidsim, 'enable_diffuse_spray', is_spray_enabled)
-        __set_property(fluidsim, 'enable_diffuse_dust', is_dust_enabled)
-        __set_property(fluidsim, 'enable_boundary_diffuse_dust_emission', is_dust_boundary_emission_enabled)
+        __set_parameter(parameters, 'enable_diffuse_foam', is_foam_enabled)
+        __set_parameter(parameters, 'enable_diffuse_bubbles', is_bubbles_enabled)
+        __set_parameter(parameters, 'enable_diffuse_spray', is_spray_enabled)
+        __set_parameter(parameters, 'enable_diffuse_dust', is_dust_enabled)
+        __set_parameter(parameters, 'enable_boundary_diffuse_dust_emission', is_dust_boundary_emission_enabled)
 
         whitewater_motion_blur = __get_parameter_data(whitewater.generate_whitewater_motion_blur_data, frameno)
-        __set_property(fluidsim, 'enable_whitewater_motion_blur', whitewater_motion_blur)
+        __set_parameter(parameters, 'enable_whitewater_motion_blur', whitewater_motion_blur)
 
         emitter_pct = __get_parameter_data(whitewater.whitewater_emitter_generation_rate, frameno)
-        __set_property(fluidsim, 'diffuse_emitter_generation_rate', emitter_pct / 100)
+        __set_parameter(parameters, 'diffuse_emitter_generation_rate', emitter_pct / 100)
 
         wavecrest_rate = __get_parameter_data(whitewater.wavecrest_emission_rate, frameno)
         turbulence_rate = __get_parameter_data(whitewater.turbulence_emission_rate, frameno)
         dust_rate = __get_parameter_data(whitewater.dust_emission_rate, frameno)
-        __set_property(fluidsim, 'diffuse_particle_wavecrest_emission_rate', wavecrest_rate)
-        __set_property(fluidsim, 'diffuse_particle_turbulence_emission_rate', turbulence_rate)
-        __set_property(fluidsim, 'diffuse_particle_dust_emission_rate', dust_rate)
+        __set_parameter(parameters, 'diffuse_particle_wavecrest_emission_rate', wavecrest_rate)
+        __set_parameter(parameters, 'diffuse_particle_turbulence_emission_rate', turbulence_rate)
+        __set_parameter(parameters, 'diffuse_particle_dust_emission_rate', dust_rate)
 
         spray_emission_speed = __get_parameter_data(whitewater.spray_emission_speed, frameno)
-        __set_property(fluidsim, 'diffuse_spray_emission_speed', spray_emission_speed)
+        __set_parameter(parameters, 'diffuse_spray_emission_speed', spray_emission_speed)
 
         min_speed, max_speed = __get_parameter_data(whitewater.min_max_whitewater_energy_speed, frameno)
-        __set_property(fluidsim, 'min_diffuse_emitter_energy', 0.5 * min_speed * min_speed)
-        __set_property(fluidsim, 'max_diffuse_emitter_energy', 0.5 * max_speed * max_speed)
+        __set_parameter(parameters, 'min_diffuse_emitter_energy', 0.5 * min_speed * min_speed)
+        __set_parameter(parameters, 'max_diffuse_emitter_energy', 0.5 * max_speed * max_speed)
 
         mink, maxk = __get_parameter_data(whitewater.min_max_whitewater_wavecrest_curvature, frameno)
-        __set_property(fluidsim, 'min_diffuse_wavecrest_curvature', mink)
-        __set_property(fluidsim, 'max_diffuse_wavecrest_curvature', maxk)
+        __set_parameter(parameters, 'min_diffuse_wavecrest_curvature', mink)
+        __set_parameter(parameters, 'max_diffuse_wavecrest_curvature', maxk)
 
         mint, maxt = __get_parameter_data(whitewater.min_max_whitewater_turbulence, frameno)
-        __set_property(fluidsim, 'min_diffuse_turbulence', mint)
-        __set_property(fluidsim, 'max_diffuse_turbulence', maxt)
+        __set_parameter(parameters, 'min_diffuse_turbulence', mint)
+        __set_parameter(parameters, 'max_diffuse_turbulence', maxt)
 
         max_particles = __get_parameter_data(whitewater.max_whitewater_particles, frameno)
-        __set_property(fluidsim, 'max_num_diffuse_particles', int(max_particles * 1e6))
+        __set_parameter(parameters, 'max_num_diffuse_particles', int(max_particles * 1e6))
 
         bounds = __get_emission_boundary(whitewater, fluidsim)
         __set_whitewater_emission_boundary_property(fluidsim, bounds)
 
         min_lifespan, max_lifespan = __get_parameter_data(whitewater.min_max_whitewater_lifespan, frameno)
         lifespan_variance = __get_parameter_data(whitewater.whitewater_lifespan_variance, frameno)
-        __set_property(fluidsim, 'min_diffuse_particle_lifetime', min_lifespan)
-        __set_property(fluidsim, 'max_diffuse_particle_lifetime', max_lifespan)
-        __set_property(fluidsim, 'diffuse_particle_lifetime_variance', lifespan_variance)
+        __set_parameter(parameters, 'min_diffuse_particle_lifetime', min_lifespan)
+        __set_parameter(parameters, 'max_diffuse_particle_lifetime', max_lifespan)
+        __set_parameter(parameters, 'diffuse_particle_lifetime_variance', lifespan_variance)
 
         foam_modifier = __get_parameter_data(whitewater.foam_lifespan_modifier, frameno)
         bubble_modifier = __get_parameter_data(whitewater.bubble_lifespan_modifier, frameno)
         spray_modifier = __get_parameter_data(whitewater.spray_lifespan_modifier, frameno)
         dust_modifier = __get_parameter_data(whitewater.dust_lifespan_modifier, frameno)
-        __set_property(fluidsim, 'foam_particle_lifetime_modifier', 1.0 / max(foam_modifier, 1e-6))
-        __set_property(fluidsim, 'bubble_particle_lifetime_modifier', 1.0 / max(bubble_modifier, 1e-6))
-        __set_property(fluidsim, 'spray_particle_lifetime_modifier', 1.0 / max(spray_modifier, 1e-6))
-        __set_property(fluidsim, 'dust_particle_lifetime_modifier', 1.0 / max(dust_modifier, 1e-6))
+        __set_parameter(parameters, 'foam_particle_lifetime_modifier', 1.0 / max(foam_modifier, 1e-6))
+        __set_parameter(parameters, 'bubble_particle_lifetime_modifier', 1.0 / max(bubble_modifier, 1e-6))
+        __set_parameter(parameters, 'spray_particle_lifetime_modifier', 1.0 / max(spray_modifier, 1e-6))
+        __set_parameter(parameters, 'dust_particle_lifetime_modifier', 1.0 / max(dust_modifier, 1e-6))
 
         boundary_collisions_mode = __get_parameter_data(whitewater.whitewater_boundary_collisions_mode, frameno)
         if boundary_collisions_mode == 'BOUNDARY_COLLISIONS_MODE_INHERIT':
@@ -1963,10 +2097,10 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
             spray_boundary_collisions = __get_parameter_data(whitewater.spray_boundary_collisions, frameno)
             dust_boundary_collisions = __get_parameter_data(whitewater.dust_boundary_collisions, frameno)
 
-        __set_property(fluidsim, 'foam_boundary_collisions', foam_boundary_collisions)
-        __set_property(fluidsim, 'bubble_boundary_collisions', bubble_boundary_collisions)
-        __set_property(fluidsim, 'spray_boundary_collisions', spray_boundary_collisions)
-        __set_property(fluidsim, 'dust_boundary_collisions', dust_boundary_collisions)
+        __set_parameter(parameters, 'foam_boundary_collisions', foam_boundary_collisions)
+        __set_parameter(parameters, 'bubble_boundary_collisions', bubble_boundary_collisions)
+        __set_parameter(parameters, 'spray_boundary_collisions', spray_boundary_collisions)
+        __set_parameter(parameters, 'dust_boundary_collisions', dust_boundary_collisions)
 
         """
         foam_behaviour = __get_parameter_data(whitewater.foam_boundary_behaviour, frameno)
@@ -1977,54 +2111,54 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
         bubble_behaviour = __get_limit_behaviour_enum(bubble_behaviour)
         spray_behaviour = __get_limit_behaviour_enum(spray_behaviour)
         dust_behaviour = __get_limit_behaviour_enum(dust_behaviour)
-        __set_property(fluidsim, 'diffuse_foam_limit_behaviour', foam_behaviour)
-        __set_property(fluidsim, 'diffuse_bubble_limit_behaviour', bubble_behaviour)
-        __set_property(fluidsim, 'diffuse_spray_limit_behaviour', spray_behaviour)
-        __set_property(fluidsim, 'diffuse_dust_limit_behaviour', dust_behaviour)
+        __set_parameter(parameters, 'diffuse_foam_limit_behaviour', foam_behaviour)
+        __set_parameter(parameters, 'diffuse_bubble_limit_behaviour', bubble_behaviour)
+        __set_parameter(parameters, 'diffuse_spray_limit_behaviour', spray_behaviour)
+        __set_parameter(parameters, 'diffuse_dust_limit_behaviour', dust_behaviour)
 
         foam_active_sides = __get_parameter_data(whitewater.foam_boundary_active, frameno)
         bubble_active_sides = __get_parameter_data(whitewater.bubble_boundary_active, frameno)
         spray_active_sides = __get_parameter_data(whitewater.spray_boundary_active, frameno)
         dust_active_sides = __get_parameter_data(whitewater.bubble_boundary_active, frameno) # Same as bubble for now
-        __set_property(fluidsim, 'diffuse_foam_active_boundary_sides', foam_active_sides)
-        __set_property(fluidsim, 'diffuse_bubble_active_boundary_sides', bubble_active_sides)
-        __set_property(fluidsim, 'diffuse_spray_active_boundary_sides', spray_active_sides)
-        __set_property(fluidsim, 'diffuse_dust_active_boundary_sides', dust_active_sides)
+        __set_parameter(parameters, 'diffuse_foam_active_boundary_sides', foam_active_sides)
+        __set_parameter(parameters, 'diffuse_bubble_active_boundary_sides', bubble_active_sides)
+        __set_parameter(parameters, 'diffuse_spray_active_boundary_sides', spray_active_sides)
+        __set_parameter(parameters, 'diffuse_dust_active_boundary_sides', dust_active_sides)
         """
 
         strength = __get_parameter_data(whitewater.foam_advection_strength, frameno)
         foam_depth = __get_parameter_data(whitewater.foam_layer_depth, frameno)
         foam_offset = __get_parameter_data(whitewater.foam_layer_offset, frameno)
-        __set_property(fluidsim, 'diffuse_foam_layer_depth', foam_depth)
-        __set_property(fluidsim, 'diffuse_foam_layer_offset', foam_offset)
-        __set_property(fluidsim, 'diffuse_foam_advection_strength', strength)
+        __set_parameter(parameters, 'diffuse_foam_layer_depth', foam_depth)
+        __set_parameter(parameters, 'diffuse_foam_layer_offset', foam_offset)
+        __set_parameter(parameters, 'diffuse_foam_advection_strength', strength)
 
         preserve_foam = __get_parameter_data(whitewater.preserve_foam, frameno)
         preserve_rate = __get_parameter_data(whitewater.foam_preservation_rate, frameno)
         min_density, max_density = __get_parameter_data(whitewater.min_max_foam_density, frameno)
-        __set_property(fluidsim, 'enable_diffuse_preserve_foam', preserve_foam)
-        __set_property(fluidsim, 'diffuse_foam_preservation_rate', preserve_rate)
-        __set_property(fluidsim, 'min_diffuse_foam_density', min_density)
-        __set_property(fluidsim, 'max_diffuse_foam_density', max_density)
+        __set_parameter(parameters, 'enable_diffuse_preserve_foam', preserve_foam)
+        __set_parameter(parameters, 'diffuse_foam_preservation_rate', preserve_rate)
+        __set_parameter(parameters, 'min_diffuse_foam_density', min_density)
+        __set_parameter(parameters, 'max_diffuse_foam_density', max_density)
 
         drag = __get_parameter_data(whitewater.bubble_drag_coefficient, frameno)
         bouyancy = __get_parameter_data(whitewater.bubble_bouyancy_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_bubble_drag_coefficient', drag)
-        __set_property(fluidsim, 'diffuse_bubble_bouyancy_coefficient', bouyancy)
+        __set_parameter(parameters, 'diffuse_bubble_drag_coefficient', drag)
+        __set_parameter(parameters, 'diffuse_bubble_bouyancy_coefficient', bouyancy)
 
         drag = __get_parameter_data(whitewater.dust_drag_coefficient, frameno)
         bouyancy = __get_parameter_data(whitewater.dust_bouyancy_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_dust_drag_coefficient', drag)
-        __set_property(fluidsim, 'diffuse_dust_bouyancy_coefficient', bouyancy)
+        __set_parameter(parameters, 'diffuse_dust_drag_coefficient', drag)
+        __set_parameter(parameters, 'diffuse_dust_bouyancy_coefficient', bouyancy)
 
         drag = __get_parameter_data(whitewater.spray_drag_coefficient, frameno)
-        __set_property(fluidsim, 'diffuse_spray_drag_coefficient', drag)
+        __set_parameter(parameters, 'diffuse_spray_drag_coefficient', drag)
 
         base_level = __get_parameter_data(whitewater.obstacle_influence_base_level, frameno)
-        __set_property(fluidsim, 'diffuse_obstacle_influence_base_level', base_level)
+        __set_parameter(parameters, 'diffuse_obstacle_influence_base_level', base_level)
 
         decay_rate = __get_parameter_data(whitewater.obstacle_influence_decay_rate, frameno)
-        __set_property(fluidsim, 'diffuse_obstacle_influence_decay_rate', decay_rate)
+        __set_parameter(parameters, 'diffuse_obstacle_influence_decay_rate', decay_rate)
 
     # World Settings
 
@@ -2041,221 +2175,225 @@ def __update_animatable_domain_properties(fluidsim, data, frameno):
     weight_whitewater_bubble = __get_parameter_data(world.force_field_weight_whitewater_bubble, frameno)
     weight_whitewater_spray = __get_parameter_data(world.force_field_weight_whitewater_spray, frameno)
     weight_whitewater_dust = __get_parameter_data(world.force_field_weight_whitewater_dust, frameno)
-    __set_property(fluidsim, 'force_field_weight_fluid_particles', weight_fluid_particles)
-    __set_property(fluidsim, 'force_field_weight_whitewater_foam', weight_whitewater_foam)
-    __set_property(fluidsim, 'force_field_weight_whitewater_bubble', weight_whitewater_bubble)
-    __set_property(fluidsim, 'force_field_weight_whitewater_spray', weight_whitewater_spray)
-    __set_property(fluidsim, 'force_field_weight_whitewater_dust', weight_whitewater_dust)
+    __set_parameter(parameters, 'force_field_weight_fluid_particles', weight_fluid_particles)
+    __set_parameter(parameters, 'force_field_weight_whitewater_foam', weight_whitewater_foam)
+    __set_parameter(parameters, 'force_field_weight_whitewater_bubble', weight_whitewater_bubble)
+    __set_parameter(parameters, 'force_field_weight_whitewater_spray', weight_whitewater_spray)
+    __set_parameter(parameters, 'force_field_weight_whitewater_dust', weight_whitewater_dust)
 
     is_viscosity_enabled = __get_parameter_data(world.enable_viscosity, frameno)
     if is_viscosity_enabled:
         surface = dprops.surface
         is_variable_viscosity_enabled = __get_parameter_data(surface.enable_viscosity_attribute, frameno)
         if is_variable_viscosity_enabled:
-            __set_property(fluidsim, 'viscosity', 0.0)
+            __set_parameter(parameters, 'viscosity', 0.0)
         else:
             constant_viscosity = __get_viscosity_value(world, frameno)
-            __set_property(fluidsim, 'viscosity', constant_viscosity)
+            __set_parameter(parameters, 'viscosity', constant_viscosity)
 
         tolerance_int = __get_parameter_data(world.viscosity_solver_error_tolerance, frameno)
         error_tolerance = 1.0 * 10.0**(-tolerance_int)
-        __set_property(fluidsim, 'viscosity_solver_error_tolerance', error_tolerance)
-    elif fluidsim.viscosity > 0.0:
-        __set_property(fluidsim, 'viscosity', 0.0)
+        __set_parameter(parameters, 'viscosity_solver_error_tolerance', error_tolerance)
+    else:
+        __set_parameter(parameters, 'viscosity', 0.0)
 
     is_surface_tension_enabled = __get_parameter_data(world.enable_surface_tension, frameno)
     if is_surface_tension_enabled:
         surface_tension = __get_surface_tension_value(world, frameno)
-        __set_property(fluidsim, 'surface_tension', surface_tension)
+        __set_parameter(parameters, 'surface_tension', surface_tension)
 
         mincfl, maxcfl = world.minimum_surface_tension_cfl, world.maximum_surface_tension_cfl
         accuracy_pct = __get_parameter_data(world.surface_tension_accuracy, frameno) / 100.0
         surface_tension_number = mincfl + (1.0 - accuracy_pct) * (maxcfl - mincfl)
-        __set_property(fluidsim, 'surface_tension_condition_number', surface_tension_number)
+        __set_parameter(parameters, 'surface_tension_condition_number', surface_tension_number)
 
-    elif fluidsim.surface_tension > 0.0:
-        __set_property(fluidsim, 'surface_tension', 0.0)
+    else:
+        __set_parameter(parameters, 'surface_tension', 0.0)
 
     is_sheet_seeding_enabled = __get_parameter_data(world.enable_sheet_seeding, frameno)
-    __set_property(fluidsim, 'enable_sheet_seeding', is_sheet_seeding_enabled)
+    __set_parameter(parameters, 'enable_sheet_seeding', is_sheet_seeding_enabled)
     if is_sheet_seeding_enabled:
         sheet_fill_rate = __get_parameter_data(world.sheet_fill_rate, frameno)
         threshold = __get_parameter_data(world.sheet_fill_threshold, frameno)
-        __set_property(fluidsim, 'sheet_fill_rate', sheet_fill_rate, value_min=0, value_max=1.0)
-        __set_property(fluidsim, 'sheet_fill_threshold', threshold - 1, value_min=-1.0, value_max=0.0)
+        __set_parameter(parameters, 'sheet_fill_rate', sheet_fill_rate, value_min=0, value_max=1.0)
+        __set_parameter(parameters, 'sheet_fill_threshold', threshold - 1, value_min=-1.0, value_max=0.0)
 
     friction = __get_parameter_data(world.boundary_friction, frameno)
-    __set_property(fluidsim, 'boundary_friction', friction, value_min=0.0, value_max=1.0)
+    __set_parameter(parameters, 'boundary_friction', friction, value_min=0.0, value_max=1.0)
 
     # Fluid Particle Settings
 
     particles = dprops.particles
 
     output_amount = __get_parameter_data(particles.fluid_particle_output_amount, frameno)
-    __set_property(fluidsim, 'fluid_particle_output_amount', output_amount,  value_min=0.0, value_max=1.0)
+    __set_parameter(parameters, 'fluid_particle_output_amount', output_amount,  value_min=0.0, value_max=1.0)
 
     enable_fluid_particle_surface_output = __get_parameter_data(particles.enable_fluid_particle_surface_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_surface_output', enable_fluid_particle_surface_output)
+    __set_parameter(parameters, 'enable_fluid_particle_surface_output', enable_fluid_particle_surface_output)
 
     enable_fluid_particle_boundary_output = __get_parameter_data(particles.enable_fluid_particle_boundary_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_boundary_output', enable_fluid_particle_boundary_output)
+    __set_parameter(parameters, 'enable_fluid_particle_boundary_output', enable_fluid_particle_boundary_output)
 
     enable_fluid_particle_interior_output = __get_parameter_data(particles.enable_fluid_particle_interior_output, frameno)
-    __set_property(fluidsim, 'enable_fluid_particle_interior_output', enable_fluid_particle_interior_output)
+    __set_parameter(parameters, 'enable_fluid_particle_interior_output', enable_fluid_particle_interior_output)
 
     source_id = __get_parameter_data(particles.fluid_particle_source_id_blacklist, frameno)
-    __set_property(fluidsim, 'fluid_particle_source_id_blacklist', source_id)
+    __set_parameter(parameters, 'fluid_particle_source_id_blacklist', source_id)
     
     # Surface Settings
 
     surface = dprops.surface
 
     enable_surface_mesh_generation = __get_parameter_data(surface.enable_surface_mesh_generation, frameno)
-    __set_property(fluidsim, 'enable_surface_reconstruction', enable_surface_mesh_generation)
+    __set_parameter(parameters, 'enable_surface_reconstruction', enable_surface_mesh_generation)
 
     subdivisions = __get_parameter_data(surface.subdivisions, frameno) + 1
-    __set_property(fluidsim, 'surface_subdivision_level', subdivisions)
+    __set_parameter(parameters, 'surface_subdivision_level', subdivisions)
 
     compute_chunk_mode = __get_parameter_data(surface.compute_chunk_mode, frameno)
     if compute_chunk_mode == 'COMPUTE_CHUNK_MODE_AUTO':
         num_chunks = __get_parameter_data(surface.compute_chunks_auto, frameno)
     elif compute_chunk_mode == 'COMPUTE_CHUNK_MODE_FIXED':
         num_chunks = __get_parameter_data(surface.compute_chunks_fixed, frameno)
-    __set_property(fluidsim, 'num_polygonizer_slices', num_chunks)
+    __set_parameter(parameters, 'num_polygonizer_slices', num_chunks)
 
     particle_scale = __get_parameter_data(surface.particle_scale, frameno)
     particle_scale *= surface.native_particle_scale
-    __set_property(fluidsim, 'marker_particle_scale', particle_scale)
+    __set_parameter(parameters, 'marker_particle_scale', particle_scale)
 
     smoothing_value = __get_parameter_data(surface.smoothing_value, frameno)
     smoothing_iterations = __get_parameter_data(surface.smoothing_iterations, frameno)
-    __set_property(fluidsim, 'surface_smoothing_value', smoothing_value)
-    __set_property(fluidsim, 'surface_smoothing_iterations', smoothing_iterations)
+    __set_parameter(parameters, 'surface_smoothing_value', smoothing_value)
+    __set_parameter(parameters, 'surface_smoothing_iterations', smoothing_iterations)
 
     enable_meshing_offset = __get_parameter_data(surface.enable_meshing_offset, frameno)
-    __set_property(fluidsim, 'enable_obstacle_meshing_offset', enable_meshing_offset)
+    __set_parameter(parameters, 'enable_obstacle_meshing_offset', enable_meshing_offset)
 
     meshing_mode = __get_parameter_data(surface.obstacle_meshing_mode, frameno)
     meshing_offset = __get_obstacle_meshing_offset(meshing_mode)
-    __set_property(fluidsim, 'obstacle_meshing_offset', meshing_offset)
+    __set_parameter(parameters, 'obstacle_meshing_offset', meshing_offset)
 
     remove_near_domain = __get_parameter_data(surface.remove_mesh_near_domain, frameno)
     near_domain_distance = __get_parameter_data(surface.remove_mesh_near_domain_distance, frameno) - 1
-    __set_property(fluidsim, 'enable_remove_surface_near_domain', remove_near_domain)
-    __set_property(fluidsim, 'remove_surface_near_domain_distance', near_domain_distance)
+    __set_parameter(parameters, 'enable_remove_surface_near_domain', remove_near_domain)
+    __set_parameter(parameters, 'remove_surface_near_domain_distance', near_domain_distance)
 
     invert_contact = __get_parameter_data(surface.invert_contact_normals, frameno)
-    __set_property(fluidsim, 'enable_inverted_contact_normals', invert_contact)
+    __set_parameter(parameters, 'enable_inverted_contact_normals', invert_contact)
 
     motion_blur = __get_parameter_data(surface.generate_motion_blur_data, frameno)
-    __set_property(fluidsim, 'enable_surface_motion_blur', motion_blur)
+    __set_parameter(parameters, 'enable_surface_motion_blur', motion_blur)
 
     age_radius = __get_parameter_data(surface.age_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_age_attribute_radius', age_radius)
+    __set_parameter(parameters, 'surface_age_attribute_radius', age_radius)
 
     lifetime_radius = __get_parameter_data(surface.lifetime_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_lifetime_attribute_radius', lifetime_radius)
+    __set_parameter(parameters, 'surface_lifetime_attribute_radius', lifetime_radius)
 
     base_death_time = __get_parameter_data(surface.lifetime_attribute_death_time, frameno)
-    __set_property(fluidsim, 'surface_lifetime_attribute_death_time', base_death_time)
+    __set_parameter(parameters, 'surface_lifetime_attribute_death_time', base_death_time)
 
     whitewater_proximity_radius = __get_parameter_data(surface.whitewater_proximity_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_whitewater_proximity_attribute_radius', whitewater_proximity_radius)
+    __set_parameter(parameters, 'surface_whitewater_proximity_attribute_radius', whitewater_proximity_radius)
 
     color_radius = __get_parameter_data(surface.color_attribute_radius, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_radius', color_radius)
+    __set_parameter(parameters, 'surface_color_attribute_radius', color_radius)
 
     enable_mixing = __get_parameter_data(surface.enable_color_attribute_mixing, frameno)
-    __set_property(fluidsim, 'enable_surface_color_attribute_mixing', enable_mixing)
+    __set_parameter(parameters, 'enable_surface_color_attribute_mixing', enable_mixing)
 
     mixing_rate = __get_parameter_data(surface.color_attribute_mixing_rate, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_mixing_rate', mixing_rate)
+    __set_parameter(parameters, 'surface_color_attribute_mixing_rate', mixing_rate)
 
     mixing_radius = __get_parameter_data(surface.color_attribute_mixing_radius, frameno)
-    __set_property(fluidsim, 'surface_color_attribute_mixing_radius', mixing_radius)
+    __set_parameter(parameters, 'surface_color_attribute_mixing_radius', mixing_radius)
 
     # Advanced Settings
 
     advanced = dprops.advanced
     min_substeps, max_substeps = __get_parameter_data(advanced.min_max_time_steps_per_frame, frameno)
-    __set_property(fluidsim, 'min_time_steps_per_frame', min_substeps)
-    __set_property(fluidsim, 'max_time_steps_per_frame', max_substeps)
+    __set_parameter(parameters, 'min_time_steps_per_frame', min_substeps)
+    __set_parameter(parameters, 'max_time_steps_per_frame', max_substeps)
 
     enable_obstacle_time_stepping = \
         __get_parameter_data(advanced.enable_adaptive_obstacle_time_stepping, frameno)
-    __set_property(fluidsim, 'enable_adaptive_obstacle_time_stepping', enable_obstacle_time_stepping)
+    __set_parameter(parameters, 'enable_adaptive_obstacle_time_stepping', enable_obstacle_time_stepping)
 
     enable_force_field_time_stepping = \
         __get_parameter_data(advanced.enable_adaptive_force_field_time_stepping, frameno)
-    __set_property(fluidsim, 'enable_adaptive_force_field_time_stepping', enable_force_field_time_stepping)
+    __set_parameter(parameters, 'enable_adaptive_force_field_time_stepping', enable_force_field_time_stepping)
 
     jitter_factor = __get_parameter_data(advanced.particle_jitter_factor, frameno)
-    __set_property(fluidsim, 'marker_particle_jitter_factor', jitter_factor)
+    __set_parameter(parameters, 'marker_particle_jitter_factor', jitter_factor)
 
     jitter_surface = __get_parameter_data(advanced.jitter_surface_particles, frameno)
-    __set_property(fluidsim, 'jitter_surface_marker_particles', jitter_surface)
+    __set_parameter(parameters, 'jitter_surface_marker_particles', jitter_surface)
 
     pressure_solver_iterations = __get_parameter_data(advanced.pressure_solver_max_iterations, frameno)
-    __set_property(fluidsim, 'pressure_solver_max_iterations', pressure_solver_iterations)
+    __set_parameter(parameters, 'pressure_solver_max_iterations', pressure_solver_iterations)
 
     viscosity_solver_iterations = __get_parameter_data(advanced.viscosity_solver_max_iterations, frameno)
-    __set_property(fluidsim, 'viscosity_solver_max_iterations', viscosity_solver_iterations)
+    __set_parameter(parameters, 'viscosity_solver_max_iterations', viscosity_solver_iterations)
 
     PICFLIP_ratio = __get_parameter_data(advanced.PICFLIP_ratio, frameno)
-    __set_property(fluidsim, 'PICFLIP_ratio', PICFLIP_ratio)
+    __set_parameter(parameters, 'PICFLIP_ratio', PICFLIP_ratio)
 
     PICAPIC_ratio = __get_parameter_data(advanced.PICAPIC_ratio, frameno)
-    __set_property(fluidsim, 'PICAPIC_ratio', PICAPIC_ratio)
+    __set_parameter(parameters, 'PICAPIC_ratio', PICAPIC_ratio)
 
     CFL_number = __get_parameter_data(advanced.CFL_condition_number, frameno)
-    __set_property(fluidsim, 'CFL_condition_number', CFL_number)
+    __set_parameter(parameters, 'CFL_condition_number', CFL_number)
 
     enable_velocity_removal = __get_parameter_data(advanced.enable_extreme_velocity_removal, frameno)
-    __set_property(fluidsim, 'enable_extreme_velocity_removal', enable_velocity_removal)
+    __set_parameter(parameters, 'enable_extreme_velocity_removal', enable_velocity_removal)
 
     threading_mode = __get_parameter_data(advanced.threading_mode, frameno)
     if threading_mode == 'THREADING_MODE_AUTO_DETECT':
         num_threads = __get_parameter_data(advanced.num_threads_auto_detect, frameno)
     elif threading_mode == 'THREADING_MODE_FIXED':
         num_threads = __get_parameter_data(advanced.num_threads_fixed, frameno)
-    __set_property(fluidsim, 'max_thread_count', num_threads)
+    __set_parameter(parameters, 'max_thread_count', num_threads)
 
     enable_cl_scalar_field = __get_parameter_data(advanced.enable_gpu_features, frameno)
     enable_cl_advection = __get_parameter_data(advanced.enable_gpu_features, frameno)
-    __set_property(fluidsim, 'enable_opencl_scalar_field', enable_cl_scalar_field)
-    __set_property(fluidsim, 'enable_opencl_particle_advection', enable_cl_advection)
+    __set_parameter(parameters, 'enable_opencl_scalar_field', enable_cl_scalar_field)
+    __set_parameter(parameters, 'enable_opencl_particle_advection', enable_cl_advection)
 
     enable_async_meshing = __get_parameter_data(advanced.enable_asynchronous_meshing, frameno)
-    __set_property(fluidsim, 'enable_asynchronous_meshing', enable_async_meshing)
+    __set_parameter(parameters, 'enable_asynchronous_meshing', enable_async_meshing)
 
     enable_fracture_optimization = __get_parameter_data(advanced.enable_fracture_optimization, frameno)
-    __set_property(fluidsim, 'enable_fracture_optimization', enable_fracture_optimization)
+    __set_parameter(parameters, 'enable_fracture_optimization', enable_fracture_optimization)
 
     precomp_static_sdf = __get_parameter_data(advanced.precompute_static_obstacles, frameno)
-    __set_property(fluidsim, 'enable_static_solid_levelset_precomputation', precomp_static_sdf)
+    __set_parameter(parameters, 'enable_static_solid_levelset_precomputation', precomp_static_sdf)
 
     reserve_temp_grids = __get_parameter_data(advanced.reserve_temporary_grids, frameno)
-    __set_property(fluidsim, 'enable_temporary_mesh_levelset', reserve_temp_grids)
+    __set_parameter(parameters, 'enable_temporary_mesh_levelset', reserve_temp_grids)
 
     # Debug Settings
 
     debug = dprops.debug
     export_internal_obstacle_mesh = __get_parameter_data(debug.export_internal_obstacle_mesh, frameno)
-    __set_property(fluidsim, 'enable_internal_obstacle_mesh_output', export_internal_obstacle_mesh)
+    __set_parameter(parameters, 'enable_internal_obstacle_mesh_output', export_internal_obstacle_mesh)
 
     # Caches created in older versions may not contain force field data. Ignore these features
     # if force field data cannot be found in the cache
     is_force_field_data_available = data.force_field_data is not None
     if is_force_field_data_available: 
         export_force_field = __get_parameter_data(debug.export_force_field, frameno)
-        __set_property(fluidsim, 'enable_force_field_debug_output', export_force_field)
+        __set_parameter(parameters, 'enable_force_field_debug_output', export_force_field)
+
+    # Only values that changed since the previous frame are sent to the engine
+    fluidsim.apply_parameters(parameters)
 
 
 def __update_animatable_properties(fluidsim, data, frameno):
     geometry_database = __get_geometry_database()
     simulation_data = __get_simulation_data()
     timeline_frame = __get_timeline_frame()
-    geometry_data = geometry_database.get_mesh_geometry_data_dict_for_frame(simulation_data, timeline_frame)
+    mesh_cache = __get_mesh_frame_cache()
+    geometry_data = geometry_database.get_mesh_geometry_data_dict_for_frame(simulation_data, timeline_frame, mesh_cache)
     
     __update_animatable_inflow_properties(data, geometry_data, frameno)
     __update_animatable_outflow_properties(data, geometry_data, frameno)
@@ -2269,7 +2407,7 @@ def __frame_number_to_string(frameno):
         return str(frameno).zfill(6)
 
 
-def __write_bounds_data(cache_directory, fluidsim, frameno):
+def __write_bounds_data(cache_directory, fluidsim, frameno, frame_output):
     offset = fluidsim.get_domain_offset()
     scale = fluidsim.get_domain_scale()
     dims = fluidsim.get_simulation_dimensions()
@@ -2289,339 +2427,291 @@ def __write_bounds_data(cache_directory, fluidsim, frameno):
     bounds_filename = "bounds" + fstring + ".bbox"
     bounds_filepath = os.path.join(cache_directory, "bakefiles", bounds_filename)
     bounds_json = json.dumps(bounds)
-    with open(bounds_filepath, 'w', encoding='utf-8') as f:
-        f.write(bounds_json)
+    frame_output.add_file(bounds_filepath, bounds_json, write_mode='w')
 
 
-def __write_surface_data(cache_directory, fluidsim, frameno):
+def __write_surface_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     surface_filename = fstring + ".bobj"
     surface_filepath = os.path.join(cache_directory, "bakefiles", surface_filename)
-    filedata = fluidsim.get_surface_data()
-    with open(surface_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_surface_data(copy=False)
+    frame_output.add_file(surface_filepath, filedata)
 
     if fluidsim.enable_surface_motion_blur:
         blur_filename = "blur" + fstring + ".bobj"
         blur_filepath = os.path.join(cache_directory, "bakefiles", blur_filename)
-        filedata = fluidsim.get_surface_blur_data()
-        with open(blur_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_blur_data(copy=False)
+        frame_output.add_file(blur_filepath, filedata)
 
     if fluidsim.enable_surface_velocity_attribute:
         velocity_filename = "velocity" + fstring + ".bobj"
         velocity_filepath = os.path.join(cache_directory, "bakefiles", velocity_filename)
-        filedata = fluidsim.get_surface_velocity_attribute_data()
-        with open(velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_velocity_attribute_data(copy=False)
+        frame_output.add_file(velocity_filepath, filedata)
 
     if fluidsim.enable_surface_vorticity_attribute:
         vorticity_filename = "vorticity" + fstring + ".bobj"
         vorticity_filepath = os.path.join(cache_directory, "bakefiles", vorticity_filename)
-        filedata = fluidsim.get_surface_vorticity_attribute_data()
-        with open(vorticity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_vorticity_attribute_data(copy=False)
+        frame_output.add_file(vorticity_filepath, filedata)
 
     if fluidsim.enable_surface_speed_attribute:
         speed_filename = "speed" + fstring + ".data"
         speed_filepath = os.path.join(cache_directory, "bakefiles", speed_filename)
-        filedata = fluidsim.get_surface_speed_attribute_data()
-        with open(speed_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_speed_attribute_data(copy=False)
+        frame_output.add_file(speed_filepath, filedata)
 
     if fluidsim.enable_surface_age_attribute:
         age_filename = "age" + fstring + ".data"
         age_filepath = os.path.join(cache_directory, "bakefiles", age_filename)
-        filedata = fluidsim.get_surface_age_attribute_data()
-        with open(age_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_age_attribute_data(copy=False)
+        frame_output.add_file(age_filepath, filedata)
 
     if fluidsim.enable_surface_lifetime_attribute:
         lifetime_filename = "lifetime" + fstring + ".data"
         lifetime_filepath = os.path.join(cache_directory, "bakefiles", lifetime_filename)
-        filedata = fluidsim.get_surface_lifetime_attribute_data()
-        with open(lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_lifetime_attribute_data(copy=False)
+        frame_output.add_file(lifetime_filepath, filedata)
 
     if fluidsim.enable_surface_whitewater_proximity_attribute:
         whitewater_proximity_filename = "whitewaterproximity" + fstring + ".bobj"
         whitewater_proximity_filepath = os.path.join(cache_directory, "bakefiles", whitewater_proximity_filename)
-        filedata = fluidsim.get_surface_whitewater_proximity_attribute_data()
-        with open(whitewater_proximity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_whitewater_proximity_attribute_data(copy=False)
+        frame_output.add_file(whitewater_proximity_filepath, filedata)
 
     if fluidsim.enable_surface_color_attribute:
         color_filename = "color" + fstring + ".bobj"
         color_filepath = os.path.join(cache_directory, "bakefiles", color_filename)
-        filedata = fluidsim.get_surface_color_attribute_data()
-        with open(color_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_color_attribute_data(copy=False)
+        frame_output.add_file(color_filepath, filedata)
 
     if fluidsim.enable_surface_source_id_attribute:
         source_id_filename = "sourceid" + fstring + ".data"
         source_id_filepath = os.path.join(cache_directory, "bakefiles", source_id_filename)
-        filedata = fluidsim.get_surface_source_id_attribute_data()
-        with open(source_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_source_id_attribute_data(copy=False)
+        frame_output.add_file(source_id_filepath, filedata)
 
     if fluidsim.enable_surface_viscosity_attribute:
         viscosity_filename = "viscosity" + fstring + ".data"
         viscosity_filepath = os.path.join(cache_directory, "bakefiles", viscosity_filename)
-        filedata = fluidsim.get_surface_viscosity_attribute_data()
-        with open(viscosity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_surface_viscosity_attribute_data(copy=False)
+        frame_output.add_file(viscosity_filepath, filedata)
 
     preview_filename = "preview" + fstring + ".bobj"
     preview_filepath = os.path.join(cache_directory, "bakefiles", preview_filename)
-    filedata = fluidsim.get_surface_preview_data()
-    with open(preview_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_surface_preview_data(copy=False)
+    frame_output.add_file(preview_filepath, filedata)
 
 
-def __write_whitewater_data(cache_directory, fluidsim, frameno):
+def __write_whitewater_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     foam_filename = "foam" + fstring + ".wwp"
     foam_filepath = os.path.join(cache_directory, "bakefiles", foam_filename)
-    filedata = fluidsim.get_diffuse_foam_data()
-    with open(foam_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_diffuse_foam_data(copy=False)
+    frame_output.add_file(foam_filepath, filedata)
 
     bubble_filename = "bubble" + fstring + ".wwp"
     bubble_filepath = os.path.join(cache_directory, "bakefiles", bubble_filename)
-    filedata = fluidsim.get_diffuse_bubble_data()
-    with open(bubble_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_diffuse_bubble_data(copy=False)
+    frame_output.add_file(bubble_filepath, filedata)
 
     spray_filename = "spray" + fstring + ".wwp"
     spray_filepath = os.path.join(cache_directory, "bakefiles", spray_filename)
-    filedata = fluidsim.get_diffuse_spray_data()
-    with open(spray_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_diffuse_spray_data(copy=False)
+    frame_output.add_file(spray_filepath, filedata)
 
     dust_filename = "dust" + fstring + ".wwp"
     dust_filepath = os.path.join(cache_directory, "bakefiles", dust_filename)
-    filedata = fluidsim.get_diffuse_dust_data()
-    with open(dust_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_diffuse_dust_data(copy=False)
+    frame_output.add_file(dust_filepath, filedata)
 
     if fluidsim.enable_whitewater_motion_blur:
         foam_blur_filename = "blurfoam" + fstring + ".wwp"
         foam_blur_filepath = os.path.join(cache_directory, "bakefiles", foam_blur_filename)
-        filedata = fluidsim.get_diffuse_foam_blur_data()
-        with open(foam_blur_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_diffuse_foam_blur_data(copy=False)
+        frame_output.add_file(foam_blur_filepath, filedata)
 
         bubble_blur_filename = "blurbubble" + fstring + ".wwp"
         bubble_blur_filepath = os.path.join(cache_directory, "bakefiles", bubble_blur_filename)
-        filedata = fluidsim.get_diffuse_bubble_blur_data()
-        with open(bubble_blur_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_diffuse_bubble_blur_data(copy=False)
+        frame_output.add_file(bubble_blur_filepath, filedata)
 
         spray_blur_filename = "blurspray" + fstring + ".wwp"
         spray_blur_filepath = os.path.join(cache_directory, "bakefiles", spray_blur_filename)
-        filedata = fluidsim.get_diffuse_spray_blur_data()
-        with open(spray_blur_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_diffuse_spray_blur_data(copy=False)
+        frame_output.add_file(spray_blur_filepath, filedata)
 
         dust_blur_filename = "blurdust" + fstring + ".wwp"
         dust_blur_filepath = os.path.join(cache_directory, "bakefiles", dust_blur_filename)
-        filedata = fluidsim.get_diffuse_dust_blur_data()
-        with open(dust_blur_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_diffuse_dust_blur_data(copy=False)
+        frame_output.add_file(dust_blur_filepath, filedata)
 
     if fluidsim.enable_whitewater_velocity_attribute:
         foam_velocity_filename = "velocityfoam" + fstring + ".wwp"
         foam_velocity_filepath = os.path.join(cache_directory, "bakefiles", foam_velocity_filename)
-        filedata = fluidsim.get_whitewater_foam_velocity_attribute_data()
-        with open(foam_velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_foam_velocity_attribute_data(copy=False)
+        frame_output.add_file(foam_velocity_filepath, filedata)
 
         bubble_velocity_filename = "velocitybubble" + fstring + ".wwp"
         bubble_velocity_filepath = os.path.join(cache_directory, "bakefiles", bubble_velocity_filename)
-        filedata = fluidsim.get_whitewater_bubble_velocity_attribute_data()
-        with open(bubble_velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_bubble_velocity_attribute_data(copy=False)
+        frame_output.add_file(bubble_velocity_filepath, filedata)
 
         spray_velocity_filename = "velocityspray" + fstring + ".wwp"
         spray_velocity_filepath = os.path.join(cache_directory, "bakefiles", spray_velocity_filename)
-        filedata = fluidsim.get_whitewater_spray_velocity_attribute_data()
-        with open(spray_velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_spray_velocity_attribute_data(copy=False)
+        frame_output.add_file(spray_velocity_filepath, filedata)
 
         dust_velocity_filename = "velocitydust" + fstring + ".wwp"
         dust_velocity_filepath = os.path.join(cache_directory, "bakefiles", dust_velocity_filename)
-        filedata = fluidsim.get_whitewater_dust_velocity_attribute_data()
-        with open(dust_velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_dust_velocity_attribute_data(copy=False)
+        frame_output.add_file(dust_velocity_filepath, filedata)
 
     if fluidsim.enable_whitewater_id_attribute:
         foam_id_filename = "idfoam" + fstring + ".wwi"
         foam_id_filepath = os.path.join(cache_directory, "bakefiles", foam_id_filename)
-        filedata = fluidsim.get_whitewater_foam_id_attribute_data()
-        with open(foam_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_foam_id_attribute_data(copy=False)
+        frame_output.add_file(foam_id_filepath, filedata)
 
         bubble_id_filename = "idbubble" + fstring + ".wwi"
         bubble_id_filepath = os.path.join(cache_directory, "bakefiles", bubble_id_filename)
-        filedata = fluidsim.get_whitewater_bubble_id_attribute_data()
-        with open(bubble_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_bubble_id_attribute_data(copy=False)
+        frame_output.add_file(bubble_id_filepath, filedata)
 
         spray_id_filename = "idspray" + fstring + ".wwi"
         spray_id_filepath = os.path.join(cache_directory, "bakefiles", spray_id_filename)
-        filedata = fluidsim.get_whitewater_spray_id_attribute_data()
-        with open(spray_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_spray_id_attribute_data(copy=False)
+        frame_output.add_file(spray_id_filepath, filedata)
 
         dust_id_filename = "iddust" + fstring + ".wwi"
         dust_id_filepath = os.path.join(cache_directory, "bakefiles", dust_id_filename)
-        filedata = fluidsim.get_whitewater_dust_id_attribute_data()
-        with open(dust_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_dust_id_attribute_data(copy=False)
+        frame_output.add_file(dust_id_filepath, filedata)
 
     if fluidsim.enable_whitewater_lifetime_attribute:
         foam_lifetime_filename = "lifetimefoam" + fstring + ".wwf"
         foam_lifetime_filepath = os.path.join(cache_directory, "bakefiles", foam_lifetime_filename)
-        filedata = fluidsim.get_whitewater_foam_lifetime_attribute_data()
-        with open(foam_lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_foam_lifetime_attribute_data(copy=False)
+        frame_output.add_file(foam_lifetime_filepath, filedata)
 
         bubble_lifetime_filename = "lifetimebubble" + fstring + ".wwf"
         bubble_lifetime_filepath = os.path.join(cache_directory, "bakefiles", bubble_lifetime_filename)
-        filedata = fluidsim.get_whitewater_bubble_lifetime_attribute_data()
-        with open(bubble_lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_bubble_lifetime_attribute_data(copy=False)
+        frame_output.add_file(bubble_lifetime_filepath, filedata)
 
         spray_lifetime_filename = "lifetimespray" + fstring + ".wwf"
         spray_lifetime_filepath = os.path.join(cache_directory, "bakefiles", spray_lifetime_filename)
-        filedata = fluidsim.get_whitewater_spray_lifetime_attribute_data()
-        with open(spray_lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_spray_lifetime_attribute_data(copy=False)
+        frame_output.add_file(spray_lifetime_filepath, filedata)
 
         dust_lifetime_filename = "lifetimedust" + fstring + ".wwf"
         dust_lifetime_filepath = os.path.join(cache_directory, "bakefiles", dust_lifetime_filename)
-        filedata = fluidsim.get_whitewater_dust_lifetime_attribute_data()
-        with open(dust_lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_whitewater_dust_lifetime_attribute_data(copy=False)
+        frame_output.add_file(dust_lifetime_filepath, filedata)
 
 
-def __write_fluid_particle_data(cache_directory, fluidsim, frameno):
+def __write_fluid_particle_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     particle_filename = "fluidparticles" + fstring + ".ffp3"
     particle_filepath = os.path.join(cache_directory, "bakefiles", particle_filename)
-    filedata = fluidsim.get_fluid_particle_data()
-    with open(particle_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_fluid_particle_data(copy=False)
+    frame_output.add_file(particle_filepath, filedata)
 
     particle_id_filename = "fluidparticlesid" + fstring + ".ffp3"
     particle_id_filepath = os.path.join(cache_directory, "bakefiles", particle_id_filename)
-    filedata = fluidsim.get_fluid_particle_id_attribute_data()
-    with open(particle_id_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_fluid_particle_id_attribute_data(copy=False)
+    frame_output.add_file(particle_id_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_velocity_attribute:
         particle_velocity_filename = "fluidparticlesvelocity" + fstring + ".ffp3"
         particle_velocity_filepath = os.path.join(cache_directory, "bakefiles", particle_velocity_filename)
-        filedata = fluidsim.get_fluid_particle_velocity_attribute_data()
-        with open(particle_velocity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_velocity_attribute_data(copy=False)
+        frame_output.add_file(particle_velocity_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_speed_attribute:
         particle_speed_filename = "fluidparticlesspeed" + fstring + ".ffp3"
         particle_speed_filepath = os.path.join(cache_directory, "bakefiles", particle_speed_filename)
-        filedata = fluidsim.get_fluid_particle_speed_attribute_data()
-        with open(particle_speed_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_speed_attribute_data(copy=False)
+        frame_output.add_file(particle_speed_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_vorticity_attribute:
         particle_vorticity_filename = "fluidparticlesvorticity" + fstring + ".ffp3"
         particle_vorticity_filepath = os.path.join(cache_directory, "bakefiles", particle_vorticity_filename)
-        filedata = fluidsim.get_fluid_particle_vorticity_attribute_data()
-        with open(particle_vorticity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_vorticity_attribute_data(copy=False)
+        frame_output.add_file(particle_vorticity_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_color_attribute:
         particle_color_filename = "fluidparticlescolor" + fstring + ".ffp3"
         particle_color_filepath = os.path.join(cache_directory, "bakefiles", particle_color_filename)
-        filedata = fluidsim.get_fluid_particle_color_attribute_data()
-        with open(particle_color_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_color_attribute_data(copy=False)
+        frame_output.add_file(particle_color_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_age_attribute:
         particle_age_filename = "fluidparticlesage" + fstring + ".ffp3"
         particle_age_filepath = os.path.join(cache_directory, "bakefiles", particle_age_filename)
-        filedata = fluidsim.get_fluid_particle_age_attribute_data()
-        with open(particle_age_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_age_attribute_data(copy=False)
+        frame_output.add_file(particle_age_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_lifetime_attribute:
         particle_lifetime_filename = "fluidparticleslifetime" + fstring + ".ffp3"
         particle_lifetime_filepath = os.path.join(cache_directory, "bakefiles", particle_lifetime_filename)
-        filedata = fluidsim.get_fluid_particle_lifetime_attribute_data()
-        with open(particle_lifetime_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_lifetime_attribute_data(copy=False)
+        frame_output.add_file(particle_lifetime_filepath, filedata)
 
     if fluidsim.enable_surface_viscosity_attribute:
         # Fluid particle viscosity attribute matches surface viscosity attribute
         particle_viscosity_filename = "fluidparticlesviscosity" + fstring + ".ffp3"
         particle_viscosity_filepath = os.path.join(cache_directory, "bakefiles", particle_viscosity_filename)
-        filedata = fluidsim.get_fluid_particle_viscosity_attribute_data()
-        with open(particle_viscosity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_viscosity_attribute_data(copy=False)
+        frame_output.add_file(particle_viscosity_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_whitewater_proximity_attribute:
         whitewater_proximity_filename = "fluidparticleswhitewaterproximity" + fstring + ".ffp3"
         whitewater_proximity_filepath = os.path.join(cache_directory, "bakefiles", whitewater_proximity_filename)
-        filedata = fluidsim.get_fluid_particle_whitewater_proximity_attribute_data()
-        with open(whitewater_proximity_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_whitewater_proximity_attribute_data(copy=False)
+        frame_output.add_file(whitewater_proximity_filepath, filedata)
 
     if fluidsim.enable_fluid_particle_source_id_attribute:
         source_id_filename = "fluidparticlessourceid" + fstring + ".ffp3"
         source_id_filepath = os.path.join(cache_directory, "bakefiles", source_id_filename)
-        filedata = fluidsim.get_fluid_particle_source_id_attribute_data()
-        with open(source_id_filepath, 'wb') as f:
-            f.write(filedata)
+        filedata = fluidsim.get_fluid_particle_source_id_attribute_data(copy=False)
+        frame_output.add_file(source_id_filepath, filedata)
 
 
-def __write_fluid_particle_debug_data(cache_directory, fluidsim, frameno):
+def __write_fluid_particle_debug_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     particle_filename = "particles" + fstring + ".fpd"
     particle_filepath = os.path.join(cache_directory, "bakefiles", particle_filename)
-    filedata = fluidsim.get_fluid_particle_debug_data()
-    with open(particle_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_fluid_particle_debug_data(copy=False)
+    frame_output.add_file(particle_filepath, filedata)
 
 
-def __write_internal_obstacle_mesh_data(cache_directory, fluidsim, frameno):
+def __write_internal_obstacle_mesh_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     obstacle_filename = "obstacle" + fstring + ".bobj"
     obstacle_filepath = os.path.join(cache_directory, "bakefiles", obstacle_filename)
-    filedata = fluidsim.get_internal_obstacle_mesh_data()
-    with open(obstacle_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_internal_obstacle_mesh_data(copy=False)
+    frame_output.add_file(obstacle_filepath, filedata)
 
 
-def __write_force_field_debug_data(cache_directory, fluidsim, frameno):
+def __write_force_field_debug_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
 
     force_field_filename = "forcefield" + fstring + ".ffd"
     force_field_filepath = os.path.join(cache_directory, "bakefiles", force_field_filename)
-    filedata = fluidsim.get_force_field_debug_data()
-    with open(force_field_filepath, 'wb') as f:
-        f.write(filedata)
+    filedata = fluidsim.get_force_field_debug_data(copy=False)
+    frame_output.add_file(force_field_filepath, filedata)
 
 
-def __write_logfile_data(cache_directory, logfile_name, fluidsim):
+def __write_logfile_data(cache_directory, logfile_name, fluidsim, frame_output):
     filedata = fluidsim.get_logfile_data()
     logpath = os.path.join(cache_directory, "logs", logfile_name)
-    with open(logpath, 'a', encoding='utf-8') as f:
-        f.write(filedata)
+    frame_output.add_task(write_file_data, logpath, filedata, 'a')
 
 
 def __get_mesh_stats_dict(mstats):
@@ -2646,6 +2736,13 @@ def __get_timing_stats_dict(tstats):
     return stats
 
 
+def __get_stage_timing_stats_dict(sstats):
+    stats = {}
+    for field_name, field_type in sstats._fields_:
+        stats[field_name] = getattr(sstats, field_name)
+    return stats
+
+
 def __get_frame_stats_dict(cstats):
     stats = {}
     stats["frame"] = cstats.frame
@@ -2660,11 +2757,16 @@ def __get_frame_stats_dict(cstats):
     stats["pressure_solver_error"] = cstats.pressure_solver_error
     stats["pressure_solver_iterations"] = cstats.pressure_solver_iterations
     stats["pressure_solver_max_iterations"] = cstats.pressure_solver_max_iterations
+    stats["pressure_solver_method"] = cstats.pressure_solver_method
+    stats["pressure_solver_total_iterations"] = cstats.pressure_solver_total_iterations
+    stats["pressure_solver_time"] = cstats.pressure_solver_time
+    stats["pressure_solver_iterations_saved"] = cstats.pressure_solver_iterations_saved
     stats["viscosity_solver_enabled"] = cstats.viscosity_solver_enabled
     stats["viscosity_solver_success"] = cstats.viscosity_solver_success
     stats["viscosity_solver_error"] = cstats.viscosity_solver_error
     stats["viscosity_solver_iterations"] = cstats.viscosity_solver_iterations
     stats["viscosity_solver_max_iterations"] = cstats.viscosity_solver_max_iterations
+    stats["viscosity_solver_total_iterations"] = cstats.viscosity_solver_total_iterations
     stats["surface"] = __get_mesh_stats_dict(cstats.surface)
     stats["preview"] = __get_mesh_stats_dict(cstats.preview)
     stats["surfaceblur"] = __get_mesh_stats_dict(cstats.surfaceblur)
@@ -2711,10 +2813,22 @@ def __get_frame_stats_dict(cstats):
     stats["particles"] = __get_mesh_stats_dict(cstats.particles)
     stats["obstacle"] = __get_mesh_stats_dict(cstats.obstacle)
     stats["timing"] = __get_timing_stats_dict(cstats.timing)
+    stats["stages"] = __get_stage_timing_stats_dict(cstats.stages)
     return stats
 
 
-def __write_frame_stats_data(cache_directory, fluidsim, frameno):
+def __write_frame_trace_data(cache_directory, fluidsim, frameno, frame_output):
+    tracedir = os.path.join(cache_directory, "logs", "traces")
+    if not os.path.exists(tracedir):
+        os.makedirs(tracedir)
+
+    fstring = __frame_number_to_string(frameno)
+    tracepath = os.path.join(tracedir, "frametrace" + fstring + ".json")
+    filedata = fluidsim.get_frame_trace_data()
+    frame_output.add_file(tracepath, filedata, 'w')
+
+
+def __write_frame_stats_data(cache_directory, fluidsim, frameno, frame_output):
     fstring = __frame_number_to_string(frameno)
     filename = "framestats" + fstring + ".data"
     tempdir =  os.path.join(cache_directory, "temp")
@@ -2724,208 +2838,169 @@ def __write_frame_stats_data(cache_directory, fluidsim, frameno):
 
     cstats = fluidsim.get_frame_stats_data()
     stats = __get_frame_stats_dict(cstats)
+    frame_output.add_task(__write_frame_stats_file, statspath, stats, frame_output.profile)
+
+
+# Bake loop stats are added when the task is run so that they include the file
+# writes of the frame when output is written asynchronously
+def __write_frame_stats_file(statspath, stats, profile):
+    if profile is not None:
+        stats["bake"] = profile.get_stats_dict()
     filedata = json.dumps(stats, sort_keys=True, indent=4)
-    with open(statspath, 'w', encoding='utf-8') as f:
-        f.write(filedata)
+    write_file_data(statspath, filedata, 'w')
+
+
+def __get_autosave_data_chunks(get_data_range_func, num_particles):
+    particles_per_write = 2**21
+    num_writes = (num_particles // particles_per_write) + 1
+    for i in range(num_writes):
+        start_idx = i * particles_per_write
+        end_idx = min((i + 1) * particles_per_write, num_particles)
+        yield get_data_range_func(start_idx, end_idx)
+
 
+def __get_autosave_data(domain_data, fluidsim, frameno):
+    init_data = domain_data.initialize
+    frame_start, frame_end = init_data.frame_start, init_data.frame_end
+
+    autosave_info = {}
+    autosave_info['isize'] = init_data.isize
+    autosave_info['jsize'] = init_data.jsize
+    autosave_info['ksize'] = init_data.ksize
+    autosave_info['dx'] = init_data.dx
+    autosave_info['frame'] = frameno
+    autosave_info['frame_start'] = frame_start
+    autosave_info['frame_end'] = frame_end
+    autosave_info['frame_id'] = fluidsim.get_current_frame() - 1
+    autosave_info['last_frame_id'] = frame_end - frame_start
+    autosave_info['num_marker_particles'] = fluidsim.get_num_marker_particles()
+    autosave_info['num_diffuse_particles'] = fluidsim.get_num_diffuse_particles()
+
+    # List of (filename, data chunks). Data chunks are generated lazily so that
+    # the synchronous writer does not need to hold all particle data in memory.
+    autosave_file_data = []
+    def add_file_data(info_key, filename, get_data_range_func, num_particles):
+        autosave_info[info_key] = filename
+        chunks = __get_autosave_data_chunks(get_data_range_func, num_particles)
+        autosave_file_data.append((filename, chunks))
+
+    for info_key in __get_autosave_info_filedata_keys():
+        autosave_info[info_key] = ""
+
+    # Chunk tables of compressed files are filled in when the files are written
+    is_compression_enabled = init_data.enable_savestate_compression
+    if is_compression_enabled is not None and is_compression_enabled:
+        autosave_info['compression'] = "zlib"
+        autosave_info['compressed_chunks'] = {}
+    else:
+        autosave_info['compression'] = ""
 
-def __write_autosave_data(domain_data, cache_directory, fluidsim, frameno):
+    num_particles = fluidsim.get_num_marker_particles()
+    add_file_data('marker_particle_position_filedata', "marker_particle_position.data", 
+                  fluidsim.get_marker_particle_position_data_range, num_particles)
+    add_file_data('marker_particle_velocity_filedata', "marker_particle_velocity.data", 
+                  fluidsim.get_marker_particle_velocity_data_range, num_particles)
+
+    if fluidsim.is_velocity_transfer_method_APIC():
+        add_file_data('marker_particle_affinex_filedata', "marker_particle_affinex.data", 
+                      fluidsim.get_marker_particle_affinex_data_range, num_particles)
+        add_file_data('marker_particle_affiney_filedata', "marker_particle_affiney.data", 
+                      fluidsim.get_marker_particle_affiney_data_range, num_particles)
+        add_file_data('marker_particle_affinez_filedata', "marker_particle_affinez.data", 
+                      fluidsim.get_marker_particle_affinez_data_range, num_particles)
+
+    if fluidsim.enable_surface_age_attribute or fluidsim.enable_fluid_particle_age_attribute:
+        add_file_data('marker_particle_age_filedata', "marker_particle_age.data", 
+                      fluidsim.get_marker_particle_age_data_range, num_particles)
+
+    if fluidsim.enable_surface_lifetime_attribute or fluidsim.enable_fluid_particle_lifetime_attribute:
+        add_file_data('marker_particle_lifetime_filedata', "marker_particle_lifetime.data", 
+                      fluidsim.get_marker_particle_lifetime_data_range, num_particles)
+
+    if fluidsim.enable_surface_color_attribute or fluidsim.enable_fluid_particle_color_attribute:
+        add_file_data('marker_particle_color_filedata', "marker_particle_color.data", 
+                      fluidsim.get_marker_particle_color_data_range, num_particles)
+
+    if fluidsim.enable_surface_source_id_attribute or fluidsim.enable_fluid_particle_source_id_attribute:
+        add_file_data('marker_particle_source_id_filedata', "marker_particle_source_id.data", 
+                      fluidsim.get_marker_particle_source_id_data_range, num_particles)
+
+    if fluidsim.enable_surface_viscosity_attribute:
+        add_file_data('marker_particle_viscosity_filedata', "marker_particle_viscosity.data", 
+                      fluidsim.get_marker_particle_viscosity_data_range, num_particles)
+
+    if fluidsim.enable_fluid_particle_output:
+        add_file_data('marker_particle_id_filedata', "marker_particle_id.data", 
+                      fluidsim.get_marker_particle_id_data_range, num_particles)
+
+    num_particles = fluidsim.get_num_diffuse_particles()
+    if num_particles > 0:
+        add_file_data('diffuse_particle_position_filedata', "diffuse_particle_position.data", 
+                      fluidsim.get_diffuse_particle_position_data_range, num_particles)
+        add_file_data('diffuse_particle_velocity_filedata', "diffuse_particle_velocity.data", 
+                      fluidsim.get_diffuse_particle_velocity_data_range, num_particles)
+        add_file_data('diffuse_particle_lifetime_filedata', "diffuse_particle_lifetime.data", 
+                      fluidsim.get_diffuse_particle_lifetime_data_range, num_particles)
+        add_file_data('diffuse_particle_type_filedata', "diffuse_particle_type.data", 
+                      fluidsim.get_diffuse_particle_type_data_range, num_particles)
+        add_file_data('diffuse_particle_id_filedata', "diffuse_particle_id.data", 
+                      fluidsim.get_diffuse_particle_id_data_range, num_particles)
+
+    return autosave_info, autosave_file_data
+
+
+def __get_autosave_info_filedata_keys():
+    return [
+        'marker_particle_position_filedata',
+        'marker_particle_velocity_filedata',
+        'marker_particle_affinex_filedata',
+        'marker_particle_affiney_filedata',
+        'marker_particle_affinez_filedata',
+        'marker_particle_age_filedata',
+        'marker_particle_lifetime_filedata',
+        'marker_particle_color_filedata',
+        'marker_particle_source_id_filedata',
+        'marker_particle_viscosity_filedata',
+        'marker_particle_id_filedata',
+        'diffuse_particle_position_filedata',
+        'diffuse_particle_velocity_filedata',
+        'diffuse_particle_lifetime_filedata',
+        'diffuse_particle_type_filedata',
+        'diffuse_particle_id_filedata'
+        ]
+
+
+def __get_autosave_filenames():
+    filenames = [k[:-len("_filedata")] + ".data" for k in __get_autosave_info_filedata_keys()]
+    filenames.append("autosave.state")
+    return filenames
+
+
+def __write_autosave_files(domain_data, cache_directory, frameno, autosave_info, autosave_file_data):
     autosave_dir = os.path.join(cache_directory, "savestates", "autosave")
     if not os.path.exists(autosave_dir):
         os.makedirs(autosave_dir)
 
-    position_data_path = os.path.join(autosave_dir, "marker_particle_position.data")
-    velocity_data_path = os.path.join(autosave_dir, "marker_particle_velocity.data")
-    affinex_data_path = os.path.join(autosave_dir, "marker_particle_affinex.data")
-    affiney_data_path = os.path.join(autosave_dir, "marker_particle_affiney.data")
-    affinez_data_path = os.path.join(autosave_dir, "marker_particle_affinez.data")
-    age_data_path = os.path.join(autosave_dir, "marker_particle_age.data")
-    lifetime_data_path = os.path.join(autosave_dir, "marker_particle_lifetime.data")
-    color_data_path = os.path.join(autosave_dir, "marker_particle_color.data")
-    source_id_data_path = os.path.join(autosave_dir, "marker_particle_source_id.data")
-    viscosity_data_path = os.path.join(autosave_dir, "marker_particle_viscosity.data")
-    id_data_path = os.path.join(autosave_dir, "marker_particle_id.data")
-
-    diffuse_position_data_path = os.path.join(autosave_dir, "diffuse_particle_position.data")
-    diffuse_velocity_data_path = os.path.join(autosave_dir, "diffuse_particle_velocity.data")
-    diffuse_lifetime_data_path = os.path.join(autosave_dir, "diffuse_particle_lifetime.data")
-    diffuse_type_data_path = os.path.join(autosave_dir, "diffuse_particle_type.data")
-    diffuse_id_data_path = os.path.join(autosave_dir, "diffuse_particle_id.data")
     autosave_info_path = os.path.join(autosave_dir, "autosave.state")
     temp_extension = ".backup"
 
-    autosave_default_filepaths = [
-            position_data_path,
-            velocity_data_path,
-            autosave_info_path
-            ]
-    autosave_apic_filepaths = [
-            affinex_data_path,
-            affiney_data_path,
-            affinez_data_path
-            ]
-    autosave_age_filepaths = [
-            age_data_path
-            ]
-    autosave_lifetime_filepaths = [
-            lifetime_data_path
-            ]
-    autosave_color_filepaths = [
-            color_data_path
-            ]
-    autosave_source_id_filepaths = [
-            source_id_data_path
-            ]
-    autosave_viscosity_filepaths = [
-            viscosity_data_path
-            ]
-    autosave_id_filepaths = [
-            id_data_path
-            ]
-
-    autosave_diffuse_filepaths = [
-            diffuse_position_data_path,
-            diffuse_velocity_data_path,
-            diffuse_lifetime_data_path,
-            diffuse_type_data_path,
-            diffuse_id_data_path
-            ]
-
-    num_particles = fluidsim.get_num_marker_particles()
-    marker_particles_per_write = 2**21
-    num_marker_particle_writes = (num_particles // marker_particles_per_write) + 1
+    written_filepaths = []
     try:
-        for i in range(num_marker_particle_writes):
-            start_idx = i * marker_particles_per_write
-            end_idx = min((i + 1) * marker_particles_per_write, num_particles)
-            is_appending = i != 0
-
-            data = fluidsim.get_marker_particle_position_data_range(start_idx, end_idx)
-            __write_save_state_file_data(position_data_path + temp_extension, data, is_appending_data=is_appending)
-            data = fluidsim.get_marker_particle_velocity_data_range(start_idx, end_idx)
-            __write_save_state_file_data(velocity_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.is_velocity_transfer_method_APIC():
-                data = fluidsim.get_marker_particle_affinex_data_range(start_idx, end_idx)
-                __write_save_state_file_data(affinex_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_marker_particle_affiney_data_range(start_idx, end_idx)
-                __write_save_state_file_data(affiney_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_marker_particle_affinez_data_range(start_idx, end_idx)
-                __write_save_state_file_data(affinez_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_surface_age_attribute or fluidsim.enable_fluid_particle_age_attribute:
-                data = fluidsim.get_marker_particle_age_data_range(start_idx, end_idx)
-                __write_save_state_file_data(age_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_surface_lifetime_attribute or fluidsim.enable_fluid_particle_lifetime_attribute:
-                data = fluidsim.get_marker_particle_lifetime_data_range(start_idx, end_idx)
-                __write_save_state_file_data(lifetime_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_surface_color_attribute or fluidsim.enable_fluid_particle_color_attribute:
-                data = fluidsim.get_marker_particle_color_data_range(start_idx, end_idx)
-                __write_save_state_file_data(color_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_surface_source_id_attribute or fluidsim.enable_fluid_particle_source_id_attribute:
-                data = fluidsim.get_marker_particle_source_id_data_range(start_idx, end_idx)
-                __write_save_state_file_data(source_id_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_surface_viscosity_attribute:
-                data = fluidsim.get_marker_particle_viscosity_data_range(start_idx, end_idx)
-                __write_save_state_file_data(viscosity_data_path + temp_extension, data, is_appending_data=is_appending)
-
-            if fluidsim.enable_fluid_particle_output:
-                data = fluidsim.get_marker_particle_id_data_range(start_idx, end_idx)
-                __write_save_state_file_data(id_data_path + temp_extension, data, is_appending_data=is_appending)
-
-        if fluidsim.get_num_diffuse_particles() > 0:
-            num_particles = fluidsim.get_num_diffuse_particles()
-            diffuse_particles_per_write = 2**21
-            num_diffuse_particle_writes = (num_particles // diffuse_particles_per_write) + 1
-            for i in range(num_diffuse_particle_writes):
-                start_idx = i * diffuse_particles_per_write
-                end_idx = min((i + 1) * diffuse_particles_per_write, num_particles)
-                is_appending = i != 0
-
-                data = fluidsim.get_diffuse_particle_position_data_range(start_idx, end_idx)
-                __write_save_state_file_data(diffuse_position_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_diffuse_particle_velocity_data_range(start_idx, end_idx)
-                __write_save_state_file_data(diffuse_velocity_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_diffuse_particle_lifetime_data_range(start_idx, end_idx)
-                __write_save_state_file_data(diffuse_lifetime_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_diffuse_particle_type_data_range(start_idx, end_idx)
-                __write_save_state_file_data(diffuse_type_data_path + temp_extension, data, is_appending_data=is_appending)
-                data = fluidsim.get_diffuse_particle_id_data_range(start_idx, end_idx)
-                __write_save_state_file_data(diffuse_id_data_path + temp_extension, data, is_appending_data=is_appending)
-
-        init_data = domain_data.initialize
-        frame_start, frame_end = init_data.frame_start, init_data.frame_end
-
-        autosave_info = {}
-        autosave_info['isize'] = init_data.isize
-        autosave_info['jsize'] = init_data.jsize
-        autosave_info['ksize'] = init_data.ksize
-        autosave_info['dx'] = init_data.dx
-        autosave_info['frame'] = frameno
-        autosave_info['frame_start'] = frame_start
-        autosave_info['frame_end'] = frame_end
-        autosave_info['frame_id'] = fluidsim.get_current_frame() - 1
-        autosave_info['last_frame_id'] = frame_end - frame_start
-        autosave_info['num_marker_particles'] = fluidsim.get_num_marker_particles()
-        autosave_info['marker_particle_position_filedata'] = "marker_particle_position.data"
-        autosave_info['marker_particle_velocity_filedata'] = "marker_particle_velocity.data"
-        autosave_info['num_diffuse_particles'] = fluidsim.get_num_diffuse_particles()
-
-        autosave_info['marker_particle_affinex_filedata'] = ""
-        autosave_info['marker_particle_affiney_filedata'] = ""
-        autosave_info['marker_particle_affinez_filedata'] = ""
-
-        autosave_info['marker_particle_age_filedata'] = ""
-        autosave_info['marker_particle_lifetime_filedata'] = ""
-        autosave_info['marker_particle_color_filedata'] = ""
-        autosave_info['marker_particle_source_id_filedata'] = ""
-        autosave_info['marker_particle_viscosity_filedata'] = ""
-        autosave_info['marker_particle_id_filedata'] = ""
-
-        autosave_info['diffuse_particle_position_filedata'] = ""
-        autosave_info['diffuse_particle_velocity_filedata'] = ""
-        autosave_info['diffuse_particle_lifetime_filedata'] = ""
-        autosave_info['diffuse_particle_type_filedata'] = ""
-        autosave_info['diffuse_particle_id_filedata'] = ""
-
-        if fluidsim.is_velocity_transfer_method_APIC():
-            autosave_info['marker_particle_affinex_filedata'] = "marker_particle_affinex.data"
-            autosave_info['marker_particle_affiney_filedata'] = "marker_particle_affiney.data"
-            autosave_info['marker_particle_affinez_filedata'] = "marker_particle_affinez.data"
-
-        if fluidsim.enable_surface_age_attribute or fluidsim.enable_fluid_particle_age_attribute:
-            autosave_info['marker_particle_age_filedata'] = "marker_particle_age.data"
-
-        if fluidsim.enable_surface_lifetime_attribute or fluidsim.enable_fluid_particle_lifetime_attribute:
-            autosave_info['marker_particle_lifetime_filedata'] = "marker_particle_lifetime.data"
-
-        if fluidsim.enable_surface_color_attribute or fluidsim.enable_fluid_particle_color_attribute:
-            autosave_info['marker_particle_color_filedata'] = "marker_particle_color.data"
-
-        if fluidsim.enable_surface_source_id_attribute or fluidsim.enable_fluid_particle_source_id_attribute:
-            autosave_info['marker_particle_source_id_filedata'] = "marker_particle_source_id.data"
-
-        if fluidsim.enable_surface_viscosity_attribute:
-            autosave_info['marker_particle_viscosity_filedata'] = "marker_particle_viscosity.data"
-
-        if fluidsim.enable_fluid_particle_output:
-            autosave_info['marker_particle_id_filedata'] = "marker_particle_id.data"
-
-        if fluidsim.get_num_diffuse_particles() > 0:
-            autosave_info['diffuse_particle_position_filedata'] = "diffuse_particle_position.data"
-            autosave_info['diffuse_particle_velocity_filedata'] = "diffuse_particle_velocity.data"
-            autosave_info['diffuse_particle_lifetime_filedata'] = "diffuse_particle_lifetime.data"
-            autosave_info['diffuse_particle_type_filedata'] = "diffuse_particle_type.data"
-            autosave_info['diffuse_particle_id_filedata'] = "diffuse_particle_id.data"
-
+        for filename, chunks in autosave_file_data:
+            filepath = os.path.join(autosave_dir, filename)
+            if autosave_info['compression']:
+                chunk_table = __write_compressed_save_state_file_data(filepath + temp_extension, chunks)
+                autosave_info['compressed_chunks'][filename] = chunk_table
+            else:
+                for i, data in enumerate(chunks):
+                    is_appending = i != 0
+                    __write_save_state_file_data(filepath + temp_extension, data, is_appending_data=is_appending)
+            written_filepaths.append(filepath)
 
         autosave_json = json.dumps(autosave_info, sort_keys=True, indent=4)
         with open(autosave_info_path + temp_extension, 'w', encoding='utf-8') as f:
             f.write(autosave_json)
+        written_filepaths.append(autosave_info_path)
     except Exception as e:
         print("FLIP Fluids: OS/Filesystem Error: Unable to write autosave files to storage")
         print("Error Message: ", e)
@@ -2933,18 +3008,8 @@ def __write_autosave_data(domain_data, cache_directory, fluidsim, frameno):
         return
 
     try:
-        data_filepaths = (
-                          autosave_default_filepaths + 
-                          autosave_apic_filepaths + 
-                          autosave_age_filepaths + 
-                          autosave_lifetime_filepaths + 
-                          autosave_color_filepaths + 
-                          autosave_source_id_filepaths + 
-                          autosave_viscosity_filepaths + 
-                          autosave_id_filepaths + 
-                          autosave_diffuse_filepaths
-                          )
-        for filepath in data_filepaths:
+        for filename in __get_autosave_filenames():
+            filepath = os.path.join(autosave_dir, filename)
             if os.path.isfile(filepath):
                 fpl.delete_file(filepath, display_popup_on_error=False)
     except Exception as e:
@@ -2954,51 +3019,56 @@ def __write_autosave_data(domain_data, cache_directory, fluidsim, frameno):
         return
 
     try:
-        for filepath in autosave_default_filepaths:
+        for filepath in written_filepaths:
             os.rename(filepath + temp_extension, filepath)
-        if fluidsim.is_velocity_transfer_method_APIC():
-            for filepath in autosave_apic_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_surface_age_attribute or fluidsim.enable_fluid_particle_age_attribute:
-            for filepath in autosave_age_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_surface_lifetime_attribute or fluidsim.enable_fluid_particle_lifetime_attribute:
-            for filepath in autosave_lifetime_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_surface_color_attribute or fluidsim.enable_fluid_particle_color_attribute:
-            for filepath in autosave_color_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_surface_source_id_attribute or fluidsim.enable_fluid_particle_source_id_attribute:
-            for filepath in autosave_source_id_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_surface_viscosity_attribute:
-            for filepath in autosave_viscosity_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.enable_fluid_particle_output:
-            for filepath in autosave_id_filepaths:
-                os.rename(filepath + temp_extension, filepath)
-        if fluidsim.get_num_diffuse_particles() > 0:
-            for filepath in autosave_diffuse_filepaths:
-                os.rename(filepath + temp_extension, filepath)
     except Exception as e:
         print("FLIP Fluids: OS/Filesystem Error: Unable to rename autosave files in storage")
         print("Error Message: ", e)
         print("Backup of the last successful autosave located here: <" + autosave_dir + ">")
         return
 
+    if __is_savestate_frame(domain_data, frameno):
+        numstr = str(frameno).zfill(6)
+        savestate_dir = os.path.join(cache_directory, "savestates", "autosave" + numstr)
+        if os.path.isdir(savestate_dir):
+            fpl.delete_files_in_directory(
+                    savestate_dir, [".state", ".data"], 
+                    remove_directory=True, 
+                    display_popup_on_error=False
+                    )
+        __link_save_state_files(autosave_dir, savestate_dir)
+
+
+def __is_savestate_frame(domain_data, frameno):
     init_data = domain_data.initialize
-    if init_data.enable_savestates:
-        interval = init_data.savestate_interval
-        if (frameno + 1 - frame_start) % interval == 0 or frameno == frame_start:
-            numstr = str(frameno).zfill(6)
-            savestate_dir = os.path.join(cache_directory, "savestates", "autosave" + numstr)
-            if os.path.isdir(savestate_dir):
-                fpl.delete_files_in_directory(
-                        savestate_dir, [".state", ".data"], 
-                        remove_directory=True, 
-                        display_popup_on_error=False
-                        )
-            shutil.copytree(autosave_dir, savestate_dir, dirs_exist_ok=True)
+    if not init_data.enable_savestates:
+        return False
+    frame_start = init_data.frame_start
+    interval = init_data.savestate_interval
+    return (frameno + 1 - frame_start) % interval == 0 or frameno == frame_start
+
+
+def __is_autosave_frame(domain_data, frameno):
+    init_data = domain_data.initialize
+    if frameno == init_data.frame_start or frameno == init_data.frame_end:
+        return True
+    if __is_savestate_frame(domain_data, frameno):
+        return True
+
+    interval = init_data.autosave_interval
+    if interval is None:
+        # Simulation data exported by an older addon version
+        return True
+    return (frameno + 1 - init_data.frame_start) % max(interval, 1) == 0
+
+
+def __write_autosave_data(domain_data, cache_directory, fluidsim, frameno, frame_output):
+    autosave_info, autosave_file_data = __get_autosave_data(domain_data, fluidsim, frameno)
+    if not frame_output.write_immediately:
+        # Particle data must be retrieved from the simulator before the next
+        # frame is simulated
+        autosave_file_data = [(filename, list(chunks)) for filename, chunks in autosave_file_data]
+    frame_output.add_task(__write_autosave_files, domain_data, cache_directory, frameno, autosave_info, autosave_file_data)
 
 
 def __write_finished_file(cache_directory, frameno):
@@ -3010,31 +3080,63 @@ def __write_finished_file(cache_directory, frameno):
         f.write(filestring)
 
 
-def __write_simulation_output(domain_data, fluidsim, frameno, cache_directory):
-    __write_bounds_data(cache_directory, fluidsim, frameno)
+def __write_simulation_output(domain_data, fluidsim, frameno, cache_directory, frame_output):
+    __write_bounds_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_surface_reconstruction:
-        __write_surface_data(cache_directory, fluidsim, frameno)
+        __write_surface_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_diffuse_material_output:
-        __write_whitewater_data(cache_directory, fluidsim, frameno)
+        __write_whitewater_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_fluid_particle_output:
-        __write_fluid_particle_data(cache_directory, fluidsim, frameno)
+        __write_fluid_particle_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_fluid_particle_debug_output:
-        __write_fluid_particle_debug_data(cache_directory, fluidsim, frameno)
+        __write_fluid_particle_debug_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_internal_obstacle_mesh_output:
-        __write_internal_obstacle_mesh_data(cache_directory, fluidsim, frameno)
+        __write_internal_obstacle_mesh_data(cache_directory, fluidsim, frameno, frame_output)
 
     if fluidsim.enable_force_field_debug_output:
-        __write_force_field_debug_data(cache_directory, fluidsim, frameno)
+        __write_force_field_debug_data(cache_directory, fluidsim, frameno, frame_output)
 
-    __write_logfile_data(cache_directory, domain_data.initialize.logfile_name, fluidsim)
-    __write_frame_stats_data(cache_directory, fluidsim, frameno)
-    __write_autosave_data(domain_data, cache_directory, fluidsim, frameno)
-    __write_finished_file(cache_directory, frameno)
+    if fluidsim.enable_frame_trace_output:
+        __write_frame_trace_data(cache_directory, fluidsim, frameno, frame_output)
+    __write_logfile_data(cache_directory, domain_data.initialize.logfile_name, fluidsim, frame_output)
+    __write_frame_stats_data(cache_directory, fluidsim, frameno, frame_output)
+    if __is_autosave_frame(domain_data, frameno):
+        __write_autosave_data(domain_data, cache_directory, fluidsim, frameno, frame_output)
+    frame_output.add_task(__write_finished_file, cache_directory, frameno)
+
+
+def __initialize_output_writer(domain_data, bakedata):
+    advanced = domain_data.advanced
+    if advanced.enable_asynchronous_output is None:
+        # Simulation data exported by an older addon version
+        return None
+    if not __get_parameter_data(advanced.enable_asynchronous_output):
+        return None
+
+    init_data = domain_data.initialize
+    num_frames = init_data.frame_end - init_data.frame_start + 1
+
+    def frame_written_callback(blender_frameno):
+        simulator_frameno = blender_frameno - init_data.frame_start
+        bakedata.completed_frames = simulator_frameno + 1
+        bakedata.progress = (simulator_frameno + 1) / num_frames
+
+    def busy_state_callback(is_busy):
+        bakedata.is_safe_to_exit = not is_busy
+
+    max_frames = __get_parameter_data(advanced.max_output_frames_in_flight)
+    num_threads = __get_parameter_data(advanced.num_output_writer_threads)
+    return OutputWriter(
+            num_threads=num_threads,
+            max_frames_in_flight=max_frames,
+            frame_written_callback=frame_written_callback,
+            busy_state_callback=busy_state_callback
+            )
 
 
 def __get_current_frame_delta_time(domain_data, frameno):
@@ -3046,7 +3148,37 @@ def __get_current_frame_delta_time(domain_data, frameno):
     return dt
 
 
+def __initialize_bake_loop_profiler(domain_data, cache_directory):
+    debug = domain_data.debug
+    if debug.export_bake_loop_profile is None:
+        # Not set in simulation data exported by an older addon version
+        return None
+    if not __get_parameter_data(debug.export_bake_loop_profile):
+        return None
+
+    frame_start = __get_parameter_data(debug.bake_loop_profile_frame_start)
+    frame_end = __get_parameter_data(debug.bake_loop_profile_frame_end)
+    output_directory = os.path.join(cache_directory, "logs")
+    return BakeLoopProfiler(frame_start, frame_end, output_directory)
+
+
 def __run_simulation(fluidsim, data, cache_directory, bakedata):
+    output_writer = __initialize_output_writer(data.domain_data, bakedata)
+    loop_profiler = __initialize_bake_loop_profiler(data.domain_data, cache_directory)
+    try:
+        __run_simulation_frames(fluidsim, data, cache_directory, bakedata, output_writer, loop_profiler)
+        if output_writer is not None:
+            output_writer.wait_until_finished()
+    finally:
+        if loop_profiler is not None:
+            loop_profiler.finish()
+        if output_writer is not None:
+            # Remaining frames in flight are always completed so that the
+            # finished/autosave files stay consistent with the bakefiles
+            output_writer.shutdown()
+
+
+def __run_simulation_frames(fluidsim, data, cache_directory, bakedata, output_writer, loop_profiler=None):
     domain = data.domain_data
     init_data = domain.initialize
     num_frames = init_data.frame_end - init_data.frame_start + 1
@@ -3056,30 +3188,55 @@ def __run_simulation(fluidsim, data, cache_directory, bakedata):
         simulator_frameno = fluidsim.get_current_frame()
         blender_frameno = simulator_frameno + init_data.frame_start
 
+        if loop_profiler is not None:
+            loop_profiler.begin_frame(blender_frameno)
+        profile = BakeFrameProfile(blender_frameno)
+        __set_bake_profile(profile)
+
         geometry_database = __get_geometry_database()
+        num_queries = geometry_database.get_num_queries()
         try:
-            geometry_database.open()
+            with profile.phase("database"):
+                geometry_database.open()
 
-            __update_animatable_properties(fluidsim, data, simulator_frameno)
-            __add_fluid_objects(fluidsim, data, bakedata, simulator_frameno)
+            with profile.phase("properties"):
+                __update_animatable_properties(fluidsim, data, simulator_frameno)
+            with profile.phase("fluid_objects"):
+                __add_fluid_objects(fluidsim, data, bakedata, simulator_frameno)
 
-            geometry_database.close()
+            with profile.phase("database"):
+                geometry_database.close()
         except Exception:
             geometry_database.close()
             raise Exception
+        profile.add_database_queries(geometry_database.get_num_queries() - num_queries)
 
         dt = __get_current_frame_delta_time(domain, simulator_frameno)
-        fluidsim.update(dt)
+        with profile.phase("simulate"):
+            fluidsim.update(dt)
 
         if __check_bake_cancelled(bakedata):
             return
 
-        bakedata.is_safe_to_exit = False
-        __write_simulation_output(domain, fluidsim, blender_frameno, cache_directory)
-        bakedata.is_safe_to_exit = True
+        if output_writer is None:
+            bakedata.is_safe_to_exit = False
+            frame_output = FrameOutputData(blender_frameno, write_immediately=True, profile=profile)
+            with profile.phase("output"):
+                __write_simulation_output(domain, fluidsim, blender_frameno, cache_directory, frame_output)
+            bakedata.is_safe_to_exit = True
 
-        bakedata.completed_frames = simulator_frameno + 1
-        bakedata.progress = (simulator_frameno + 1) / num_frames
+            bakedata.completed_frames = simulator_frameno + 1
+            bakedata.progress = (simulator_frameno + 1) / num_frames
+        else:
+            # Frame data is retrieved from the simulator here and written to storage
+            # in the background while the next frame is simulated
+            frame_output = FrameOutputData(blender_frameno, profile=profile)
+            with profile.phase("output"):
+                __write_simulation_output(domain, fluidsim, blender_frameno, cache_directory, frame_output)
+            output_writer.submit(frame_output)
+
+        if loop_profiler is not None:
+            loop_profiler.end_frame(blender_frameno)
 
         if __check_bake_cancelled(bakedata):
             return
@@ -3125,6 +3282,8 @@ def __launch_bake(datafile, cache_directory, bakedata, savestate_id=None):
     db_filepath = __get_geometry_database_filepath()
     geometry_database = flip_fluid_geometry_database.GeometryDatabase(db_filepath)
     __set_geometry_database(geometry_database)
+    __set_mesh_frame_cache(MeshFrameCache())
+    __set_bake_profile(BakeFrameProfile(-1))
 
     if __check_bake_cancelled(bakedata):
         return
@@ -118,6 +118,8 @@ def __get_domain_data_dict(context, dobj):
 
     initialize_properties['enable_savestates'] = dprops.simulation.enable_savestates
     initialize_properties['savestate_interval'] = dprops.simulation.savestate_interval
+    initialize_properties['autosave_interval'] = dprops.simulation.autosave_interval
+    initialize_properties['enable_savestate_compression'] = dprops.simulation.enable_savestate_compression
     initialize_properties['delete_outdated_savestates'] = dprops.simulation.delete_outdated_savestates
     initialize_properties['delete_outdated_meshes'] = dprops.simulation.delete_outdated_meshes
 
@@ -437,6 +439,7 @@ def add_objects_to_geometry_exporter(geometry_exporter):
         force_reexport = hasattr(props, "force_reexport_on_next_bake") and props.force_reexport_on_next_bake
         skip_reexport = skip_reexport and not force_reexport
         export_object.skip_reexport = skip_reexport and not force_reexport
+        export_object.force_reexport = force_reexport
         export_object.disable_changing_topology_warning = disable_topology_warning or is_dynamic_topology_exception        
         geometry_exporter.add_geometry_export_object(export_object)
 
@@ -39,6 +39,8 @@ __EXTENSION_WHITELIST = [
     ".preset",
     ".sim",
     ".sqlite3",
+    ".sqlite3-shm",
+    ".sqlite3-wal",
     ".state",
     ".txt",
     ".txt~",
@@ -243,7 +245,7 @@ def clear_cache_directory(cache_directory, clear_export=False, clear_logs=False,
     if clear_export:
         export_dir = os.path.join(cache_directory, "export")
         if os.path.isdir(export_dir):
-            extensions = [".sqlite3", ".sim"]
+            extensions = [".sqlite3", ".sqlite3-wal", ".sqlite3-shm", ".sim"]
             delete_files_in_directory(export_dir, extensions, remove_directory=True)
 
     if clear_logs:
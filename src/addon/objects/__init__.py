@@ -18,13 +18,19 @@ if "bpy" in locals():
     import importlib
     reloadable_modules = [
         'flip_fluid_aabb',
+        'flip_fluid_bake_profiler',
         'flip_fluid_cache',
         'flip_fluid_material_library'
         'flip_fluid_map',
         'flip_fluid_geometry_export_object',
         'flip_fluid_geometry_database',
         'flip_fluid_geometry_exporter',
+        'flip_fluid_parallel_geometry_exporter',
+        'flip_fluid_mesh_frame_cache',
+        'flip_fluid_frame_prefetcher',
+        'flip_fluid_output_writer',
         'flip_fluid_preset_stack',
+        'flip_fluid_stats_store',
     ]
     for module_name in reloadable_modules:
         if module_name in locals():
@@ -34,16 +40,30 @@ import bpy
 
 from . import (
     flip_fluid_aabb,
+    flip_fluid_bake_profiler,
     flip_fluid_cache,
     flip_fluid_material_library,
     flip_fluid_map,
     flip_fluid_geometry_export_object,
     flip_fluid_geometry_database,
     flip_fluid_geometry_exporter,
+    flip_fluid_parallel_geometry_exporter,
+    flip_fluid_mesh_frame_cache,
+    flip_fluid_frame_prefetcher,
+    flip_fluid_output_writer,
     flip_fluid_preset_stack,
+    flip_fluid_stats_store,
     )
 
 
+def load_pre():
+    flip_fluid_cache.load_pre()
+
+
+def on_exit():
+    flip_fluid_cache.shutdown_frame_prefetcher()
+
+
 def register():
     flip_fluid_cache.register()
     flip_fluid_material_library.register()
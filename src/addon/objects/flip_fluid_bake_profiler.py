@@ -0,0 +1,182 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os, re, io, time, threading, contextlib, cProfile, pstats
+
+
+# Phases of the bake loop that run sequentially on the bake thread. The sum of
+# these phases is the wall time of a frame.
+FRAME_PHASES = [
+    "database",
+    "properties",
+    "fluid_objects",
+    "simulate",
+    "output",
+    "output_wait",
+]
+
+# Phases that are contained in the frame phases or that run on the output
+# writer threads in parallel with the next frame.
+NESTED_PHASES = [
+    "mesh_extraction",
+    "file_write",
+]
+
+
+# Returns the type of an output file as its filename with the 6 digit frame
+# number removed, e.g. "velocity000012.bobj" -> "velocity.bobj". Other digits,
+# such as in the ".ffp3" extension, are kept.
+def get_output_file_type(filepath):
+    return re.sub(r"\d{6}(?=\.)", "", os.path.basename(filepath))
+
+
+# Wall time, file output and database usage of the Python side of the bake
+# loop for a single frame.
+#
+# Phases may be nested and are timed independently. A phase may be timed more
+# than once per frame, in which case the times are summed. File writes may be
+# recorded from output writer threads while the next frame is being simulated.
+class BakeFrameProfile():
+    def __init__(self, frameno):
+        self.frameno = frameno
+        self._lock = threading.Lock()
+        self._phase_times = {}
+        self._phase_start_times = {}
+        self._file_bytes = {}
+        self._num_files = 0
+        self._num_database_queries = 0
+
+
+    def begin_phase(self, name):
+        with self._lock:
+            self._phase_start_times[name] = time.perf_counter()
+
+
+    def end_phase(self, name):
+        with self._lock:
+            start_time = self._phase_start_times.pop(name, None)
+            if start_time is not None:
+                self._add_phase_time(name, time.perf_counter() - start_time)
+
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.begin_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+
+    def add_phase_time(self, name, seconds):
+        with self._lock:
+            self._add_phase_time(name, seconds)
+
+
+    def add_file(self, filepath, num_bytes):
+        file_type = get_output_file_type(filepath)
+        with self._lock:
+            self._file_bytes[file_type] = self._file_bytes.get(file_type, 0) + num_bytes
+            self._num_files += 1
+
+
+    def add_database_queries(self, num_queries):
+        with self._lock:
+            self._num_database_queries += num_queries
+
+
+    # Phases that have not ended yet are included up to the current time. This
+    # allows stats to be written from within the output phase.
+    def get_stats_dict(self):
+        with self._lock:
+            current_time = time.perf_counter()
+            timing = {}
+            for name in FRAME_PHASES + NESTED_PHASES:
+                timing[name] = self._phase_times.get(name, 0.0)
+            for name, start_time in self._phase_start_times.items():
+                timing[name] = timing.get(name, 0.0) + current_time - start_time
+            timing["total"] = sum(timing[name] for name in FRAME_PHASES)
+
+            stats = {}
+            stats["frame"] = self.frameno
+            stats["timing"] = timing
+            stats["bytes"] = dict(self._file_bytes)
+            stats["total_bytes"] = sum(self._file_bytes.values())
+            stats["files"] = self._num_files
+            stats["database_queries"] = self._num_database_queries
+            return stats
+
+
+    def _add_phase_time(self, name, seconds):
+        self._phase_times[name] = self._phase_times.get(name, 0.0) + seconds
+
+
+# Runs the bake loop under cProfile for a range of frames. The profile is saved
+# to <output_directory>/bake_profile_<start>-<end>.prof along with a text
+# summary sorted by cumulative time. Only the bake thread is profiled.
+class BakeLoopProfiler():
+    NUM_SUMMARY_ENTRIES = 60
+
+    def __init__(self, frame_start, frame_end, output_directory):
+        self._frame_start = min(frame_start, frame_end)
+        self._frame_end = max(frame_start, frame_end)
+        self._output_directory = output_directory
+        self._profile = None
+        self._is_finished = False
+
+
+    def get_profile_filepath(self):
+        filename = "bake_profile_" + str(self._frame_start) + "-" + str(self._frame_end) + ".prof"
+        return os.path.join(self._output_directory, filename)
+
+
+    def begin_frame(self, frameno):
+        if self._is_finished or self._profile is not None:
+            return
+        if self._frame_start <= frameno <= self._frame_end:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+
+    def end_frame(self, frameno):
+        if self._profile is not None and frameno >= self._frame_end:
+            self.finish()
+
+
+    # Saves the frames that have been profiled so far, such as when the bake
+    # is stopped before reaching the end of the frame range
+    def finish(self):
+        if self._profile is None:
+            return
+        self._profile.disable()
+        profile = self._profile
+        self._profile = None
+        self._is_finished = True
+
+        if not os.path.exists(self._output_directory):
+            os.makedirs(self._output_directory)
+
+        profile_filepath = self.get_profile_filepath()
+        profile.dump_stats(profile_filepath)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.NUM_SUMMARY_ENTRIES)
+        summary_filepath = os.path.splitext(profile_filepath)[0] + ".txt"
+        with open(summary_filepath, 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+
+        print("FLIP Fluids: Saved bake loop profile to <" + profile_filepath + ">")
@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, os, struct, math, json, mathutils
+import bpy, os, struct, math, json, mathutils, numpy
 from bpy.props import (
         BoolProperty,
         IntProperty,
@@ -25,6 +25,7 @@ from bpy.props import (
         )
 
 from .flip_fluid_aabb import AABB
+from .flip_fluid_frame_prefetcher import FramePrefetcher
 from .. import render
 from ..operators import draw_particles_operators
 from ..operators import draw_force_field_operators
@@ -34,6 +35,7 @@ from ..utils import version_compatibility_utils as vcu
 DISABLE_MESH_CACHE_LOAD = False
 GL_POINT_CACHE_DATA = {}
 GL_FORCE_FIELD_CACHE_DATA = {}
+FRAME_PREFETCHER = None
 
 
 class EnabledMeshCacheObjects:
@@ -124,7 +126,241 @@ class FlipFluidLoadedMeshData(bpy.types.PropertyGroup):
         self.property_unset("frame")
 
 
-class FlipFluidMeshCache(bpy.types.PropertyGroup):
+# File importers of the mesh cache. Importers only read files and do not access
+# Blender data so that frames can also be imported on background threads by the
+# frame prefetcher.
+class FlipFluidMeshFileImporter():
+    # Importers return NumPy arrays that reference the file data without further
+    # copies. Arrays are flat unless generate_flat_array is False, in which case
+    # vector data is shaped (n, 3). Arrays can be passed directly to foreach_set.
+    def import_bobj(self, filename, generate_flat_array=False):
+        with open(filename, "rb") as f:
+            bobj_data = f.read()
+
+        if len(bobj_data) == 0:
+            return [], []
+
+        data_offset = 0
+        num_vertices = struct.unpack_from('i', bobj_data, data_offset)[0]
+        data_offset += 4
+
+        num_floats = 3 * num_vertices
+        num_bytes = 4 * num_floats
+        vertices = numpy.frombuffer(bobj_data, dtype=numpy.float32, count=num_floats, offset=data_offset)
+        data_offset += num_bytes
+
+        num_triangles = struct.unpack_from('i', bobj_data, data_offset)[0]
+        data_offset += 4
+
+        num_ints = 3 * num_triangles
+        triangles = numpy.frombuffer(bobj_data, dtype=numpy.int32, count=num_ints, offset=data_offset)
+
+        if not generate_flat_array:
+            vertices = vertices.reshape((num_vertices, 3))
+            triangles = triangles.reshape((num_triangles, 3))
+
+        return vertices, triangles
+
+
+    # Reads count values of dtype starting at byte_offset into out (or a new
+    # array) without reading the rest of the file
+    def _read_file_values(self, f, byte_offset, dtype, count, out=None):
+        if out is None:
+            out = numpy.empty(count, dtype=dtype)
+        if out.nbytes == 0:
+            return out
+        f.seek(byte_offset)
+        num_bytes_read = f.readinto(out)
+        if num_bytes_read != out.nbytes:
+            raise ValueError("Unexpected end of file <" + f.name + ">")
+        return out
+
+
+    def _read_file_uint(self, f, byte_offset):
+        return int(self._read_file_values(f, byte_offset, numpy.uint32, 1)[0])
+
+
+    # WWP, WWI and WWF files begin with a table of 256 vertex counts where entry
+    # i is the number of vertices to read for an import percentage of i / 255.
+    # Only the table entry and the required prefix of the data are read.
+    def _import_percentage_indexed_values(self, filename, pct, dtype, num_components):
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+
+            dataidx = int(math.ceil((pct / 100) * 255))
+            num_vertices = int(self._read_file_values(f, dataidx * 4, numpy.int32, 1)[0]) + 1
+            if num_vertices <= 0:
+                return []
+
+            data_offset = 256 * 4
+            return self._read_file_values(f, data_offset, dtype, num_components * num_vertices)
+
+
+    # FFP3 particle data is sorted by id within the surface, boundary and interior
+    # categories. The header id table gives the number of particles of each
+    # category to read for an import percentage, so only the header entries and
+    # a prefix of each category are read.
+    def import_ffp3(self, filename, pct_surface=1.0, pct_boundary=1.0, pct_interior=1.0, attribute_type='ATTRIBUTE_TYPE_UNKNOWN', generate_flat_array=False):
+        vertices = []
+        triangles = []
+        header_info_dict = None
+
+        if pct_surface == 0.0 and pct_boundary == 0.0 and pct_interior == 0.0:
+            return vertices, triangles, header_info_dict
+
+        num_components = 1
+        if attribute_type == 'ATTRIBUTE_TYPE_VECTOR':
+            sizeof_attribute = 12
+            attribute_dtype = numpy.float32
+            num_components = 3
+        elif attribute_type == 'ATTRIBUTE_TYPE_INT':
+            sizeof_attribute = 4
+            attribute_dtype = numpy.int32
+        elif attribute_type == 'ATTRIBUTE_TYPE_FLOAT':
+            sizeof_attribute = 4
+            attribute_dtype = numpy.float32
+        elif attribute_type == 'ATTRIBUTE_TYPE_UINT16':
+            sizeof_attribute = 2
+            attribute_dtype = numpy.uint16
+
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return vertices, triangles, header_info_dict
+
+            sizeof_uint = 4
+            num_surface_particles  = self._read_file_uint(f, 0 * sizeof_uint)
+            num_boundary_particles = self._read_file_uint(f, 1 * sizeof_uint)
+            num_interior_particles = self._read_file_uint(f, 2 * sizeof_uint)
+            id_limit               = self._read_file_uint(f, 3 * sizeof_uint)
+
+            id_surface = int(math.ceil(pct_surface * (id_limit - 1)))
+            id_boundary = int(math.ceil(pct_boundary * (id_limit - 1)))
+            id_interior = int(math.ceil(pct_interior * (id_limit - 1)))
+
+            id_data_byte_offset = 4 * sizeof_uint
+            id_surface_byte_offset = id_data_byte_offset + id_surface * 3 * sizeof_uint + 0 * sizeof_uint
+            id_boundary_byte_offset = id_data_byte_offset + id_boundary * 3 * sizeof_uint + 1 * sizeof_uint
+            id_interior_byte_offset = id_data_byte_offset + id_interior * 3 * sizeof_uint + 2 * sizeof_uint
+
+            num_surface_particles_to_read  = self._read_file_uint(f, id_surface_byte_offset)
+            num_boundary_particles_to_read = self._read_file_uint(f, id_boundary_byte_offset)
+            num_interior_particles_to_read = self._read_file_uint(f, id_interior_byte_offset)
+
+            tol = 1e-9
+            if pct_surface < tol:
+                num_surface_particles_to_read = 0
+            if pct_boundary < tol:
+                num_boundary_particles_to_read = 0
+            if pct_interior < tol:
+                num_interior_particles_to_read = 0
+
+            particle_data_byte_offset = id_data_byte_offset + id_limit * 3 * sizeof_uint
+            surface_particle_data_byte_offset = particle_data_byte_offset
+            boundary_particle_data_byte_offset = surface_particle_data_byte_offset + num_surface_particles * sizeof_attribute
+            interior_particle_data_byte_offset = boundary_particle_data_byte_offset + num_boundary_particles * sizeof_attribute
+
+            segments = [
+                (num_surface_particles_to_read,  surface_particle_data_byte_offset),
+                (num_boundary_particles_to_read, boundary_particle_data_byte_offset),
+                (num_interior_particles_to_read, interior_particle_data_byte_offset)
+                ]
+
+            # Categories are read directly into their range of the output array
+            num_values = num_components * (num_surface_particles_to_read + 
+                                           num_boundary_particles_to_read + 
+                                           num_interior_particles_to_read)
+            attribute_values = numpy.empty(num_values, dtype=attribute_dtype)
+            value_offset = 0
+            for num_particles, byte_offset in segments:
+                count = num_components * num_particles
+                out = attribute_values[value_offset:value_offset + count]
+                self._read_file_values(f, byte_offset, attribute_dtype, count, out=out)
+                value_offset += count
+
+        if attribute_type == 'ATTRIBUTE_TYPE_UINT16':
+            # INT attributes are set from 32-bit integer data
+            attribute_values = attribute_values.astype(numpy.int32)
+        if attribute_type == 'ATTRIBUTE_TYPE_VECTOR' and not generate_flat_array:
+            attribute_values = attribute_values.reshape((-1, 3))
+
+        header_info_dict = {}
+        header_info_dict["num_surface_particles"] = num_surface_particles
+        header_info_dict["num_boundary_particles"] = num_boundary_particles
+        header_info_dict["num_interior_particles"] = num_interior_particles
+        header_info_dict["id_limit"] = id_limit
+        header_info_dict["num_surface_particles_to_read"] = num_surface_particles_to_read
+        header_info_dict["num_boundary_particles_to_read"] = num_boundary_particles_to_read
+        header_info_dict["num_interior_particles_to_read"] = num_interior_particles_to_read
+
+        return attribute_values, triangles, header_info_dict
+
+
+    def import_wwp(self, filename, pct, generate_flat_array=False):
+        if pct == 0:
+            return [], []
+
+        vertices = self._import_percentage_indexed_values(filename, pct, numpy.float32, 3)
+        if len(vertices) > 0 and not generate_flat_array:
+            vertices = vertices.reshape((-1, 3))
+        triangles = []
+
+        return vertices, triangles
+
+
+    def import_wwi(self, filename, pct):
+        if pct == 0:
+            return [], []
+
+        int_values = self._import_percentage_indexed_values(filename, pct, numpy.int32, 1)
+        triangles = []
+
+        return int_values, triangles
+
+
+    def import_wwf(self, filename, pct):
+        if pct == 0:
+            return [], []
+
+        float_values = self._import_percentage_indexed_values(filename, pct, numpy.float32, 1)
+        triangles = []
+
+        return float_values, triangles
+
+
+    def import_floats(self, filename):
+        with open(filename, "rb") as f:
+            float_data = f.read()
+
+        if len(float_data) == 0:
+            return []
+
+        datasize = len(float_data)
+        num_floats = datasize // 4
+        floats = numpy.frombuffer(float_data, dtype=numpy.float32, count=num_floats)
+
+        return floats
+
+
+    def import_ints(self, filename):
+        with open(filename, "rb") as f:
+            int_data = f.read()
+
+        if len(int_data) == 0:
+            return []
+
+        datasize = len(int_data)
+        num_int = datasize // 4
+        ints = numpy.frombuffer(int_data, dtype=numpy.int32, count=num_int)
+
+        return ints
+
+
+    def import_empty(self, filename):
+        return [], []
+
+
+class FlipFluidMeshCache(bpy.types.PropertyGroup, FlipFluidMeshFileImporter):
     conv = vcu.convert_attribute_to_28
 
     # Mesh properties
@@ -477,7 +713,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         velocity_data, _ = self._import_velocity_attribute_data(frameno)
 
-        if not velocity_data:
+        if len(velocity_data) == 0:
             return
 
         attribute_name = "flip_velocity"
@@ -499,7 +735,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         speed_data, _ = self._import_speed_attribute_data(frameno)
 
-        if not speed_data:
+        if len(speed_data) == 0:
             return
 
         attribute_name = "flip_speed"
@@ -521,7 +757,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         vorticity_data, _ = self._import_vorticity_attribute_data(frameno)
 
-        if not vorticity_data:
+        if len(vorticity_data) == 0:
             return
 
         attribute_name = "flip_vorticity"
@@ -543,7 +779,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         age_data, _ = self._import_age_attribute_data(frameno)
 
-        if not age_data:
+        if len(age_data) == 0:
             return
 
         attribute_name = "flip_age"
@@ -565,7 +801,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         color_data, _ = self._import_color_attribute_data(frameno)
 
-        if not color_data:
+        if len(color_data) == 0:
             return
 
         attribute_name = "flip_color"
@@ -587,7 +823,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         source_id_data, _ = self._import_source_id_attribute_data(frameno)
 
-        if not source_id_data:
+        if len(source_id_data) == 0:
             return
 
         attribute_name = "flip_source_id"
@@ -609,7 +845,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         viscosity_data, _ = self._import_viscosity_attribute_data(frameno)
 
-        if not viscosity_data:
+        if len(viscosity_data) == 0:
             return
 
         attribute_name = "flip_viscosity"
@@ -631,7 +867,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         id_data, ffp3_header_info = self._import_id_attribute_data(frameno)
 
-        if not id_data:
+        if len(id_data) == 0:
             return
 
         attribute_name = "flip_id"
@@ -648,9 +884,15 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
             num_surface_particles = ffp3_header_info["num_surface_particles_to_read"]
             num_boundary_particles = ffp3_header_info["num_boundary_particles_to_read"]
             num_interior_particles = ffp3_header_info["num_interior_particles_to_read"]
-            is_surface_data = [True] * num_surface_particles + [False] * num_boundary_particles + [False] * num_interior_particles
-            is_boundary_data = [False] * num_surface_particles + [True] * num_boundary_particles + [False] * num_interior_particles
-            is_interior_data = [False] * num_surface_particles + [False] * num_boundary_particles + [True] * num_interior_particles
+            num_particles = num_surface_particles + num_boundary_particles + num_interior_particles
+            boundary_start = num_surface_particles
+            interior_start = num_surface_particles + num_boundary_particles
+            is_surface_data = numpy.zeros(num_particles, dtype=bool)
+            is_boundary_data = numpy.zeros(num_particles, dtype=bool)
+            is_interior_data = numpy.zeros(num_particles, dtype=bool)
+            is_surface_data[:boundary_start] = True
+            is_boundary_data[boundary_start:interior_start] = True
+            is_interior_data[interior_start:] = True
 
             attribute_name = "flip_is_surface_particle"
             try:
@@ -685,7 +927,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         frame_string = self._frame_number_to_string(frameno)
         lifetime_data, _ = self._import_lifetime_attribute_data(frameno)
 
-        if not lifetime_data:
+        if len(lifetime_data) == 0:
             return
 
         attribute_name = "flip_lifetime"
@@ -706,13 +948,15 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         cache_object = self.get_cache_object()
         frame_string = self._frame_number_to_string(frameno)
         whitewater_proximity_data, _ = self._import_whitewater_proximity_attribute_data(frameno)
-        foam_proximity_data = whitewater_proximity_data[0::3]
-        bubble_proximity_data = whitewater_proximity_data[1::3]
-        spray_proximity_data = whitewater_proximity_data[2::3]
-        
-        if not whitewater_proximity_data:
+        if len(whitewater_proximity_data) == 0:
             return
 
+        # foreach_set only reads contiguous buffers without conversion
+        whitewater_proximity_data = numpy.asarray(whitewater_proximity_data, dtype=numpy.float32)
+        foam_proximity_data = numpy.ascontiguousarray(whitewater_proximity_data[0::3])
+        bubble_proximity_data = numpy.ascontiguousarray(whitewater_proximity_data[1::3])
+        spray_proximity_data = numpy.ascontiguousarray(whitewater_proximity_data[2::3])
+
         mesh = cache_object.data
         foam_attribute_name = "flip_foam_proximity"
         bubble_attribute_name = "flip_bubble_proximity"
@@ -764,6 +1008,9 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         is_smooth = self._is_mesh_smooth(cache_object.data)
         octane_mesh_type = self._get_octane_mesh_type(cache_object)
 
+        prefetcher = get_frame_prefetcher()
+        prefetcher.begin_frame(self.as_pointer(), frameno)
+
         vertices, triangles = self._import_frame_mesh(frameno)
 
         vcu.swap_object_mesh_data_geometry(cache_object, vertices, triangles, 
@@ -784,6 +1031,8 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         self._update_lifetime_attribute(frameno)
         self._update_whitewater_proximity_attribute(frameno)
 
+        prefetcher.end_frame(self.as_pointer())
+
         self.current_loaded_frame = render.get_current_render_frame()
         self._commit_loaded_frame_data(frameno)
 
@@ -850,235 +1099,6 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         return self.cache_object
 
 
-    def import_bobj(self, filename, generate_flat_array=False):
-        with open(filename, "rb") as f:
-            bobj_data = f.read()
-
-        if len(bobj_data) == 0:
-            return [], []
-
-        data_offset = 0
-        num_vertices = struct.unpack_from('i', bobj_data, data_offset)[0]
-        data_offset += 4
-
-        num_floats = 3 * num_vertices
-        num_bytes = 4 * num_floats
-
-        if generate_flat_array:
-            vertices = list(struct.unpack_from('{0}f'.format(num_floats), bobj_data, data_offset))
-        else:
-            it = iter(struct.unpack_from('{0}f'.format(num_floats), bobj_data, data_offset))
-            vertices = list(zip(it, it, it))
-        data_offset += num_bytes
-
-        num_triangles = struct.unpack_from('i', bobj_data, data_offset)[0]
-        data_offset += 4
-
-        num_ints = 3 * num_triangles
-        num_bytes = 4 * num_ints
-
-        if generate_flat_array:
-            triangles = list(struct.unpack_from('{0}i'.format(num_ints), bobj_data, data_offset))
-        else:
-            it = iter(struct.unpack_from('{0}i'.format(num_ints), bobj_data, data_offset))
-            triangles = list(zip(it, it, it))
-
-        return vertices, triangles
-
-
-    def import_ffp3(self, filename, pct_surface=1.0, pct_boundary=1.0, pct_interior=1.0, attribute_type='ATTRIBUTE_TYPE_UNKNOWN', generate_flat_array=False):
-        with open(filename, "rb") as f:
-            attribute_data = f.read()
-
-        vertices = []
-        triangles = []
-        header_info_dict = None
-
-        if len(attribute_data) == 0:
-            return vertices, triangles, header_info_dict
-        if pct_surface == 0.0 and pct_boundary == 0.0 and pct_interior == 0.0:
-            return vertices, triangles, header_info_dict
-
-        if attribute_type == 'ATTRIBUTE_TYPE_VECTOR':
-            sizeof_attribute = 12
-            attribute_struct_format_str = '{0}f'
-        elif attribute_type == 'ATTRIBUTE_TYPE_INT':
-            sizeof_attribute = 4
-            attribute_struct_format_str = '{0}i'
-        elif attribute_type == 'ATTRIBUTE_TYPE_FLOAT':
-            sizeof_attribute = 4
-            attribute_struct_format_str = '{0}f'
-        elif attribute_type == 'ATTRIBUTE_TYPE_UINT16':
-            sizeof_attribute = 2
-            attribute_struct_format_str = '{0}H'
-
-        sizeof_uint = 4
-        num_surface_particles  = struct.unpack_from('I', attribute_data, 0 * sizeof_uint)[0]
-        num_boundary_particles = struct.unpack_from('I', attribute_data, 1 * sizeof_uint)[0]
-        num_interior_particles = struct.unpack_from('I', attribute_data, 2 * sizeof_uint)[0]
-        id_limit               = struct.unpack_from('I', attribute_data, 3 * sizeof_uint)[0]
-
-        id_surface = int(math.ceil(pct_surface * (id_limit - 1)))
-        id_boundary = int(math.ceil(pct_boundary * (id_limit - 1)))
-        id_interior = int(math.ceil(pct_interior * (id_limit - 1)))
-
-        id_data_byte_offset = 4 * sizeof_uint
-        id_surface_byte_offset = id_data_byte_offset + id_surface * 3 * sizeof_uint + 0 * sizeof_uint
-        id_boundary_byte_offset = id_data_byte_offset + id_boundary * 3 * sizeof_uint + 1 * sizeof_uint
-        id_interior_byte_offset = id_data_byte_offset + id_interior * 3 * sizeof_uint + 2 * sizeof_uint
-
-        num_surface_particles_to_read  = struct.unpack_from('I', attribute_data, id_surface_byte_offset)[0]
-        num_boundary_particles_to_read = struct.unpack_from('I', attribute_data, id_boundary_byte_offset)[0]
-        num_interior_particles_to_read = struct.unpack_from('I', attribute_data, id_interior_byte_offset)[0]
-
-        tol = 1e-9
-        if pct_surface < tol:
-            num_surface_particles_to_read = 0
-        if pct_boundary < tol:
-            num_boundary_particles_to_read = 0
-        if pct_interior < tol:
-            num_interior_particles_to_read = 0
-
-        particle_data_byte_offset = id_data_byte_offset + id_limit * 3 * sizeof_uint
-        surface_particle_data_byte_offset = particle_data_byte_offset
-        boundary_particle_data_byte_offset = surface_particle_data_byte_offset + num_surface_particles * sizeof_attribute
-        interior_particle_data_byte_offset = boundary_particle_data_byte_offset + num_boundary_particles * sizeof_attribute
-
-        if attribute_type == 'ATTRIBUTE_TYPE_VECTOR':
-            if generate_flat_array:
-                attribute_values  = list(struct.unpack_from(attribute_struct_format_str.format(3 * num_surface_particles_to_read),  attribute_data, surface_particle_data_byte_offset))
-                attribute_values += list(struct.unpack_from(attribute_struct_format_str.format(3 * num_boundary_particles_to_read), attribute_data, boundary_particle_data_byte_offset))
-                attribute_values += list(struct.unpack_from(attribute_struct_format_str.format(3 * num_interior_particles_to_read), attribute_data, interior_particle_data_byte_offset))
-            else:
-                surface_it  = iter(struct.unpack_from(attribute_struct_format_str.format(3 * num_surface_particles_to_read),  attribute_data, surface_particle_data_byte_offset))
-                boundary_it = iter(struct.unpack_from(attribute_struct_format_str.format(3 * num_boundary_particles_to_read), attribute_data, boundary_particle_data_byte_offset))
-                interior_it = iter(struct.unpack_from(attribute_struct_format_str.format(3 * num_interior_particles_to_read), attribute_data, interior_particle_data_byte_offset))
-                attribute_values = list(zip(surface_it, surface_it, surface_it))
-                attribute_values += list(zip(boundary_it, boundary_it, boundary_it))
-                attribute_values += list(zip(interior_it, interior_it, interior_it))
-        else:
-            attribute_values  = list(struct.unpack_from(attribute_struct_format_str.format(num_surface_particles_to_read),  attribute_data, surface_particle_data_byte_offset))
-            attribute_values += list(struct.unpack_from(attribute_struct_format_str.format(num_boundary_particles_to_read), attribute_data, boundary_particle_data_byte_offset))
-            attribute_values += list(struct.unpack_from(attribute_struct_format_str.format(num_interior_particles_to_read), attribute_data, interior_particle_data_byte_offset))
-
-        header_info_dict = {}
-        header_info_dict["num_surface_particles"] = num_surface_particles
-        header_info_dict["num_boundary_particles"] = num_boundary_particles
-        header_info_dict["num_interior_particles"] = num_interior_particles
-        header_info_dict["id_limit"] = id_limit
-        header_info_dict["num_surface_particles_to_read"] = num_surface_particles_to_read
-        header_info_dict["num_boundary_particles_to_read"] = num_boundary_particles_to_read
-        header_info_dict["num_interior_particles_to_read"] = num_interior_particles_to_read
-
-        return attribute_values, triangles, header_info_dict
-
-
-    def import_wwp(self, filename, pct, generate_flat_array=False):
-        if pct == 0:
-            return [], []
-
-        with open(filename, "rb") as f:
-            wwp_data = f.read()
-
-        if len(wwp_data) == 0:
-            return [], []
-
-        dataidx = int(math.ceil((pct / 100) * 255))
-        num_vertices = struct.unpack_from('i', wwp_data, dataidx * 4)[0] + 1
-        if num_vertices <= 0:
-            return [], []
-
-        num_floats = 3 * num_vertices
-        data_offset = 256 * 4
-
-        if generate_flat_array:
-            vertices = list(struct.unpack_from('{0}f'.format(num_floats), wwp_data, data_offset))
-        else:
-            it = iter(struct.unpack_from('{0}f'.format(num_floats), wwp_data, data_offset))
-            vertices = list(zip(it, it, it))
-        triangles = []
-
-        return vertices, triangles
-
-
-    def import_wwi(self, filename, pct):
-        if pct == 0:
-            return [], []
-
-        with open(filename, "rb") as f:
-            wwi_data = f.read()
-
-        if len(wwi_data) == 0:
-            return [], []
-
-        dataidx = int(math.ceil((pct / 100) * 255))
-        num_vertices = struct.unpack_from('i', wwi_data, dataidx * 4)[0] + 1
-        if num_vertices <= 0:
-            return [], []
-
-        num_ints = num_vertices
-        data_offset = 256 * 4
-        int_values = list(struct.unpack_from('{0}i'.format(num_ints), wwi_data, data_offset))
-        triangles = []
-
-        return int_values, triangles
-
-
-    def import_wwf(self, filename, pct):
-        if pct == 0:
-            return [], []
-
-        with open(filename, "rb") as f:
-            wwi_data = f.read()
-
-        if len(wwi_data) == 0:
-            return [], []
-
-        dataidx = int(math.ceil((pct / 100) * 255))
-        num_vertices = struct.unpack_from('i', wwi_data, dataidx * 4)[0] + 1
-        if num_vertices <= 0:
-            return [], []
-
-        num_ints = num_vertices
-        data_offset = 256 * 4
-        float_values = list(struct.unpack_from('{0}f'.format(num_ints), wwi_data, data_offset))
-        triangles = []
-
-        return float_values, triangles
-
-
-    def import_floats(self, filename):
-        with open(filename, "rb") as f:
-            float_data = f.read()
-
-        if len(float_data) == 0:
-            return []
-
-        datasize = len(float_data)
-        num_floats = datasize // 4
-        floats = list(struct.unpack_from('{0}f'.format(num_floats), float_data, 0))
-
-        return floats
-
-
-    def import_ints(self, filename):
-        with open(filename, "rb") as f:
-            int_data = f.read()
-
-        if len(int_data) == 0:
-            return []
-
-        datasize = len(int_data)
-        num_int = datasize // 4
-        ints = list(struct.unpack_from('{0}i'.format(num_int), int_data, 0))
-
-        return ints
-
-
-    def import_empty(self, filename):
-        return [], []
-
-
     def _is_domain_set(self):
         return bpy.context.scene.flip_fluid.get_domain_object() is not None
 
@@ -1379,6 +1399,13 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
         mesh_data.polygons.foreach_set("use_smooth", values)
 
 
+    # Bakefiles of a frame are imported through the frame prefetcher so that
+    # files that were already read in the background are not read again
+    def _import_frame_file(self, frameno, import_function_name, filepath, *args, **kwargs):
+        prefetcher = get_frame_prefetcher()
+        return prefetcher.import_file(self.as_pointer(), frameno, import_function_name, filepath, args, kwargs)
+
+
     def _import_frame_mesh(self, frameno):
         if not self._is_domain_set() or not self._is_frame_cached(frameno):
             return [], []
@@ -1387,17 +1414,17 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            vertices, triangles = import_function(filepath, self.wwp_import_percentage)
+            vertices, triangles = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage)
         elif import_function == self.import_ffp3:
-            vertices, triangles, _ = import_function(
-                    filepath,
+            vertices, triangles, _ = self._import_frame_file(
+                    frameno, self.import_function_name, filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_VECTOR'
                     )
         else:
-            vertices, triangles = import_function(filepath)
+            vertices, triangles = self._import_frame_file(frameno, self.import_function_name, filepath)
         return vertices, triangles
 
 
@@ -1411,9 +1438,9 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            translation_data, _ = import_function(filepath, self.wwp_import_percentage)
+            translation_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage)
         else:
-            translation_data, _ = import_function(filepath)
+            translation_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath)
         return translation_data
 
 
@@ -1433,10 +1460,10 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            velocity_data, _ = import_function(filepath, self.wwp_import_percentage, generate_flat_array=True)
+            velocity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage, generate_flat_array=True)
         elif import_function == self.import_ffp3:
-            velocity_data, _, header_info = self.import_ffp3(
-                    filepath,
+            velocity_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
@@ -1444,7 +1471,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
                     generate_flat_array=True
                     )
         else:
-            velocity_data, _ = import_function(filepath, generate_flat_array=True)
+            velocity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, generate_flat_array=True)
         return velocity_data, header_info
 
 
@@ -1463,15 +1490,15 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
             return speed_data, header_info
 
         if self.cache_object_type == 'CACHE_OBJECT_TYPE_FLUID_PARTICLES':
-            speed_data, _, header_info = self.import_ffp3(
-                    filepath,
+            speed_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_FLOAT'
                     )
         else:
-            speed_data = self.import_floats(filepath)
+            speed_data = self._import_frame_file(frameno, "import_floats", filepath)
         return speed_data, header_info
 
 
@@ -1491,10 +1518,10 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            vorticity_data, _ = import_function(filepath, self.wwp_import_percentage, generate_flat_array=True)
+            vorticity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage, generate_flat_array=True)
         elif import_function == self.import_ffp3:
-            vorticity_data, _, header_info = self.import_ffp3(
-                    filepath,
+            vorticity_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
@@ -1502,7 +1529,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
                     generate_flat_array=True
                     )
         else:
-            vorticity_data, _ = import_function(filepath, generate_flat_array=True)
+            vorticity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, generate_flat_array=True)
         return vorticity_data, header_info
 
 
@@ -1522,17 +1549,17 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            age_data, _ = import_function(filepath, self.wwp_import_percentage)
+            age_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage)
         elif import_function == self.import_ffp3:
-            age_data, _, header_info = self.import_ffp3(
-                    filepath,
+            age_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_FLOAT'
                     )
         else:
-            age_data = self.import_floats(filepath)
+            age_data = self._import_frame_file(frameno, "import_floats", filepath)
         return age_data, header_info
 
 
@@ -1552,10 +1579,10 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            color_data, _ = import_function(filepath, self.wwp_import_percentage, generate_flat_array=True)
+            color_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage, generate_flat_array=True)
         elif import_function == self.import_ffp3:
-            color_data, _, header_info = self.import_ffp3(
-                    filepath,
+            color_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
@@ -1563,7 +1590,7 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
                     generate_flat_array=True
                     )
         else:
-            color_data, _ = import_function(filepath, generate_flat_array=True)
+            color_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, generate_flat_array=True)
         return color_data, header_info
 
 
@@ -1584,17 +1611,17 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            source_id_data, _ = import_function(filepath, self.wwp_import_percentage)
+            source_id_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage)
         elif import_function == self.import_ffp3:
-            source_id_data, _, header_info = self.import_ffp3(
-                    filepath,
+            source_id_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_INT'
                     )
         else:
-            source_id_data = self.import_ints(filepath)
+            source_id_data = self._import_frame_file(frameno, "import_ints", filepath)
 
         return source_id_data, header_info
 
@@ -1615,17 +1642,17 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if import_function == self.import_wwp:
-            viscosity_data, _ = import_function(filepath, self.wwp_import_percentage)
+            viscosity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage)
         elif import_function == self.import_ffp3:
-            viscosity_data, _, header_info = self.import_ffp3(
-                    filepath,
+            viscosity_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_FLOAT'
                     )
         else:
-            viscosity_data = self.import_floats(filepath)
+            viscosity_data = self._import_frame_file(frameno, "import_floats", filepath)
 
         return viscosity_data, header_info
 
@@ -1645,15 +1672,15 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
             return id_data, header_info
 
         if self.cache_object_type == 'CACHE_OBJECT_TYPE_FLUID_PARTICLES':
-            id_data, _, header_info = self.import_ffp3(
-                    filepath,
+            id_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
                     attribute_type='ATTRIBUTE_TYPE_UINT16'
                     )
         else:
-            id_data, _ = self.import_wwi(filepath, self.wwp_import_percentage)
+            id_data, _ = self._import_frame_file(frameno, "import_wwi", filepath, self.wwp_import_percentage)
         return id_data, header_info
 
 
@@ -1677,8 +1704,8 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
             return lifetime_data, header_info
 
         if self.cache_object_type == 'CACHE_OBJECT_TYPE_FLUID_PARTICLES':
-            lifetime_data, _, header_info = self.import_ffp3(
-                    filepath,
+            lifetime_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
@@ -1686,9 +1713,9 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
                     )
         else:
             if import_function == self.import_wwp:
-                lifetime_data, _ = self.import_wwf(filepath, self.wwp_import_percentage)
+                lifetime_data, _ = self._import_frame_file(frameno, "import_wwf", filepath, self.wwp_import_percentage)
             else:
-                lifetime_data = self.import_floats(filepath)
+                lifetime_data = self._import_frame_file(frameno, "import_floats", filepath)
 
         return lifetime_data, header_info
 
@@ -1709,8 +1736,8 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
 
         import_function = getattr(self, self.import_function_name)
         if self.cache_object_type == 'CACHE_OBJECT_TYPE_FLUID_PARTICLES':
-            whitewater_proximity_data, _, header_info = self.import_ffp3(
-                    filepath,
+            whitewater_proximity_data, _, header_info = self._import_frame_file(
+                    frameno, "import_ffp3", filepath,
                     pct_surface=self.ffp3_surface_import_percentage,
                     pct_boundary=self.ffp3_boundary_import_percentage,
                     pct_interior=self.ffp3_interior_import_percentage,
@@ -1719,9 +1746,9 @@ class FlipFluidMeshCache(bpy.types.PropertyGroup):
                     )
         else:
             if import_function == self.import_wwp:
-                whitewater_proximity_data, _ = import_function(filepath, self.wwp_import_percentage, generate_flat_array=True)
+                whitewater_proximity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, self.wwp_import_percentage, generate_flat_array=True)
             else:
-                whitewater_proximity_data, _ = import_function(filepath, generate_flat_array=True)
+                whitewater_proximity_data, _ = self._import_frame_file(frameno, self.import_function_name, filepath, generate_flat_array=True)
 
         return whitewater_proximity_data, header_info
 
@@ -2112,6 +2139,18 @@ class FlipFluidCache(bpy.types.PropertyGroup):
         pass
 
 
+    # Starts reading the bakefiles of the frames at frame_offsets from the
+    # most recently loaded frame on background threads
+    def prefetch_frames(self, frame_offsets, memory_limit):
+        prefetcher = get_frame_prefetcher()
+        prefetcher.set_memory_limit(memory_limit)
+        prefetcher.prefetch_frames(frame_offsets)
+
+
+    def clear_prefetched_frames(self):
+        get_frame_prefetcher().clear()
+
+
     def initialize_cache_objects(self, enabled_mesh_cache_objects=None):
         self.initialize_cache_settings()
         if not self._is_domain_set():
@@ -2277,6 +2316,26 @@ class FlipFluidCache(bpy.types.PropertyGroup):
         return os.path.normpath(dprops.cache.get_cache_abspath())
 
 
+def get_frame_prefetcher():
+    global FRAME_PREFETCHER
+    if FRAME_PREFETCHER is None:
+        FRAME_PREFETCHER = FramePrefetcher(FlipFluidMeshFileImporter())
+    return FRAME_PREFETCHER
+
+
+def load_pre():
+    # Prefetched frames and import plans are only valid for the current Blend file
+    if FRAME_PREFETCHER is not None:
+        FRAME_PREFETCHER.clear()
+
+
+def shutdown_frame_prefetcher():
+    global FRAME_PREFETCHER
+    if FRAME_PREFETCHER is not None:
+        FRAME_PREFETCHER.shutdown()
+        FRAME_PREFETCHER = None
+
+
 def register():
     bpy.utils.register_class(FLIPFluidMeshBounds)
     bpy.utils.register_class(FlipFluidLoadedMeshData)
@@ -2299,3 +2358,5 @@ def unregister():
 
     global GL_FORCE_FIELD_CACHE_DATA
     GL_FORCE_FIELD_CACHE_DATA = {}
+
+    shutdown_frame_prefetcher()
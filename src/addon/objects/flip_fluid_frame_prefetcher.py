@@ -0,0 +1,273 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os, threading, collections
+from concurrent.futures import ThreadPoolExecutor
+
+
+def frame_number_to_string(frameno):
+    return str(frameno).zfill(6)
+
+
+def get_result_size(result):
+    if hasattr(result, 'nbytes'):
+        return result.nbytes
+    if isinstance(result, (list, tuple)):
+        return sum(get_result_size(r) for r in result)
+    if isinstance(result, dict):
+        return sum(get_result_size(r) for r in result.values())
+    return 0
+
+
+def get_file_stat(filepath):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class FrameImportPlan():
+    def __init__(self, frameno):
+        self.frameno = frameno
+        self.imports = []
+        self.nbytes = 0
+
+
+class FrameImportEntry():
+    def __init__(self, file_stat, result):
+        self.file_stat = file_stat
+        self.result = result
+        self.nbytes = get_result_size(result)
+
+
+# Reads and decodes the bakefiles of upcoming frames on background threads so
+# that the frame change handler only needs to update the Blender mesh data.
+#
+# While a mesh cache loads a frame, each file import that it performs is
+# recorded into an import plan. Plans are replayed for the next frames in the
+# playback direction. Import functions must not access Blender data as they
+# are run outside of the main thread.
+#
+# Imported results are kept in an LRU that is bounded by the total size of the
+# returned arrays. An entry is only used if the modification time and size of
+# its file are unchanged, so files that are rewritten during a bake or re-mesh
+# are never loaded from stale data.
+class FramePrefetcher():
+    def __init__(self, importer, num_threads=2):
+        self._importer = importer
+        self._num_threads = num_threads
+        self._memory_limit = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._entries = collections.OrderedDict()
+        self._entries_nbytes = 0
+        self._pending = {}
+        self._plans = {}
+        self._recording_plans = {}
+        self._updated_plan_owners = set()
+        self._generation = 0
+        self._num_hits = 0
+        self._num_misses = 0
+
+
+    def get_num_hits(self):
+        return self._num_hits
+
+
+    def get_num_misses(self):
+        return self._num_misses
+
+
+    def get_memory_usage(self):
+        return self._entries_nbytes
+
+
+    def set_memory_limit(self, num_bytes):
+        with self._lock:
+            self._memory_limit = max(num_bytes, 0)
+            self._evict_entries()
+
+
+    def begin_frame(self, owner, frameno):
+        self._recording_plans[owner] = FrameImportPlan(frameno)
+
+
+    def end_frame(self, owner):
+        plan = self._recording_plans.pop(owner, None)
+        if plan is None:
+            return
+        self._plans[owner] = plan
+        self._updated_plan_owners.add(owner)
+
+
+    # Returns the result of importer.<import_function_name>(filepath, *args, **kwargs),
+    # using the prefetched result if available
+    def import_file(self, owner, frameno, import_function_name, filepath, args=(), kwargs=None):
+        if kwargs is None:
+            kwargs = {}
+        key = (import_function_name, filepath, tuple(args), tuple(sorted(kwargs.items())))
+        self._record_import(owner, frameno, key)
+
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None and not future.cancelled():
+            # The file is being read in the background, which is faster than
+            # starting over
+            future.result()
+
+        file_stat = get_file_stat(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.file_stat == file_stat:
+                self._entries.move_to_end(key)
+                self._num_hits += 1
+                result = entry.result
+            else:
+                result = None
+                self._num_misses += 1
+
+        if result is None:
+            result = getattr(self._importer, import_function_name)(filepath, *args, **kwargs)
+            with self._lock:
+                self._insert_entry(key, FrameImportEntry(file_stat, result))
+
+        plan = self._recording_plans.get(owner)
+        if plan is not None:
+            plan.nbytes += get_result_size(result)
+        return result
+
+
+    # Starts background imports of the frames at the given offsets from the
+    # frames that were loaded since the last call. Frames are imported in
+    # order of frame_offsets and only as many frames are imported as are
+    # expected to fit within the memory limit.
+    def prefetch_frames(self, frame_offsets):
+        plans = [self._plans[owner] for owner in self._updated_plan_owners if owner in self._plans]
+        self._updated_plan_owners = set()
+
+        frame_nbytes = sum(plan.nbytes for plan in plans)
+        if frame_nbytes > 0:
+            # Room is left for the frame that is currently loaded
+            max_frames = max(self._memory_limit // frame_nbytes - 1, 0)
+            frame_offsets = frame_offsets[:max_frames]
+
+        keys = []
+        for offset in frame_offsets:
+            for plan in plans:
+                prefetch_frameno = plan.frameno + offset
+                if prefetch_frameno < 0:
+                    continue
+                frame_string = frame_number_to_string(prefetch_frameno)
+                for import_function_name, directory, head, tail, args, kwargs in plan.imports:
+                    filepath = os.path.join(directory, head + frame_string + tail)
+                    keys.append((import_function_name, filepath, args, kwargs))
+
+        with self._lock:
+            # Queued imports of frames that are no longer upcoming, such as after
+            # scrubbing the timeline, are dropped
+            key_set = set(keys)
+            for key, future in list(self._pending.items()):
+                if key not in key_set and future.cancel():
+                    del self._pending[key]
+
+            # Upcoming frames are marked as recently used so that frames that
+            # were already played are evicted first, nearest frames last
+            for key in reversed(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+
+            for key in keys:
+                if key in self._entries or key in self._pending:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._num_threads)
+                future = self._executor.submit(self._prefetch_file, key, self._generation)
+                self._pending[key] = future
+
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending = {}
+            self._entries = collections.OrderedDict()
+            self._entries_nbytes = 0
+        self._plans = {}
+        self._recording_plans = {}
+        self._updated_plan_owners = set()
+        self._num_hits = 0
+        self._num_misses = 0
+
+
+    def shutdown(self):
+        self.clear()
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+    def _record_import(self, owner, frameno, key):
+        plan = self._recording_plans.get(owner)
+        if plan is None:
+            return
+        import_function_name, filepath, args, kwargs = key
+        directory, filename = os.path.split(filepath)
+        frame_string = frame_number_to_string(frameno)
+        if frame_string not in filename:
+            return
+        head, tail = filename.rsplit(frame_string, 1)
+        plan.imports.append((import_function_name, directory, head, tail, args, kwargs))
+
+
+    def _prefetch_file(self, key, generation):
+        import_function_name, filepath, args, kwargs = key
+        entry = None
+        file_stat = get_file_stat(filepath)
+        if file_stat is not None:
+            try:
+                result = getattr(self._importer, import_function_name)(filepath, *args, **dict(kwargs))
+                entry = FrameImportEntry(file_stat, result)
+            except Exception:
+                # Errors are reported when the frame is imported on the main thread
+                entry = None
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pending.pop(key, None)
+            if entry is not None:
+                self._insert_entry(key, entry)
+
+
+    # Must be called with the lock held
+    def _insert_entry(self, key, entry):
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self._entries_nbytes -= old_entry.nbytes
+        self._entries[key] = entry
+        self._entries_nbytes += entry.nbytes
+        self._evict_entries()
+
+
+    # Must be called with the lock held
+    def _evict_entries(self):
+        while self._entries and self._entries_nbytes > self._memory_limit:
+            _, entry = self._entries.popitem(last=False)
+            self._entries_nbytes -= entry.nbytes
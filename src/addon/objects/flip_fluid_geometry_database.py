@@ -14,20 +14,52 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, os, sqlite3, math
+import bpy, os, sqlite3, math, struct, hashlib, zlib
+from collections import OrderedDict
 
 from .flip_fluid_geometry_export_object import GeometryExportType, MotionExportType
 from ..filesystem import filesystem_protection_layer as fpl
 
+from .flip_fluid_mesh_frame_cache import MeshFrameCache
 from ..pyfluid import TriangleMesh
 
 
 class GeometryDatabase():
+    # Incremented when tables or indexes are added. Existing databases with an
+    # older schema version are upgraded in _migrate_database().
+    SCHEMA_VERSION = 2
+
+    PAGE_SIZE = 16384
+    CACHE_SIZE_KB = 65536
+
+    # Animated mesh rows are stored in one of the following forms:
+    #     reference NULL, data = BOBJ             Full mesh (uncompressed)
+    #     reference NULL, data = header + BOBJ    Full mesh (compressed)
+    #     reference ID,   data NULL               Same mesh as row ID
+    #     reference ID,   data = header + delta   Vertex positions of row ID XOR delta
+    #
+    # A BOBJ blob begins with a non-negative int32 vertex count, so blobs that begin
+    # with the header magic can not be mistaken for uncompressed meshes.
+    MESH_ENCODING_MAGIC = b"FMD\xff"
+    MESH_ENCODING_HEADER_FORMAT = "<4sIQ"
+    MESH_ENCODING_HEADER_SIZE = struct.calcsize(MESH_ENCODING_HEADER_FORMAT)
+    MESH_ENCODING_FLAG_ZLIB = 1
+    MESH_ENCODING_FLAG_DELTA = 2
+
+    # Limits the number of rows that are decoded to read a single delta encoded frame
+    MAX_MESH_DELTA_CHAIN_LENGTH = 16
+    MESH_DECODE_CACHE_SIZE = 8
+    ZLIB_COMPRESSION_LEVEL = 1
+
     def __init__(self, db_filepath, clear_database=False):
         self._conn = None
         self._cursor = None
         self._is_conn_open = False
         self._filepath = db_filepath
+        self._num_queries = 0
+
+        self._is_mesh_compression_enabled = False
+        self._reset_mesh_encoding_state()
 
         self._initialize_database(db_filepath, clear_database)
 
@@ -42,10 +74,19 @@ class GeometryDatabase():
         self._conn = sqlite3.connect(self._filepath)
         self._cursor = self._conn.cursor()
         self._is_conn_open = True
+        self._mesh_decode_cache.clear()
+        self._set_connection_pragmas(self._cursor)
+        self._conn.set_trace_callback(self._count_query)
 
 
     def close(self):
         if self._is_conn_open:
+            try:
+                # Move committed WAL pages back into the database file so that
+                # the database can be copied or linked as a single file
+                self._cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
             self._cursor.close()
             self._conn.close()
             self._is_conn_open = False
@@ -63,6 +104,68 @@ class GeometryDatabase():
         self._conn.commit()
 
 
+    # Copies all animated geometry rows from a staging database with the same
+    # object ids into this database. Row ids are offset past the existing rows
+    # so that references between staging rows remain valid. The connection must
+    # be open and not within a transaction.
+    def merge_animated_data(self, staging_filepath):
+        animated_tables = [
+            "mesh_animated", "points_animated", "centroid_animated", "axis_animated", "curve_animated"
+        ]
+
+        self._cursor.execute("ATTACH DATABASE ? AS staging", (staging_filepath,))
+        try:
+            self.begin()
+            for tname in animated_tables:
+                id_column = tname + "_id"
+                self._cursor.execute("SELECT IFNULL(MAX(" + id_column + "), 0) FROM main." + tname)
+                id_offset = self._cursor.fetchone()[0]
+
+                self._cursor.execute("PRAGMA table_info(" + tname + ")")
+                columns = [row[1] for row in self._cursor.fetchall()]
+                select_columns = []
+                for column in columns:
+                    if column == id_column or column == "reference":
+                        select_columns.append(column + " + " + str(id_offset))
+                    else:
+                        select_columns.append(column)
+
+                cmd = ("INSERT INTO main." + tname + " (" + ", ".join(columns) + ") " +
+                       "SELECT " + ", ".join(select_columns) + " FROM staging." + tname)
+                self._cursor.execute(cmd)
+            self.commit()
+        except Exception as e:
+            self._conn.rollback()
+            raise e
+        finally:
+            self._cursor.execute("DETACH DATABASE staging")
+
+
+    # Number of SQL statements executed since the database was created. Used
+    # for bake loop profiling.
+    def get_num_queries(self):
+        return self._num_queries
+
+
+    def _count_query(self, statement):
+        self._num_queries += 1
+
+
+    def _set_connection_pragmas(self, cursor):
+        # Negative cache_size is interpreted by SQLite as a size in KiB
+        cursor.execute("PRAGMA cache_size = -" + str(self.CACHE_SIZE_KB))
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        try:
+            journal_mode = cursor.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        except sqlite3.Error:
+            # WAL is not supported on some network filesystems or read-only
+            # directories. Fall back to the default rollback journal.
+            journal_mode = None
+        if journal_mode is not None and journal_mode.lower() == "wal":
+            # NORMAL is durable across application crashes in WAL mode
+            cursor.execute("PRAGMA synchronous = NORMAL")
+
+
     def _format_bytes(self, num):
         # Method adapted from: http://stackoverflow.com/a/10171475
         unit_list = ['bytes', 'kB', 'MB', 'GB', 'TB', 'PB']
@@ -115,6 +218,23 @@ class GeometryDatabase():
         self._cursor.execute(insert_command, values)
 
 
+    # Inserts an object row as returned by get_all_objects(), keeping its
+    # object_id. Used to mirror the main database objects in a staging database.
+    def add_object_row(self, row):
+        insert_command = """INSERT INTO object (
+                object_id,
+                object_name, 
+                object_slug, 
+                object_motion_type, 
+                export_mesh, 
+                export_vertices,
+                export_centroid,
+                export_axis,
+                export_curve   
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+        self._cursor.execute(insert_command, tuple(row))
+
+
     def object_exists(self, export_obj):
         cmd = """SELECT EXISTS(SELECT object_id FROM object WHERE object_slug=?)"""
         self._cursor.execute(cmd, (export_obj.name_slug,))
@@ -159,6 +279,9 @@ class GeometryDatabase():
         delete_command = """DELETE FROM object WHERE object_slug=?"""
         self._cursor.execute(delete_command, (name_slug,))
 
+        # Row ids of deleted rows may be reused
+        self._reset_mesh_encoding_state()
+
 
     def add_mesh_static(self, object_id, blob):
         insert_command = """INSERT INTO mesh_static (
@@ -189,13 +312,46 @@ class GeometryDatabase():
         self._cursor.execute(insert_command, values)
 
 
+    def set_mesh_compression_enabled(self, is_enabled):
+        self._is_mesh_compression_enabled = is_enabled
+
+
+    # Frames that are identical to a previously added frame of the object are stored
+    # as a reference to that frame. Frames with the same topology as the previous
+    # frame only store the change in vertex positions.
     def add_mesh_animated(self, object_id, frame_id, blob):
+        blob = bytes(blob)
+        digest = hashlib.sha256(blob).digest()
+        object_hashes = self._mesh_hash_index.setdefault(object_id, {})
+
+        reference = None
+        data = None
+        chain_length = 0
+        if digest in object_hashes:
+            reference, chain_length = object_hashes[digest]
+        else:
+            previous = self._previous_mesh_animated.get(object_id)
+            if (previous is not None and previous[2] < self.MAX_MESH_DELTA_CHAIN_LENGTH and 
+                    self._is_same_bobj_topology(previous[0], blob)):
+                reference = previous[1]
+                chain_length = previous[2] + 1
+                data = self._encode_mesh_delta(previous[0], blob)
+            elif self._is_mesh_compression_enabled:
+                data = self._encode_mesh_data(blob, 0, blob)
+            else:
+                data = blob
+
         insert_command = """INSERT INTO mesh_animated (
-                object_id, frame_id, mesh_animated_data
-            ) VALUES (?, ?, ?)"""
-        values = (object_id, frame_id, blob)
+                object_id, frame_id, mesh_animated_data, reference
+            ) VALUES (?, ?, ?, ?)"""
+        values = (object_id, frame_id, data, reference)
         self._cursor.execute(insert_command, values)
 
+        if data is not None:
+            object_hashes[digest] = (self._cursor.lastrowid, chain_length)
+            reference = self._cursor.lastrowid
+        self._previous_mesh_animated[object_id] = (blob, reference, chain_length)
+
 
     def add_centroid_static(self, object_id, centroid):
         insert_command = """INSERT INTO centroid_static (
@@ -355,6 +511,84 @@ class GeometryDatabase():
         return frames
 
 
+    # Object fingerprints are stored with a NULL frame_id, per-frame fingerprints
+    # of animated objects with the frame_id. Databases that could not be upgraded
+    # have no fingerprint table and are treated as having no fingerprints.
+    def get_object_fingerprint(self, name_slug):
+        object_id = self.get_object_id_by_name_slug(name_slug)
+        if object_id is None:
+            return None
+        cmd = """SELECT fingerprint FROM object_fingerprint WHERE object_id=? AND frame_id IS NULL"""
+        try:
+            self._cursor.execute(cmd, (object_id,))
+        except sqlite3.OperationalError:
+            return None
+        result = self._cursor.fetchone()
+        if not result:
+            return None
+        return result[0]
+
+
+    def get_object_frame_fingerprints(self, name_slug):
+        object_id = self.get_object_id_by_name_slug(name_slug)
+        if object_id is None:
+            return {}
+        cmd = """SELECT frame_id, fingerprint FROM object_fingerprint WHERE object_id=? AND frame_id IS NOT NULL"""
+        try:
+            self._cursor.execute(cmd, (object_id,))
+        except sqlite3.OperationalError:
+            return {}
+        return dict(self._cursor.fetchall())
+
+
+    def set_object_fingerprint(self, object_id, fingerprint):
+        cmd = """DELETE FROM object_fingerprint WHERE object_id=? AND frame_id IS NULL"""
+        self._cursor.execute(cmd, (object_id,))
+        cmd = """INSERT INTO object_fingerprint (object_id, frame_id, fingerprint) VALUES (?, NULL, ?)"""
+        self._cursor.execute(cmd, (object_id, fingerprint))
+
+
+    def set_object_frame_fingerprints(self, object_id, frame_fingerprints):
+        cmd = """DELETE FROM object_fingerprint WHERE object_id=? AND frame_id IS NOT NULL"""
+        self._cursor.execute(cmd, (object_id,))
+        cmd = """INSERT INTO object_fingerprint (object_id, frame_id, fingerprint) VALUES (?, ?, ?)"""
+        values = [(object_id, frame_id, fingerprint) for frame_id, fingerprint in frame_fingerprints.items()]
+        self._cursor.executemany(cmd, values)
+
+
+    # Deletes the animated geometry of an object for a set of frames. Mesh rows of
+    # other frames that reference deleted rows are rewritten as full meshes first.
+    def delete_animated_frames(self, object_id, frame_ids):
+        frame_ids = set(frame_ids)
+        if not frame_ids:
+            return
+
+        cmd = """SELECT mesh_animated_id, frame_id, reference FROM mesh_animated WHERE object_id=?"""
+        self._cursor.execute(cmd, (object_id,))
+        rows = self._cursor.fetchall()
+        deleted_ids = set([row[0] for row in rows if row[1] in frame_ids])
+        dependent_ids = [row[0] for row in rows if row[1] not in frame_ids and row[2] in deleted_ids]
+
+        for mesh_animated_id in dependent_ids:
+            bobj_data = self._get_mesh_animated_data_by_id(mesh_animated_id)
+            if self._is_mesh_compression_enabled:
+                data = self._encode_mesh_data(bobj_data, 0, bobj_data)
+            else:
+                data = bobj_data
+            cmd = """UPDATE mesh_animated SET mesh_animated_data=?, reference=NULL WHERE mesh_animated_id=?"""
+            self._cursor.execute(cmd, (data, mesh_animated_id))
+
+        animated_tables = [
+            "mesh_animated", "points_animated", "centroid_animated", "axis_animated", "curve_animated"
+        ]
+        values = [(object_id, frame_id) for frame_id in frame_ids]
+        for tname in animated_tables:
+            cmd = """DELETE FROM {0} WHERE object_id=? AND frame_id=?""".format(tname)
+            self._cursor.executemany(cmd, values)
+
+        self._reset_mesh_encoding_state()
+
+
     def get_object_motion_export_type(self, name_slug):
         cmd = """SELECT object_motion_type FROM object WHERE object_slug=?"""
         self._cursor.execute(cmd, (name_slug,))
@@ -418,24 +652,58 @@ class GeometryDatabase():
         object_id = self.get_object_id_by_name_slug(name_slug)
         if object_id is None:
             return None
-        cmd = """SELECT mesh_animated_data FROM mesh_animated WHERE object_id=? AND frame_id=?"""
+        cmd = """SELECT mesh_animated_id FROM mesh_animated WHERE object_id=? AND frame_id=?"""
         self._cursor.execute(cmd, (object_id, frameno))
         result = self._cursor.fetchone()
         if not result:
             return None
-        return result[0]
+        return self._get_mesh_animated_data_by_id(result[0])
 
 
+    # Length of the decoded mesh data
     def get_mesh_animated_blob_length(self, name_slug, frameno):
         object_id = self.get_object_id_by_name_slug(name_slug)
         if object_id is None:
             return None
-        cmd = """SELECT LENGTH(mesh_animated_data) FROM mesh_animated WHERE object_id=? AND frame_id=?"""
+        cmd = """SELECT mesh_animated_id FROM mesh_animated WHERE object_id=? AND frame_id=?"""
         self._cursor.execute(cmd, (object_id, frameno))
         result = self._cursor.fetchone()
         if not result:
             return None
-        return result[0]
+
+        mesh_animated_id = result[0]
+        while True:
+            cmd = """SELECT LENGTH(mesh_animated_data), SUBSTR(mesh_animated_data, 1, ?), reference 
+                FROM mesh_animated WHERE mesh_animated_id=?"""
+            self._cursor.execute(cmd, (self.MESH_ENCODING_HEADER_SIZE, mesh_animated_id))
+            length, prefix, reference = self._cursor.fetchone()
+            if length is not None:
+                return self._get_decoded_mesh_length(length, prefix)
+            mesh_animated_id = reference
+
+
+    # Returns a dict of frame_id to decoded mesh data length for all exported frames
+    def get_mesh_animated_blob_lengths(self, name_slug):
+        object_id = self.get_object_id_by_name_slug(name_slug)
+        if object_id is None:
+            return {}
+        cmd = """SELECT mesh_animated_id, frame_id, LENGTH(mesh_animated_data), SUBSTR(mesh_animated_data, 1, ?), reference 
+            FROM mesh_animated WHERE object_id=?"""
+        self._cursor.execute(cmd, (self.MESH_ENCODING_HEADER_SIZE, object_id))
+        result = self._cursor.fetchall()
+
+        row_lengths = {}
+        for mesh_animated_id, frame_id, length, prefix, reference in result:
+            if length is not None:
+                row_lengths[mesh_animated_id] = self._get_decoded_mesh_length(length, prefix)
+
+        frame_lengths = {}
+        for mesh_animated_id, frame_id, length, prefix, reference in result:
+            if length is None:
+                frame_lengths[frame_id] = row_lengths.get(reference)
+            else:
+                frame_lengths[frame_id] = row_lengths[mesh_animated_id]
+        return frame_lengths
 
 
     def get_centroid_static(self, name_slug):
@@ -600,13 +868,18 @@ class GeometryDatabase():
         return result[0]
 
 
-    def get_mesh_geometry_data_dict_for_frame(self, simulation_data, frameno):
+    # Dynamic object meshes are retrieved through mesh_cache so that meshes that
+    # were built for the previous frame are reused. Without a cache, all three
+    # meshes are built for each dynamic object.
+    def get_mesh_geometry_data_dict_for_frame(self, simulation_data, frameno, mesh_cache=None):
+        if mesh_cache is None:
+            mesh_cache = MeshFrameCache()
+
         cmd = """ SELECT object_id, object_slug, object_motion_type FROM object"""
         self._cursor.execute(cmd)
         result = self._cursor.fetchall()
 
         geometry_data = {}
-        object_id_to_name_slug = {}
         for row in result:
             object_id = row[0]
             name_slug = row[1]
@@ -619,152 +892,173 @@ class GeometryDatabase():
                 "object_motion_type": object_motion_type,
                 "is_motion_static": is_static,
                 "is_motion_dynamic": is_dynamic,
-                "static_bobj_data": None,
-                "transform_previous": None,
-                "transform_current": None,
-                "transform_next": None,
                 "triangle_mesh_previous": None,
                 "triangle_mesh_current": None,
                 "triangle_mesh_next": None,
             }
-            object_id_to_name_slug[object_id] = name_slug
-
-
-        # Retreive static meshes for static and keyframed objects
-        cmd = """SELECT object_id, mesh_static_data FROM mesh_static"""
-        self._cursor.execute(cmd)
-        result_static_bobj_data = self._cursor.fetchall()
-
-        static_bobj_data = {}
-        for row in result_static_bobj_data:
-            object_id = row[0]
-            bobj_data = row[1]
-            static_bobj_data[object_id] = bobj_data
-
-            name_slug = object_id_to_name_slug[object_id]
-            geometry_data[name_slug]["static_bobj_data"] = bobj_data
-
-        frame_previous = frameno - 1
-        frame_current = frameno
-        frame_next = frameno + 1
 
-        # Retrieve keyframed mesh transforms
-        cmd = """
-            SELECT object_id,
-                   m00, m01, m02, m03, 
-                   m10, m11, m12, m13, 
-                   m20, m21, m22, m23, 
-                   m30, m31, m32, m33 FROM mesh_keyframed 
-            WHERE frame_id=?
-            """
+        frame_ids = (frameno - 1, frameno, frameno + 1)
 
-        self._cursor.execute(cmd, (frame_previous,))
-        result_frame_previous = self._cursor.fetchall()
-        self._cursor.execute(cmd, (frame_current,))
-        result_frame_current = self._cursor.fetchall()
-        self._cursor.execute(cmd, (frame_next,))
-        result_frame_next = self._cursor.fetchall()
+        # Frames within the window that contain exported mesh data
+        cmd = """SELECT object_id, frame_id FROM mesh_keyframed WHERE frame_id IN (?, ?, ?)"""
+        self._cursor.execute(cmd, frame_ids)
+        keyframed_frames = set(self._cursor.fetchall())
 
-        for row in result_frame_previous:
-            object_id = row[0]
-            transform = list(row[1:])
-            name_slug = object_id_to_name_slug[object_id]
-            geometry_data[name_slug]["transform_previous"] = transform
-
-        for row in result_frame_current:
-            object_id = row[0]
-            transform = list(row[1:])
-            name_slug = object_id_to_name_slug[object_id]
-            geometry_data[name_slug]["transform_current"] = transform
-
-        for row in result_frame_next:
-            object_id = row[0]
-            transform = list(row[1:])
-            name_slug = object_id_to_name_slug[object_id]
-            geometry_data[name_slug]["transform_next"] = transform
+        cmd = """SELECT object_id, frame_id FROM mesh_animated WHERE frame_id IN (?, ?, ?)"""
+        self._cursor.execute(cmd, frame_ids)
+        animated_frames = set(self._cursor.fetchall())
 
-        for name_slug, entry in geometry_data.items():
-            if not entry["object_motion_type"] == 'KEYFRAMED':
-                continue
-            if entry["transform_previous"] is None:
-                entry["transform_previous"] = entry["transform_current"]
-            if entry["transform_next"] is None:
-                entry["transform_next"] = entry["transform_current"]
-
-        # Generate keyframed triangle meshes from transforms
         scale = simulation_data.domain_data.initialize.scale
         bbox = simulation_data.domain_data.initialize.bbox
-        for name_slug, entry in geometry_data.items():
-            if not entry["object_motion_type"] == 'KEYFRAMED':
-                continue
 
-            mesh_previous = TriangleMesh.from_bobj(entry["static_bobj_data"])
-            mesh_current = TriangleMesh.from_bobj(entry["static_bobj_data"])
-            mesh_next = TriangleMesh.from_bobj(entry["static_bobj_data"])
-            mesh_previous.apply_transform(entry["transform_previous"])
-            mesh_current.apply_transform(entry["transform_current"])
-            mesh_next.apply_transform(entry["transform_next"])
-            mesh_previous.translate(-bbox.x, -bbox.y, -bbox.z)
-            mesh_current.translate(-bbox.x, -bbox.y, -bbox.z)
-            mesh_next.translate(-bbox.x, -bbox.y, -bbox.z)
-            mesh_previous.scale(scale)
-            mesh_current.scale(scale)
-            mesh_next.scale(scale)
-
-            entry["triangle_mesh_previous"] = mesh_previous
-            entry["triangle_mesh_current"] = mesh_current
-            entry["triangle_mesh_next"] = mesh_next
-
-        # Retrieve animated triangle meshes
-        cmd = """SELECT object_id, mesh_animated_data FROM mesh_animated WHERE frame_id=?"""
-
-        self._cursor.execute(cmd, (frame_previous,))
-        result_frame_previous = self._cursor.fetchall()
-        self._cursor.execute(cmd, (frame_current,))
-        result_frame_current = self._cursor.fetchall()
-        self._cursor.execute(cmd, (frame_next,))
-        result_frame_next = self._cursor.fetchall()
-
-        for row in result_frame_previous:
-            object_id = row[0]
-            bobj_data = row[1]
-            name_slug = object_id_to_name_slug[object_id]
-            mesh = TriangleMesh.from_bobj(bobj_data)
-            mesh.translate(-bbox.x, -bbox.y, -bbox.z)
-            mesh.scale(scale)
-            geometry_data[name_slug]["triangle_mesh_previous"] = mesh
+        def load_keyframed_mesh(object_id, frame_id):
+            cmd = """SELECT mesh_static_data FROM mesh_static WHERE object_id=?"""
+            self._cursor.execute(cmd, (object_id,))
+            bobj_data = self._cursor.fetchone()[0]
+
+            cmd = """
+                SELECT m00, m01, m02, m03, 
+                       m10, m11, m12, m13, 
+                       m20, m21, m22, m23, 
+                       m30, m31, m32, m33 FROM mesh_keyframed 
+                WHERE object_id=? AND frame_id=?
+                """
+            self._cursor.execute(cmd, (object_id, frame_id))
+            transform = list(self._cursor.fetchone())
 
-        for row in result_frame_current:
-            object_id = row[0]
-            bobj_data = row[1]
-            name_slug = object_id_to_name_slug[object_id]
             mesh = TriangleMesh.from_bobj(bobj_data)
+            mesh.apply_transform(transform)
             mesh.translate(-bbox.x, -bbox.y, -bbox.z)
             mesh.scale(scale)
-            geometry_data[name_slug]["triangle_mesh_current"] = mesh
+            return mesh
+
+        def load_animated_mesh(object_id, frame_id):
+            cmd = """SELECT mesh_animated_id FROM mesh_animated WHERE object_id=? AND frame_id=?"""
+            self._cursor.execute(cmd, (object_id, frame_id))
+            bobj_data = self._get_mesh_animated_data_by_id(self._cursor.fetchone()[0])
 
-        for row in result_frame_next:
-            object_id = row[0]
-            bobj_data = row[1]
-            name_slug = object_id_to_name_slug[object_id]
             mesh = TriangleMesh.from_bobj(bobj_data)
             mesh.translate(-bbox.x, -bbox.y, -bbox.z)
             mesh.scale(scale)
-            geometry_data[name_slug]["triangle_mesh_next"] = mesh
+            return mesh
 
         for name_slug, entry in geometry_data.items():
-            if not entry["object_motion_type"] == 'ANIMATED':
+            object_id = entry["object_id"]
+            if entry["object_motion_type"] == 'KEYFRAMED':
+                load_func = lambda f, object_id=object_id: load_keyframed_mesh(object_id, f)
+                exists_func = lambda f, object_id=object_id: (object_id, f) in keyframed_frames
+            elif entry["object_motion_type"] == 'ANIMATED':
+                load_func = lambda f, object_id=object_id: load_animated_mesh(object_id, f)
+                exists_func = lambda f, object_id=object_id: (object_id, f) in animated_frames
+            else:
                 continue
-            if entry["triangle_mesh_previous"] is None:
-                entry["triangle_mesh_previous"] = entry["triangle_mesh_current"]
-            if entry["triangle_mesh_next"] is None:
-                entry["triangle_mesh_next"] = entry["triangle_mesh_current"]
+
+            if not exists_func(frameno):
+                continue
+
+            meshes = mesh_cache.get_frame_meshes(name_slug, frameno, load_func, exists_func)
+            entry["triangle_mesh_previous"] = meshes[0]
+            entry["triangle_mesh_current"] = meshes[1]
+            entry["triangle_mesh_next"] = meshes[2]
 
         return geometry_data
 
 
 
 
+    ###########################################################################
+    ### Animated Mesh Encoding
+    ###########################################################################
+
+    def _reset_mesh_encoding_state(self):
+        self._mesh_hash_index = {}
+        self._previous_mesh_animated = {}
+        self._mesh_decode_cache = OrderedDict()
+
+
+    def _is_same_bobj_topology(self, bobj_data1, bobj_data2):
+        if len(bobj_data1) != len(bobj_data2) or len(bobj_data1) < 4:
+            return False
+        if bobj_data1[:4] != bobj_data2[:4]:
+            return False
+        triangles_offset = 4 + 12 * struct.unpack_from("<i", bobj_data1, 0)[0]
+        return bobj_data1[triangles_offset:] == bobj_data2[triangles_offset:]
+
+
+    # Vertex data is stored as bytes grouped by significance so that the zero
+    # bytes of small position changes are contiguous
+    def _shuffle_bytes(self, data):
+        return b"".join([data[i::4] for i in range(4)])
+
+
+    def _unshuffle_bytes(self, data):
+        n = len(data) // 4
+        result = bytearray(len(data))
+        for i in range(4):
+            result[i::4] = data[i * n:(i + 1) * n]
+        return bytes(result)
+
+
+    def _xor_bytes(self, data1, data2):
+        value = int.from_bytes(data1, 'little') ^ int.from_bytes(data2, 'little')
+        return value.to_bytes(len(data1), 'little')
+
+
+    def _encode_mesh_data(self, payload, flags, bobj_data):
+        if self._is_mesh_compression_enabled:
+            flags |= self.MESH_ENCODING_FLAG_ZLIB
+            payload = zlib.compress(payload, self.ZLIB_COMPRESSION_LEVEL)
+        header = struct.pack(self.MESH_ENCODING_HEADER_FORMAT, self.MESH_ENCODING_MAGIC, flags, len(bobj_data))
+        return header + payload
+
+
+    def _encode_mesh_delta(self, base_bobj_data, bobj_data):
+        triangles_offset = 4 + 12 * struct.unpack_from("<i", bobj_data, 0)[0]
+        vertex_delta = self._xor_bytes(base_bobj_data[4:triangles_offset], bobj_data[4:triangles_offset])
+        payload = self._shuffle_bytes(vertex_delta)
+        return self._encode_mesh_data(payload, self.MESH_ENCODING_FLAG_DELTA, bobj_data)
+
+
+    def _get_decoded_mesh_length(self, length, prefix):
+        if prefix is not None and bytes(prefix[:4]) == self.MESH_ENCODING_MAGIC:
+            return struct.unpack_from(self.MESH_ENCODING_HEADER_FORMAT, prefix, 0)[2]
+        return length
+
+
+    def _get_mesh_animated_data_by_id(self, mesh_animated_id):
+        if mesh_animated_id in self._mesh_decode_cache:
+            self._mesh_decode_cache.move_to_end(mesh_animated_id)
+            return self._mesh_decode_cache[mesh_animated_id]
+
+        cmd = """SELECT mesh_animated_data, reference FROM mesh_animated WHERE mesh_animated_id=?"""
+        self._cursor.execute(cmd, (mesh_animated_id,))
+        data, reference = self._cursor.fetchone()
+
+        if data is None:
+            bobj_data = self._get_mesh_animated_data_by_id(reference)
+        elif bytes(data[:4]) != self.MESH_ENCODING_MAGIC:
+            bobj_data = data
+        else:
+            magic, flags, length = struct.unpack_from(self.MESH_ENCODING_HEADER_FORMAT, data, 0)
+            payload = data[self.MESH_ENCODING_HEADER_SIZE:]
+            if flags & self.MESH_ENCODING_FLAG_ZLIB:
+                payload = zlib.decompress(payload)
+
+            if flags & self.MESH_ENCODING_FLAG_DELTA:
+                base_bobj_data = self._get_mesh_animated_data_by_id(reference)
+                triangles_offset = 4 + 12 * struct.unpack_from("<i", base_bobj_data, 0)[0]
+                vertex_data = self._xor_bytes(base_bobj_data[4:triangles_offset], self._unshuffle_bytes(payload))
+                bobj_data = base_bobj_data[:4] + vertex_data + base_bobj_data[triangles_offset:]
+            else:
+                bobj_data = payload
+
+        self._mesh_decode_cache[mesh_animated_id] = bobj_data
+        if len(self._mesh_decode_cache) > self.MESH_DECODE_CACHE_SIZE:
+            self._mesh_decode_cache.popitem(last=False)
+        return bobj_data
+
+
+
     ###########################################################################
     ### Initialize Database
     ###########################################################################
@@ -1003,6 +1297,31 @@ class GeometryDatabase():
         return [curve_static_table, curve_keyframed_table, curve_animated_table]
 
 
+    def _generate_create_fingerprint_table_commands(self):
+        fingerprint_table = """
+            CREATE TABLE IF NOT EXISTS object_fingerprint ( 
+                object_fingerprint_id  INTEGER  PRIMARY KEY, 
+                object_id              INTEGER  NOT NULL,
+                frame_id               INTEGER,
+                fingerprint            TEXT     NOT NULL
+            )"""
+
+        fingerprint_trigger = """
+            CREATE TRIGGER IF NOT EXISTS delete_object_from_object_fingerprint
+                AFTER DELETE ON object
+            BEGIN
+                DELETE FROM object_fingerprint
+                WHERE object_id = OLD.object_id;
+            END;
+        """
+
+        fingerprint_index = """
+            CREATE INDEX IF NOT EXISTS idx_object_fingerprint_object_frame ON object_fingerprint (object_id, frame_id)
+        """
+
+        return [fingerprint_table, fingerprint_trigger, fingerprint_index]
+
+
     def _generate_trigger_commands(self):
         table_names = [
             "mesh_static", "mesh_keyframed", "mesh_animated",
@@ -1029,6 +1348,45 @@ class GeometryDatabase():
         return commands
 
 
+    def _generate_create_index_commands(self):
+        static_table_names = [
+            "mesh_static", "points_static", "centroid_static", "axis_static", "curve_static"
+        ]
+
+        dynamic_table_names = [
+            "mesh_keyframed", "mesh_animated",
+            "points_keyframed", "points_animated",
+            "centroid_keyframed", "centroid_animated",
+            "axis_keyframed", "axis_animated",
+            "curve_keyframed", "curve_animated"
+        ]
+
+        # Tables that are queried for all objects at a single frame
+        frame_table_names = ["mesh_keyframed", "mesh_animated"]
+
+        static_index_cmd = """
+            CREATE INDEX IF NOT EXISTS idx_{0}_object ON {0} (object_id)
+        """
+
+        dynamic_index_cmd = """
+            CREATE INDEX IF NOT EXISTS idx_{0}_object_frame ON {0} (object_id, frame_id)
+        """
+
+        frame_index_cmd = """
+            CREATE INDEX IF NOT EXISTS idx_{0}_frame ON {0} (frame_id)
+        """
+
+        commands = []
+        for tname in static_table_names:
+            commands.append(static_index_cmd.format(tname))
+        for tname in dynamic_table_names:
+            commands.append(dynamic_index_cmd.format(tname))
+        for tname in frame_table_names:
+            commands.append(frame_index_cmd.format(tname))
+
+        return commands
+
+
     def _generate_create_table_commands(self):
         object_table = """
             CREATE TABLE object ( 
@@ -1062,16 +1420,50 @@ class GeometryDatabase():
         cmds += self._generate_create_axis_table_commands()
         cmds += self._generate_create_curve_table_commands()
         cmds += self._generate_trigger_commands()
+        cmds += self._generate_create_index_commands()
+        cmds += self._generate_create_fingerprint_table_commands()
 
         return cmds
 
 
+    def _migrate_database(self, db_filepath):
+        conn = sqlite3.connect(db_filepath)
+        c = conn.cursor()
+        try:
+            schema_version = c.execute("PRAGMA user_version").fetchone()[0]
+            if schema_version >= self.SCHEMA_VERSION:
+                return
+
+            # Version 0 -> 1: composite (object_id, frame_id) lookup indexes
+            if schema_version < 1:
+                for cmd in self._generate_create_index_commands():
+                    c.execute(cmd)
+
+            # Version 1 -> 2: object fingerprints for skipping unchanged objects
+            if schema_version < 2:
+                for cmd in self._generate_create_fingerprint_table_commands():
+                    c.execute(cmd)
+
+            c.execute("PRAGMA user_version = " + str(self.SCHEMA_VERSION))
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            # A database in a read-only location (such as linked geometry) can
+            # still be used without indexes or fingerprints
+            print("FLIP Fluids: Unable to upgrade geometry database <" + db_filepath + ">: " + str(e))
+        finally:
+            c.close()
+            conn.close()
+
+
     def _initialize_database(self, db_filepath, clear_database=False):
-        if clear_database and os.path.isfile(db_filepath):
-            fpl.delete_file(db_filepath)
+        if clear_database:
+            for suffix in ["-wal", "-shm", ""]:
+                if os.path.isfile(db_filepath + suffix):
+                    fpl.delete_file(db_filepath + suffix)
 
         if os.path.isfile(db_filepath):
-            return sqlite3.connect(db_filepath)
+            self._migrate_database(db_filepath)
+            return
         
         create_table_commands = self._generate_create_table_commands()
 
@@ -1081,10 +1473,12 @@ class GeometryDatabase():
 
         conn = sqlite3.connect(db_filepath)
         c = conn.cursor()
+        # Page size must be set before the first table is created. Larger pages
+        # reduce overflow page chains for the BOBJ blobs.
+        c.execute("PRAGMA page_size = " + str(self.PAGE_SIZE))
         for cmd in create_table_commands:
             c.execute(cmd)
+        c.execute("PRAGMA user_version = " + str(self.SCHEMA_VERSION))
         c.close()
         conn.commit()
         conn.close()
-
-
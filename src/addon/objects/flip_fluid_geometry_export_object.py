@@ -20,6 +20,7 @@ from ..pyfluid import TriangleMesh
 from ..utils import export_utils
 from ..utils import version_compatibility_utils as vcu
 from ..utils import cache_utils
+from ..utils import fingerprint_utils
 
 
 ###########################################################################
@@ -225,10 +226,14 @@ class GeometryExportObject():
         self.motion_export_type = self._initialize_motion_export_type()
         self.geometry_export_types = []
         self.skip_reexport = False
+        self.force_reexport = False
         self.disable_changing_topology_warning = False
         self.frame_start = 0
         self.frame_end = 0
         self.exported_frames = {}
+        self.fingerprint = None
+        self.frame_fingerprints = {}
+        self.changed_frames = []
         self._object_id = -1
 
 
@@ -397,6 +402,28 @@ class GeometryExportObject():
         return tmesh.to_bobj()
 
 
+    # Keyframed objects are exported with a single mesh in object space, so the
+    # fingerprint must not depend on the current frame. Animated objects are
+    # fingerprinted without animation and changes in animation are detected per
+    # frame with get_frame_fingerprints().
+    def get_fingerprint(self):
+        export_settings = [
+            self.motion_export_type_to_string(), 
+            [geotype.value for geotype in self.geometry_export_types]
+        ]
+        return fingerprint_utils.get_object_fingerprint(
+                self.get_blender_object(), 
+                extra_data=export_settings, 
+                is_frame_independent=not self.is_static(),
+                include_keyframes=not self.is_animated(),
+                include_evaluated_mesh=not self.is_animated()
+                )
+
+
+    def get_frame_fingerprints(self, frame_ids):
+        return fingerprint_utils.get_object_frame_fingerprints(self.get_blender_object(), frame_ids)
+
+
     def get_bobj_vertex_triangle_count(self, bobj_data):
         tmesh = TriangleMesh.from_bobj(bobj_data)
         return len(tmesh.vertices) // 3, len(tmesh.triangles) // 3
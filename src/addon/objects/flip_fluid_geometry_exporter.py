@@ -20,6 +20,7 @@ from datetime import datetime
 from . import flip_fluid_cache
 from .flip_fluid_geometry_export_object import GeometryExportObject, MotionExportType, GeometryExportType
 from .flip_fluid_geometry_database import GeometryDatabase
+from .flip_fluid_parallel_geometry_exporter import ParallelAnimatedGeometryExporter
 from ..utils import version_compatibility_utils as vcu
 from ..utils import cache_utils
 
@@ -33,16 +34,26 @@ class WorkQueueItem():
 
 
 class GeometryExportManager():
-    def __init__(self, export_directory):
+    # shard_job: if set, the manager runs as a parallel export worker process and
+    # only exports the work items of the job into the database at database_filepath.
+    # See flip_fluid_parallel_geometry_exporter.py.
+    def __init__(self, export_directory, database_filepath=None, shard_job=None):
         self.geometry_export_objects = []
 
         self._database_filename = "export_data.sqlite3"
+        self._export_directory = export_directory
+        self._shard_job = shard_job
 
         dprops = bpy.context.scene.flip_fluid.get_domain_properties()
-        self._database_filepath = dprops.cache.get_geometry_database_abspath(export_directory, self._database_filename)
-        self._is_linked_geometry_database = dprops.cache.is_linked_geometry_directory()
+        if database_filepath is None:
+            database_filepath = dprops.cache.get_geometry_database_abspath(export_directory, self._database_filename)
+            self._is_linked_geometry_database = dprops.cache.is_linked_geometry_directory()
+        else:
+            self._is_linked_geometry_database = False
+        self._database_filepath = database_filepath
 
         self._geometry_database = GeometryDatabase(self._database_filepath, clear_database=False)
+        self._geometry_database.set_mesh_compression_enabled(dprops.advanced.enable_geometry_compression)
 
         self._geometry_export_objects_dict = {}
         self._is_initialized = False
@@ -55,6 +66,9 @@ class GeometryExportManager():
         self._num_keyframed_processed = 0
         self._num_animated_processed = 0
 
+        self._parallel_exporter = None
+        self._is_topology_check_enabled = shard_job is None
+
         self._export_stage_string = ""
         self._export_stage_progress = 0.0
         self._is_error = False
@@ -95,12 +109,18 @@ class GeometryExportManager():
 
         self._geometry_database.open()
         try:
-            self._delete_geometry_export_objects_from_database()
-            self._add_geometry_export_objects_to_database()
-            self._initialize_geometry_export_object_ids()
-            self._clean_unused_objects_from_database()
-            self._initialize_frame_ranges()
-            self._initialize_work_queues()
+            if self._shard_job is not None:
+                self._initialize_shard()
+            else:
+                self._initialize_fingerprints()
+                self._delete_geometry_export_objects_from_database()
+                self._add_geometry_export_objects_to_database()
+                self._initialize_geometry_export_object_ids()
+                self._clean_unused_objects_from_database()
+                self._update_fingerprints()
+                self._initialize_frame_ranges()
+                self._initialize_work_queues()
+                self._initialize_parallel_export()
             self._geometry_database.commit()
         except Exception as e:
             self._geometry_database.close()
@@ -111,7 +131,12 @@ class GeometryExportManager():
 
 
     def update_export(self, step_time):
+        if self._parallel_exporter is not None and not self._parallel_exporter.is_launched():
+            self._parallel_exporter.launch()
+
         if not self._work_queue:
+            if self._parallel_exporter is not None:
+                return self._update_parallel_export()
             return True
 
         self._geometry_database.open()
@@ -142,7 +167,7 @@ class GeometryExportManager():
         output_str += "\t(Database size: " + str(filesize) + ")"
         print(output_str)
 
-        return not self._work_queue
+        return not self._work_queue and self._parallel_exporter is None
 
 
     def get_export_progress(self):
@@ -161,6 +186,20 @@ class GeometryExportManager():
         return self._error_message
 
 
+    def get_num_processed(self):
+        return self._total_queue_size - len(self._work_queue)
+
+
+    def get_total_queue_size(self):
+        return self._total_queue_size
+
+
+    def cancel(self):
+        if self._parallel_exporter is not None:
+            self._parallel_exporter.cleanup()
+            self._parallel_exporter = None
+
+
     def _initialize_work_queues(self):
         static_queue = self._generate_static_work_queue()
         keyframed_queue = self._generate_keyframed_work_queue()
@@ -175,6 +214,78 @@ class GeometryExportManager():
         self._total_queue_size = len(total_queue)
 
 
+    def _initialize_parallel_export(self):
+        dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+        num_processes = dprops.advanced.num_animated_export_processes
+        if not dprops.advanced.enable_parallel_animated_export or num_processes < 2:
+            return
+
+        animated_queue = [w for w in self._work_queue if w.geometry_export_object.motion_export_type == MotionExportType.ANIMATED]
+        num_frames = len(set([w.frame for w in animated_queue]))
+        if num_frames < 2:
+            return
+
+        self._work_queue = [w for w in self._work_queue if w.geometry_export_object.motion_export_type != MotionExportType.ANIMATED]
+        self._total_queue_size = len(self._work_queue)
+
+        object_rows = [list(row) for row in self._geometry_database.get_all_objects()]
+        self._parallel_exporter = ParallelAnimatedGeometryExporter(self._export_directory, num_processes)
+        self._parallel_exporter.initialize(animated_queue, object_rows)
+
+
+    # Worker process initialization. Objects are added to the staging database with
+    # the object ids of the main database so that rows can be merged as-is.
+    def _initialize_shard(self):
+        for row in self._shard_job["objects"]:
+            self._geometry_database.add_object_row(row)
+        self._initialize_geometry_export_object_ids()
+
+        work_queue = []
+        for name_slug, geotype_value, frameno in self._shard_job["work_items"]:
+            w = WorkQueueItem()
+            w.geometry_export_object = self._geometry_export_objects_dict[name_slug]
+            w.geometry_export_type = GeometryExportType(geotype_value)
+            w.frame = frameno
+            work_queue.append(w)
+        work_queue.reverse()
+
+        self._work_queue = work_queue
+        self._animated_queue_size = len(work_queue)
+        self._total_queue_size = len(work_queue)
+
+
+    def _update_parallel_export(self):
+        self._parallel_exporter.update()
+        if self._parallel_exporter.is_error():
+            self._set_error(self._parallel_exporter.get_error_message())
+            self.cancel()
+            return True
+
+        self._export_stage_string = "ANIMATED"
+        if not self._parallel_exporter.is_export_finished():
+            self._export_stage_progress = self._parallel_exporter.get_progress()
+            return False
+
+        self._geometry_database.open()
+        try:
+            is_merged = self._parallel_exporter.merge_next_shard(self._geometry_database)
+            if is_merged:
+                self._check_animated_mesh_topology()
+        except Exception as e:
+            self._geometry_database.close()
+            self.cancel()
+            raise e
+        self._geometry_database.close()
+
+        self._export_stage_progress = 1.0
+        print("Merging animated geometry... " + str(round(100 * self._parallel_exporter.get_merge_progress())) + "%" +
+              "\t(Database size: " + str(self._geometry_database.get_filesize()) + ")")
+
+        if is_merged:
+            self.cancel()
+        return is_merged
+
+
     def _generate_static_work_queue(self):
         static_objects = self.get_geometry_export_objects_by_export_type(MotionExportType.STATIC)
 
@@ -327,6 +438,52 @@ class GeometryExportManager():
                 self._geometry_database.delete_object_by_slug(slug)
 
 
+    # Objects that are unchanged since the last export are not re-exported. Frames
+    # of animated objects are re-exported if their frame fingerprint has changed.
+    # Objects set to skip re-export by the user are left as they are.
+    def _initialize_fingerprints(self):
+        dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+        if not dprops.advanced.skip_unchanged_objects_on_export:
+            return
+
+        frame_start, frame_end = dprops.simulation.get_frame_range()
+        num_unchanged = 0
+        for obj in self.geometry_export_objects:
+            if obj.skip_reexport:
+                continue
+
+            obj.fingerprint = obj.get_fingerprint()
+            if obj.is_animated():
+                obj.frame_fingerprints = obj.get_frame_fingerprints(range(frame_start, frame_end + 1))
+
+            if obj.force_reexport:
+                continue
+            if obj.fingerprint != self._geometry_database.get_object_fingerprint(obj.name_slug):
+                continue
+
+            obj.skip_reexport = True
+            num_unchanged += 1
+            if obj.is_animated():
+                stored_fingerprints = self._geometry_database.get_object_frame_fingerprints(obj.name_slug)
+                obj.changed_frames = [frame_id for frame_id, fingerprint in obj.frame_fingerprints.items() 
+                                      if stored_fingerprints.get(frame_id) != fingerprint]
+
+        if num_unchanged > 0:
+            print("Skipping re-export of " + str(num_unchanged) + " unchanged objects")
+
+
+    def _update_fingerprints(self):
+        for obj in self.geometry_export_objects:
+            if obj.fingerprint is None:
+                continue
+            object_id = obj.get_object_id()
+            if obj.changed_frames:
+                self._geometry_database.delete_animated_frames(object_id, obj.changed_frames)
+            self._geometry_database.set_object_fingerprint(object_id, obj.fingerprint)
+            if obj.is_animated():
+                self._geometry_database.set_object_frame_fingerprints(object_id, obj.frame_fingerprints)
+
+
     def _initialize_geometry_export_object_frame_range(self, obj):
         dprops = bpy.context.scene.flip_fluid.get_domain_properties()
         frame_start, frame_end = dprops.simulation.get_frame_range()
@@ -392,40 +549,67 @@ class GeometryExportManager():
             disable_warning = work_item.geometry_export_object.disable_changing_topology_warning
             bobj_data = work_item.geometry_export_object.get_mesh_bobj()
 
-            if not disable_warning:
+            if not disable_warning and self._is_topology_check_enabled:
                 current_frame_bytes = len(bobj_data)
                 previous_frame_bytes = self._geometry_database.get_mesh_animated_blob_length(name_slug, frame_id - 1)
                 if previous_frame_bytes is not None and current_frame_bytes != previous_frame_bytes:
-                    current_bobj_data = bobj_data
-                    previous_bobj_data = previous_frame_bytes = self._geometry_database.get_mesh_animated(name_slug, frame_id - 1)
-                    current_vcount, current_tcount = work_item.geometry_export_object.get_bobj_vertex_triangle_count(current_bobj_data)
-                    previous_vcount, previous_tcount = work_item.geometry_export_object.get_bobj_vertex_triangle_count(previous_bobj_data)
-
-                    bl_object = bpy.data.objects.get(work_item.geometry_export_object.name)
-                    error_reason = "Unknown"
-                    if bl_object is not None:
-                        if bl_object.flip_fluid.is_obstacle():
-                            error_reason = "Obstacle object require mesh velocities to be computed for fluid interaction."
-                        elif bl_object.flip_fluid.is_inflow():
-                            error_reason = "Inflow object 'Add Object Velocity to Inflow' option require mesh velocities to be computed for this feature."
-                        elif bl_object.flip_fluid.is_fluid():
-                            error_reason = "Fluid object 'Add Object Velocity to Fluid' option require mesh velocities to be computed for this feature."
-
-                    errmsg = ("Warning: unable to export animated mesh '" + work_item.geometry_export_object.name +
-                             "'. Animated meshes must have the same number of " +
-                             "vertices/triangles for each frame and must not change topology\nif the mesh velocity is required to be computed correctly." + 
-                             "\nError Reason: " + error_reason +
-                             "\n\nFrame " + str(frame_id - 1) + ": " + str(previous_vcount) + " vertices, " + str(previous_tcount) + " triangles"
-                             "\nFrame " + str(frame_id) + ": " + str(current_vcount)) + " vertices, " + str(current_tcount) + " triangles"
-
-                    errmsg += ("\n\nDisable this warning in the Advanced Settings panel. Warning: " +
-                              "mesh velocity data will not be computed for meshes with changing topology.")
+                    previous_bobj_data = self._geometry_database.get_mesh_animated(name_slug, frame_id - 1)
+                    errmsg = self._get_changing_topology_error_message(
+                            work_item.geometry_export_object, frame_id, bobj_data, previous_bobj_data
+                            )
                     self._set_error(errmsg)
 
             object_id = work_item.geometry_export_object.get_object_id()
             self._geometry_database.add_mesh_animated(object_id, frame_id, bobj_data)
 
 
+    # Frames exported by parallel export processes are checked for changing topology
+    # after all frames have been merged into the database
+    def _check_animated_mesh_topology(self):
+        animated_objects = self.get_geometry_export_objects_by_export_type(MotionExportType.ANIMATED)
+        for obj in animated_objects:
+            if obj.disable_changing_topology_warning or GeometryExportType.MESH not in obj.geometry_export_types:
+                continue
+
+            frame_lengths = self._geometry_database.get_mesh_animated_blob_lengths(obj.name_slug)
+            for frame_id in sorted(frame_lengths.keys()):
+                previous_frame_bytes = frame_lengths.get(frame_id - 1)
+                if previous_frame_bytes is None or previous_frame_bytes == frame_lengths[frame_id]:
+                    continue
+
+                current_bobj_data = self._geometry_database.get_mesh_animated(obj.name_slug, frame_id)
+                previous_bobj_data = self._geometry_database.get_mesh_animated(obj.name_slug, frame_id - 1)
+                errmsg = self._get_changing_topology_error_message(obj, frame_id, current_bobj_data, previous_bobj_data)
+                self._set_error(errmsg)
+                return
+
+
+    def _get_changing_topology_error_message(self, export_object, frame_id, current_bobj_data, previous_bobj_data):
+        current_vcount, current_tcount = export_object.get_bobj_vertex_triangle_count(current_bobj_data)
+        previous_vcount, previous_tcount = export_object.get_bobj_vertex_triangle_count(previous_bobj_data)
+
+        bl_object = bpy.data.objects.get(export_object.name)
+        error_reason = "Unknown"
+        if bl_object is not None:
+            if bl_object.flip_fluid.is_obstacle():
+                error_reason = "Obstacle object require mesh velocities to be computed for fluid interaction."
+            elif bl_object.flip_fluid.is_inflow():
+                error_reason = "Inflow object 'Add Object Velocity to Inflow' option require mesh velocities to be computed for this feature."
+            elif bl_object.flip_fluid.is_fluid():
+                error_reason = "Fluid object 'Add Object Velocity to Fluid' option require mesh velocities to be computed for this feature."
+
+        errmsg = ("Warning: unable to export animated mesh '" + export_object.name +
+                 "'. Animated meshes must have the same number of " +
+                 "vertices/triangles for each frame and must not change topology\nif the mesh velocity is required to be computed correctly." + 
+                 "\nError Reason: " + error_reason +
+                 "\n\nFrame " + str(frame_id - 1) + ": " + str(previous_vcount) + " vertices, " + str(previous_tcount) + " triangles"
+                 "\nFrame " + str(frame_id) + ": " + str(current_vcount)) + " vertices, " + str(current_tcount) + " triangles"
+
+        errmsg += ("\n\nDisable this warning in the Advanced Settings panel. Warning: " +
+                  "mesh velocity data will not be computed for meshes with changing topology.")
+        return errmsg
+
+
     def _process_centroid_object(self, work_item):
         motion_type = work_item.geometry_export_object.motion_export_type
         if motion_type == MotionExportType.STATIC:
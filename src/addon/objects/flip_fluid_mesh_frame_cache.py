@@ -0,0 +1,107 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# Sliding window of decoded, transformed and domain-scaled triangle meshes for
+# dynamic objects, keyed by object name slug and frame.
+#
+# Each simulation frame requires the previous, current and next mesh of a
+# dynamic object. The next mesh of frame N is the current mesh of frame N + 1,
+# so keeping a window of frames [N - radius, N + radius] per object allows each
+# mesh to be built once per bake instead of three times.
+#
+# A frame that has no exported mesh is stored as None so that the existence
+# check is also only performed once.
+class MeshFrameCache():
+    def __init__(self, window_radius=1):
+        self._window_radius = window_radius
+        self._object_frames = {}
+        self._num_hits = 0
+        self._num_misses = 0
+
+
+    def clear(self):
+        self._object_frames = {}
+        self._num_hits = 0
+        self._num_misses = 0
+
+
+    def get_num_hits(self):
+        return self._num_hits
+
+
+    def get_num_misses(self):
+        return self._num_misses
+
+
+    def is_frame_cached(self, name_slug, frameno):
+        return name_slug in self._object_frames and frameno in self._object_frames[name_slug]
+
+
+    def get_frame_mesh(self, name_slug, frameno):
+        self._num_hits += 1
+        return self._object_frames[name_slug][frameno]
+
+
+    def set_frame_mesh(self, name_slug, frameno, mesh):
+        self._num_misses += 1
+        if name_slug not in self._object_frames:
+            self._object_frames[name_slug] = {}
+        self._object_frames[name_slug][frameno] = mesh
+
+
+    # Drops all frames of the object that are outside of the window centered at frameno
+    def shift_window(self, name_slug, frameno):
+        frames = self._object_frames.get(name_slug)
+        if not frames:
+            return
+        frame_min = frameno - self._window_radius
+        frame_max = frameno + self._window_radius
+        for f in list(frames.keys()):
+            if f < frame_min or f > frame_max:
+                del frames[f]
+
+
+    # Returns the (previous, current, next) meshes of an object at frameno. If the
+    # previous or next frame does not exist, the current mesh is used in its place.
+    #
+    # load_mesh_func(frameno) must return the transformed and scaled mesh.
+    # mesh_exists_func(frameno) is used to check the previous and next frames
+    # before loading. The current frame is expected to exist.
+    def get_frame_meshes(self, name_slug, frameno, load_mesh_func, mesh_exists_func):
+        self.shift_window(name_slug, frameno)
+
+        mesh_current = None
+        if self.is_frame_cached(name_slug, frameno):
+            mesh_current = self.get_frame_mesh(name_slug, frameno)
+        if mesh_current is None:
+            mesh_current = load_mesh_func(frameno)
+            self.set_frame_mesh(name_slug, frameno, mesh_current)
+
+        neighbour_meshes = []
+        for f in [frameno - 1, frameno + 1]:
+            if self.is_frame_cached(name_slug, f):
+                mesh = self.get_frame_mesh(name_slug, f)
+            else:
+                mesh = None
+                if f >= 0 and mesh_exists_func(f):
+                    mesh = load_mesh_func(f)
+                self.set_frame_mesh(name_slug, f, mesh)
+            if mesh is None:
+                mesh = mesh_current
+            neighbour_meshes.append(mesh)
+
+        return neighbour_meshes[0], mesh_current, neighbour_meshes[1]
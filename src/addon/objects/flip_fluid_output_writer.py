@@ -0,0 +1,212 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading, queue, time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def write_file_data(filepath, data, write_mode='wb'):
+    if 'b' in write_mode:
+        with open(filepath, write_mode) as f:
+            f.write(data)
+    else:
+        with open(filepath, write_mode, encoding='utf-8') as f:
+            f.write(data)
+
+
+# Collection of output files and post-write tasks for a single simulation frame.
+#
+# Bakefile data is written in any order by the writer thread pool. Tasks are
+# run sequentially after all bakefiles of the frame have been written and
+# are used for output that must be ordered between frames (logfile, frame
+# stats, autosave, finished marker).
+#
+# If write_immediately is set, files and tasks are written/run as they are
+# added, which matches the original synchronous output behaviour.
+#
+# If a BakeFrameProfile is set, output bytes and file write times are recorded
+# into the profile.
+class FrameOutputData():
+    def __init__(self, frameno, write_immediately=False, profile=None):
+        self.frameno = frameno
+        self.write_immediately = write_immediately
+        self.profile = profile
+        self.files = []
+        self.tasks = []
+        self.num_bytes = 0
+
+
+    # Data may be a memoryview into simulator memory, which is only valid until
+    # the next frame is simulated and is copied if the file is not written now.
+    def add_file(self, filepath, data, write_mode='wb'):
+        self.num_bytes += len(data)
+        if self.profile is not None:
+            self.profile.add_file(filepath, len(data))
+
+        if self.write_immediately:
+            if self.profile is not None:
+                with self.profile.phase("file_write"):
+                    write_file_data(filepath, data, write_mode)
+            else:
+                write_file_data(filepath, data, write_mode)
+        else:
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            self.files.append((filepath, data, write_mode))
+
+
+    def add_task(self, func, *args):
+        if self.write_immediately:
+            func(*args)
+        else:
+            self.tasks.append((func, args))
+
+
+    def clear(self):
+        self.files = []
+        self.tasks = []
+
+
+class OutputWriter():
+    def __init__(self, num_threads=4, max_frames_in_flight=2,
+                 frame_written_callback=None, busy_state_callback=None):
+        self._num_threads = max(num_threads, 1)
+        self._max_frames_in_flight = max(max_frames_in_flight, 1)
+        self._frame_written_callback = frame_written_callback
+        self._busy_state_callback = busy_state_callback
+
+        self._lock = threading.Lock()
+        self._frame_slots = threading.Semaphore(self._max_frames_in_flight)
+        self._idle_condition = threading.Condition(self._lock)
+        self._num_frames_in_flight = 0
+        self._error = None
+
+        self._executor = ThreadPoolExecutor(max_workers=self._num_threads)
+        self._frame_queue = queue.Queue()
+        self._sequencer_thread = threading.Thread(target=self._sequencer_loop, daemon=True)
+        self._sequencer_thread.start()
+        self._is_shutdown = False
+
+
+    def get_max_frames_in_flight(self):
+        return self._max_frames_in_flight
+
+
+    def get_num_frames_in_flight(self):
+        with self._lock:
+            return self._num_frames_in_flight
+
+
+    def is_busy(self):
+        with self._lock:
+            return self._num_frames_in_flight > 0
+
+
+    # Blocks while the maximum number of frames are in flight. Errors raised
+    # by previously submitted frames are re-raised here on the calling thread.
+    def submit(self, frame_output):
+        self._raise_pending_error()
+        if frame_output.profile is not None:
+            with frame_output.profile.phase("output_wait"):
+                self._frame_slots.acquire()
+        else:
+            self._frame_slots.acquire()
+        with self._lock:
+            self._num_frames_in_flight += 1
+            if self._num_frames_in_flight == 1 and self._busy_state_callback is not None:
+                self._busy_state_callback(True)
+        self._frame_queue.put(frame_output)
+
+
+    def wait_until_finished(self):
+        with self._idle_condition:
+            while self._num_frames_in_flight > 0:
+                self._idle_condition.wait()
+        self._raise_pending_error()
+
+
+    def shutdown(self):
+        if self._is_shutdown:
+            return
+        with self._idle_condition:
+            while self._num_frames_in_flight > 0:
+                self._idle_condition.wait()
+        self._frame_queue.put(None)
+        self._sequencer_thread.join()
+        self._executor.shutdown(wait=True)
+        self._is_shutdown = True
+
+
+    def _raise_pending_error(self):
+        with self._lock:
+            error = self._error
+        if error is not None:
+            raise error
+
+
+    def _write_frame(self, frame_output):
+        start_time = time.perf_counter()
+        futures = []
+        for filepath, data, write_mode in frame_output.files:
+            futures.append(self._executor.submit(write_file_data, filepath, data, write_mode))
+
+        write_error = None
+        for f in futures:
+            try:
+                f.result()
+            except Exception as e:
+                if write_error is None:
+                    write_error = e
+        if write_error is not None:
+            raise write_error
+
+        if frame_output.profile is not None:
+            frame_output.profile.add_phase_time("file_write", time.perf_counter() - start_time)
+
+        for func, args in frame_output.tasks:
+            func(*args)
+
+
+    def _sequencer_loop(self):
+        while True:
+            frame_output = self._frame_queue.get()
+            if frame_output is None:
+                break
+
+            is_error = False
+            with self._lock:
+                is_error = self._error is not None
+
+            if not is_error:
+                # Do not write any further frames after an error. The finished
+                # marker files must stay consecutive for the bake to be resumable.
+                try:
+                    self._write_frame(frame_output)
+                except Exception as e:
+                    is_error = True
+                    with self._lock:
+                        self._error = e
+
+            frame_output.clear()
+            with self._idle_condition:
+                if not is_error and self._frame_written_callback is not None:
+                    self._frame_written_callback(frame_output.frameno)
+                self._num_frames_in_flight -= 1
+                if self._num_frames_in_flight == 0:
+                    if self._busy_state_callback is not None:
+                        self._busy_state_callback(False)
+                    self._idle_condition.notify_all()
+            self._frame_slots.release()
@@ -0,0 +1,260 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import bpy, os, json, time, shutil, subprocess
+
+
+STAGING_DIRECTORY_NAME = "parallel_export"
+WORKER_SCRIPT_FILENAME = "export_animated_geometry.py"
+STATUS_FILE_REPLACE_ATTEMPTS = 20
+STATUS_FILE_REPLACE_RETRY_DELAY = 0.05
+
+
+def get_worker_script_filepath():
+    script_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    script_path = os.path.join(script_path, "resources", "command_line_scripts", WORKER_SCRIPT_FILENAME)
+    if not os.path.isfile(script_path):
+        errmsg = "Unable to locate script <" + script_path + ">. Please contact the developers with this error."
+        raise Exception(errmsg)
+    return script_path
+
+
+def read_status_file(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+# The status file is replaced rather than rewritten so that the main process
+# never reads a partially written file. On Windows, the replace fails while the
+# main process has the status file open for reading, so it is retried.
+def write_status_file(filepath, num_processed, num_items, is_finished=False, error_message=""):
+    status = {
+        "processed": num_processed,
+        "total": num_items,
+        "is_finished": is_finished,
+        "error": error_message
+    }
+    temp_filepath = filepath + ".tmp"
+    with open(temp_filepath, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(status))
+
+    for attempt in range(STATUS_FILE_REPLACE_ATTEMPTS):
+        try:
+            os.replace(temp_filepath, filepath)
+            return
+        except PermissionError:
+            if attempt == STATUS_FILE_REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(STATUS_FILE_REPLACE_RETRY_DELAY)
+
+
+class ExportShard():
+    def __init__(self, shard_id, staging_directory):
+        self.shard_id = shard_id
+        self.work_items = []
+        self.process = None
+        self.is_merged = False
+
+        basename = "shard" + str(shard_id).zfill(3)
+        self.job_filepath = os.path.join(staging_directory, basename + ".json")
+        self.status_filepath = os.path.join(staging_directory, basename + "_status.json")
+        self.database_filepath = os.path.join(staging_directory, basename + ".sqlite3")
+        self.log_filepath = os.path.join(staging_directory, basename + "_log.txt")
+
+
+# Exports the frames of ANIMATED objects in background Blender processes.
+#
+# The animated frame range is split into contiguous shards, one per process.
+# Each process opens a copy of the current .blend file, evaluates its frames
+# and writes the geometry into its own staging database. Staging databases are
+# merged into the main geometry database once all processes have finished.
+class ParallelAnimatedGeometryExporter():
+    def __init__(self, export_directory, num_processes):
+        self._staging_directory = os.path.join(export_directory, STAGING_DIRECTORY_NAME)
+        self._blend_filepath = os.path.join(self._staging_directory, "export_scene.blend")
+        self._num_processes = max(num_processes, 1)
+        self._shards = []
+        self._is_launched = False
+        self._is_error = False
+        self._error_message = ""
+
+
+    def initialize(self, work_items, object_rows):
+        self._remove_staging_directory()
+        os.makedirs(self._staging_directory)
+
+        frame_items = {}
+        for w in work_items:
+            frame_items.setdefault(w.frame, []).append(w)
+        frames = sorted(frame_items.keys())
+
+        # Contiguous frame ranges keep each process evaluating consecutive
+        # frames, which is faster for simulations and cached modifiers
+        num_shards = min(self._num_processes, len(frames))
+        items_per_shard = len(work_items) / num_shards
+        shard = None
+        num_assigned = 0
+        for frameno in frames:
+            if shard is None or (num_assigned >= items_per_shard * len(self._shards) and len(self._shards) < num_shards):
+                shard = ExportShard(len(self._shards), self._staging_directory)
+                self._shards.append(shard)
+            shard.work_items += frame_items[frameno]
+            num_assigned += len(frame_items[frameno])
+
+        for shard in self._shards:
+            job = {
+                "database_filepath": shard.database_filepath,
+                "status_filepath": shard.status_filepath,
+                "objects": object_rows,
+                "work_items": [[w.geometry_export_object.name_slug, w.geometry_export_type.value, w.frame]
+                               for w in shard.work_items]
+            }
+            with open(shard.job_filepath, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(job))
+            write_status_file(shard.status_filepath, 0, len(shard.work_items))
+
+
+    def get_num_shards(self):
+        return len(self._shards)
+
+
+    def is_launched(self):
+        return self._is_launched
+
+
+    def launch(self):
+        if self._is_launched:
+            return
+        self._is_launched = True
+
+        # Worker processes load a copy of the current scene so that unsaved
+        # changes are exported
+        bpy.ops.wm.save_as_mainfile(filepath=self._blend_filepath, copy=True, check_existing=False)
+
+        script_filepath = get_worker_script_filepath()
+        for shard in self._shards:
+            command = [
+                bpy.app.binary_path, "--background", self._blend_filepath,
+                "--python", script_filepath, "--", shard.job_filepath
+            ]
+            logfile = open(shard.log_filepath, 'w', encoding='utf-8')
+            try:
+                shard.process = subprocess.Popen(command, stdout=logfile, stderr=subprocess.STDOUT)
+            finally:
+                logfile.close()
+
+        print("Exporting animated geometry in " + str(len(self._shards)) + " background processes...")
+
+
+    def update(self):
+        if self._is_error:
+            return
+
+        for shard in self._shards:
+            status = read_status_file(shard.status_filepath)
+            if status is not None and status["error"]:
+                self._set_error("Error exporting animated geometry: " + status["error"])
+                return
+
+            if shard.process is not None and shard.process.poll() is not None:
+                if status is None or not status["is_finished"]:
+                    errmsg = ("Animated geometry export process exited unexpectedly. See log file for details: <" +
+                              shard.log_filepath + ">")
+                    self._set_error(errmsg)
+                    return
+
+
+    def get_progress(self):
+        num_processed = 0
+        num_items = 0
+        for shard in self._shards:
+            num_items += len(shard.work_items)
+            status = read_status_file(shard.status_filepath)
+            if status is not None:
+                num_processed += status["processed"]
+        if num_items == 0:
+            return 1.0
+        return num_processed / num_items
+
+
+    def get_num_processed(self):
+        return int(round(self.get_progress() * sum(len(shard.work_items) for shard in self._shards)))
+
+
+    def is_export_finished(self):
+        for shard in self._shards:
+            status = read_status_file(shard.status_filepath)
+            if status is None or not status["is_finished"]:
+                return False
+            if shard.process is not None and shard.process.poll() is None:
+                return False
+        return True
+
+
+    # Merges one staging database per call so that the export operator can
+    # report progress between merges. Returns True when all shards are merged.
+    def merge_next_shard(self, geometry_database):
+        for shard in self._shards:
+            if not shard.is_merged:
+                geometry_database.merge_animated_data(shard.database_filepath)
+                shard.is_merged = True
+                break
+        return all(shard.is_merged for shard in self._shards)
+
+
+    def get_merge_progress(self):
+        if not self._shards:
+            return 1.0
+        return len([shard for shard in self._shards if shard.is_merged]) / len(self._shards)
+
+
+    def is_error(self):
+        return self._is_error
+
+
+    def get_error_message(self):
+        return self._error_message
+
+
+    def cancel(self):
+        for shard in self._shards:
+            if shard.process is not None and shard.process.poll() is None:
+                shard.process.terminate()
+                try:
+                    shard.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    shard.process.kill()
+
+
+    def cleanup(self):
+        self.cancel()
+        self._remove_staging_directory()
+
+
+    def _set_error(self, errmsg):
+        self._is_error = True
+        self._error_message = errmsg
+
+
+    def _remove_staging_directory(self):
+        if os.path.isdir(self._staging_directory):
+            try:
+                shutil.rmtree(self._staging_directory)
+            except OSError:
+                print("FLIP Fluids: Unable to remove directory <" + self._staging_directory + "> (skipping)")
@@ -0,0 +1,272 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os, json, threading
+
+
+# Append-only store for the per-frame simulation stats in the cache stats file.
+#
+# Each line of the file is a JSON record {"frame_key": <frameno>, "frame_stats": {...}}.
+# New frames are appended to the end of the file and readers only parse lines
+# that were added since the previous read. If a frame is written more than
+# once, the last record wins.
+#
+# Stats files written by older versions contain a single JSON object that maps
+# frame number strings to frame stats. These files are converted to the record
+# format the first time they are read. Older versions of the addon cannot read
+# stats files in the record format.
+#
+# Values that are derived from all frames are kept as running totals with
+# get_accumulated_value(). Only frames that were appended since the previous
+# call are accumulated. Totals are recomputed from all frames if a frame was
+# written again or frames were removed.
+class StatsStore():
+    FILE_HEAD_SIZE = 64
+
+    def __init__(self, filepath):
+        self._filepath = filepath
+        self._lock = threading.RLock()
+        self._reset()
+
+
+    def _reset(self):
+        self._frame_stats = {}
+        self._read_offset = 0
+        self._file_id = None
+        self._file_head = b""
+        self._version = 0
+        self._frame_keys = []
+        self._accumulators = {}
+
+
+    def get_filepath(self):
+        return self._filepath
+
+
+    def get_version(self):
+        with self._lock:
+            return self._version
+
+
+    # Returns a dict mapping frame number strings to frame stats dicts, in the
+    # same layout as the legacy stats file. The dict must not be modified.
+    def get_frame_stats_dict(self):
+        with self._lock:
+            self.refresh()
+            return self._frame_stats
+
+
+    def get_frame_stats(self, frameno):
+        with self._lock:
+            self.refresh()
+            return self._frame_stats.get(str(frameno))
+
+
+    # Returns the value of accumulate_func(value, frame_key, frame_stats) applied
+    # to each frame in the order that frames were added, starting from
+    # initial_value_func()
+    def get_accumulated_value(self, name, initial_value_func, accumulate_func):
+        with self._lock:
+            self.refresh()
+            if name not in self._accumulators:
+                self._accumulators[name] = [initial_value_func(), 0]
+            accumulator = self._accumulators[name]
+            for key in self._frame_keys[accumulator[1]:]:
+                accumulator[0] = accumulate_func(accumulator[0], key, self._frame_stats[key])
+            accumulator[1] = len(self._frame_keys)
+            return accumulator[0]
+
+
+    def initialize_file(self):
+        with self._lock:
+            if not os.path.isfile(self._filepath):
+                open(self._filepath, 'w', encoding='utf-8').close()
+                self._reset()
+
+
+    # frame_stats_list is a list of (frameno, frame_stats_dict) tuples
+    def append_frame_stats(self, frame_stats_list):
+        if not frame_stats_list:
+            return
+
+        with self._lock:
+            self.refresh()
+            lines = [self._record_to_line(frameno, stats) for frameno, stats in frame_stats_list]
+            with open(self._filepath, 'a', encoding='utf-8') as f:
+                f.write("".join(lines))
+            self.refresh()
+
+
+    # Removes all frames greater than frameno. The file is compacted so that
+    # it contains a single record per frame.
+    def delete_frames_after(self, frameno):
+        with self._lock:
+            self.refresh()
+            frame_stats = {}
+            for key, stats in self._frame_stats.items():
+                if int(key) <= frameno:
+                    frame_stats[key] = stats
+            self._rewrite_file(frame_stats)
+
+
+    def clear(self):
+        with self._lock:
+            self._rewrite_file({})
+
+
+    # Reads records that were appended since the last refresh. The whole file is
+    # read again if it has been replaced or truncated.
+    def refresh(self):
+        with self._lock:
+            if not os.path.isfile(self._filepath):
+                if self._file_id is not None:
+                    self._reset()
+                return
+
+            stat = os.stat(self._filepath)
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id != self._file_id or stat.st_size < self._read_offset or not self._is_file_head_unchanged():
+                self._frame_stats = {}
+                self._frame_keys = []
+                self._read_offset = 0
+                self._file_id = file_id
+                self._file_head = b""
+                self._invalidate(is_frame_data_replaced=True)
+                if self._is_legacy_file():
+                    self._convert_legacy_file()
+                    return
+
+            if stat.st_size == self._read_offset:
+                return
+
+            with open(self._filepath, 'rb') as f:
+                f.seek(self._read_offset)
+                data = f.read()
+
+            # A partially written last line is read on the next refresh
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                return
+            if self._read_offset == 0:
+                self._file_head = data[:self.FILE_HEAD_SIZE]
+            self._read_offset += end
+
+            is_updated = False
+            is_frame_data_replaced = False
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                    key = str(int(record["frame_key"]))
+                    frame_stats = record["frame_stats"]
+                except (ValueError, KeyError, TypeError):
+                    # Skip records that were corrupted, such as after a crash
+                    continue
+
+                if key in self._frame_stats:
+                    is_frame_data_replaced = True
+                else:
+                    self._frame_keys.append(key)
+                self._frame_stats[key] = frame_stats
+                is_updated = True
+
+            if is_updated:
+                self._invalidate(is_frame_data_replaced)
+
+
+    # A cleared cache directory may recreate the stats file with the same inode,
+    # so the start of the file is also compared to detect a replaced file
+    def _is_file_head_unchanged(self):
+        if self._read_offset == 0:
+            return True
+        with open(self._filepath, 'rb') as f:
+            head = f.read(len(self._file_head))
+        return head == self._file_head
+
+
+    def _invalidate(self, is_frame_data_replaced=False):
+        self._version += 1
+        if is_frame_data_replaced:
+            self._accumulators = {}
+
+
+    def _record_to_line(self, frameno, frame_stats):
+        record = {"frame_key": int(frameno), "frame_stats": frame_stats}
+        return json.dumps(record, sort_keys=True, separators=(',', ':')) + "\n"
+
+
+    def _is_legacy_file(self):
+        with open(self._filepath, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+        if not first_line.strip():
+            return False
+        try:
+            record = json.loads(first_line)
+        except ValueError:
+            return True
+        return not (isinstance(record, dict) and "frame_key" in record)
+
+
+    def _convert_legacy_file(self):
+        with open(self._filepath, 'r', encoding='utf-8') as f:
+            try:
+                legacy_data = json.loads(f.read())
+            except ValueError:
+                # Corrupt file, such as after a Blender crash
+                legacy_data = {}
+                print("FLIP Fluids Warning: Corrupt stats file detected: <" + self._filepath + ">. " +
+                      "Regenerating a new stats file.")
+
+        frame_stats = {}
+        if isinstance(legacy_data, dict):
+            for key, stats in legacy_data.items():
+                if key.isdigit():
+                    frame_stats[key] = stats
+        self._rewrite_file(frame_stats)
+
+
+    def _rewrite_file(self, frame_stats):
+        keys = sorted(frame_stats.keys(), key=lambda k: int(k))
+        lines = [self._record_to_line(int(k), frame_stats[k]) for k in keys]
+
+        data = "".join(lines).encode('utf-8')
+        temp_filepath = self._filepath + ".backup"
+        with open(temp_filepath, 'wb') as f:
+            f.write(data)
+        os.replace(temp_filepath, self._filepath)
+
+        stat = os.stat(self._filepath)
+        self._file_head = data[:self.FILE_HEAD_SIZE]
+        self._frame_stats = dict(frame_stats)
+        self._frame_keys = keys
+        self._read_offset = stat.st_size
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._invalidate(is_frame_data_replaced=True)
+
+
+__STATS_STORES = {}
+__STATS_STORES_LOCK = threading.Lock()
+
+
+# Stores are shared per file so that frame data is only parsed once across
+# the bake operator, stats panel and export operators
+def get_stats_store(filepath):
+    filepath = os.path.normpath(os.path.abspath(filepath))
+    with __STATS_STORES_LOCK:
+        if filepath not in __STATS_STORES:
+            __STATS_STORES[filepath] = StatsStore(filepath)
+        return __STATS_STORES[filepath]
@@ -17,15 +17,20 @@
 import bpy, os, glob, json, threading
 
 from .. import bake
+from .. import remesh
+from .. import render
 from ..objects import flip_fluid_geometry_exporter
+from ..objects import flip_fluid_stats_store
 from .. import export
 from ..utils import installation_utils
+from ..utils import export_utils
 from ..utils import audio_utils
 from ..filesystem import filesystem_protection_layer as fpl
 from ..utils import version_compatibility_utils as vcu
 
 _IS_BAKE_OPERATOR_RUNNING = False
 _IS_CMD_BAKE_OPERATOR_RUNNING = False
+_IS_REMESH_OPERATOR_RUNNING = False
 
 
 def _notify_bake_operator_running():
@@ -58,6 +63,21 @@ def is_bake_cmd_operator_running():
     return _IS_CMD_BAKE_OPERATOR_RUNNING
 
 
+def _notify_remesh_operator_running():
+    global _IS_REMESH_OPERATOR_RUNNING
+    _IS_REMESH_OPERATOR_RUNNING = True
+
+
+def _notify_remesh_operator_cancelled():
+    global _IS_REMESH_OPERATOR_RUNNING
+    _IS_REMESH_OPERATOR_RUNNING = False
+
+
+def is_remesh_operator_running():
+    global _IS_REMESH_OPERATOR_RUNNING
+    return _IS_REMESH_OPERATOR_RUNNING
+
+
 def update_stats(context=None):
     if context is None:
         context = bpy.context
@@ -67,13 +87,12 @@ def update_stats(context=None):
     dprops = bpy.context.scene.flip_fluid.get_domain_properties()
     cache_dir = dprops.cache.get_cache_abspath()
     statsfilepath = os.path.join(cache_dir, dprops.stats.stats_filename)
-    if not os.path.isfile(statsfilepath):
-        try:
-            # Case that the cache directory path is not valid
-            with open(statsfilepath, 'w', encoding='utf-8') as f:
-                f.write(json.dumps({}, sort_keys=True, indent=4))
-        except:
-            return num_updated_frames
+    stats_store = flip_fluid_stats_store.get_stats_store(statsfilepath)
+    try:
+        # Case that the cache directory path is not valid
+        stats_store.initialize_file()
+    except:
+        return num_updated_frames
 
     temp_dir = os.path.join(cache_dir, "temp")
     if not os.path.isdir(temp_dir):
@@ -89,9 +108,8 @@ def update_stats(context=None):
     if not stat_files:
         return num_updated_frames
 
-    with open(statsfilepath, 'r', encoding='utf-8') as f:
-        stats_dict = json.loads(f.read())
-
+    frame_stats_list = []
+    completed_stat_files = []
     for statpath in stat_files:
         filename = os.path.basename(statpath)
         frameno = int(filename[len(stat_prefix):-len(stat_extension)])
@@ -103,12 +121,15 @@ def update_stats(context=None):
                 # result in a decode error. Skip this data for now and
                 # process the next time stats are updated.
                 continue
-            stats_dict[str(frameno)] = frame_stats_dict
-        fpl.delete_file(statpath, error_ok=True)
-        num_updated_frames += 1
+            frame_stats_list.append((frameno, frame_stats_dict))
+        completed_stat_files.append(statpath)
 
-    with open(statsfilepath, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(stats_dict, sort_keys=True, indent=4))
+    # Only the new frames are appended, the existing stats file is not rewritten
+    frame_stats_list.sort(key=lambda x: x[0])
+    stats_store.append_frame_stats(frame_stats_list)
+    for statpath in completed_stat_files:
+        fpl.delete_file(statpath, error_ok=True)
+    num_updated_frames = len(completed_stat_files)
 
     dprops.stats.is_stats_current = False
     context.scene.flip_fluid_helper.frame_complete_callback()
@@ -250,7 +271,7 @@ class BakeFluidSimulation(bpy.types.Operator):
         dprops = bpy.context.scene.flip_fluid.get_domain_properties()
         if dprops is None:
             return False
-        return not dprops.bake.is_simulation_running
+        return not dprops.bake.is_simulation_running and not is_remesh_operator_running()
 
 
     def modal(self, context, event):
@@ -631,7 +652,7 @@ class FlipFluidResetBake(bpy.types.Operator):
         dprops = bpy.context.scene.flip_fluid.get_domain_properties()
         if dprops is None:
             return False
-        return not dprops.bake.is_simulation_running
+        return not dprops.bake.is_simulation_running and not is_remesh_operator_running()
 
 
     def execute(self, context):
@@ -654,11 +675,182 @@ class FlipFluidResetBake(bpy.types.Operator):
         return context.window_manager.invoke_confirm(self, event)
 
 
+class RemeshFluidSurfaceFromCache(bpy.types.Operator):
+    bl_idname = "flip_fluid_operators.remesh_fluid_surface_from_cache"
+    bl_label = "Re-mesh Surface From Cache"
+    bl_description = ("Re-generate the fluid surface mesh and surface attributes of the baked" + 
+                      " frames from the cached fluid particles using the current surface settings," + 
+                      " without re-running the simulation. Requires Fluid Particle export to be enabled" + 
+                      " during the bake. Meshing against obstacles and meshing volumes is not supported." + 
+                      " Press ESC to cancel. WARNING: this operation will overwrite the baked surface meshes")
+    bl_options = {'REGISTER'}
+
+
+    def __init__(self):
+        self.timer = None
+        self.thread = None
+        self.data = BakeData()
+
+
+    def _get_domain_properties(self):
+        return bpy.context.scene.flip_fluid.get_domain_properties()
+
+
+    def _get_export_filepath(self):
+        dprops = self._get_domain_properties()
+        if dprops.bake.export_filepath:
+            return dprops.bake.export_filepath
+        return os.path.join(dprops.cache.get_cache_abspath(), 
+                            dprops.bake.export_directory_name,
+                            dprops.bake.export_filename)
+
+
+    def _get_remesh_settings(self):
+        dprops = self._get_domain_properties()
+        sprops = dprops.surface
+
+        settings = remesh.RemeshSettings()
+        settings.subdivisions = sprops.subdivisions + 1
+        if sprops.compute_chunk_mode == 'COMPUTE_CHUNK_MODE_AUTO':
+            settings.compute_chunks = sprops.compute_chunks_auto
+        else:
+            settings.compute_chunks = sprops.compute_chunks_fixed
+
+        # Animated settings are resolved for each frame during the re-mesh
+        domain_object = bpy.context.scene.flip_fluid.get_domain_object()
+        def get_data_dict(prop_name):
+            path_name = "flip_fluid.domain.surface." + prop_name
+            return export_utils.get_property_data_dict_from_path(domain_object, sprops, path_name)
+
+        settings.frame_start = dprops.simulation.get_frame_range()[0]
+        settings.particle_scale = get_data_dict("particle_scale")
+        settings.native_particle_scale = sprops.native_particle_scale
+        settings.smoothing_value = get_data_dict("smoothing_value")
+        settings.smoothing_iterations = get_data_dict("smoothing_iterations")
+        settings.enable_remove_surface_near_domain = get_data_dict("remove_mesh_near_domain")
+        settings.remove_surface_near_domain_distance = get_data_dict("remove_mesh_near_domain_distance")
+        settings.preview_dx = dprops.simulation.get_viewport_preview_dx()
+        settings.enable_motion_blur = sprops.generate_motion_blur_data
+        settings.enable_speed_attribute = sprops.enable_speed_attribute
+        settings.attributes = {
+            "velocity":            sprops.enable_velocity_vector_attribute,
+            "vorticity":           sprops.enable_vorticity_vector_attribute,
+            "color":               sprops.enable_color_attribute,
+            "whitewaterproximity": sprops.enable_whitewater_proximity_attribute,
+            "age":                 sprops.enable_age_attribute,
+            "lifetime":            sprops.enable_lifetime_attribute,
+            "viscosity":           sprops.enable_viscosity_attribute,
+        }
+        settings.num_threads = sprops.remesh_num_threads
+        return settings
+
+
+    def _is_particle_output_complete(self):
+        pprops = self._get_domain_properties().particles
+        return (pprops.fluid_particle_output_amount >= 1.0 and
+                pprops.enable_fluid_particle_surface_output and
+                pprops.enable_fluid_particle_boundary_output and
+                pprops.enable_fluid_particle_interior_output)
+
+
+    def _update_status(self, context):
+        dprops = self._get_domain_properties()
+        dprops.surface.remesh_progress = self.data.progress
+        try:
+            # Depending on window, area may be None
+            context.area.tag_redraw()
+        except:
+            pass
+
+
+    @classmethod
+    def poll(cls, context):
+        dprops = bpy.context.scene.flip_fluid.get_domain_properties()
+        if dprops is None:
+            return False
+        return not dprops.bake.is_simulation_running and not is_remesh_operator_running()
+
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.data.is_cancelled = True
+
+        if event.type == 'TIMER':
+            self._update_status(context)
+
+        if self.thread and not self.thread.is_alive():
+            self.thread = None
+            self._update_status(context)
+            render.reload_frame(render.get_current_simulation_frame())
+
+            if self.data.error_message:
+                bpy.ops.flip_fluid_operators.display_error(
+                    'INVOKE_DEFAULT',
+                    error_message="Error Re-meshing Fluid Surface",
+                    error_description=self.data.error_message,
+                    popup_width=400
+                    )
+            else:
+                self.report({"INFO"}, "Re-meshed " + str(self.data.completed_frames) + " frames")
+
+            self.cancel(context)
+            return {'FINISHED'}
+
+        return {'PASS_THROUGH'}
+
+
+    def execute(self, context):
+        if not installation_utils.is_installation_complete():
+            self.report({"ERROR"}, 
+                         "FLIP Fluids installation incomplete. Restart Blender to complete installation. If you think this is an error, please contact the developers.")
+            return {'CANCELLED'}
+
+        dprops = self._get_domain_properties()
+        cache_directory = dprops.cache.get_cache_abspath()
+        frames = remesh.get_cached_frames(cache_directory)
+        if not frames:
+            self.report({"ERROR_INVALID_INPUT"}, 
+                         "No cached fluid particles found. Enable Fluid Particle export in the" + 
+                         " 'Domain > FLIP Fluid Particles' panel and bake the simulation to re-mesh from cache.")
+            return {'CANCELLED'}
+
+        if not self._is_particle_output_complete():
+            self.report({"WARNING"}, 
+                         "Fluid particle export amount or particle types are limited. The re-meshed" + 
+                         " surface will only contain the particles that were exported")
+
+        export_filepath = self._get_export_filepath()
+        settings = self._get_remesh_settings()
+
+        self.data.reset()
+        dprops.surface.remesh_progress = 0.0
+        self.thread = threading.Thread(
+                target=remesh.remesh, 
+                args=(export_filepath, cache_directory, self.data, settings, frames,),
+                daemon=True
+                )
+        self.thread.start()
+
+        context.window_manager.modal_handler_add(self)
+        self.timer = context.window_manager.event_timer_add(0.1, window=context.window)
+        _notify_remesh_operator_running()
+
+        return {'RUNNING_MODAL'}
+
+
+    def cancel(self, context):
+        if self.timer:
+            context.window_manager.event_timer_remove(self.timer)
+            self.timer = None
+        _notify_remesh_operator_cancelled()
+
+
 def register():
     bpy.utils.register_class(BakeFluidSimulation)
     bpy.utils.register_class(BakeFluidSimulationCommandLine)
     bpy.utils.register_class(CancelBakeFluidSimulation)
     bpy.utils.register_class(FlipFluidResetBake)
+    bpy.utils.register_class(RemeshFluidSurfaceFromCache)
 
 
 def unregister():
@@ -666,3 +858,4 @@ def unregister():
     bpy.utils.unregister_class(BakeFluidSimulationCommandLine)
     bpy.utils.unregister_class(CancelBakeFluidSimulation)
     bpy.utils.unregister_class(FlipFluidResetBake)
+    bpy.utils.unregister_class(RemeshFluidSurfaceFromCache)
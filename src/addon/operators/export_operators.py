@@ -14,9 +14,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, os, json, csv, math
+import bpy, os, json, csv, math, traceback
+
+from bpy.props import (
+        StringProperty
+        )
 
 from ..objects import flip_fluid_geometry_exporter as geometry_exporter
+from ..objects import flip_fluid_parallel_geometry_exporter as parallel_geometry_exporter
+from ..objects import flip_fluid_stats_store
+from ..objects.flip_fluid_geometry_database import GeometryDatabase
+from ..utils import version_compatibility_utils as vcu
 from .. import export
 
 
@@ -188,12 +196,66 @@ class ExportFluidSimulation(bpy.types.Operator):
             context.window_manager.event_timer_remove(self.timer)
             self.timer = None
 
+        if self.geometry_exporter is not None:
+            self.geometry_exporter.cancel()
+
         dprops = self._get_domain_properties()
         if dprops is None:
             return
         dprops.bake.is_export_operator_running = False
 
 
+# Runs in a background Blender process launched by the parallel animated geometry
+# export. Exports the animated frames listed in the job file into a staging database.
+class ExportAnimatedGeometryShardCommandLine(bpy.types.Operator):
+    bl_idname = "flip_fluid_operators.export_animated_geometry_shard_cmd"
+    bl_label = "Export Animated Geometry Shard"
+    bl_description = "Export a range of animated geometry frames into a staging database"
+    bl_options = {'REGISTER'}
+
+    job_filepath = StringProperty(default="")
+    exec(vcu.convert_attribute_to_28("job_filepath"))
+
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.context.scene.flip_fluid.is_domain_object_set()
+
+
+    def execute(self, context):
+        with open(self.job_filepath, 'r', encoding='utf-8') as f:
+            job = json.loads(f.read())
+
+        status_filepath = job["status_filepath"]
+        num_items = len(job["work_items"])
+        try:
+            database_filepath = job["database_filepath"]
+            GeometryDatabase(database_filepath, clear_database=True)
+            export_directory = os.path.dirname(database_filepath)
+            exporter = geometry_exporter.GeometryExportManager(
+                    export_directory, 
+                    database_filepath=database_filepath, 
+                    shard_job=job
+                    )
+            export.add_objects_to_geometry_exporter(exporter)
+
+            # Status is written about once per second to limit file writes
+            is_finished = num_items == 0
+            while not is_finished:
+                is_finished = exporter.update_export(1.0)
+                if exporter.is_error():
+                    raise Exception(exporter.get_error_message())
+                parallel_geometry_exporter.write_status_file(status_filepath, exporter.get_num_processed(), num_items)
+        except Exception as e:
+            traceback.print_exc()
+            errmsg = str(e) if str(e) else "Unknown error"
+            parallel_geometry_exporter.write_status_file(status_filepath, 0, num_items, error_message=errmsg)
+            return {'CANCELLED'}
+
+        parallel_geometry_exporter.write_status_file(status_filepath, num_items, num_items, is_finished=True)
+        return {'FINISHED'}
+
+
 class FlipFluidExportStatsCSV(bpy.types.Operator):
     bl_idname = "flip_fluid_operators.export_stats_csv"
     bl_label = "Export CSV"
@@ -368,8 +430,8 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
             self.report({"ERROR"}, "Missing simulation stats data file: " + statsfile)
             return {'CANCELLED'}
 
-        with open(statsfile, 'r', encoding='utf-8') as f:
-            statsdata = json.loads(f.read())
+        stats_store = flip_fluid_stats_store.get_stats_store(statsfile)
+        statsdata = stats_store.get_frame_stats_dict()
 
         csv_filepath = dprops.stats.csv_save_filepath
         csv_directory = os.path.dirname(csv_filepath)
@@ -391,9 +453,11 @@ class FlipFluidExportStatsCSV(bpy.types.Operator):
 
 def register():
     bpy.utils.register_class(ExportFluidSimulation)
+    bpy.utils.register_class(ExportAnimatedGeometryShardCommandLine)
     bpy.utils.register_class(FlipFluidExportStatsCSV)
 
 
 def unregister():
     bpy.utils.unregister_class(ExportFluidSimulation)
+    bpy.utils.unregister_class(ExportAnimatedGeometryShardCommandLine)
     bpy.utils.unregister_class(FlipFluidExportStatsCSV)
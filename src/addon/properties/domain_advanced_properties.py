@@ -86,6 +86,19 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
             min=1, soft_max=10000,
             default=900,
             ); exec(conv("pressure_solver_max_iterations"))
+    pressure_solver_method = EnumProperty(
+            name="Pressure Solver Method",
+            description="Linear solver method used to solve the pressure system",
+            items=types.pressure_solver_methods,
+            default='PRESSURE_SOLVER_METHOD_PCG',
+            ); exec(conv("pressure_solver_method"))
+    enable_solver_warm_start = BoolProperty(
+            name="Warm Start Solvers",
+            description="Start the pressure solve from the pressure of the previous substep. This"
+                " can reduce the number of pressure solver iterations when the fluid changes slowly"
+                " between substeps",
+            default=False,
+            ); exec(conv("enable_solver_warm_start"))
     viscosity_solver_max_iterations = IntProperty(
             name="Viscosity Solver Max Iterations",
             description="Maximum number of iterations that the viscosity solver is allowed"
@@ -187,6 +200,56 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
                 " but will use more RAM if enabled",
             default = True,
             ); exec(conv("enable_asynchronous_meshing"))
+    enable_asynchronous_output = BoolProperty(
+            name="Enable Async Output",
+            description="Write simulation output files to storage in background threads while"
+                " the next frame is simulated. May increase simulation performance when"
+                " writing large amounts of data but will use more RAM if enabled, as the"
+                " output data of each frame in flight is held in memory until written",
+            default = False,
+            ); exec(conv("enable_asynchronous_output"))
+    max_output_frames_in_flight = IntProperty(
+            name="Max Frames in Flight",
+            description="Maximum number of frames that can be waiting to be written to storage."
+                " The simulation will pause until output is written if this limit is reached."
+                " Higher values can smooth out slow storage at the cost of more RAM",
+            min=1, soft_max=8, max=64,
+            default=2,
+            ); exec(conv("max_output_frames_in_flight"))
+    num_output_writer_threads = IntProperty(
+            name="Writer Threads",
+            description="Number of threads used to write the output files of a frame to storage",
+            min=1, soft_max=16, max=64,
+            default=4,
+            ); exec(conv("num_output_writer_threads"))
+    skip_unchanged_objects_on_export = BoolProperty(
+            name="Skip Unchanged Objects on Export",
+            description="Only re-export objects and animated frames that have changed since the"
+                " last export. Changes are detected from object transforms, mesh data, modifiers,"
+                " constraints and animation. Use the Force Re-Export option of an object if a"
+                " change is not detected, such as a change in a driver's input",
+            default = True,
+            ); exec(conv("skip_unchanged_objects_on_export"))
+    enable_parallel_animated_export = BoolProperty(
+            name="Parallel Animated Export",
+            description="Export the frames of animated meshes in multiple background Blender"
+                " processes. Can greatly reduce export time for objects with slow to evaluate"
+                " animation or modifiers. Each process loads a copy of the .blend file and"
+                " will use as much RAM as a separate Blender instance",
+            default = False,
+            ); exec(conv("enable_parallel_animated_export"))
+    num_animated_export_processes = IntProperty(
+            name="Export Processes",
+            description="Number of background Blender processes used to export animated meshes",
+            min=1, soft_max=16, max=64,
+            default=4,
+            ); exec(conv("num_animated_export_processes"))
+    enable_geometry_compression = BoolProperty(
+            name="Compress Animated Geometry",
+            description="Compress exported animated mesh data. Reduces the size of the geometry"
+                " export database for large animated meshes but increases export time",
+            default = False,
+            ); exec(conv("enable_geometry_compression"))
     precompute_static_obstacles = BoolProperty(
             name="Precompute Static Obstacles",
             description="Precompute data for static obstacles. If enabled,"
@@ -237,6 +300,8 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
         add(path + ".particle_jitter_factor",                    "Jitter Factor",                      group_id=0)
         add(path + ".jitter_surface_particles",                  "Jitter Surface Particles",           group_id=0)
         add(path + ".pressure_solver_max_iterations",            "Pressure Solver Iterations",         group_id=0)
+        add(path + ".pressure_solver_method",                    "Pressure Solver Method",             group_id=0)
+        add(path + ".enable_solver_warm_start",                  "Warm Start Solvers",                 group_id=0)
         add(path + ".viscosity_solver_max_iterations",           "Viscosity Solver Iterations",        group_id=0)
         add(path + ".velocity_transfer_method",                  "Velocity Transfer Method",           group_id=0)
         add(path + ".PICFLIP_ratio",                             "PIC/FLIP Ratio",                     group_id=0)
@@ -248,6 +313,13 @@ class DomainAdvancedProperties(bpy.types.PropertyGroup):
         add(path + ".num_threads_fixed",                         "Num Threads (fixed)",                group_id=1)
         add(path + ".enable_asynchronous_meshing",               "Async Meshing",                      group_id=1)
         add(path + ".enable_fracture_optimization",              "Enable Fracture Optimization",        group_id=1)
+        add(path + ".enable_asynchronous_output",                "Async Output",                       group_id=1)
+        add(path + ".max_output_frames_in_flight",               "Max Output Frames in Flight",        group_id=1)
+        add(path + ".num_output_writer_threads",                 "Output Writer Threads",              group_id=1)
+        add(path + ".skip_unchanged_objects_on_export",          "Skip Unchanged Objects on Export",   group_id=1)
+        add(path + ".enable_parallel_animated_export",           "Parallel Animated Export",           group_id=1)
+        add(path + ".num_animated_export_processes",             "Animated Export Processes",          group_id=1)
+        add(path + ".enable_geometry_compression",               "Compress Animated Geometry",         group_id=1)
         add(path + ".precompute_static_obstacles",               "Precompute Static Obstacles",        group_id=1)
         add(path + ".reserve_temporary_grids",                   "Reserve Temporary Grid Memory",      group_id=1)
         add(path + ".disable_changing_topology_warning",         "Disable Changing Topology Warning",  group_id=1)
@@ -305,6 +305,32 @@ class DomainDebugProperties(bpy.types.PropertyGroup):
             update=lambda self, context: self._update_export_internal_obstacle_mesh(context),
             ); exec(conv("internal_obstacle_mesh_visibility"))
 
+    export_frame_trace = BoolProperty(
+            name="Export Frame Timing Trace",
+            description="Export a timeline of the simulation stages of each frame to the"
+                " cache logs/traces directory. The timeline is saved in the Chrome trace"
+                " event format and can be viewed in chrome://tracing or ui.perfetto.dev."
+                " Enable this option before baking a simulation to use this feature",
+            default=False,
+            ); exec(conv("export_frame_trace"))
+    export_bake_loop_profile = BoolProperty(
+            name="Profile Bake Loop",
+            description="Run the Python side of the bake loop under cProfile for a range of"
+                " frames. The profile is saved to the cache logs directory as a .prof file"
+                " with a text summary sorted by cumulative time. Enable this option before"
+                " baking a simulation to use this feature",
+            default=False,
+            ); exec(conv("export_bake_loop_profile"))
+    bake_loop_profile_frame_start = IntProperty(
+            name="Start",
+            description="First frame of the range to profile",
+            default=1,
+            ); exec(conv("bake_loop_profile_frame_start"))
+    bake_loop_profile_frame_end = IntProperty(
+            name="End",
+            description="Last frame of the range to profile",
+            default=10,
+            ); exec(conv("bake_loop_profile_frame_end"))
     display_console_output = BoolProperty(
             name="Display Console Output",
             description="Display simulation info in the Blender system console",
@@ -354,6 +380,10 @@ class DomainDebugProperties(bpy.types.PropertyGroup):
         add(path + ".force_field_line_size",              "Line Size",                       group_id=2)
         add(path + ".export_internal_obstacle_mesh",      "Enable Obstacle Debugging",       group_id=3)
         add(path + ".internal_obstacle_mesh_visibility",  "Obstacle Debugging Visibility", group_id=3)
+        add(path + ".export_frame_trace",                 "Export Frame Timing Trace",     group_id=3)
+        add(path + ".export_bake_loop_profile",           "Profile Bake Loop",             group_id=3)
+        add(path + ".bake_loop_profile_frame_start",      "Profile Frame Start",           group_id=3)
+        add(path + ".bake_loop_profile_frame_end",        "Profile Frame End",             group_id=3)
         add(path + ".display_console_output",             "Display Console Output",        group_id=3)
 
 
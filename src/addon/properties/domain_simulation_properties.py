@@ -87,6 +87,25 @@ class DomainSimulationProperties(bpy.types.PropertyGroup):
             default=50,
             options={'HIDDEN'},
             ); exec(conv("savestate_interval"))
+    autosave_interval = IntProperty(
+            name="Autosave Interval",
+            description="Number of frames between each autosave of the simulation state."
+                " Writing the autosave can take as long as simulating a frame for"
+                " large simulations. A resumed bake continues from the most recent"
+                " autosave, so up to this many frames may need to be re-simulated."
+                " The first frame, last frame, and savestate frames are always autosaved",
+            min=1,
+            default=1,
+            options={'HIDDEN'},
+            ); exec(conv("autosave_interval"))
+    enable_savestate_compression = BoolProperty(
+            name="Compress Savestates",
+            description="Compress autosave and savestate particle data. Reduces storage"
+                " space and write bandwidth at the cost of additional processing time"
+                " when saving and resuming",
+            default=False,
+            options={'HIDDEN'},
+            ); exec(conv("enable_savestate_compression"))
     delete_outdated_savestates = BoolProperty(
             name="Delete Outdated Savestates on Resume",
             description="When resuming a simulation from a previous frame, delete"
@@ -352,6 +371,8 @@ class DomainSimulationProperties(bpy.types.PropertyGroup):
         add(path + ".update_settings_on_resume",   "Update Settings on Resume",     group_id=1)
         add(path + ".enable_savestates",           "Enable Savestates",             group_id=1)
         add(path + ".savestate_interval",          "Savestate Interval",            group_id=1)
+        add(path + ".autosave_interval",           "Autosave Interval",             group_id=1)
+        add(path + ".enable_savestate_compression", "Compress Savestates",          group_id=1)
         add(path + ".delete_outdated_savestates",  "Delete Outdated Savestates",    group_id=1)
         add(path + ".delete_outdated_meshes",      "Delete Outdated Meshes",        group_id=1)
 
@@ -14,9 +14,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import bpy, os, json, math, datetime
+import bpy, os, math, datetime
 from bpy.props import (
         BoolProperty,
+        CollectionProperty,
         EnumProperty,
         FloatProperty,
         IntProperty,
@@ -26,6 +27,7 @@ from bpy.props import (
 
 from .. import types
 from ..utils import version_compatibility_utils as vcu
+from ..objects import flip_fluid_stats_store
 from ..operators import bake_operators
 
 
@@ -33,6 +35,59 @@ from ..operators import bake_operators
 #   STATS PROPERTIES
 # ##############################################################################
 
+# Mesh stats properties and the frame stats entries that are totaled into them.
+# Some entries do not exist in caches baked by older versions.
+CACHE_MESH_STATS = [
+    ("surface_mesh",                             "surface"),
+    ("preview_mesh",                             "preview"),
+    ("surfaceblur_mesh",                         "surfaceblur"),
+    ("surfacevelocity_mesh",                     "surfacevelocity"),
+    ("surfacespeed_mesh",                        "surfacespeed"),
+    ("surfacevorticity_mesh",                    "surfacevorticity"),
+    ("surfaceage_mesh",                          "surfaceage"),
+    ("surfacelifetime_mesh",                     "surfacelifetime"),
+    ("surfacewhitewaterproximity_mesh",          "surfacewhitewaterproximity"),
+    ("surfacecolor_mesh",                        "surfacecolor"),
+    ("surfacesourceid_mesh",                     "surfacesourceid"),
+    ("surfaceviscosity_mesh",                    "surfaceviscosity"),
+    ("foam_mesh",                                "foam"),
+    ("bubble_mesh",                              "bubble"),
+    ("spray_mesh",                               "spray"),
+    ("dust_mesh",                                "dust"),
+    ("foamblur_mesh",                            "foamblur"),
+    ("bubbleblur_mesh",                          "bubbleblur"),
+    ("sprayblur_mesh",                           "sprayblur"),
+    ("dustblur_mesh",                            "dustblur"),
+    ("foamvelocity_mesh",                        "foamvelocity"),
+    ("bubblevelocity_mesh",                      "bubblevelocity"),
+    ("sprayvelocity_mesh",                       "sprayvelocity"),
+    ("dustvelocity_mesh",                        "dustvelocity"),
+    ("foamid_mesh",                              "foamid"),
+    ("bubbleid_mesh",                            "bubbleid"),
+    ("sprayid_mesh",                             "sprayid"),
+    ("dustid_mesh",                              "dustid"),
+    ("foamlifetime_mesh",                        "foamlifetime"),
+    ("bubblelifetime_mesh",                      "bubblelifetime"),
+    ("spraylifetime_mesh",                       "spraylifetime"),
+    ("dustlifetime_mesh",                        "dustlifetime"),
+    ("fluid_particle_mesh",                      "fluidparticles"),
+    ("fluid_particle_id_mesh",                   "fluidparticlesid"),
+    ("fluid_particle_velocity_mesh",             "fluidparticlesvelocity"),
+    ("fluid_particle_speed_mesh",                "fluidparticlesspeed"),
+    ("fluid_particle_vorticity_mesh",            "fluidparticlesvorticity"),
+    ("fluid_particle_color_mesh",                "fluidparticlescolor"),
+    ("fluid_particle_age_mesh",                  "fluidparticlesage"),
+    ("fluid_particle_lifetime_mesh",             "fluidparticleslifetime"),
+    ("fluid_particle_viscosity_mesh",            "fluidparticlesviscosity"),
+    ("fluid_particle_whitewater_proximity_mesh", "fluidparticleswhitewaterproximity"),
+    ("fluid_particle_source_id_mesh",            "fluidparticlessourceid"),
+    ("debug_particle_mesh",                      "particles"),
+    ("obstacle_mesh",                            "obstacle"),
+    ]
+
+TIMING_STATS = ["mesh", "advection", "particles", "pressure", "diffuse", "viscosity", "objects"]
+
+
 class ByteProperty(bpy.types.PropertyGroup):
     conv = vcu.convert_attribute_to_28
     bytes = FloatProperty(
@@ -126,6 +181,12 @@ class SolverStressProperties(bpy.types.PropertyGroup):
             return 0.0
 
 
+class FileTypeBytesProperties(bpy.types.PropertyGroup):
+    conv = vcu.convert_attribute_to_28
+    file_type = StringProperty(default=""); exec(conv("file_type"))
+    bytes = PointerProperty(type=ByteProperty); exec(conv("bytes"))
+
+
 class DomainStatsProperties(bpy.types.PropertyGroup):
     conv = vcu.convert_attribute_to_28
     
@@ -210,6 +271,7 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
     frame_info_viscosity_solver_stats_expanded = BoolProperty(default=True); exec(conv("frame_info_viscosity_solver_stats_expanded"))
     frame_info_timing_stats_expanded = BoolProperty(default=True); exec(conv("frame_info_timing_stats_expanded"))
     frame_info_mesh_stats_expanded = BoolProperty(default=True); exec(conv("frame_info_mesh_stats_expanded"))
+    frame_info_bake_loop_stats_expanded = BoolProperty(default=False); exec(conv("frame_info_bake_loop_stats_expanded"))
     display_frame_viscosity_timing_stats = BoolProperty(default=False); exec(conv("display_frame_viscosity_timing_stats"))
     display_frame_diffuse_timing_stats = BoolProperty(default=False); exec(conv("display_frame_diffuse_timing_stats"))
     display_frame_diffuse_particle_stats = BoolProperty(default=False); exec(conv("display_frame_diffuse_particle_stats"))
@@ -220,6 +282,11 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
     frame_fluid_particles = IntProperty(default=-1); exec(conv("frame_fluid_particles"))
     frame_diffuse_particles = IntProperty(default=-1); exec(conv("frame_diffuse_particles"))
     frame_performance_score = IntProperty(default=-1); exec(conv("frame_performance_score"))
+    is_frame_bake_loop_info_available = BoolProperty(default=False); exec(conv("is_frame_bake_loop_info_available"))
+    frame_bake_loop_database_queries = IntProperty(default=-1); exec(conv("frame_bake_loop_database_queries"))
+    frame_bake_loop_files = IntProperty(default=-1); exec(conv("frame_bake_loop_files"))
+    frame_bake_loop_bytes = PointerProperty(type=ByteProperty); exec(conv("frame_bake_loop_bytes"))
+    frame_bake_loop_file_type_bytes = CollectionProperty(type=FileTypeBytesProperties); exec(conv("frame_bake_loop_file_type_bytes"))
 
     frame_pressure_solver_enabled = BoolProperty(default=False); exec(conv("frame_pressure_solver_enabled"))
     frame_pressure_solver_success = BoolProperty(default=True); exec(conv("frame_pressure_solver_success"))
@@ -292,6 +359,16 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
     time_objects = PointerProperty(type=TimeStatsProperties); exec(conv("time_objects"))
     time_other = PointerProperty(type=TimeStatsProperties); exec(conv("time_other"))
 
+    # Bake Loop Info
+    bake_time_database = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_database"))
+    bake_time_properties = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_properties"))
+    bake_time_fluid_objects = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_fluid_objects"))
+    bake_time_simulate = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_simulate"))
+    bake_time_output = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_output"))
+    bake_time_output_wait = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_output_wait"))
+    bake_time_mesh_extraction = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_mesh_extraction"))
+    bake_time_file_write = PointerProperty(type=TimeStatsProperties); exec(conv("bake_time_file_write"))
+
 
     def register_preset_properties(self, registry, path):
         add = registry.add_property
@@ -300,18 +377,6 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         add(path + ".csv_region_format",           "CSV Region Format",      group_id=0)
 
 
-    def repair_corrupt_stats_file(self, stats_filepath):
-        errmsg = "FLIP Fluids Error: Corrupt stats file detected: <" + stats_filepath + ">. "
-        errmsg += "This file may have become corrupted after a Blender crash. Regenerating a new stats file. "
-        errmsg += "Information in the 'Domain > FLIP Fluid Stats' panel may be missing data and may display inaccurate data."
-        print(errmsg)
-        empty_dict = {}
-        empty_json = json.dumps(empty_dict)
-        with open(stats_filepath, 'w', encoding='utf-8') as f:
-            f.write(empty_json)
-        return empty_dict
-
-
     def format_long_time(self, t):
         m, s = divmod(t, 60)
         h, m = divmod(m, 60)
@@ -398,11 +463,23 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
             "time_diffuse",
             "time_viscosity",
             "time_objects",
-            "time_other"
+            "time_other",
+            "frame_bake_loop_database_queries",
+            "frame_bake_loop_files",
+            "frame_bake_loop_bytes",
+            "bake_time_database",
+            "bake_time_properties",
+            "bake_time_fluid_objects",
+            "bake_time_simulate",
+            "bake_time_output",
+            "bake_time_output_wait",
+            "bake_time_mesh_extraction",
+            "bake_time_file_write"
             ]
 
         for name in prop_names:
             self.property_unset(name)
+        self.frame_bake_loop_file_type_bytes.clear()
 
 
     def reset_time_remaining(self):
@@ -490,21 +567,13 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
             self.is_frame_info_available = False
             return
 
-        with open(statsfile, 'r', encoding='utf-8') as f:
-            try:
-                statsdata = json.loads(f.read())
-            except json.decoder.JSONDecodeError:
-                # JSON file may have become corrupted after a crash.
-                # In this case, repair the file by regenerating an
-                # empty JSON file and continue with empty stats.
-                statsdata = self.repair_corrupt_stats_file(statsfile)
-
-        framekey = str(self.current_info_frame)
-        if not framekey in statsdata:
+        stats_store = flip_fluid_stats_store.get_stats_store(statsfile)
+
+        data = stats_store.get_frame_stats(self.current_info_frame)
+        if data is None:
             self.is_frame_info_available = False
             return
 
-        data = statsdata[framekey]
         self.is_frame_info_available = True
         self.frame_info_id = data['frame']
         self.frame_substeps = data['substeps']
@@ -693,26 +762,53 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         self.time_objects.time   = round(data['timing']['objects'], precision)
         self.time_other.time     = round(time_other, precision)
 
-        self.display_frame_viscosity_timing_stats = False
-        self.display_frame_diffuse_timing_stats = False
-        self.display_frame_diffuse_particle_stats = False
-        for key in statsdata.keys():
-            if key.isdigit():
-                if statsdata[key]['diffuse_particles'] > 0.0:
-                    self.display_frame_diffuse_particle_stats = True
-                    break
-        for key in statsdata.keys():
-            if key.isdigit():
-                if statsdata[key]['timing']['viscosity'] > 0.0:
-                    self.display_frame_viscosity_timing_stats = True
-                    break
-        for key in statsdata.keys():
-            if key.isdigit():
-                if statsdata[key]['timing']['diffuse'] > 0.0:
-                    self.display_frame_diffuse_timing_stats = True
-                    break
-
-        self._update_cache_size(statsdata)
+        self._update_frame_bake_loop_stats(data)
+
+        cache_stats = self._get_cache_stats(stats_store)
+        self.display_frame_diffuse_particle_stats = cache_stats['is_diffuse_particles']
+        self.display_frame_viscosity_timing_stats = cache_stats['timing']['viscosity'] > 0.0
+        self.display_frame_diffuse_timing_stats = cache_stats['timing']['diffuse'] > 0.0
+        self.cache_bytes.set(cache_stats['cache_size'])
+
+
+    def _update_frame_bake_loop_stats(self, data):
+        if 'bake' not in data:
+            # Caches baked by older versions do not have bake loop stats
+            self.is_frame_bake_loop_info_available = False
+            return
+
+        bake_data = data['bake']
+        timing = bake_data['timing']
+        time_stats = [
+            (self.bake_time_database,        timing['database']),
+            (self.bake_time_properties,      timing['properties']),
+            (self.bake_time_fluid_objects,   timing['fluid_objects']),
+            (self.bake_time_simulate,        timing['simulate']),
+            (self.bake_time_output,          timing['output']),
+            (self.bake_time_output_wait,     timing['output_wait']),
+            (self.bake_time_mesh_extraction, timing['mesh_extraction']),
+            (self.bake_time_file_write,      timing['file_write']),
+            ]
+
+        total_time = max(timing['total'], 1e-4)
+        precision = 2
+        for time_stats_props, t in time_stats:
+            time_stats_props.set_time_pct(min(100 * t / total_time, 100.0))
+            time_stats_props.time = round(t, precision)
+
+        self.frame_bake_loop_database_queries = bake_data['database_queries']
+        self.frame_bake_loop_files = bake_data['files']
+        self.frame_bake_loop_bytes.set(bake_data['total_bytes'])
+
+        # Largest file types first
+        self.frame_bake_loop_file_type_bytes.clear()
+        file_type_bytes = sorted(bake_data.get('bytes', {}).items(), key=lambda item: (-item[1], item[0]))
+        for file_type, num_bytes in file_type_bytes:
+            item = self.frame_bake_loop_file_type_bytes.add()
+            item.file_type = file_type
+            item.bytes.set(num_bytes)
+
+        self.is_frame_bake_loop_info_available = True
 
 
     def _set_mesh_stats_data(self, mesh_stats, mesh_stats_dict):
@@ -722,103 +818,86 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         mesh_stats.bytes.set(mesh_stats_dict['bytes'])
 
 
-    def _update_cache_size(self, cachedata):
-        cache_size = 0
-        for key in cachedata.keys():
-            if not key.isdigit():
+    # Totals over all frames in the cache. Only frames that were added to the stats
+    # file since the last update are accumulated.
+    def _get_cache_stats(self, stats_store):
+        return stats_store.get_accumulated_value("cache_stats", self._get_initial_cache_stats, self._accumulate_cache_stats)
+
+
+    def _get_initial_cache_stats(self):
+        solver_stats = {
+            'enabled': False,
+            'max_error': 0.0,
+            'max_error_frame': -1,
+            'max_iterations': 0,
+            'max_iterations_frame': -1,
+            'failures': 0,
+            'steps': 0,
+            'max_stress': 0.0,
+            'max_stress_frame': -1,
+            }
+        return {
+            'num_frames': 0,
+            'num_performance_score_frames': 0,
+            'performance_score_total': 0,
+            'is_diffuse_particles': False,
+            'cache_size': 0,
+            'mesh_enabled': {stats_key: False for _, stats_key in CACHE_MESH_STATS},
+            'mesh_bytes': {stats_key: 0 for _, stats_key in CACHE_MESH_STATS},
+            'total_time': 0.0,
+            'timing': {name: 0.0 for name in TIMING_STATS},
+            'pressure': dict(solver_stats),
+            'viscosity': dict(solver_stats),
+            }
+
+
+    def _accumulate_cache_stats(self, cache_stats, key, fdata):
+        if not key.isdigit():
+            return cache_stats
+
+        cache_stats['num_frames'] += 1
+        if 'performance_score' in fdata and fdata['performance_score'] != -1:
+            cache_stats['num_performance_score_frames'] += 1
+            cache_stats['performance_score_total'] += fdata['performance_score']
+
+        if fdata['diffuse_particles'] > 0.0:
+            cache_stats['is_diffuse_particles'] = True
+
+        for _, stats_key in CACHE_MESH_STATS:
+            # Caches baked by older versions may not have an entry for every mesh type
+            mesh_stats = fdata.get(stats_key)
+            if mesh_stats is not None and mesh_stats['enabled']:
+                cache_stats['mesh_enabled'][stats_key] = True
+                cache_stats['mesh_bytes'][stats_key] += mesh_stats['bytes']
+                cache_stats['cache_size'] += mesh_stats['bytes']
+
+        cache_stats['total_time'] += fdata['timing']['total']
+        for name in TIMING_STATS:
+            cache_stats['timing'][name] += fdata['timing'][name]
+
+        frameno = int(key)
+        for solver in ['pressure', 'viscosity']:
+            if solver + "_solver_enabled" not in fdata:
                 continue
-            fdata = cachedata[key]
-            if fdata['surface']['enabled']:
-                cache_size += fdata['surface']['bytes']
-            if fdata['preview']['enabled']:
-                cache_size += fdata['preview']['bytes']
-            if fdata['surfaceblur']['enabled']:
-                cache_size += fdata['surfaceblur']['bytes']
-            if 'surfacevelocity' in fdata and fdata['surfacevelocity']['enabled']: # If statement to support caches without a surfacevelocity entry
-                cache_size += fdata['surfacevelocity']['bytes']
-            if 'surfacespeed' in fdata and fdata['surfacespeed']['enabled']: # If statement to support caches without a surfacespeed entry
-                cache_size += fdata['surfacespeed']['bytes']
-            if 'surfacevorticity' in fdata and fdata['surfacevorticity']['enabled']: # If statement to support caches without a surfacevorticity entry
-                cache_size += fdata['surfacevorticity']['bytes']
-            if 'surfaceage' in fdata and fdata['surfaceage']['enabled']: # If statement to support caches without a surfaceage entry
-                cache_size += fdata['surfaceage']['bytes']
-            if 'surfacelifetime' in fdata and fdata['surfacelifetime']['enabled']: # If statement to support caches without a surfacelifetime entry
-                cache_size += fdata['surfacelifetime']['bytes']
-            if 'surfacewhitewaterproximity' in fdata and fdata['surfacewhitewaterproximity']['enabled']: # If statement to support caches without a surfacewhitewaterproximity entry
-                cache_size += fdata['surfacewhitewaterproximity']['bytes']
-            if 'surfacecolor' in fdata and fdata['surfacecolor']['enabled']: # If statement to support caches without a surfacecolor entry
-                cache_size += fdata['surfacecolor']['bytes']
-            if 'surfacesourceid' in fdata and fdata['surfacesourceid']['enabled']: # If statement to support caches without a surfacesourceid entry
-                cache_size += fdata['surfacesourceid']['bytes']
-            if 'surfaceviscosity' in fdata and fdata['surfaceviscosity']['enabled']: # If statement to support caches without a surfaceviscosity entry
-                cache_size += fdata['surfaceviscosity']['bytes']
-            if fdata['foam']['enabled']:
-                cache_size += fdata['foam']['bytes']
-            if fdata['bubble']['enabled']:
-                cache_size += fdata['bubble']['bytes']
-            if fdata['spray']['enabled']:
-                cache_size += fdata['spray']['bytes']
-            if 'dust' in fdata and fdata['dust']['enabled']: # If statement to support caches without a dust entry
-                cache_size += fdata['dust']['bytes']
-            if fdata['foamblur']['enabled']:
-                cache_size += fdata['foamblur']['bytes']
-            if fdata['bubbleblur']['enabled']:
-                cache_size += fdata['bubbleblur']['bytes']
-            if fdata['sprayblur']['enabled']:
-                cache_size += fdata['sprayblur']['bytes']
-            if 'dustblur' in fdata and fdata['dustblur']['enabled']: # If statement to support caches without a dustblur entry
-                cache_size += fdata['dustblur']['bytes']
-            if 'foamvelocity' in fdata and fdata['foamvelocity']['enabled']:
-                cache_size += fdata['foamvelocity']['bytes']
-            if 'bubblevelocity' in fdata and fdata['bubblevelocity']['enabled']:
-                cache_size += fdata['bubblevelocity']['bytes']
-            if 'sprayvelocity' in fdata and fdata['sprayvelocity']['enabled']:
-                cache_size += fdata['sprayvelocity']['bytes']
-            if 'dustvelocity' in fdata and fdata['dustvelocity']['enabled']:
-                cache_size += fdata['dustvelocity']['bytes']
-            if 'foamid' in fdata and fdata['foamid']['enabled']:
-                cache_size += fdata['foamid']['bytes']
-            if 'bubbleid' in fdata and fdata['bubbleid']['enabled']:
-                cache_size += fdata['bubbleid']['bytes']
-            if 'sprayid' in fdata and fdata['sprayid']['enabled']:
-                cache_size += fdata['sprayid']['bytes']
-            if 'dustid' in fdata and fdata['dustid']['enabled']:
-                cache_size += fdata['dustid']['bytes']
-            if 'foamlifetime' in fdata and fdata['foamlifetime']['enabled']:
-                cache_size += fdata['foamlifetime']['bytes']
-            if 'bubblelifetime' in fdata and fdata['bubblelifetime']['enabled']:
-                cache_size += fdata['bubblelifetime']['bytes']
-            if 'spraylifetime' in fdata and fdata['spraylifetime']['enabled']:
-                cache_size += fdata['spraylifetime']['bytes']
-            if 'dustlifetime' in fdata and fdata['dustlifetime']['enabled']:
-                cache_size += fdata['dustlifetime']['bytes']
-            if 'fluidparticles' in fdata and fdata['fluidparticles']['enabled']:
-                cache_size += fdata['fluidparticles']['bytes']
-            if 'fluidparticlesid' in fdata and fdata['fluidparticlesid']['enabled']:
-                cache_size += fdata['fluidparticlesid']['bytes']
-            if 'fluidparticlesvelocity' in fdata and fdata['fluidparticlesvelocity']['enabled']:
-                cache_size += fdata['fluidparticlesvelocity']['bytes']
-            if 'fluidparticlesspeed' in fdata and fdata['fluidparticlesspeed']['enabled']:
-                cache_size += fdata['fluidparticlesspeed']['bytes']
-            if 'fluidparticlesvorticity' in fdata and fdata['fluidparticlesvorticity']['enabled']:
-                cache_size += fdata['fluidparticlesvorticity']['bytes']
-            if 'fluidparticlescolor' in fdata and fdata['fluidparticlescolor']['enabled']:
-                cache_size += fdata['fluidparticlescolor']['bytes']
-            if 'fluidparticlesage' in fdata and fdata['fluidparticlesage']['enabled']:
-                cache_size += fdata['fluidparticlesage']['bytes']
-            if 'fluidparticleslifetime' in fdata and fdata['fluidparticleslifetime']['enabled']:
-                cache_size += fdata['fluidparticleslifetime']['bytes']
-            if 'fluidparticlesviscosity' in fdata and fdata['fluidparticlesviscosity']['enabled']:
-                cache_size += fdata['fluidparticlesviscosity']['bytes']
-            if 'fluidparticleswhitewaterproximity' in fdata and fdata['fluidparticleswhitewaterproximity']['enabled']:
-                cache_size += fdata['fluidparticleswhitewaterproximity']['bytes']
-            if 'fluidparticlessourceid' in fdata and fdata['fluidparticlessourceid']['enabled']:
-                cache_size += fdata['fluidparticlessourceid']['bytes']
-            if fdata['particles']['enabled']:
-                cache_size += fdata['particles']['bytes']
-            if fdata['obstacle']['enabled']:
-                cache_size += fdata['obstacle']['bytes']
-        self.cache_bytes.set(cache_size)
+            solver_stats = cache_stats[solver]
+            error = fdata[solver + "_solver_error"]
+            iterations = fdata[solver + "_solver_iterations"]
+            solver_stats['enabled'] = solver_stats['enabled'] or bool(fdata[solver + "_solver_enabled"])
+            if error > solver_stats['max_error']:
+                solver_stats['max_error'] = error
+                solver_stats['max_error_frame'] = frameno
+            if iterations > solver_stats['max_iterations']:
+                solver_stats['max_iterations'] = iterations
+                solver_stats['max_iterations_frame'] = frameno
+            if not fdata[solver + "_solver_success"]:
+                solver_stats['failures'] += 1
+            solver_stats['steps'] += fdata["substeps"]
+            stress = 100.0 * (iterations / fdata[solver + "_solver_max_iterations"])
+            if stress > solver_stats['max_stress']:
+                solver_stats['max_stress'] = stress
+                solver_stats['max_stress_frame'] = frameno
+
+        return cache_stats
 
 
     def _update_cache_stats(self):
@@ -832,537 +911,115 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
             self.is_frame_info_available = False
             return
 
-        with open(statsfile, 'r', encoding='utf-8') as f:
-            try:
-                cachedata = json.loads(f.read())
-            except json.decoder.JSONDecodeError:
-                # JSON file may have become corrupted after a crash.
-                # In this case, repair the file by regenerating an
-                # empty JSON file and continue with empty stats.
-                cachedata = self.repair_corrupt_stats_file(statsfile)
-
-        self.is_cache_info_available = True
-
-        is_surface_enabled = False
-        is_preview_enabled = False
-        is_surfaceblur_enabled = False
-        is_surfacevelocity_enabled = False
-        is_surfacespeed_enabled = False
-        is_surfacevorticity_enabled = False
-        is_surfaceage_enabled = False
-        is_surfacelifetime_enabled = False
-        is_surfacewhitewaterproximity_enabled = False
-        is_surfacecolor_enabled = False
-        is_surfacesourceid_enabled = False
-        is_surfaceviscosity_enabled = False
-        is_foam_enabled = False
-        is_bubble_enabled = False
-        is_spray_enabled = False
-        is_dust_enabled = False
-        is_foamblur_enabled = False
-        is_bubbleblur_enabled = False
-        is_sprayblur_enabled = False
-        is_dustblur_enabled = False
-        is_foamvelocity_enabled = False
-        is_bubblevelocity_enabled = False
-        is_sprayvelocity_enabled = False
-        is_dustvelocity_enabled = False
-        is_foamid_enabled = False
-        is_bubbleid_enabled = False
-        is_sprayid_enabled = False
-        is_dustid_enabled = False
-        is_foamlifetime_enabled = False
-        is_bubblelifetime_enabled = False
-        is_spraylifetime_enabled = False
-        is_dustlifetime_enabled = False
-        is_fluid_particles_enabled = False
-        is_fluid_particles_id_enabled = False
-        is_fluid_particles_velocity_enabled = False
-        is_fluid_particles_vorticity_enabled = False
-        is_fluid_particles_color_enabled = False
-        is_fluid_particles_speed_enabled = False
-        is_fluid_particles_age_enabled = False
-        is_fluid_particles_lifetime_enabled = False
-        is_fluid_particles_viscosity_enabled = False
-        is_fluid_particles_whitewater_proximity_enabled = False
-        is_fluid_particles_source_id_enabled = False
-        is_debug_particles_enabled = False
-        is_obstacle_enabled = False
-        surface_bytes = 0
-        preview_bytes = 0
-        surfaceblur_bytes = 0
-        surfacevelocity_bytes = 0
-        surfacespeed_bytes = 0
-        surfacevorticity_bytes = 0
-        surfaceage_bytes = 0
-        surfacelifetime_bytes = 0
-        surfacewhitewaterproximity_bytes = 0
-        surfacecolor_bytes = 0
-        surfacesourceid_bytes = 0
-        surfaceviscosity_bytes = 0
-        foam_bytes = 0
-        bubble_bytes = 0
-        spray_bytes = 0
-        dust_bytes = 0
-        foamblur_bytes = 0
-        bubbleblur_bytes = 0
-        sprayblur_bytes = 0
-        dustblur_bytes = 0
-        foamvelocity_bytes = 0
-        bubblevelocity_bytes = 0
-        sprayvelocity_bytes = 0
-        dustvelocity_bytes = 0
-        foamid_bytes = 0
-        bubbleid_bytes = 0
-        sprayid_bytes = 0
-        dustid_bytes = 0
-        foamlifetime_bytes = 0
-        bubblelifetime_bytes = 0
-        spraylifetime_bytes = 0
-        dustlifetime_bytes = 0
-        fluid_particles_bytes = 0
-        fluid_particles_id_bytes = 0
-        fluid_particles_velocity_bytes = 0
-        fluid_particles_speed_bytes = 0
-        fluid_particles_vorticity_bytes = 0
-        fluid_particles_color_bytes = 0
-        fluid_particles_age_bytes = 0
-        fluid_particles_lifetime_bytes = 0
-        fluid_particles_viscosity_bytes = 0
-        fluid_particles_whitewater_proximity_bytes = 0
-        fluid_particles_source_id_bytes = 0
-        debug_particles_bytes = 0
-        obstacle_bytes = 0
-
-        total_time = 0.0
-        time_mesh = 0.0
-        time_advection = 0.0
-        time_particles = 0.0
-        time_pressure = 0.0
-        time_diffuse = 0.0
-        time_viscosity = 0.0
-        time_objects = 0.0
-        time_other = 0.0
-        is_data_in_cache = False
-        num_cache_frames = 0
-        average_performance_score = 0
-        num_performance_score_frames = 0;
-        is_average_performance_score_enabled = False
-        for key in cachedata.keys():
-            if not key.isdigit():
-                continue
-
-            is_data_in_cache = True
-            num_cache_frames += 1
-
-            fdata = cachedata[key]
-            if 'performance_score' in fdata:
-                if fdata['performance_score'] != -1:
-                    num_performance_score_frames += 1
-                    is_average_performance_score_enabled = True
-                    average_performance_score += fdata['performance_score']
-
-            if fdata['surface']['enabled']:
-                is_surface_enabled = True
-                surface_bytes += fdata['surface']['bytes']
-            if fdata['preview']['enabled']:
-                is_preview_enabled = True
-                preview_bytes += fdata['preview']['bytes']
-            if fdata['surfaceblur']['enabled']:
-                is_surfaceblur_enabled = True
-                surfaceblur_bytes += fdata['surfaceblur']['bytes']
-            if 'surfacevelocity' in fdata and fdata['surfacevelocity']['enabled']: # If statement to support caches without a surfacevelocity entry
-                is_surfacevelocity_enabled = True
-                surfacevelocity_bytes += fdata['surfacevelocity']['bytes']
-            if 'surfacespeed' in fdata and fdata['surfacespeed']['enabled']: # If statement to support caches without a surfacespeed entry
-                is_surfacespeed_enabled = True
-                surfacespeed_bytes += fdata['surfacespeed']['bytes']
-            if 'surfacevorticity' in fdata and fdata['surfacevorticity']['enabled']: # If statement to support caches without a surfacevorticity entry
-                is_surfacevorticity_enabled = True
-                surfacevorticity_bytes += fdata['surfacevorticity']['bytes']
-            if 'surfaceage' in fdata and fdata['surfaceage']['enabled']: # If statement to support caches without a surfaceage entry
-                is_surfaceage_enabled = True
-                surfaceage_bytes += fdata['surfaceage']['bytes']
-            if 'surfacelifetime' in fdata and fdata['surfacelifetime']['enabled']: # If statement to support caches without a surfacelifetime entry
-                is_surfacelifetime_enabled = True
-                surfacelifetime_bytes += fdata['surfacelifetime']['bytes']
-            if 'surfacewhitewaterproximity' in fdata and fdata['surfacewhitewaterproximity']['enabled']: # If statement to support caches without a surfacewhitewaterproximity entry
-                is_surfacewhitewaterproximity_enabled = True
-                surfacewhitewaterproximity_bytes += fdata['surfacewhitewaterproximity']['bytes']
-            if 'surfacecolor' in fdata and fdata['surfacecolor']['enabled']: # If statement to support caches without a surfacecolor entry
-                is_surfacecolor_enabled = True
-                surfacecolor_bytes += fdata['surfacecolor']['bytes']
-            if 'surfacesourceid' in fdata and fdata['surfacesourceid']['enabled']: # If statement to support caches without a surfacesourceid entry
-                is_surfacesourceid_enabled = True
-                surfacesourceid_bytes += fdata['surfacesourceid']['bytes']
-            if 'surfaceviscosity' in fdata and fdata['surfaceviscosity']['enabled']: # If statement to support caches without a surfaceviscosity entry
-                is_surfaceviscosity_enabled = True
-                surfaceviscosity_bytes += fdata['surfaceviscosity']['bytes']
-            if fdata['foam']['enabled']:
-                is_foam_enabled = True
-                foam_bytes += fdata['foam']['bytes']
-            if fdata['bubble']['enabled']:
-                is_bubble_enabled = True
-                bubble_bytes += fdata['bubble']['bytes']
-            if fdata['spray']['enabled']:
-                is_spray_enabled = True
-                spray_bytes += fdata['spray']['bytes']
-            if 'dust' in fdata and fdata['dust']['enabled']: # If statement to support caches without a dust entry
-                is_dust_enabled = True
-                dust_bytes += fdata['dust']['bytes']
-            if fdata['foamblur']['enabled']:
-                is_foamblur_enabled = True
-                foamblur_bytes += fdata['foamblur']['bytes']
-            if fdata['bubbleblur']['enabled']:
-                is_bubbleeblur_enabled = True
-                bubbleblur_bytes += fdata['bubbleblur']['bytes']
-            if fdata['sprayblur']['enabled']:
-                is_sprayblur_enabled = True
-                sprayblur_bytes += fdata['sprayblur']['bytes']
-            if 'dustblur' in fdata and fdata['sprayblur']['enabled']: # If statement to support caches without a dustblur entry
-                is_dustblur_enabled = True
-                dustblur_bytes += fdata['dustblur']['bytes']
-            if 'foamvelocity' in fdata and fdata['foamvelocity']['enabled']:
-                is_foamvelocity_enabled = True
-                foamvelocity_bytes += fdata['foamvelocity']['bytes']
-            if 'bubblevelocity' in fdata and fdata['bubblevelocity']['enabled']:
-                is_bubblevelocity_enabled = True
-                bubblevelocity_bytes += fdata['bubblevelocity']['bytes']
-            if 'sprayvelocity' in fdata and fdata['sprayvelocity']['enabled']:
-                is_sprayvelocity_enabled = True
-                sprayvelocity_bytes += fdata['sprayvelocity']['bytes']
-            if 'dustvelocity' in fdata and fdata['dustvelocity']['enabled']:
-                is_dustvelocity_enabled = True
-                dustvelocity_bytes += fdata['dustvelocity']['bytes']
-            if 'foamid' in fdata and fdata['foamid']['enabled']:
-                is_foamid_enabled = True
-                foamid_bytes += fdata['foamid']['bytes']
-            if 'bubbleid' in fdata and fdata['bubbleid']['enabled']:
-                is_bubbleid_enabled = True
-                bubbleid_bytes += fdata['bubbleid']['bytes']
-            if 'sprayid' in fdata and fdata['sprayid']['enabled']:
-                is_sprayid_enabled = True
-                sprayid_bytes += fdata['sprayid']['bytes']
-            if 'dustid' in fdata and fdata['dustid']['enabled']:
-                is_dustid_enabled = True
-                dustid_bytes += fdata['dustid']['bytes']
-            if 'foamlifetime' in fdata and fdata['foamlifetime']['enabled']:
-                is_foamlifetime_enabled = True
-                foamlifetime_bytes += fdata['foamlifetime']['bytes']
-            if 'bubblelifetime' in fdata and fdata['bubblelifetime']['enabled']:
-                is_bubblelifetime_enabled = True
-                bubblelifetime_bytes += fdata['bubblelifetime']['bytes']
-            if 'spraylifetime' in fdata and fdata['spraylifetime']['enabled']:
-                is_spraylifetime_enabled = True
-                spraylifetime_bytes += fdata['spraylifetime']['bytes']
-            if 'dustlifetime' in fdata and fdata['dustlifetime']['enabled']:
-                is_dustlifetime_enabled = True
-                dustlifetime_bytes += fdata['dustlifetime']['bytes']
-            if 'fluidparticles' in fdata and fdata['fluidparticles']['enabled']:
-                is_fluid_particles_enabled = True
-                fluid_particles_bytes += fdata['fluidparticles']['bytes']
-            if 'fluidparticlesid' in fdata and fdata['fluidparticlesid']['enabled']:
-                is_fluid_particles_id_enabled = True
-                fluid_particles_id_bytes += fdata['fluidparticlesid']['bytes']
-            if 'fluidparticlesvelocity' in fdata and fdata['fluidparticlesvelocity']['enabled']:
-                is_fluid_particles_velocity_enabled = True
-                fluid_particles_velocity_bytes += fdata['fluidparticlesvelocity']['bytes']
-            if 'fluidparticlesspeed' in fdata and fdata['fluidparticlesspeed']['enabled']:
-                is_fluid_particles_speed_enabled = True
-                fluid_particles_speed_bytes += fdata['fluidparticlesspeed']['bytes']
-            if 'fluidparticlesvorticity' in fdata and fdata['fluidparticlesvorticity']['enabled']:
-                is_fluid_particles_vorticity_enabled = True
-                fluid_particles_vorticity_bytes += fdata['fluidparticlesvorticity']['bytes']
-            if 'fluidparticlescolor' in fdata and fdata['fluidparticlescolor']['enabled']:
-                is_fluid_particles_color_enabled = True
-                fluid_particles_color_bytes += fdata['fluidparticlescolor']['bytes']
-            if 'fluidparticlesage' in fdata and fdata['fluidparticlesage']['enabled']:
-                is_fluid_particles_age_enabled = True
-                fluid_particles_age_bytes += fdata['fluidparticlesage']['bytes']
-            if 'fluidparticleslifetime' in fdata and fdata['fluidparticleslifetime']['enabled']:
-                is_fluid_particles_lifetime_enabled = True
-                fluid_particles_lifetime_bytes += fdata['fluidparticleslifetime']['bytes']
-            if 'fluidparticlesviscosity' in fdata and fdata['fluidparticlesviscosity']['enabled']:
-                is_fluid_particles_viscosity_enabled = True
-                fluid_particles_viscosity_bytes += fdata['fluidparticlesviscosity']['bytes']
-            if 'fluidparticleswhitewaterproximity' in fdata and fdata['fluidparticleswhitewaterproximity']['enabled']:
-                is_fluid_particles_whitewater_proximity_enabled = True
-                fluid_particles_whitewater_proximity_bytes += fdata['fluidparticleswhitewaterproximity']['bytes']
-            if 'fluidparticlessourceid' in fdata and fdata['fluidparticlessourceid']['enabled']:
-                is_fluid_particles_source_id_enabled = True
-                fluid_particles_source_id_bytes += fdata['fluidparticlessourceid']['bytes']
-            if fdata['particles']['enabled']:
-                is_debug_particles_enabled = True
-                debug_particles_bytes += fdata['particles']['bytes']
-            if fdata['obstacle']['enabled']:
-                is_obstacle_enabled = True
-                obstacle_bytes += fdata['obstacle']['bytes']
-
-            total_time     += fdata['timing']['total']
-            time_mesh      += fdata['timing']['mesh']
-            time_advection += fdata['timing']['advection']
-            time_particles += fdata['timing']['particles']
-            time_pressure  += fdata['timing']['pressure']
-            time_diffuse   += fdata['timing']['diffuse']
-            time_viscosity += fdata['timing']['viscosity']
-            time_objects   += fdata['timing']['objects']
-
-        if not is_data_in_cache:
+        stats_store = flip_fluid_stats_store.get_stats_store(statsfile)
+        cache_stats = self._get_cache_stats(stats_store)
+        if cache_stats['num_frames'] == 0:
             self.is_cache_info_available = False
             return
 
-        if num_performance_score_frames > 0 and is_average_performance_score_enabled:
-            average_performance_score /= num_performance_score_frames
+        self.is_cache_info_available = True
+
+        num_performance_score_frames = cache_stats['num_performance_score_frames']
+        self.is_average_performance_score_enabled = num_performance_score_frames > 0
+        if num_performance_score_frames > 0:
+            self.average_performance_score = int(cache_stats['performance_score_total'] / num_performance_score_frames)
         else:
-            is_average_performance_score_enabled = False
-            average_performance_score = 0
+            self.average_performance_score = 0
 
         self.frame_start, _ = dprops.simulation.get_frame_range()
-        self.num_cache_frames = num_cache_frames
-        self.is_average_performance_score_enabled = is_average_performance_score_enabled
-        self.average_performance_score = int(average_performance_score)
-
-        self.surface_mesh.enabled = is_surface_enabled
-        self.preview_mesh.enabled = is_preview_enabled
-        self.surfaceblur_mesh.enabled = is_surfaceblur_enabled
-        self.surfacevelocity_mesh.enabled = is_surfacevelocity_enabled
-        self.surfacespeed_mesh.enabled = is_surfacespeed_enabled
-        self.surfacevorticity_mesh.enabled = is_surfacevorticity_enabled
-        self.surfaceage_mesh.enabled = is_surfaceage_enabled
-        self.surfacelifetime_mesh.enabled = is_surfacelifetime_enabled
-        self.surfacewhitewaterproximity_mesh.enabled = is_surfacewhitewaterproximity_enabled
-        self.surfacecolor_mesh.enabled = is_surfacecolor_enabled
-        self.surfacesourceid_mesh.enabled = is_surfacesourceid_enabled
-        self.surfaceviscosity_mesh.enabled = is_surfaceviscosity_enabled
-        self.foam_mesh.enabled = is_foam_enabled
-        self.bubble_mesh.enabled = is_bubble_enabled
-        self.spray_mesh.enabled = is_spray_enabled
-        self.dust_mesh.enabled = is_dust_enabled
-        self.foamblur_mesh.enabled = is_foamblur_enabled
-        self.bubbleblur_mesh.enabled = is_bubbleblur_enabled
-        self.sprayblur_mesh.enabled = is_sprayblur_enabled
-        self.dustblur_mesh.enabled = is_dustblur_enabled
-        self.foamvelocity_mesh.enabled = is_foamvelocity_enabled
-        self.bubblevelocity_mesh.enabled = is_bubblevelocity_enabled
-        self.sprayvelocity_mesh.enabled = is_sprayvelocity_enabled
-        self.dustvelocity_mesh.enabled = is_dustvelocity_enabled
-        self.foamid_mesh.enabled = is_foamid_enabled
-        self.bubbleid_mesh.enabled = is_bubbleid_enabled
-        self.sprayid_mesh.enabled = is_sprayid_enabled
-        self.dustid_mesh.enabled = is_dustid_enabled
-        self.foamlifetime_mesh.enabled = is_foamlifetime_enabled
-        self.bubblelifetime_mesh.enabled = is_bubblelifetime_enabled
-        self.spraylifetime_mesh.enabled = is_spraylifetime_enabled
-        self.dustlifetime_mesh.enabled = is_dustlifetime_enabled
-        self.fluid_particle_mesh.enabled = is_fluid_particles_enabled
-        self.fluid_particle_id_mesh.enabled = is_fluid_particles_id_enabled
-        self.fluid_particle_velocity_mesh.enabled = is_fluid_particles_velocity_enabled
-        self.fluid_particle_speed_mesh.enabled = is_fluid_particles_speed_enabled
-        self.fluid_particle_vorticity_mesh.enabled = is_fluid_particles_vorticity_enabled
-        self.fluid_particle_color_mesh.enabled = is_fluid_particles_color_enabled
-        self.fluid_particle_age_mesh.enabled = is_fluid_particles_age_enabled
-        self.fluid_particle_lifetime_mesh.enabled = is_fluid_particles_lifetime_enabled
-        self.fluid_particle_viscosity_mesh.enabled = is_fluid_particles_viscosity_enabled
-        self.fluid_particle_whitewater_proximity_mesh.enabled = is_fluid_particles_whitewater_proximity_enabled
-        self.fluid_particle_source_id_mesh.enabled = is_fluid_particles_source_id_enabled
-        self.debug_particle_mesh.enabled = is_debug_particles_enabled
-        self.obstacle_mesh.enabled = is_obstacle_enabled
-
-        self.surface_mesh.bytes.set(surface_bytes)
-        self.preview_mesh.bytes.set(preview_bytes)
-        self.surfaceblur_mesh.bytes.set(surfaceblur_bytes)
-        self.surfacevelocity_mesh.bytes.set(surfacevelocity_bytes)
-        self.surfacespeed_mesh.bytes.set(surfacespeed_bytes)
-        self.surfacevorticity_mesh.bytes.set(surfacevorticity_bytes)
-        self.surfaceage_mesh.bytes.set(surfaceage_bytes)
-        self.surfacelifetime_mesh.bytes.set(surfacelifetime_bytes)
-        self.surfacewhitewaterproximity_mesh.bytes.set(surfacewhitewaterproximity_bytes)
-        self.surfacecolor_mesh.bytes.set(surfacecolor_bytes)
-        self.surfacesourceid_mesh.bytes.set(surfacesourceid_bytes)
-        self.surfaceviscosity_mesh.bytes.set(surfaceviscosity_bytes)
-        self.foam_mesh.bytes.set(foam_bytes)
-        self.bubble_mesh.bytes.set(bubble_bytes)
-        self.spray_mesh.bytes.set(spray_bytes)
-        self.dust_mesh.bytes.set(dust_bytes)
-        self.foamblur_mesh.bytes.set(foamblur_bytes)
-        self.bubbleblur_mesh.bytes.set(bubbleblur_bytes)
-        self.sprayblur_mesh.bytes.set(sprayblur_bytes)
-        self.dustblur_mesh.bytes.set(dustblur_bytes)
-        self.foamvelocity_mesh.bytes.set(foamvelocity_bytes)
-        self.bubblevelocity_mesh.bytes.set(bubblevelocity_bytes)
-        self.sprayvelocity_mesh.bytes.set(sprayvelocity_bytes)
-        self.dustvelocity_mesh.bytes.set(dustvelocity_bytes)
-        self.foamid_mesh.bytes.set(foamid_bytes)
-        self.bubbleid_mesh.bytes.set(bubbleid_bytes)
-        self.sprayid_mesh.bytes.set(sprayid_bytes)
-        self.dustid_mesh.bytes.set(dustid_bytes)
-        self.foamlifetime_mesh.bytes.set(foamlifetime_bytes)
-        self.bubblelifetime_mesh.bytes.set(bubblelifetime_bytes)
-        self.spraylifetime_mesh.bytes.set(spraylifetime_bytes)
-        self.dustlifetime_mesh.bytes.set(dustlifetime_bytes)
-        self.fluid_particle_mesh.bytes.set(fluid_particles_bytes)
-        self.fluid_particle_id_mesh.bytes.set(fluid_particles_id_bytes)
-        self.fluid_particle_velocity_mesh.bytes.set(fluid_particles_velocity_bytes)
-        self.fluid_particle_speed_mesh.bytes.set(fluid_particles_speed_bytes)
-        self.fluid_particle_vorticity_mesh.bytes.set(fluid_particles_vorticity_bytes)
-        self.fluid_particle_color_mesh.bytes.set(fluid_particles_color_bytes)
-        self.fluid_particle_age_mesh.bytes.set(fluid_particles_age_bytes)
-        self.fluid_particle_lifetime_mesh.bytes.set(fluid_particles_lifetime_bytes)
-        self.fluid_particle_viscosity_mesh.bytes.set(fluid_particles_viscosity_bytes)
-        self.fluid_particle_whitewater_proximity_mesh.bytes.set(fluid_particles_whitewater_proximity_bytes)
-        self.fluid_particle_source_id_mesh.bytes.set(fluid_particles_source_id_bytes)
-        self.debug_particle_mesh.bytes.set(debug_particles_bytes)
-        self.obstacle_mesh.bytes.set(obstacle_bytes)
-
-        time_other = (total_time - time_mesh
-                                 - time_advection
-                                 - time_particles
-                                 - time_pressure
-                                 - time_diffuse
-                                 - time_viscosity
-                                 - time_objects)
-
-        self.time_mesh.time      = time_mesh
-        self.time_advection.time = time_advection
-        self.time_particles.time = time_particles
-        self.time_pressure.time  = time_pressure
-        self.time_diffuse.time   = time_diffuse
-        self.time_viscosity.time = time_viscosity
-        self.time_objects .time  = time_objects
-        self.time_other.time     = time_other
-        self.display_frame_viscosity_timing_stats = time_viscosity > 0.0
-        self.display_frame_diffuse_timing_stats = time_diffuse > 0.0
+        self.num_cache_frames = cache_stats['num_frames']
+
+        for prop_name, stats_key in CACHE_MESH_STATS:
+            mesh_stats = getattr(self, prop_name)
+            mesh_stats.enabled = cache_stats['mesh_enabled'][stats_key]
+            mesh_stats.bytes.set(cache_stats['mesh_bytes'][stats_key])
+
+        timing = cache_stats['timing']
+        total_time = cache_stats['total_time']
+        time_other = total_time - sum(timing.values())
+        time_stats = [
+            (self.time_mesh,       timing['mesh']),
+            (self.time_advection,  timing['advection']),
+            (self.time_particles,  timing['particles']),
+            (self.time_pressure,   timing['pressure']),
+            (self.time_diffuse,    timing['diffuse']),
+            (self.time_viscosity,  timing['viscosity']),
+            (self.time_objects,    timing['objects']),
+            (self.time_other,      time_other),
+            ]
 
         total_time = max(total_time, 1e-4)
-        self.time_mesh.set_time_pct(     100 * time_mesh      / total_time)
-        self.time_advection.set_time_pct(100 * time_advection / total_time)
-        self.time_particles.set_time_pct(100 * time_particles / total_time)
-        self.time_pressure.set_time_pct( 100 * time_pressure  / total_time)
-        self.time_diffuse.set_time_pct(  100 * time_diffuse   / total_time)
-        self.time_viscosity.set_time_pct(100 * time_viscosity / total_time)
-        self.time_objects.set_time_pct(  100 * time_objects   / total_time)
-        self.time_other.set_time_pct(    100 * time_other     / total_time)
-
-        self._update_cache_size(cachedata)
-
-        pressure_enabled = False
-        pressure_max_error = 0.0
-        pressure_max_error_frame = -1
-        pressure_max_iterations = 0
-        pressure_max_iterations_frame = -1
-        pressure_failures = 0
-        pressure_steps = 0
-        pressure_max_stress = 0.0
-        pressure_max_stress_frame = -1
-
-        viscosity_enabled = False
-        viscosity_max_error = 0.0
-        viscosity_max_error_frame = -1
-        viscosity_max_iterations = 0
-        viscosity_max_iterations_frame = -1
-        viscosity_failures = 0
-        viscosity_steps = 0
-        viscosity_max_stress = 0.0
-        viscosity_max_stress_frame = -1
-        for key in cachedata.keys():
-            if not key.isdigit():
-                continue
-
-            frameno = int(key)
-            fdata = cachedata[key]
-            if "pressure_solver_enabled" in fdata:
-                pressure_enabled = pressure_enabled or bool(fdata["pressure_solver_enabled"])
-                if fdata["pressure_solver_error"] > pressure_max_error:
-                    pressure_max_error = fdata["pressure_solver_error"]
-                    pressure_max_error_frame = frameno
-                if fdata["pressure_solver_iterations"] > pressure_max_iterations:
-                    pressure_max_iterations = fdata["pressure_solver_iterations"]
-                    pressure_max_iterations_frame = frameno
-                if not fdata["pressure_solver_success"]:
-                    pressure_failures += 1
-                pressure_steps += fdata["substeps"]
-                stress = 100.0 * (fdata["pressure_solver_iterations"] / fdata["pressure_solver_max_iterations"])
-                if stress > pressure_max_stress:
-                    pressure_max_stress = stress
-                    pressure_max_stress_frame = frameno
-
-            if "viscosity_solver_enabled" in fdata:
-                viscosity_enabled = viscosity_enabled or bool(fdata["viscosity_solver_enabled"])
-                if fdata["viscosity_solver_error"] > viscosity_max_error:
-                    viscosity_max_error = fdata["viscosity_solver_error"]
-                    viscosity_max_error_frame = frameno
-                if fdata["viscosity_solver_iterations"] > viscosity_max_iterations:
-                    viscosity_max_iterations = fdata["viscosity_solver_iterations"]
-                    viscosity_max_iterations_frame = frameno
-                if not fdata["viscosity_solver_success"]:
-                    viscosity_failures += 1
-                viscosity_steps += fdata["substeps"]
-                stress = 100.0 * (fdata["viscosity_solver_iterations"] / fdata["viscosity_solver_max_iterations"])
-                if stress > viscosity_max_stress:
-                    viscosity_max_stress = stress
-                    viscosity_max_stress_frame = frameno
-
-        self.pressure_solver_enabled = pressure_enabled
-        self.pressure_solver_failures = pressure_failures
-        self.pressure_solver_steps = pressure_steps
-        self.pressure_solver_max_iterations = pressure_max_iterations
-        self.pressure_solver_max_iterations_frame = pressure_max_iterations_frame
-        self.pressure_solver_max_error = pressure_max_error
-        self.pressure_solver_max_error_frame = pressure_max_error_frame
-        self.pressure_solver_max_stress = pressure_max_stress
-        self.pressure_solver_max_stress_frame = pressure_max_stress_frame
-
-        self.viscosity_solver_enabled = viscosity_enabled
-        self.viscosity_solver_failures = viscosity_failures
-        self.viscosity_solver_steps = viscosity_steps
-        self.viscosity_solver_max_iterations = viscosity_max_iterations
-        self.viscosity_solver_max_iterations_frame = viscosity_max_iterations_frame
-        self.viscosity_solver_max_error = viscosity_max_error
-        self.viscosity_solver_max_error_frame = viscosity_max_error_frame
-        self.viscosity_solver_max_stress = viscosity_max_stress
-        self.viscosity_solver_max_stress_frame = viscosity_max_stress_frame
-
-
-    def _get_estimated_frame_speed(self, cachedata):
-        max_frame = 0
-        num_frames = 0
-        total_time = 0.0
-        for key in cachedata.keys():
-            if not key.isdigit():
-                continue
-            max_frame = max(max_frame, cachedata[key]['frame'])
-            num_frames += 1
-            total_time += cachedata[key]['timing']['total']
-
-        if num_frames <= 1:
-            return -1.0
-
-        avg_frame_time = total_time / num_frames
-
-        is_frame_data_available = (max_frame + 1) * [False]
-        for key in cachedata.keys():
-            if not key.isdigit():
-                continue
-            is_frame_data_available[cachedata[key]['frame']] = True
-
-        frame_times = (max_frame + 1) * [avg_frame_time]
-        for key in cachedata.keys():
-            if not key.isdigit():
-                continue
-            frame_times[cachedata[key]['frame']] = cachedata[key]['timing']['total']
-
-        # First frame is often innaccurate, so discard
-        frame_times.pop(0)
+        for time_stats_props, t in time_stats:
+            time_stats_props.time = t
+            time_stats_props.set_time_pct(100 * t / total_time)
+        self.display_frame_viscosity_timing_stats = timing['viscosity'] > 0.0
+        self.display_frame_diffuse_timing_stats = timing['diffuse'] > 0.0
+
+        self.cache_bytes.set(cache_stats['cache_size'])
+
+        for solver in ['pressure', 'viscosity']:
+            solver_stats = cache_stats[solver]
+            prefix = solver + "_solver_"
+            setattr(self, prefix + "enabled",              solver_stats['enabled'])
+            setattr(self, prefix + "failures",             solver_stats['failures'])
+            setattr(self, prefix + "steps",                solver_stats['steps'])
+            setattr(self, prefix + "max_iterations",       solver_stats['max_iterations'])
+            setattr(self, prefix + "max_iterations_frame", solver_stats['max_iterations_frame'])
+            setattr(self, prefix + "max_error",            solver_stats['max_error'])
+            setattr(self, prefix + "max_error_frame",      solver_stats['max_error_frame'])
+            setattr(self, prefix + "max_stress",           solver_stats['max_stress'])
+            setattr(self, prefix + "max_stress_frame",     solver_stats['max_stress_frame'])
+
+
+    # The frame speed is a moving average over the frame times in frame order.
+    # Missing frames count with the average frame time of the frames before them.
+    def _get_initial_frame_speed_stats(self):
+        return {
+            'num_frames': 0,
+            'total_time': 0.0,
+            'last_frame': 0,
+            'average_speed': None,
+            }
+
+
+    def _accumulate_frame_speed_stats(self, speed_stats, key, fdata):
+        if not key.isdigit():
+            return speed_stats
+
+        frameno = fdata['frame']
+        frame_time = fdata['timing']['total']
+        if speed_stats['num_frames'] > 0:
+            avg_frame_time = speed_stats['total_time'] / speed_stats['num_frames']
+        else:
+            avg_frame_time = frame_time
+        speed_stats['num_frames'] += 1
+        speed_stats['total_time'] += frame_time
 
-        frame_speeds = []
-        for t in frame_times:
-            frame_speeds.append(1.0 / max(1e-6, t))
+        # First frame is often innaccurate, so discard. Frames that are added out
+        # of order only count toward the average frame time.
+        if frameno <= speed_stats['last_frame']:
+            return speed_stats
+        frame_times = (frameno - speed_stats['last_frame'] - 1) * [avg_frame_time] + [frame_time]
+        speed_stats['last_frame'] = frameno
 
         smoothing_factor = 0.1
-        average_speed = frame_speeds[0]
-        for s in frame_speeds:
-            average_speed = smoothing_factor * s + (1.0 - smoothing_factor) * average_speed
-        return average_speed
+        for t in frame_times:
+            s = 1.0 / max(1e-6, t)
+            if speed_stats['average_speed'] is None:
+                speed_stats['average_speed'] = s
+            speed_stats['average_speed'] = smoothing_factor * s + (1.0 - smoothing_factor) * speed_stats['average_speed']
+        return speed_stats
+
+
+    def _get_estimated_frame_speed(self, stats_store):
+        speed_stats = stats_store.get_accumulated_value(
+                "frame_speed_stats", 
+                self._get_initial_frame_speed_stats, 
+                self._accumulate_frame_speed_stats
+                )
+        if speed_stats['num_frames'] <= 1 or speed_stats['average_speed'] is None:
+            return -1.0
+        return speed_stats['average_speed']
 
 
     def _update_estimated_time_remaining(self):
@@ -1375,16 +1032,8 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
         if not os.path.isfile(statsfile):
             return
 
-        with open(statsfile, 'r', encoding='utf-8') as f:
-            try:
-                cachedata = json.loads(f.read())
-            except json.decoder.JSONDecodeError:
-                # JSON file may have become corrupted after a crash.
-                # In this case, repair the file by regenerating an
-                # empty JSON file and continue with empty stats.
-                cachedata = self.repair_corrupt_stats_file(statsfile)
-
-        frame_speed = self._get_estimated_frame_speed(cachedata)
+        stats_store = flip_fluid_stats_store.get_stats_store(statsfile)
+        frame_speed = self._get_estimated_frame_speed(stats_store)
         self.estimated_frame_speed = frame_speed
         self.is_estimated_time_remaining_available = frame_speed > 0
 
@@ -1400,6 +1049,7 @@ class DomainStatsProperties(bpy.types.PropertyGroup):
 
 def register():
     bpy.utils.register_class(ByteProperty)
+    bpy.utils.register_class(FileTypeBytesProperties)
     bpy.utils.register_class(MeshStatsProperties)
     bpy.utils.register_class(TimeStatsProperties)
     bpy.utils.register_class(SolverStressProperties)
@@ -1408,6 +1058,7 @@ def register():
 
 def unregister():
     bpy.utils.unregister_class(ByteProperty)
+    bpy.utils.unregister_class(FileTypeBytesProperties)
     bpy.utils.unregister_class(MeshStatsProperties)
     bpy.utils.unregister_class(TimeStatsProperties)
     bpy.utils.unregister_class(SolverStressProperties)
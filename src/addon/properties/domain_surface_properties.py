@@ -346,6 +346,17 @@ class DomainSurfaceProperties(bpy.types.PropertyGroup):
             options={'HIDDEN'},
             ); exec(conv("enable_viscosity_attribute"))
 
+    remesh_num_threads = IntProperty(
+            name="Threads",
+            description="Number of cached frames to re-mesh simultaneously. Each frame"
+                " is meshed using multiple threads, so a small number of frames is"
+                " usually enough to keep all processors busy. Higher values will use"
+                " more RAM",
+            min=1, soft_max=16,
+            default=4,
+            ); exec(conv("remesh_num_threads"))
+    remesh_progress = FloatProperty(default=0.0); exec(conv("remesh_progress"))
+
     native_particle_scale = FloatProperty(default=3.0); exec(conv("native_particle_scale"))
     default_cells_per_compute_chunk = FloatProperty(default=15.0); exec(conv("default_cells_per_compute_chunk"))   # in millions
 
@@ -358,6 +369,7 @@ class DomainSurfaceProperties(bpy.types.PropertyGroup):
     velocity_attributes_expanded = BoolProperty(default=False); exec(conv("velocity_attributes_expanded"))
     color_attributes_expanded = BoolProperty(default=False); exec(conv("color_attributes_expanded"))
     other_attributes_expanded = BoolProperty(default=False); exec(conv("other_attributes_expanded"))
+    remesh_from_cache_expanded = BoolProperty(default=False); exec(conv("remesh_from_cache_expanded"))
 
     show_smoothing_radius_in_ui = BoolProperty(default=False); exec(conv("show_smoothing_radius_in_ui"))
     is_smoothing_radius_updated_to_default = BoolProperty(default=False); exec(conv("is_smoothing_radius_updated_to_default"))
@@ -225,6 +225,35 @@ class FLIPFluidAddonPreferences(bpy.types.AddonPreferences):
     exec(vcu.convert_attribute_to_28("enable_bake_alarm"))
     FAKE_PREFERENCES.enable_experimental_build_warning = False
 
+    enable_frame_prefetch = BoolProperty(
+            name="Prefetch upcoming frames",
+            description="Read the simulation cache files of upcoming frames on background threads during timeline"
+                " playback and rendering so that frames load faster. Prefetched frames are kept in memory up to"
+                " the memory limit",
+            default=True,
+            );
+    exec(vcu.convert_attribute_to_28("enable_frame_prefetch"))
+    FAKE_PREFERENCES.enable_frame_prefetch = True
+
+    num_prefetch_frames = IntProperty(
+            name="Frames",
+            description="Maximum number of upcoming frames to prefetch. Fewer frames are prefetched if they do not"
+                " fit within the memory limit",
+            min=1, soft_max=16, max=64,
+            default=4,
+            )
+    exec(vcu.convert_attribute_to_28("num_prefetch_frames"))
+    FAKE_PREFERENCES.num_prefetch_frames = 4
+
+    frame_prefetch_memory_limit = IntProperty(
+            name="Memory Limit (MB)",
+            description="Maximum amount of memory in megabytes used to store prefetched frames",
+            min=64,
+            default=2048,
+            )
+    exec(vcu.convert_attribute_to_28("frame_prefetch_memory_limit"))
+    FAKE_PREFERENCES.frame_prefetch_memory_limit = 2048
+
     enable_presets = BoolProperty(
                 name="Enable Presets",
                 description="Presets are a deprecated feature that will no longer be updated. Enable to use the older preset"
@@ -827,6 +856,17 @@ class FLIPFluidAddonPreferences(bpy.types.AddonPreferences):
         row.label(text="")
         helper_column.separator()
 
+        box = self.layout.box()
+        box.enabled = is_installation_complete
+        helper_column = box.column(align=True)
+        helper_column.label(text="Simulation Playback:")
+        helper_column.prop(self, "enable_frame_prefetch")
+        row = helper_column.row(align=True)
+        row.enabled = self.enable_frame_prefetch
+        row.prop(self, "num_prefetch_frames")
+        row.prop(self, "frame_prefetch_memory_limit")
+        helper_column.separator()
+
         if vcu.is_blender_28():
             box = self.layout.box()
             box.enabled = is_installation_complete
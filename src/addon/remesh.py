@@ -0,0 +1,284 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Re-generates the fluid surface mesh and surface attributes of a baked
+# simulation from the cached fluid particle files, without re-running the
+# simulation.
+#
+# Frames are meshed in parallel in a thread pool. The engine releases the GIL
+# while meshing, so frames run concurrently within the Blender process.
+
+import os, json, struct, traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .objects import flip_fluid_map
+from .filesystem import filesystem_protection_layer as fpl
+from .pyfluid import SurfaceRemesher
+
+
+# Surface attributes that are transferred from fluid particle attributes:
+# (settings key, particle attribute file prefix, surface attribute file prefix,
+#  surface attribute file extension, is_vector_attribute)
+SURFACE_ATTRIBUTES = [
+    ("velocity",            "velocity",            "velocity",            ".bobj", True),
+    ("vorticity",           "vorticity",           "vorticity",           ".bobj", True),
+    ("color",               "color",               "color",               ".bobj", True),
+    ("whitewaterproximity", "whitewaterproximity", "whitewaterproximity", ".bobj", True),
+    ("age",                 "age",                 "age",                 ".data", False),
+    ("lifetime",            "lifetime",            "lifetime",            ".data", False),
+    ("viscosity",           "viscosity",           "viscosity",           ".data", False),
+]
+
+# Surface attributes that cannot be generated from the particle cache. Existing
+# files would not match the new surface mesh.
+UNSUPPORTED_SURFACE_ATTRIBUTES = [
+    ("sourceid", ".data"),
+]
+
+
+# Animatable settings may be set to a property data dict and are resolved for
+# each frame, relative to frame_start
+class RemeshSettings(object):
+    def __init__(self):
+        self.frame_start = 0
+        self.subdivisions = 1
+        self.compute_chunks = 1
+        self.particle_scale = 1.0
+        self.native_particle_scale = 1.0
+        self.smoothing_value = 0.5
+        self.smoothing_iterations = 2
+        self.enable_remove_surface_near_domain = False
+        self.remove_surface_near_domain_distance = 0
+        self.preview_dx = 0.0
+        self.enable_motion_blur = False
+        self.enable_speed_attribute = False
+        self.attributes = {}
+        self.num_threads = 1
+
+
+def __frame_number_to_string(frameno):
+    return str(frameno).zfill(6)
+
+
+def __get_bakefile_path(cache_directory, prefix, frameno, extension):
+    filename = prefix + __frame_number_to_string(frameno) + extension
+    return os.path.join(cache_directory, "bakefiles", filename)
+
+
+def __get_parameter_data(parameter, frameno=0):
+    if hasattr(parameter, 'data') and hasattr(parameter, 'is_animated'):
+        if parameter.is_animated:
+            frameno = max(min(frameno, len(parameter.data) - 1), 0)
+            return parameter.data[frameno]
+        return parameter.data
+    return parameter
+
+
+def __extract_data(data_filepath):
+    with open(data_filepath, 'r', encoding='utf-8') as f:
+        json_data = json.loads(f.read())
+    return flip_fluid_map.Map(json_data)
+
+
+def get_cached_frames(cache_directory):
+    bakefiles_directory = os.path.join(cache_directory, "bakefiles")
+    if not os.path.isdir(bakefiles_directory):
+        return []
+
+    prefix = "fluidparticles"
+    extension = ".ffp3"
+    frames = []
+    for f in os.listdir(bakefiles_directory):
+        if not (f.startswith(prefix) and f.endswith(extension)):
+            continue
+        frame_string = f[len(prefix):-len(extension)]
+        if frame_string.isdigit():
+            frames.append(int(frame_string))
+    frames.sort()
+    return frames
+
+
+# Returns the packed particle data of an .ffp3 file, skipping the header and
+# id table, and the number of particles.
+def __read_ffp3_data(filepath, sizeof_attribute):
+    with open(filepath, 'rb') as f:
+        filedata = f.read()
+    if len(filedata) < 16:
+        return b"", 0
+
+    num_surface, num_boundary, num_interior, id_limit = struct.unpack_from("4I", filedata, 0)
+    num_particles = num_surface + num_boundary + num_interior
+    data_offset = 16 + id_limit * 3 * 4
+    data = filedata[data_offset:data_offset + num_particles * sizeof_attribute]
+    return data, num_particles
+
+
+def __get_frame_delta_time(domain_data, frameno):
+    simulator_frameno = frameno - domain_data.initialize.frame_start
+    time_scale = __get_parameter_data(domain_data.simulation.time_scale, simulator_frameno)
+    fps = __get_parameter_data(domain_data.simulation.frames_per_second, simulator_frameno)
+    return (1.0 / fps) * time_scale
+
+
+def __write_file(filepath, filedata):
+    with open(filepath, 'wb') as f:
+        f.write(filedata)
+
+
+def __delete_file(filepath):
+    if os.path.isfile(filepath):
+        fpl.delete_file(filepath, error_ok=True)
+
+
+def __remesh_frame(domain_data, cache_directory, frameno, settings):
+    bounds_filepath = __get_bakefile_path(cache_directory, "bounds", frameno, ".bbox")
+    with open(bounds_filepath, 'r', encoding='utf-8') as f:
+        bounds = json.loads(f.read())
+
+    particle_filepath = __get_bakefile_path(cache_directory, "fluidparticles", frameno, ".ffp3")
+    particle_data, num_particles = __read_ffp3_data(particle_filepath, 12)
+
+    settings_frameno = frameno - settings.frame_start
+    particle_scale = __get_parameter_data(settings.particle_scale, settings_frameno)
+    particle_scale *= settings.native_particle_scale
+
+    # Particles and bounds are stored in domain space, so the surface is
+    # meshed in domain units and does not need the simulation world scale
+    remesher = SurfaceRemesher(bounds["isize"], bounds["jsize"], bounds["ksize"], bounds["dx"])
+    remesher.subdivisions = settings.subdivisions
+    remesher.compute_chunks = settings.compute_chunks
+    remesher.particle_scale = particle_scale
+    remesher.smoothing_value = __get_parameter_data(settings.smoothing_value, settings_frameno)
+    remesher.smoothing_iterations = __get_parameter_data(settings.smoothing_iterations, settings_frameno)
+    remesher.enable_remove_surface_near_domain = \
+        __get_parameter_data(settings.enable_remove_surface_near_domain, settings_frameno)
+    remesher.remove_surface_near_domain_distance = \
+        __get_parameter_data(settings.remove_surface_near_domain_distance, settings_frameno) - 1
+    remesher.enable_preview_mesh = settings.preview_dx > 0.0
+    remesher.preview_dx = settings.preview_dx
+    remesher.domain_scale = 1.0
+    remesher.domain_offset = (bounds["x"], bounds["y"], bounds["z"])
+    remesher.mesh_particles(particle_data, num_particles)
+
+    __write_file(__get_bakefile_path(cache_directory, "", frameno, ".bobj"), remesher.get_surface_data())
+    __write_file(__get_bakefile_path(cache_directory, "preview", frameno, ".bobj"), remesher.get_preview_data())
+
+    # Particle velocities are stored in simulation units
+    velocity_filepath = __get_bakefile_path(cache_directory, "fluidparticlesvelocity", frameno, ".ffp3")
+    velocity_data = None
+    if os.path.isfile(velocity_filepath):
+        velocity_data, num_values = __read_ffp3_data(velocity_filepath, 12)
+        if num_values != num_particles:
+            velocity_data = None
+
+    blur_filepath = __get_bakefile_path(cache_directory, "blur", frameno, ".bobj")
+    if settings.enable_motion_blur and velocity_data is not None:
+        domain_scale = 1.0 / domain_data.initialize.scale
+        blur_scale = domain_scale * __get_frame_delta_time(domain_data, frameno)
+        remesher.transfer_vector_attribute(velocity_data, num_particles)
+        __write_file(blur_filepath, remesher.get_vector_attribute_data(blur_scale))
+    else:
+        __delete_file(blur_filepath)
+
+    speed_filepath = __get_bakefile_path(cache_directory, "speed", frameno, ".data")
+    if settings.enable_speed_attribute and velocity_data is not None:
+        remesher.transfer_vector_attribute(velocity_data, num_particles)
+        __write_file(speed_filepath, remesher.get_vector_magnitude_attribute_data())
+    else:
+        __delete_file(speed_filepath)
+
+    for key, particle_prefix, surface_prefix, extension, is_vector in SURFACE_ATTRIBUTES:
+        surface_filepath = __get_bakefile_path(cache_directory, surface_prefix, frameno, extension)
+        particle_filepath = __get_bakefile_path(cache_directory, "fluidparticles" + particle_prefix, frameno, ".ffp3")
+        if not settings.attributes.get(key, False) or not os.path.isfile(particle_filepath):
+            __delete_file(surface_filepath)
+            continue
+
+        if is_vector:
+            attribute_data, num_values = __read_ffp3_data(particle_filepath, 12)
+        else:
+            attribute_data, num_values = __read_ffp3_data(particle_filepath, 4)
+        if num_values != num_particles:
+            __delete_file(surface_filepath)
+            continue
+
+        if is_vector:
+            remesher.transfer_vector_attribute(attribute_data, num_values)
+            filedata = remesher.get_vector_attribute_data()
+        else:
+            remesher.transfer_scalar_attribute(attribute_data, num_values)
+            filedata = remesher.get_scalar_attribute_data()
+        __write_file(surface_filepath, filedata)
+
+    for surface_prefix, extension in UNSUPPORTED_SURFACE_ATTRIBUTES:
+        __delete_file(__get_bakefile_path(cache_directory, surface_prefix, frameno, extension))
+
+
+def __launch_remesh(datafile, cache_directory, remeshdata, settings, frames):
+    domain_data = __extract_data(datafile).domain_data
+
+    num_frames = len(frames)
+    num_completed = 0
+    executor = ThreadPoolExecutor(max_workers=max(settings.num_threads, 1))
+    futures = {}
+    try:
+        for frameno in frames:
+            future = executor.submit(__remesh_frame, domain_data, cache_directory, frameno, settings)
+            futures[future] = frameno
+
+        for future in as_completed(futures):
+            future.result()
+            num_completed += 1
+            remeshdata.completed_frames = num_completed
+            remeshdata.progress = num_completed / num_frames
+            if remeshdata.is_cancelled:
+                break
+    finally:
+        # On cancel or error, only wait for the frames that are already running
+        for f in futures:
+            f.cancel()
+        executor.shutdown(wait=True)
+
+
+def remesh(datafile, cache_directory, remeshdata, settings, frames=None):
+    if frames is None:
+        frames = get_cached_frames(cache_directory)
+
+    try:
+        if not frames:
+            raise Exception("No cached fluid particle frames found in <" + cache_directory + ">")
+        if not os.path.isfile(datafile):
+            raise Exception("Simulation export data not found: <" + datafile + ">")
+
+        print("------------------------------------------------------------")
+        print("Re-meshing " + str(len(frames)) + " cached frames...")
+        __launch_remesh(datafile, cache_directory, remeshdata, settings, frames)
+        print("Re-meshing complete: " + str(remeshdata.completed_frames) + " frames")
+        print("------------------------------------------------------------")
+
+    except Exception as e:
+        errmsg = str(e)
+        if "std::bad_alloc" in errmsg:
+            errmsg = "Out of memory. "
+        elif not errmsg:
+            errmsg = "Unknown error. "
+        if not errmsg.endswith(". "):
+            errmsg += ". "
+        errmsg += "See system console for error info."
+        traceback.print_exc()
+        remeshdata.error_message = errmsg
+
+    remeshdata.is_finished = True
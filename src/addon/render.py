@@ -34,6 +34,9 @@ ENABLE_OBSTACLE_DEBUG_LOAD = True
 ENABLE_PARTICLE_DEBUG_LOAD = True
 ENABLE_FORCE_FIELD_DEBUG_LOAD = True
 
+PREFETCH_PREVIOUS_FRAME = None
+PREFETCH_DIRECTION = 1
+
 
 def is_rendering():
     global IS_RENDERING
@@ -698,6 +701,38 @@ def __load_force_field_debug_frame(frameno, force_reload=False):
         dprops.mesh_cache.gl_force_field.load_frame(frameno, force_load)
 
 
+def __get_prefetch_frame_offsets(frameno, num_frames):
+    global PREFETCH_PREVIOUS_FRAME
+    global PREFETCH_DIRECTION
+
+    if PREFETCH_PREVIOUS_FRAME is not None and frameno != PREFETCH_PREVIOUS_FRAME:
+        PREFETCH_DIRECTION = 1 if frameno > PREFETCH_PREVIOUS_FRAME else -1
+    PREFETCH_PREVIOUS_FRAME = frameno
+
+    direction = PREFETCH_DIRECTION
+    if is_rendering():
+        direction = 1
+    step = max(bpy.context.scene.frame_step, 1)
+    return [direction * step * i for i in range(1, num_frames + 1)]
+
+
+def __prefetch_frames(frameno):
+    dprops = __get_domain_properties()
+    preferences = vcu.get_addon_preferences()
+    if not preferences.enable_frame_prefetch:
+        # A memory limit of 0 releases all prefetched frames
+        dprops.mesh_cache.prefetch_frames([], 0)
+        return
+
+    num_frames = preferences.num_prefetch_frames
+    if dprops.render.simulation_playback_mode == 'PLAYBACK_MODE_HOLD_FRAME':
+        num_frames = 0
+
+    frame_offsets = __get_prefetch_frame_offsets(frameno, num_frames)
+    memory_limit = preferences.frame_prefetch_memory_limit * 1024 * 1024
+    dprops.mesh_cache.prefetch_frames(frame_offsets, memory_limit)
+
+
 def __load_frame(frameno, force_reload=False, depsgraph=None):
     if not __is_domain_set():
         return
@@ -716,6 +751,7 @@ def __load_frame(frameno, force_reload=False, depsgraph=None):
     __load_fluid_particle_debug_frame(frameno, force_reload)
     __load_force_field_debug_frame(frameno, force_reload)
     __load_obstacle_debug_frame(frameno, force_reload)
+    __prefetch_frames(frameno)
 
 
 def reload_frame(frameno):
@@ -0,0 +1,7 @@
+import bpy, sys
+
+argv = sys.argv
+argv = argv[argv.index("--") + 1:]
+job_filepath = argv[0]
+
+bpy.ops.flip_fluid_operators.export_animated_geometry_shard_cmd(job_filepath=job_filepath)
@@ -190,6 +190,12 @@ velocity_transfer_methods = (
     ('VELOCITY_TRANSFER_METHOD_APIC', "APIC", "Choose APIC for high vorticity, swirly, and stable simulations. Generally better for small scale simulations where reduced surface noise is desirable or for viscous simulations.")
     )
 
+pressure_solver_methods = (
+    ('PRESSURE_SOLVER_METHOD_PCG',          "PCG",          "Conjugate gradient solver with an incomplete Cholesky preconditioner. The original solver, which may require many iterations on high resolution domains."),
+    ('PRESSURE_SOLVER_METHOD_PARALLEL_PCG', "Parallel PCG", "Same solver and results as PCG, but the incomplete Cholesky preconditioner is computed and applied on multiple threads. Faster than PCG on CPUs with many cores."),
+    ('PRESSURE_SOLVER_METHOD_MGPCG',        "MGPCG",        "Conjugate gradient solver with a multithreaded multigrid preconditioner. Requires far fewer iterations than PCG and is generally faster on high resolution domains and CPUs with many cores.")
+    )
+
 surface_tension_solver_methods = (
     ('SURFACE_TENSION_SOLVER_METHOD_REGULAR', "Regular", "Choose for general purpose surface tension effects."),
     ('SURFACE_TENSION_SOLVER_METHOD_SMOOTH',  "Smooth",  "Choose for improved stability and smoother results in small-scale surface tension effects. Good for thin streams/strands of liquid and for high surface tension effects. Not recommended for highly chaotic liquid motion or large volumes of liquid as this can result in volume increase issues.")
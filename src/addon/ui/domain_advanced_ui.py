@@ -151,6 +151,10 @@ class FLIPFLUID_PT_DomainTypeAdvancedPanel(bpy.types.Panel):
             column = box.column(align=True)
             column.prop(aprops, "pressure_solver_max_iterations")
             column.prop(aprops, "viscosity_solver_max_iterations")
+            row = column.row(align=True)
+            row.label(text="Pressure Solver:")
+            row.prop(aprops, "pressure_solver_method", expand=True)
+            column.prop(aprops, "enable_solver_warm_start")
 
         box = self.layout.box()
         row = box.row(align=True)
@@ -189,6 +193,25 @@ class FLIPFLUID_PT_DomainTypeAdvancedPanel(bpy.types.Panel):
             column = box.column()
             column.prop(aprops, "enable_fracture_optimization")
 
+            column = box.column(align=True)
+            column.prop(aprops, "enable_asynchronous_output")
+            row = column.row(align=True)
+            row.enabled = aprops.enable_asynchronous_output
+            row.prop(aprops, "max_output_frames_in_flight")
+            row.prop(aprops, "num_output_writer_threads")
+
+            column = box.column()
+            column.prop(aprops, "skip_unchanged_objects_on_export")
+
+            column = box.column(align=True)
+            column.prop(aprops, "enable_parallel_animated_export")
+            row = column.row(align=True)
+            row.enabled = aprops.enable_parallel_animated_export
+            row.prop(aprops, "num_animated_export_processes")
+
+            column = box.column()
+            column.prop(aprops, "enable_geometry_compression")
+
             if show_documentation:
                 column = box.column(align=True)
                 column.operator(
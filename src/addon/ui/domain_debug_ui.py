@@ -206,6 +206,12 @@ class FLIPFLUID_PT_DomainTypeDebugPanel(bpy.types.Panel):
 
         box = self.layout.box()
         column = box.column(align=True)
+        column.prop(gprops, "export_frame_trace")
+        column.prop(gprops, "export_bake_loop_profile")
+        row = column.row(align=True)
+        row.enabled = gprops.export_bake_loop_profile
+        row.prop(gprops, "bake_loop_profile_frame_start")
+        row.prop(gprops, "bake_loop_profile_frame_end")
         column.prop(gprops, "display_console_output")
 
 
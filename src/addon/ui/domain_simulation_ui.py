@@ -290,6 +290,20 @@ def draw_more_bake_settings(self, context, box):
     column.enabled = sprops.enable_savestates
     column.prop(sprops, "delete_outdated_savestates")
     column.prop(sprops, "delete_outdated_meshes")
+    column = subbox.column(align=True)
+    split = column.split()
+    column = split.column()
+    row = column.row()
+    row.alignment = 'RIGHT'
+    row.label(text="Autosave every")
+    column = split.column()
+    split = column.split()
+    column = split.column()
+    row = column.row(align=True)
+    row.prop(sprops, "autosave_interval", text="")
+    row.label(text="frames")
+    column = subbox.column(align=True)
+    column.prop(sprops, "enable_savestate_compression")
 
 
 def draw_resolution_settings(self, context, master_column):
@@ -257,6 +257,80 @@ def draw_frame_info_timing_stats(self, context, box):
         column.label(text=format_time(total_time))
 
 
+def draw_frame_info_bake_loop_stats(self, context, box):
+    sprops = vcu.get_active_object(context).flip_fluid.domain.stats
+
+    subbox = box.box()
+    row = subbox.row()
+    row.prop(sprops, "frame_info_bake_loop_stats_expanded",
+        icon="TRIA_DOWN" if sprops.frame_info_bake_loop_stats_expanded else "TRIA_RIGHT",
+        icon_only=True, 
+        emboss=False
+    )
+    row.label(text="Bake Loop Stats")
+
+    if not sprops.frame_info_bake_loop_stats_expanded:
+        return
+
+    if not sprops.is_frame_bake_loop_info_available:
+        subbox.label(text="Data Not Available")
+        return
+
+    column = subbox.column()
+    split = vcu.ui_split(column, factor=0.75)
+    column = split.column(align = True)
+    column.prop(sprops.bake_time_database, "pct", slider = True, text = "Geometry Database")
+    column.prop(sprops.bake_time_properties, "pct", slider = True, text = "Property Updates")
+    column.prop(sprops.bake_time_fluid_objects, "pct", slider = True, text = "Fluid Objects")
+    column.prop(sprops.bake_time_simulate, "pct", slider = True, text = "Simulation")
+    column.prop(sprops.bake_time_output, "pct", slider = True, text = "Output Retrieval")
+    column.prop(sprops.bake_time_output_wait, "pct", slider = True, text = "Output Writer Wait")
+    column.separator()
+    column.prop(sprops.bake_time_mesh_extraction, "pct", slider = True, text = "Mesh Extraction")
+    column.prop(sprops.bake_time_file_write, "pct", slider = True, text = "File Writes")
+
+    column = split.column(align = True)
+    padstr = " "
+    column.label(text=padstr + format_time(sprops.bake_time_database.time))
+    column.label(text=padstr + format_time(sprops.bake_time_properties.time))
+    column.label(text=padstr + format_time(sprops.bake_time_fluid_objects.time))
+    column.label(text=padstr + format_time(sprops.bake_time_simulate.time))
+    column.label(text=padstr + format_time(sprops.bake_time_output.time))
+    column.label(text=padstr + format_time(sprops.bake_time_output_wait.time))
+    column.separator()
+    column.label(text=padstr + format_time(sprops.bake_time_mesh_extraction.time))
+    column.label(text=padstr + format_time(sprops.bake_time_file_write.time))
+
+    total_time = (sprops.bake_time_database.time + sprops.bake_time_properties.time +
+                  sprops.bake_time_fluid_objects.time + sprops.bake_time_simulate.time +
+                  sprops.bake_time_output.time + sprops.bake_time_output_wait.time)
+
+    column = subbox.column()
+    split = column.split()
+    column_left = split.column(align=True)
+    column_left.label(text="Database Queries:")
+    column_left.label(text="Files Written:")
+    column_left.label(text="Bytes Written:")
+    column_left.label(text="Frame Total:")
+    column_right = split.column(align=True)
+    column_right.label(text=format_number(sprops.frame_bake_loop_database_queries))
+    column_right.label(text=format_number(sprops.frame_bake_loop_files))
+    column_right.label(text=format_bytes(sprops.frame_bake_loop_bytes.get()))
+    column_right.label(text=format_time(total_time))
+
+    if len(sprops.frame_bake_loop_file_type_bytes) == 0:
+        return
+
+    column = subbox.column()
+    column.label(text="Bytes Written by File Type:")
+    split = column.split()
+    column_left = split.column(align=True)
+    column_right = split.column(align=True)
+    for item in sprops.frame_bake_loop_file_type_bytes:
+        column_left.label(text="      " + item.file_type)
+        column_right.label(text=format_bytes(item.bytes.get()))
+
+
 def draw_frame_info_mesh_stats(self, context, box):
     sprops = vcu.get_active_object(context).flip_fluid.domain.stats
     simprops = vcu.get_active_object(context).flip_fluid.domain.simulation
@@ -624,6 +698,7 @@ def draw_frame_info(self, context, box):
     draw_frame_info_simulation_stats(self, context, box)
     draw_frame_info_solver_stats(self, context, box)
     draw_frame_info_timing_stats(self, context, box)
+    draw_frame_info_bake_loop_stats(self, context, box)
     draw_frame_info_mesh_stats(self, context, box)
 
 
@@ -17,6 +17,7 @@
 import bpy
 
 from ..ui import domain_display_ui
+from ..operators import bake_operators
 from ..utils import version_compatibility_utils as vcu
 from ..utils import installation_utils
 
@@ -27,6 +28,35 @@ def _draw_fluid_surface_display_settings(self, context):
     domain_display_ui.draw_surface_display_settings(self, context, dprops.surface)
 
 
+def _draw_remesh_from_cache_menu(self, context):
+    obj = vcu.get_active_object(context)
+    dprops = obj.flip_fluid.domain
+    sprops = dprops.surface
+
+    box = self.layout.box()
+    row = box.row(align=True)
+    row.prop(sprops, "remesh_from_cache_expanded",
+        icon="TRIA_DOWN" if sprops.remesh_from_cache_expanded else "TRIA_RIGHT",
+        icon_only=True, 
+        emboss=False
+    )
+    row.label(text="Re-mesh From Cache:")
+
+    if not sprops.remesh_from_cache_expanded:
+        return
+
+    column = box.column(align=True)
+    if bake_operators.is_remesh_operator_running():
+        progress_text = "Re-meshing... " + "{:.1f}".format(100 * sprops.remesh_progress) + "%"
+        column.label(text=progress_text, icon="TIME")
+        column.label(text="Press ESC to cancel")
+        return
+
+    column.enabled = not dprops.bake.is_simulation_running
+    column.prop(sprops, "remesh_num_threads")
+    column.operator("flip_fluid_operators.remesh_fluid_surface_from_cache", icon="FILE_REFRESH")
+
+
 def _draw_geometry_attributes_menu(self, context):
     obj = vcu.get_active_object(context)
     sprops = obj.flip_fluid.domain.surface
@@ -418,6 +448,7 @@ class FLIPFLUID_PT_DomainTypeFluidSurfacePanel(bpy.types.Panel):
 
         _draw_fluid_surface_display_settings(self, context)
         _draw_geometry_attributes_menu(self, context)
+        _draw_remesh_from_cache_menu(self, context)
 
         self.layout.separator()
         column = self.layout.column(align=True)
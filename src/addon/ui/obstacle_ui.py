@@ -151,7 +151,9 @@ class FLIPFLUID_PT_ObstacleTypePanel(bpy.types.Panel):
         column.prop(obstacle_props, "skip_reexport")
         column.separator()
         column = box.column(align=True)
-        column.enabled = obstacle_props.skip_reexport
+        domain_props = context.scene.flip_fluid.get_domain_properties()
+        is_skipping_unchanged = domain_props is not None and domain_props.advanced.skip_unchanged_objects_on_export
+        column.enabled = obstacle_props.skip_reexport or is_skipping_unchanged
         column.prop(obstacle_props, "force_reexport_on_next_bake", toggle=True)
 
         column = self.layout.column(align=True)
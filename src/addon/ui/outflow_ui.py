@@ -99,7 +99,9 @@ class FLIPFLUID_PT_OutflowTypePanel(bpy.types.Panel):
         column.prop(outflow_props, "skip_reexport")
         column.separator()
         column = box.column(align=True)
-        column.enabled = outflow_props.skip_reexport
+        domain_props = context.scene.flip_fluid.get_domain_properties()
+        is_skipping_unchanged = domain_props is not None and domain_props.advanced.skip_unchanged_objects_on_export
+        column.enabled = outflow_props.skip_reexport or is_skipping_unchanged
         column.prop(outflow_props, "force_reexport_on_next_bake", toggle=True)
 
         column = self.layout.column(align=True)
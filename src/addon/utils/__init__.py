@@ -25,6 +25,7 @@ if "bpy" in locals():
         'version_compatibility_utils',
         'cache_utils',
         'api_workaround_utils',
+        'fingerprint_utils',
     ]
     for module_name in reloadable_modules:
         if module_name in locals():
@@ -41,4 +42,5 @@ from . import (
     version_compatibility_utils,
     cache_utils,
     api_workaround_utils,
+    fingerprint_utils,
     )
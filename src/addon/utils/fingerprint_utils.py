@@ -0,0 +1,479 @@
+# Blender FLIP Fluids Add-on
+# Copyright (C) 2024 Ryan L. Guy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Content fingerprints of objects for skipping the re-export of unchanged
+# geometry.
+#
+# A fingerprint covers the object transform, object data, modifiers,
+# constraints, animation and drivers of the object and of the data blocks that
+# it depends on through its parent, modifiers, constraints, particle systems and
+# drivers, such as objects, collections, textures and particle settings. External
+# files that are referenced by these (such as Mesh Sequence Cache files and
+# images) are included by path and modification time. The evaluated mesh can be
+# included as well, which covers any dependency that is not walked.
+#
+# Property values of animated objects depend on the current frame. For frame
+# independent fingerprints, properties that are animated or driven are left out
+# and their keyframes are hashed instead, or their keyframed values are hashed
+# for each frame with get_object_frame_fingerprints().
+
+import bpy, os, array, hashlib
+
+from . import version_compatibility_utils as vcu
+
+
+# Properties that do not affect the evaluated geometry or that change between
+# sessions
+SKIP_PROPERTIES = {
+    "rna_type", "name_full", "original", "users", "use_fake_user", "is_evaluated",
+    "session_uid", "tag", "is_runtime_data", "is_override_data", "is_missing",
+    "is_embedded_data", "is_library_indirect", "is_active", "show_expanded",
+    "show_on_cage", "show_in_editmode", "persistent_uid",
+    "execution_time", "id_data", "animation_data", "pixels", "bindcode",
+}
+
+# Object types that can be evaluated to a mesh
+EVALUATED_MESH_OBJECT_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}
+
+MAX_STRUCT_DEPTH = 2
+
+
+def __to_hashable(value):
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return repr(value)
+    if isinstance(value, bpy.types.ID):
+        return "ID:" + value.name
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    elif hasattr(value, "to_list"):
+        value = value.to_list()
+    if isinstance(value, dict):
+        value = sorted(value.items())
+    elif isinstance(value, (set, frozenset)):
+        # Enum flag properties
+        value = sorted(value)
+    try:
+        return "(" + ",".join([__to_hashable(v) for v in value]) + ")"
+    except TypeError:
+        return repr(value)
+
+
+def __update(hasher, *values):
+    for v in values:
+        hasher.update(__to_hashable(v).encode('utf-8'))
+        hasher.update(b";")
+
+
+def __update_foreach(hasher, collection, attribute, num_components, typecode='f'):
+    data = array.array(typecode, [0]) * (len(collection) * num_components)
+    collection.foreach_get(attribute, data)
+    hasher.update(data.tobytes())
+
+
+class FingerprintContext():
+    def __init__(self, is_masking_animated_properties=False):
+        self.visited_ids = set()
+        self.animated_ids = []
+        self.is_masking_animated_properties = is_masking_animated_properties
+        self.animated_paths = set()
+
+
+def __get_id_key(id_data):
+    return (type(id_data).__name__, id_data.name)
+
+
+def __is_masked(context, struct, path):
+    if not context.is_masking_animated_properties:
+        return False
+    return (__get_id_key(struct.id_data), path) in context.animated_paths
+
+
+def __get_custom_property_path(path_prefix, key):
+    base = path_prefix[:-1] if path_prefix.endswith(".") else path_prefix
+    return base + '["' + key + '"]'
+
+
+def __update_id_reference(hasher, id_data, context):
+    __update(hasher, "ID", type(id_data).__name__, id_data.name)
+    if hasattr(id_data, "library") and id_data.library is not None:
+        __update(hasher, id_data.library.filepath)
+
+    key = __get_id_key(id_data)
+    if key in context.visited_ids:
+        return
+    context.visited_ids.add(key)
+
+    if isinstance(id_data, bpy.types.Object):
+        __update_object(hasher, id_data, context)
+    elif isinstance(id_data, bpy.types.NodeTree):
+        __update_node_tree(hasher, id_data, context)
+    elif isinstance(id_data, bpy.types.Collection):
+        __update_collection(hasher, id_data, context)
+    elif __is_object_data(id_data):
+        __update_object_data(hasher, id_data, context)
+    else:
+        # Textures, images, particle settings and other data blocks
+        __collect_animated_paths(id_data, context)
+        __update_rna_struct(hasher, id_data, context, depth=1)
+        if hasattr(id_data, "filepath"):
+            __update_external_file(hasher, id_data.filepath)
+        __update_animation_data(hasher, id_data, context)
+
+
+def __update_external_file(hasher, filepath):
+    abspath = bpy.path.abspath(filepath)
+    __update(hasher, abspath)
+    if os.path.isfile(abspath):
+        stat = os.stat(abspath)
+        __update(hasher, stat.st_size, stat.st_mtime)
+
+
+def __update_rna_struct(hasher, struct, context, depth=0, path_prefix=""):
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in SKIP_PROPERTIES or __is_masked(context, struct, path_prefix + identifier):
+            continue
+        try:
+            value = getattr(struct, identifier)
+        except Exception:
+            continue
+
+        if prop.type == 'POINTER':
+            if value is None:
+                __update(hasher, identifier, None)
+            elif isinstance(value, bpy.types.ID):
+                __update(hasher, identifier)
+                __update_id_reference(hasher, value, context)
+            elif depth < MAX_STRUCT_DEPTH:
+                __update(hasher, identifier)
+                __update_rna_struct(hasher, value, context, depth + 1, path_prefix + identifier + ".")
+        elif prop.type == 'COLLECTION':
+            if depth < MAX_STRUCT_DEPTH:
+                __update(hasher, identifier, len(value))
+                for item in value:
+                    __update_rna_struct(hasher, item, context, depth + 1)
+        else:
+            __update(hasher, identifier, value)
+
+    # Custom properties, such as Geometry Nodes modifier inputs
+    if hasattr(struct, "keys"):
+        for key in sorted(struct.keys()):
+            if not __is_masked(context, struct, __get_custom_property_path(path_prefix, key)):
+                __update(hasher, key, struct[key])
+
+
+def __update_node_tree(hasher, node_tree, context):
+    __collect_animated_paths(node_tree, context)
+    for node in node_tree.nodes:
+        __update(hasher, node.bl_idname, node.name)
+        node_path = 'nodes["' + node.name + '"].'
+        for socket_index, socket in enumerate(node.inputs):
+            socket_path = node_path + "inputs[" + str(socket_index) + "].default_value"
+            if not hasattr(socket, "default_value") or __is_masked(context, node_tree, socket_path):
+                continue
+            __update(hasher, socket.identifier, socket.default_value)
+            if isinstance(socket.default_value, bpy.types.ID):
+                __update_id_reference(hasher, socket.default_value, context)
+        for prop in node.bl_rna.properties:
+            if prop.identifier in SKIP_PROPERTIES or prop.is_readonly:
+                continue
+            if __is_masked(context, node_tree, node_path + prop.identifier):
+                continue
+            value = getattr(node, prop.identifier, None)
+            if isinstance(value, bpy.types.ID):
+                __update_id_reference(hasher, value, context)
+            elif prop.type not in {'POINTER', 'COLLECTION'}:
+                __update(hasher, prop.identifier, value)
+    for link in node_tree.links:
+        __update(hasher, link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+    __update_animation_data(hasher, node_tree, context)
+
+
+def __update_collection(hasher, collection, context):
+    __update(hasher, collection.instance_offset)
+    for bl_object in sorted(collection.objects, key=lambda obj: obj.name):
+        __update_id_reference(hasher, bl_object, context)
+    for child in sorted(collection.children, key=lambda c: c.name):
+        __update_id_reference(hasher, child, context)
+
+
+def __update_mesh_geometry(hasher, mesh):
+    __update(hasher, len(mesh.vertices), len(mesh.loops), len(mesh.polygons))
+    __update_foreach(hasher, mesh.vertices, "co", 3)
+    __update_foreach(hasher, mesh.loops, "vertex_index", 1, 'i')
+    __update_foreach(hasher, mesh.polygons, "loop_total", 1, 'i')
+
+
+def __update_shape_keys(hasher, data, context):
+    if data.shape_keys is None:
+        return
+    __collect_animated_paths(data.shape_keys, context)
+    for key_block in data.shape_keys.key_blocks:
+        __update(hasher, key_block.name, key_block.mute, key_block.relative_key.name)
+        if not __is_masked(context, data.shape_keys, 'key_blocks["' + key_block.name + '"].value'):
+            __update(hasher, key_block.value)
+        __update_foreach(hasher, key_block.data, "co", 3)
+    __update_animation_data(hasher, data.shape_keys, context)
+
+
+def __update_mesh(hasher, mesh, context):
+    __update_mesh_geometry(hasher, mesh)
+    __update_shape_keys(hasher, mesh, context)
+
+
+def __update_curve(hasher, curve, context):
+    __update_rna_struct(hasher, curve, context, depth=MAX_STRUCT_DEPTH)
+    for spline in curve.splines:
+        __update(hasher, spline.type, spline.use_cyclic_u, spline.resolution_u, len(spline.points), len(spline.bezier_points))
+        __update_foreach(hasher, spline.points, "co", 4)
+        __update_foreach(hasher, spline.points, "radius", 1)
+        __update_foreach(hasher, spline.bezier_points, "co", 3)
+        __update_foreach(hasher, spline.bezier_points, "handle_left", 3)
+        __update_foreach(hasher, spline.bezier_points, "handle_right", 3)
+        __update_foreach(hasher, spline.bezier_points, "radius", 1)
+
+
+def __update_lattice(hasher, lattice, context):
+    __update_rna_struct(hasher, lattice, context, depth=MAX_STRUCT_DEPTH)
+    __update_foreach(hasher, lattice.points, "co_deform", 3)
+    __update_shape_keys(hasher, lattice, context)
+
+
+def __update_armature(hasher, armature, context):
+    __update_rna_struct(hasher, armature, context, depth=MAX_STRUCT_DEPTH)
+    for bone in armature.bones:
+        parent_name = bone.parent.name if bone.parent is not None else None
+        __update(hasher, bone.name, parent_name, bone.use_deform, bone.use_connect, bone.use_inherit_rotation)
+    __update_foreach(hasher, armature.bones, "head_local", 3)
+    __update_foreach(hasher, armature.bones, "tail_local", 3)
+    __update_foreach(hasher, armature.bones, "matrix_local", 16)
+
+
+def __is_object_data(id_data):
+    object_data_types = (bpy.types.Mesh, bpy.types.Curve, bpy.types.Lattice, bpy.types.Armature)
+    return isinstance(id_data, object_data_types)
+
+
+def __update_object_data(hasher, data, context):
+    __collect_animated_paths(data, context)
+    if isinstance(data, bpy.types.Mesh):
+        __update_mesh(hasher, data, context)
+    elif isinstance(data, bpy.types.Curve):
+        __update_curve(hasher, data, context)
+    elif isinstance(data, bpy.types.Lattice):
+        __update_lattice(hasher, data, context)
+    elif isinstance(data, bpy.types.Armature):
+        __update_armature(hasher, data, context)
+    else:
+        __update_rna_struct(hasher, data, context, depth=1)
+    __update_animation_data(hasher, data, context)
+
+
+# Mesh of the object after modifiers, shape keys and constraints are evaluated,
+# in object space
+def __update_evaluated_mesh(hasher, bl_object):
+    if not vcu.is_blender_28() or bl_object.type not in EVALUATED_MESH_OBJECT_TYPES:
+        return
+
+    # Objects that are hidden in the viewport are not evaluated by the depsgraph
+    hide_viewport_status = bl_object.hide_viewport
+    if hide_viewport_status:
+        bl_object.hide_viewport = False
+
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        obj_eval = bl_object.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        if mesh is not None:
+            __update(hasher, "EVALUATED_MESH")
+            __update_mesh_geometry(hasher, mesh)
+        obj_eval.to_mesh_clear()
+    finally:
+        if hide_viewport_status:
+            bl_object.hide_viewport = hide_viewport_status
+
+
+# Actions of the NLA tracks. The active action is not included.
+def __get_nla_strips(anim_data):
+    strips = []
+    for track in anim_data.nla_tracks:
+        if track.mute:
+            continue
+        for strip in track.strips:
+            if not strip.mute and strip.action is not None:
+                strips.append(strip)
+    return strips
+
+
+def __collect_animated_paths(id_data, context):
+    anim_data = id_data.animation_data
+    if anim_data is None:
+        return
+    key = __get_id_key(id_data)
+    for driver_fcurve in anim_data.drivers:
+        context.animated_paths.add((key, driver_fcurve.data_path))
+    actions = [strip.action for strip in __get_nla_strips(anim_data)]
+    if anim_data.action is not None:
+        actions.append(anim_data.action)
+    for action in actions:
+        for fcurve in action.fcurves:
+            context.animated_paths.add((key, fcurve.data_path))
+
+
+def __update_animation_data(hasher, id_data, context):
+    anim_data = id_data.animation_data
+    if anim_data is None:
+        return
+
+    for driver_fcurve in anim_data.drivers:
+        driver = driver_fcurve.driver
+        __update(hasher, driver_fcurve.data_path, driver_fcurve.array_index, driver.type, driver.expression)
+        for variable in driver.variables:
+            __update(hasher, variable.name, variable.type)
+            for target in variable.targets:
+                __update(hasher, target.data_path, target.transform_type, target.transform_space)
+                if target.id is not None:
+                    __update_id_reference(hasher, target.id, context)
+
+    # NLA strips are always included as a whole. Frame fingerprints only
+    # cover the active action.
+    __update(hasher, anim_data.use_nla, anim_data.action_blend_type, anim_data.action_influence,
+             anim_data.action_extrapolation)
+    for strip in __get_nla_strips(anim_data):
+        __update(hasher, "NLA_STRIP", strip.action.name, strip.frame_start, strip.frame_end,
+                 strip.action_frame_start, strip.action_frame_end, strip.scale, strip.repeat,
+                 strip.blend_type, strip.extrapolation, strip.influence, strip.use_reverse)
+        __update_action_keyframes(hasher, strip.action)
+
+    if anim_data.action is not None and len(anim_data.action.fcurves) > 0:
+        context.animated_ids.append(id_data)
+
+
+def __update_action_keyframes(hasher, action):
+    for fcurve in action.fcurves:
+        __update(hasher, fcurve.data_path, fcurve.array_index, fcurve.extrapolation, fcurve.mute, len(fcurve.modifiers))
+        __update_foreach(hasher, fcurve.keyframe_points, "co", 2)
+        __update_foreach(hasher, fcurve.keyframe_points, "handle_left", 2)
+        __update_foreach(hasher, fcurve.keyframe_points, "handle_right", 2)
+        __update(hasher, [k.interpolation for k in fcurve.keyframe_points])
+        for modifier in fcurve.modifiers:
+            __update_rna_struct(hasher, modifier, FingerprintContext(), depth=MAX_STRUCT_DEPTH)
+
+
+def __update_object(hasher, bl_object, context):
+    __collect_animated_paths(bl_object, context)
+    if bl_object.data is not None:
+        __collect_animated_paths(bl_object.data, context)
+
+    __update(hasher, bl_object.type, bl_object.parent_type, bl_object.parent_bone)
+    __update(hasher, bl_object.matrix_parent_inverse)
+    if not context.is_masking_animated_properties:
+        __update(hasher, bl_object.matrix_world)
+    if bl_object.instance_collection is not None:
+        __update(hasher, bl_object.instance_type)
+        __update_id_reference(hasher, bl_object.instance_collection, context)
+
+    transform_properties = [
+        "location", "rotation_mode", "rotation_euler", "rotation_quaternion", "rotation_axis_angle", "scale",
+        "delta_location", "delta_rotation_euler", "delta_rotation_quaternion", "delta_scale"
+    ]
+    for identifier in transform_properties:
+        if not __is_masked(context, bl_object, identifier):
+            __update(hasher, identifier, getattr(bl_object, identifier))
+
+    if bl_object.parent is not None:
+        __update_id_reference(hasher, bl_object.parent, context)
+
+    if bl_object.data is not None:
+        __update(hasher, "DATA", bl_object.data.name)
+        __update_object_data(hasher, bl_object.data, context)
+
+    if bl_object.pose is not None:
+        for pose_bone in bl_object.pose.bones:
+            __update(hasher, "POSE_BONE", pose_bone.name)
+            for identifier in ["location", "rotation_mode", "rotation_euler", "rotation_quaternion", "rotation_axis_angle", "scale"]:
+                if not __is_masked(context, bl_object, 'pose.bones["' + pose_bone.name + '"].' + identifier):
+                    __update(hasher, identifier, getattr(pose_bone, identifier))
+
+    for modifier in bl_object.modifiers:
+        __update(hasher, "MODIFIER", modifier.type)
+        __update_rna_struct(hasher, modifier, context, depth=1, path_prefix='modifiers["' + modifier.name + '"].')
+
+    for constraint in bl_object.constraints:
+        __update(hasher, "CONSTRAINT", constraint.type)
+        __update_rna_struct(hasher, constraint, context, depth=1, path_prefix='constraints["' + constraint.name + '"].')
+
+    for particle_system in bl_object.particle_systems:
+        __update(hasher, "PARTICLE_SYSTEM", particle_system.seed)
+        if particle_system.settings is not None:
+            __update_id_reference(hasher, particle_system.settings, context)
+
+    __update_animation_data(hasher, bl_object, context)
+
+
+def __get_object_context(bl_object, is_masking_animated_properties=False):
+    hasher = hashlib.sha256()
+    context = FingerprintContext(is_masking_animated_properties)
+    context.visited_ids.add(__get_id_key(bl_object))
+    __update(hasher, bl_object.name)
+    __update_object(hasher, bl_object, context)
+    return hasher, context
+
+
+# Fingerprint of the object geometry.
+#
+# If is_frame_independent is True, values that depend on the current frame
+# (animated and driven properties and the world matrix) are left out so that
+# the fingerprint does not change with the timeline position. If
+# include_keyframes is False, keyframes of the active actions are not included
+# and changes in animation are expected to be detected through
+# get_object_frame_fingerprints(). If include_evaluated_mesh is True, the
+# evaluated mesh at the current frame is included in object space.
+def get_object_fingerprint(bl_object, extra_data=None, is_frame_independent=False,
+                           include_keyframes=True, include_evaluated_mesh=False):
+    hasher, context = __get_object_context(bl_object, is_masking_animated_properties=is_frame_independent)
+    if include_keyframes:
+        for id_data in context.animated_ids:
+            __update(hasher, id_data.name)
+            __update_action_keyframes(hasher, id_data.animation_data.action)
+    if include_evaluated_mesh:
+        __update_evaluated_mesh(hasher, bl_object)
+    if extra_data is not None:
+        __update(hasher, extra_data)
+    return hasher.hexdigest()
+
+
+# Fingerprints of the animated values of the object and its dependencies for
+# each frame. Frames with an unchanged fingerprint evaluate to the same geometry
+# as long as the object fingerprint without animation is unchanged.
+def get_object_frame_fingerprints(bl_object, frame_ids):
+    hasher, context = __get_object_context(bl_object, is_masking_animated_properties=True)
+
+    fcurves = []
+    fcurve_hasher = hashlib.sha256()
+    for id_data in context.animated_ids:
+        for fcurve in id_data.animation_data.action.fcurves:
+            if not fcurve.mute:
+                fcurves.append(fcurve)
+                __update(fcurve_hasher, id_data.name, fcurve.data_path, fcurve.array_index)
+
+    frame_fingerprints = {}
+    for frame_id in frame_ids:
+        values = array.array('f', [fcurve.evaluate(frame_id) for fcurve in fcurves])
+        frame_hasher = fcurve_hasher.copy()
+        frame_hasher.update(values.tobytes())
+        frame_fingerprints[frame_id] = frame_hasher.hexdigest()
+    return frame_fingerprints
@@ -297,6 +297,48 @@ def depsgraph_update(context=None):
         context.scene.update()
 
 
+# Applies a 4x4 matrix to flat float32 vertex coordinates. Matches the result of
+# mathutils 'matrix @ vector': each product is computed in single precision,
+# the products are summed in double precision and the sum is stored as float.
+def _transform_vertex_coordinates(coords, matrix_world):
+    m = numpy.array(matrix_world, dtype=numpy.float32)
+    coords = coords.reshape(-1, 3)
+    transformed = numpy.empty_like(coords)
+    for row in range(3):
+        dot = (m[row][0] * coords[:, 0]).astype(numpy.float64)
+        dot += m[row][1] * coords[:, 1]
+        dot += m[row][2] * coords[:, 2]
+        dot += numpy.float64(m[row][3])
+        transformed[:, row] = dot
+    return transformed.reshape(-1)
+
+
+def _get_mesh_vertex_data(mesh_data, matrix_world=None):
+    coords = numpy.empty(3 * len(mesh_data.vertices), dtype=numpy.float32)
+    mesh_data.vertices.foreach_get("co", coords)
+    if matrix_world is not None:
+        coords = _transform_vertex_coordinates(coords, matrix_world)
+    return coords
+
+
+# Vertex indices of each polygon in polygon order, the same as concatenating
+# polygon.vertices. Polygon loops are not required to be stored in polygon order.
+def _get_mesh_triangle_data(mesh_data):
+    num_polygons = len(mesh_data.polygons)
+    loop_starts = numpy.empty(num_polygons, dtype=numpy.int32)
+    loop_totals = numpy.empty(num_polygons, dtype=numpy.int32)
+    mesh_data.polygons.foreach_get("loop_start", loop_starts)
+    mesh_data.polygons.foreach_get("loop_total", loop_totals)
+
+    loop_vertices = numpy.empty(len(mesh_data.loops), dtype=numpy.int32)
+    mesh_data.loops.foreach_get("vertex_index", loop_vertices)
+
+    num_indices = int(loop_totals.sum())
+    polygon_offsets = numpy.cumsum(loop_totals) - loop_totals
+    loop_indices = numpy.repeat(loop_starts - polygon_offsets, loop_totals) + numpy.arange(num_indices)
+    return loop_vertices[loop_indices].astype(numpy.int32)
+
+
 def object_to_triangle_mesh(obj, matrix_world=None):
     is_b3d_28 = is_blender_28()
 
@@ -335,35 +377,9 @@ def object_to_triangle_mesh(obj, matrix_world=None):
                                apply_modifiers=True, 
                                settings='RENDER')
 
-    vertex_components = []
-    if matrix_world is None:
-        for mv in new_mesh.vertices:
-            v = mv.co
-            vertex_components.append(v.x)
-            vertex_components.append(v.y)
-            vertex_components.append(v.z)
-    else:
-        if is_b3d_28:
-            for mv in new_mesh.vertices:
-                v = matrix_world @ mv.co
-                vertex_components.append(v.x)
-                vertex_components.append(v.y)
-                vertex_components.append(v.z)
-        else:
-            for mv in new_mesh.vertices:
-                v = matrix_world * mv.co
-                vertex_components.append(v.x)
-                vertex_components.append(v.y)
-                vertex_components.append(v.z)
-
-    triangle_indices = []
-    for t in new_mesh.polygons:
-        for idx in t.vertices:
-            triangle_indices.append(idx)
-    
     tmesh = TriangleMesh()
-    tmesh.vertices = array.array('f', vertex_components)
-    tmesh.triangles = array.array('i', triangle_indices)
+    tmesh.vertices = array.array('f', _get_mesh_vertex_data(new_mesh, matrix_world).tobytes())
+    tmesh.triangles = array.array('i', _get_mesh_triangle_data(new_mesh).tobytes())
 
     if is_b3d_28:
         obj_eval.to_mesh_clear()
@@ -407,6 +423,33 @@ def _transfer_mesh_materials(src_mesh_data, dst_mesh_data):
                     break
 
 
+# Equivalent to mesh_data.from_pydata(vertices, [], triangles) for triangle
+# meshes, but passes contiguous buffers to foreach_set instead of iterating
+# over the vertex and triangle data in Python.
+def _set_mesh_triangle_geometry(mesh_data, vertices, triangles):
+    vertices = numpy.ascontiguousarray(vertices, dtype=numpy.float32).reshape(-1)
+    vertex_index = numpy.ascontiguousarray(triangles, dtype=numpy.int32).reshape(-1)
+    num_vertices = len(vertices) // 3
+    num_triangles = len(vertex_index) // 3
+
+    mesh_data.vertices.add(num_vertices)
+    mesh_data.vertices.foreach_set("co", vertices)
+    if num_triangles == 0:
+        mesh_data.update()
+        return
+
+    loop_start = numpy.arange(0, 3 * num_triangles, 3, dtype=numpy.int32)
+    mesh_data.loops.add(3 * num_triangles)
+    mesh_data.loops.foreach_set("vertex_index", vertex_index)
+    mesh_data.polygons.add(num_triangles)
+    mesh_data.polygons.foreach_set("loop_start", loop_start)
+    if not is_blender_40():
+        # Polygon loop_total is read-only in Blender >= 4.0 and derived from loop_start
+        loop_total = numpy.full(num_triangles, 3, dtype=numpy.int32)
+        mesh_data.polygons.foreach_set("loop_total", loop_total)
+    mesh_data.update(calc_edges=True)
+
+
 def swap_object_mesh_data_geometry(bl_object, vertices=[], triangles=[], 
                                    mesh_name="Untitled",
                                    smooth_mesh=False,
@@ -435,15 +478,8 @@ def swap_object_mesh_data_geometry(bl_object, vertices=[], triangles=[],
             is_vc_layer_active = [vc.active for vc in bl_object.data.vertex_colors]
             is_vc_layer_active_render = [vc.active_render for vc in bl_object.data.vertex_colors]
 
-        vertices = numpy.array(vertices, dtype=numpy.float32)
-        num_vertices = vertices.shape[0] // 3
-        vertex_index = numpy.array(triangles, dtype=numpy.int32)
-        loop_start = numpy.array(list(range(0, len(triangles), 3)), dtype=numpy.int32)
-        num_loops = loop_start.shape[0]
-        loop_total = numpy.array([3] * (len(triangles) // 3), dtype=numpy.int32)
-
         bl_object.data.clear_geometry()
-        bl_object.data.from_pydata(vertices, [], triangles)
+        _set_mesh_triangle_geometry(bl_object.data, vertices, triangles)
 
         _set_mesh_smoothness(bl_object.data, smooth_mesh)
         _set_octane_mesh_type(bl_object, octane_mesh_type)
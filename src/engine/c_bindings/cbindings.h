@@ -27,6 +27,7 @@ SOFTWARE.
 
 #include <exception>
 #include <string>
+#include <vector>
 
 #include "../vmath.h"
 #include "../aabb.h"
@@ -154,6 +155,27 @@ RT safe_execute_method_ret_3param(CLASS *obj,
     return result;
 }
 
+// Returns a pointer to the data of a std::vector<char> owned by the object
+// without copying. The pointer remains valid until the vector is next modified.
+template<class CLASS>
+char* safe_execute_method_ret_data_view(CLASS *obj,
+                       std::vector<char>* (CLASS::*funcptr)(void),
+                       unsigned long long *size, int *err) {
+    *err = SUCCESS;
+    *size = 0;
+    char *result = nullptr;
+    try {
+        std::vector<char> *data = (obj->*funcptr)();
+        *size = (unsigned long long)data->size();
+        result = data->data();
+    } catch (std::exception &ex) {
+        CBindings::set_error_message(ex);
+        *err = FAIL;
+    }
+
+    return result;
+}
+
 Vector3_t to_struct(vmath::vec3 v);
 vmath::vec3 to_class(Vector3_t v);
 AABB_t to_struct(AABB b);
@@ -330,6 +330,87 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_set_pressure_solver_method_PCG(FluidSimulation* obj,
+                                                                  int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverMethodPCG, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_pressure_solver_method_MGPCG(FluidSimulation* obj,
+                                                                    int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverMethodMGPCG, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_set_pressure_solver_method_parallel_PCG(FluidSimulation* obj,
+                                                                           int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::setPressureSolverMethodParallelPCG, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_method_PCG(FluidSimulation* obj,
+                                                                int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverMethodPCG, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_method_MGPCG(FluidSimulation* obj,
+                                                                  int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverMethodMGPCG, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_pressure_solver_method_parallel_PCG(FluidSimulation* obj,
+                                                                         int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isPressureSolverMethodParallelPCG, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_solver_warm_start(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableSolverWarmStart, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_solver_warm_start(FluidSimulation* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableSolverWarmStart, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_solver_warm_start_enabled(FluidSimulation* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isSolverWarmStartEnabled, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_enable_solver_cold_reference_solves(FluidSimulation* obj, 
+                                                                       int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableSolverColdReferenceSolves, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_solver_cold_reference_solves(FluidSimulation* obj, 
+                                                                        int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableSolverColdReferenceSolves, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_solver_cold_reference_solves_enabled(FluidSimulation* obj, 
+                                                                          int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isSolverColdReferenceSolvesEnabled, err
+        );
+    }
+
     EXPORTDLL int FluidSimulation_get_viscosity_solver_max_iterations(FluidSimulation* obj, 
                                                                       int *err) {
         return CBindings::safe_execute_method_ret_0param(
@@ -1437,6 +1518,27 @@ extern "C" {
         );
     }
 
+    EXPORTDLL void FluidSimulation_enable_frame_trace_output(FluidSimulation* obj,
+                                                             int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::enableFrameTraceOutput, err
+        );
+    }
+
+    EXPORTDLL void FluidSimulation_disable_frame_trace_output(FluidSimulation* obj,
+                                                              int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &FluidSimulation::disableFrameTraceOutput, err
+        );
+    }
+
+    EXPORTDLL int FluidSimulation_is_frame_trace_output_enabled(FluidSimulation* obj,
+                                                                int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &FluidSimulation::isFrameTraceOutputEnabled, err
+        );
+    }
+
     EXPORTDLL void FluidSimulation_enable_diffuse_material_output(FluidSimulation* obj,
                                                                   int *err) {
         CBindings::safe_execute_method_void_0param(
@@ -4496,6 +4598,349 @@ extern "C" {
         }
     }
 
+    EXPORTDLL char* FluidSimulation_get_surface_data_view(FluidSimulation* obj, 
+                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_preview_data_view(FluidSimulation* obj, 
+                                                                  unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfacePreviewData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_blur_data_view(FluidSimulation* obj, 
+                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceBlurData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                             unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_foam_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterFoamVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_bubble_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                                       unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterBubbleVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_spray_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                                      unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterSprayVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_dust_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterDustVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_vorticity_attribute_data_view(FluidSimulation* obj, 
+                                                                              unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceVorticityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_speed_attribute_data_view(FluidSimulation* obj, 
+                                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceSpeedAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_age_attribute_data_view(FluidSimulation* obj, 
+                                                                        unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceAgeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                             unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_whitewater_proximity_attribute_data_view(FluidSimulation* obj, 
+                                                                                         unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceWhitewaterProximityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_color_attribute_data_view(FluidSimulation* obj, 
+                                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceColorAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_source_id_attribute_data_view(FluidSimulation* obj, 
+                                                                              unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceSourceIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_surface_viscosity_attribute_data_view(FluidSimulation* obj, 
+                                                                              unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getSurfaceViscosityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_data_view(FluidSimulation* obj, 
+                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_foam_data_view(FluidSimulation* obj, 
+                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseFoamData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_bubble_data_view(FluidSimulation* obj, 
+                                                                 unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseBubbleData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_spray_data_view(FluidSimulation* obj, 
+                                                                unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseSprayData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_dust_data_view(FluidSimulation* obj, 
+                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseDustData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_foam_blur_data_view(FluidSimulation* obj, 
+                                                                    unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseFoamBlurData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_bubble_blur_data_view(FluidSimulation* obj, 
+                                                                      unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseBubbleBlurData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_spray_blur_data_view(FluidSimulation* obj, 
+                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseSprayBlurData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_diffuse_dust_blur_data_view(FluidSimulation* obj, 
+                                                                    unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getDiffuseDustBlurData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_foam_id_attribute_data_view(FluidSimulation* obj, 
+                                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterFoamIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_bubble_id_attribute_data_view(FluidSimulation* obj, 
+                                                                                 unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterBubbleIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_spray_id_attribute_data_view(FluidSimulation* obj, 
+                                                                                unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterSprayIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_dust_id_attribute_data_view(FluidSimulation* obj, 
+                                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterDustIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_foam_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterFoamLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_bubble_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                                       unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterBubbleLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_spray_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                                      unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterSprayLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_whitewater_dust_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getWhitewaterDustLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_data_view(FluidSimulation* obj, 
+                                                                 unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_id_attribute_data_view(FluidSimulation* obj, 
+                                                                              unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_velocity_attribute_data_view(FluidSimulation* obj, 
+                                                                                    unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleVelocityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_speed_attribute_data_view(FluidSimulation* obj, 
+                                                                                 unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleSpeedAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_vorticity_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleVorticityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_color_attribute_data_view(FluidSimulation* obj, 
+                                                                                 unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleColorAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_age_attribute_data_view(FluidSimulation* obj, 
+                                                                               unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleAgeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_lifetime_attribute_data_view(FluidSimulation* obj, 
+                                                                                    unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleLifetimeAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_viscosity_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleViscosityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_whitewater_proximity_attribute_data_view(FluidSimulation* obj, 
+                                                                                                unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleWhitewaterProximityAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_source_id_attribute_data_view(FluidSimulation* obj, 
+                                                                                     unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleSourceIDAttributeData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_fluid_particle_debug_data_view(FluidSimulation* obj, 
+                                                                       unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFluidParticleDebugData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_internal_obstacle_mesh_data_view(FluidSimulation* obj, 
+                                                                         unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getInternalObstacleMeshData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_force_field_debug_data_view(FluidSimulation* obj, 
+                                                                    unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getForceFieldDebugData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_logfile_data_view(FluidSimulation* obj, 
+                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getLogFileData, size, err
+        );
+    }
+
+    EXPORTDLL char* FluidSimulation_get_frame_trace_data_view(FluidSimulation* obj, 
+                                                              unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &FluidSimulation::getFrameTraceData, size, err
+        );
+    }
+
     EXPORTDLL FluidSimulationFrameStats FluidSimulation_get_frame_stats_data(FluidSimulation* obj, 
                                                                              int *err) {
         return CBindings::safe_execute_method_ret_0param(
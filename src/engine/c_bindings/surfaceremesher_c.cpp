@@ -0,0 +1,202 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include <vector>
+#include <cstring>
+
+#include "../surfaceremesher.h"
+#include "vector3_c.h"
+#include "cbindings.h"
+
+#ifdef _WIN32
+    #define EXPORTDLL __declspec(dllexport)
+#else
+    #define EXPORTDLL
+#endif
+
+
+struct SurfaceRemesherParameters_t {
+    int subdivisions;
+    int computechunks;
+    double particle_scale;
+    double smoothing_value;
+    int smoothing_iterations;
+    int minimum_polyhedron_triangle_count;
+    int enable_preview_mesh;
+    double preview_dx;
+    int enable_remove_surface_near_domain;
+    int remove_surface_near_domain_distance;
+    double domain_scale;
+    Vector3_t domain_offset;
+};
+
+
+extern "C" {
+
+    EXPORTDLL SurfaceRemesher* SurfaceRemesher_new(int isize, int jsize, int ksize, double dx, int *err) {
+        *err = CBindings::SUCCESS;
+        SurfaceRemesher *remesher = nullptr;
+        try {
+            remesher = new SurfaceRemesher(isize, jsize, ksize, dx);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+
+        return remesher;
+    }
+
+    EXPORTDLL void SurfaceRemesher_destroy(SurfaceRemesher* obj) {
+        delete obj;
+    }
+
+    EXPORTDLL void SurfaceRemesher_set_parameters(SurfaceRemesher* obj, 
+                                                  SurfaceRemesherParameters_t params, int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            SurfaceRemesherParameters p;
+            p.subdivisions = params.subdivisions;
+            p.computechunks = params.computechunks;
+            p.particleScale = params.particle_scale;
+            p.smoothingValue = params.smoothing_value;
+            p.smoothingIterations = params.smoothing_iterations;
+            p.minimumPolyhedronTriangleCount = params.minimum_polyhedron_triangle_count;
+            p.isPreviewMeshEnabled = params.enable_preview_mesh != 0;
+            p.previewdx = params.preview_dx;
+            p.isRemoveSurfaceNearDomainEnabled = params.enable_remove_surface_near_domain != 0;
+            p.removeSurfaceNearDomainDistance = params.remove_surface_near_domain_distance;
+            p.domainScale = params.domain_scale;
+            p.domainOffset = CBindings::to_class(params.domain_offset);
+            obj->setParameters(p);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    // data is an array of num_particles packed float32 xyz positions
+    EXPORTDLL void SurfaceRemesher_mesh_particles(SurfaceRemesher* obj, 
+                                                  char *data, int num_particles, int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            float *values = (float*)data;
+            std::vector<vmath::vec3> particles(num_particles);
+            for (int i = 0; i < num_particles; i++) {
+                particles[i] = vmath::vec3(values[3*i], values[3*i + 1], values[3*i + 2]);
+            }
+            obj->meshParticles(particles);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    // data is an array of num_values packed float32 xyz vectors
+    EXPORTDLL void SurfaceRemesher_transfer_vector_attribute(SurfaceRemesher* obj, 
+                                                             char *data, int num_values, int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            float *floatData = (float*)data;
+            std::vector<vmath::vec3> values(num_values);
+            for (int i = 0; i < num_values; i++) {
+                values[i] = vmath::vec3(floatData[3*i], floatData[3*i + 1], floatData[3*i + 2]);
+            }
+            obj->transferVectorAttribute(values);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    // data is an array of num_values float32 values
+    EXPORTDLL void SurfaceRemesher_transfer_scalar_attribute(SurfaceRemesher* obj, 
+                                                             char *data, int num_values, int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            std::vector<float> values(num_values);
+            std::memcpy(values.data(), data, num_values * sizeof(float));
+            obj->transferScalarAttribute(values);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    EXPORTDLL void SurfaceRemesher_generate_vector_attribute_data(SurfaceRemesher* obj, 
+                                                                  double scale, int *err) {
+        *err = CBindings::SUCCESS;
+        try {
+            obj->generateVectorAttributeData((float)scale);
+        } catch (std::exception &ex) {
+            CBindings::set_error_message(ex);
+            *err = CBindings::FAIL;
+        }
+    }
+
+    EXPORTDLL void SurfaceRemesher_generate_vector_magnitude_attribute_data(SurfaceRemesher* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &SurfaceRemesher::generateVectorMagnitudeAttributeData, err
+        );
+    }
+
+    EXPORTDLL void SurfaceRemesher_generate_scalar_attribute_data(SurfaceRemesher* obj, int *err) {
+        CBindings::safe_execute_method_void_0param(
+            obj, &SurfaceRemesher::generateScalarAttributeData, err
+        );
+    }
+
+    EXPORTDLL int SurfaceRemesher_get_num_surface_vertices(SurfaceRemesher* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &SurfaceRemesher::getNumSurfaceVertices, err
+        );
+    }
+
+    EXPORTDLL int SurfaceRemesher_get_num_surface_triangles(SurfaceRemesher* obj, int *err) {
+        return CBindings::safe_execute_method_ret_0param(
+            obj, &SurfaceRemesher::getNumSurfaceTriangles, err
+        );
+    }
+
+    EXPORTDLL char* SurfaceRemesher_get_surface_data_view(SurfaceRemesher* obj, 
+                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &SurfaceRemesher::getSurfaceData, size, err
+        );
+    }
+
+    EXPORTDLL char* SurfaceRemesher_get_preview_data_view(SurfaceRemesher* obj, 
+                                                          unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &SurfaceRemesher::getPreviewData, size, err
+        );
+    }
+
+    EXPORTDLL char* SurfaceRemesher_get_attribute_data_view(SurfaceRemesher* obj, 
+                                                            unsigned long long *size, int *err) {
+        return CBindings::safe_execute_method_ret_data_view(
+            obj, &SurfaceRemesher::getAttributeData, size, err
+        );
+    }
+
+}
@@ -1526,18 +1526,9 @@ void DiffuseParticleSimulation::_trilinearInterpolate(std::vector<vmath::vec3> &
                                                       std::vector<vmath::vec3> &output) {
     FLUIDSIM_ASSERT(output.size() == input.size());
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, input.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, input.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_trilinearInterpolateThread, this,
-                                 intervals[i], intervals[i + 1], &input, vfield, &output);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, input.size(), [&](int startidx, int endidx) {
+        _trilinearInterpolateThread(startidx, endidx, &input, vfield, &output);
+    });
 }
 
 void DiffuseParticleSimulation::_trilinearInterpolateThread(int startidx, int endidx, 
@@ -1610,28 +1601,14 @@ void DiffuseParticleSimulation::_initializeMaterialGrid() {
     }
 
     size_t gridsize = _mgrid.width * _mgrid.height * _mgrid.depth;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_initializeMaterialGridThread, this,
-                                 intervals[i], intervals[i + 1]);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _initializeMaterialGridThread(startidx, endidx);
+    });
 
     FluidMaterialGrid mgridtemp = _mgrid;
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_shrinkMaterialGridFluidThread, this,
-                                 intervals[i], intervals[i + 1], &mgridtemp);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _shrinkMaterialGridFluidThread(startidx, endidx, &mgridtemp);
+    });
 
     _mgrid = mgridtemp;
 
@@ -2165,18 +2142,9 @@ void DiffuseParticleSimulation::_advanceSprayParticles(double dt) {
         return;
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _diffuseParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _diffuseParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_advanceSprayParticlesThread, this,
-                                 intervals[i], intervals[i + 1], dt);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _diffuseParticles.size(), [&](int startidx, int endidx) {
+        _advanceSprayParticlesThread(startidx, endidx, dt);
+    });
 }
 
 void DiffuseParticleSimulation::_advanceBubbleParticles(double dt) {
@@ -2186,18 +2154,9 @@ void DiffuseParticleSimulation::_advanceBubbleParticles(double dt) {
         return;
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _diffuseParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _diffuseParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_advanceBubbleParticlesThread, this,
-                                 intervals[i], intervals[i + 1], dt);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _diffuseParticles.size(), [&](int startidx, int endidx) {
+        _advanceBubbleParticlesThread(startidx, endidx, dt);
+    });
 }
 
 void DiffuseParticleSimulation::_advanceFoamParticles(double dt) {
@@ -2207,18 +2166,9 @@ void DiffuseParticleSimulation::_advanceFoamParticles(double dt) {
         return;
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _diffuseParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _diffuseParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_advanceFoamParticlesThread, this,
-                                 intervals[i], intervals[i + 1], dt);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _diffuseParticles.size(), [&](int startidx, int endidx) {
+        _advanceFoamParticlesThread(startidx, endidx, dt);
+    });
 }
 
 void DiffuseParticleSimulation::_advanceDustParticles(double dt) {
@@ -2228,18 +2178,9 @@ void DiffuseParticleSimulation::_advanceDustParticles(double dt) {
         return;
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _diffuseParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _diffuseParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&DiffuseParticleSimulation::_advanceDustParticlesThread, this,
-                                 intervals[i], intervals[i + 1], dt);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _diffuseParticles.size(), [&](int startidx, int endidx) {
+        _advanceDustParticlesThread(startidx, endidx, dt);
+    });
 }
 
 void DiffuseParticleSimulation::_advanceSprayParticlesThread(int startidx, int endidx, double dt) {
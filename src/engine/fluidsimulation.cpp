@@ -300,6 +300,77 @@ void FluidSimulation::setPressureSolverMaxIterations(int n) {
     _maxPressureSolveIterations = n;
 }
 
+void FluidSimulation::setPressureSolverMethodPCG() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverMethodPCG" << std::endl);
+
+    _pressureSolverMethod = PressureSolverMethod::PCG;
+}
+
+void FluidSimulation::setPressureSolverMethodMGPCG() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverMethodMGPCG" << std::endl);
+
+    _pressureSolverMethod = PressureSolverMethod::MGPCG;
+}
+
+void FluidSimulation::setPressureSolverMethodParallelPCG() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " setPressureSolverMethodParallelPCG" << std::endl);
+
+    _pressureSolverMethod = PressureSolverMethod::ParallelPCG;
+}
+
+bool FluidSimulation::isPressureSolverMethodPCG() {
+    return _pressureSolverMethod == PressureSolverMethod::PCG;
+}
+
+bool FluidSimulation::isPressureSolverMethodMGPCG() {
+    return _pressureSolverMethod == PressureSolverMethod::MGPCG;
+}
+
+bool FluidSimulation::isPressureSolverMethodParallelPCG() {
+    return _pressureSolverMethod == PressureSolverMethod::ParallelPCG;
+}
+
+void FluidSimulation::enableSolverWarmStart() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableSolverWarmStart" << std::endl);
+
+    _isSolverWarmStartEnabled = true;
+}
+
+void FluidSimulation::disableSolverWarmStart() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableSolverWarmStart" << std::endl);
+
+    _isSolverWarmStartEnabled = false;
+}
+
+bool FluidSimulation::isSolverWarmStartEnabled() {
+    return _isSolverWarmStartEnabled;
+}
+
+void FluidSimulation::enableSolverColdReferenceSolves() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableSolverColdReferenceSolves" << std::endl);
+
+    _isSolverColdReferenceSolvesEnabled = true;
+}
+
+void FluidSimulation::disableSolverColdReferenceSolves() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableSolverColdReferenceSolves" << std::endl);
+
+    _isSolverColdReferenceSolvesEnabled = false;
+    _pressureSolverColdReferenceIterations = -1;
+    _pressureSolverColdReferenceFrame = -1;
+}
+
+bool FluidSimulation::isSolverColdReferenceSolvesEnabled() {
+    return _isSolverColdReferenceSolvesEnabled;
+}
+
 int FluidSimulation::getViscositySolverMaxIterations() {
     return _maxViscositySolveIterations;
 }
@@ -1330,6 +1401,26 @@ bool FluidSimulation::isForceFieldDebugOutputEnabled() {
     return _isForceFieldDebugOutputEnabled;
 }
 
+void FluidSimulation::enableFrameTraceOutput() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " enableFrameTraceOutput" << std::endl);
+
+    _stageProfiler.enable();
+}
+
+void FluidSimulation::disableFrameTraceOutput() {
+    _logfile.log(std::ostringstream().flush() << 
+                 _logfile.getTime() << " disableFrameTraceOutput" << std::endl);
+
+    _stageProfiler.disable();
+    _outputData.frameTraceData.clear();
+    _outputData.frameTraceData.shrink_to_fit();
+}
+
+bool FluidSimulation::isFrameTraceOutputEnabled() {
+    return _stageProfiler.isEnabled();
+}
+
 void FluidSimulation::enableDiffuseMaterialOutput() {
     _logfile.log(std::ostringstream().flush() << 
                  _logfile.getTime() << " enableDiffuseMaterialOutput" << std::endl);
@@ -3370,6 +3461,10 @@ std::vector<char>* FluidSimulation::getLogFileData() {
     return &_outputData.logfileData;
 }
 
+std::vector<char>* FluidSimulation::getFrameTraceData() {
+    return &_outputData.frameTraceData;
+}
+
 FluidSimulationFrameStats FluidSimulation::getFrameStatsData() {
     return _outputData.frameData;
 }
@@ -5128,19 +5223,10 @@ void FluidSimulation::_updateNearSolidGrid() {
         _nearSolidGrid.fill(false);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
     size_t gridsize = _isize * _jsize * _ksize;
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_initializeNearSolidGridThread, this,
-                                 intervals[i], intervals[i + 1]);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _initializeNearSolidGridThread(startidx, endidx);
+    });
 
     int numlayers = (int)std::ceil((float)_CFLConditionNumber / (float)_nearSolidGridCellSizeFactor);
     for (int i = 0; i < numlayers; i++) {
@@ -5202,23 +5288,15 @@ void FluidSimulation::_resolveSolidLevelSetUpdateCollisions() {
         _nearSolidGrid.fill(false);
     }
     
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _markerParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _markerParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_resolveSolidLevelSetUpdateCollisionsThread, this,
-                                 intervals[i], intervals[i + 1]);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _markerParticles.size(), [&](int startidx, int endidx) {
+        _resolveSolidLevelSetUpdateCollisionsThread(startidx, endidx);
+    });
 }
 
 void FluidSimulation::_updateObstacleObjects(double) {
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Obstacle Objects");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Obstacle Objects", "step");
     StopWatch t;
     t.start();
 
@@ -5255,6 +5333,7 @@ void FluidSimulation::_joinUpdateObstacleObjectsThread() {
 void FluidSimulation::_updateLiquidLevelSet() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Liquid Level Set");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Liquid Level Set", "step");
     StopWatch t;
     t.start();
 
@@ -5292,6 +5371,7 @@ void FluidSimulation::_joinUpdateLiquidLevelSetThread() {
 void FluidSimulation::_advectVelocityField() {
 _logfile.logString(_logfile.getTime() + " BEGIN       Advect Velocity Field");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Advect Velocity Field", "step");
     StopWatch t;
     t.start();
 
@@ -5340,6 +5420,7 @@ void FluidSimulation::_joinAdvectVelocityFieldThread() {
 void FluidSimulation::_saveVelocityField() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Save Velocity Field");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Save Velocity Field", "step");
     StopWatch t;
     t.start();
 
@@ -5356,6 +5437,7 @@ void FluidSimulation::_saveVelocityField() {
 void FluidSimulation::_deleteSavedVelocityField() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Delete Saved Velocity Field");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Delete Saved Velocity Field", "step");
     StopWatch t;
     t.start();
     _savedVelocityField = MACVelocityField();
@@ -5373,6 +5455,7 @@ void FluidSimulation::_deleteSavedVelocityField() {
 void FluidSimulation::_calculateFluidCurvatureGridThread() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Calculate Surface Curvature");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Calculate Surface Curvature", "step");
     StopWatch t;
     t.start();
 
@@ -5565,18 +5648,9 @@ void FluidSimulation::_applyForceFieldGridForcesMT(ValidVelocityComponentGrid &e
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_applyForceFieldGridForcesThread, this,
-                                 intervals[i], intervals[i + 1], &ex, dt, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _applyForceFieldGridForcesThread(startidx, endidx, &ex, dt, dir);
+    });
 }
 
 void FluidSimulation::_applyForceFieldGridForcesThread(int startidx, int endidx, 
@@ -5622,6 +5696,7 @@ void FluidSimulation::_applyForceFieldGridForcesThread(int startidx, int endidx,
 void FluidSimulation::_applyBodyForcesToVelocityField(double dt) {
     _logfile.logString(_logfile.getTime() + " BEGIN       Apply Force Fields");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Apply Force Fields", "step");
     StopWatch t;
     t.start();
 
@@ -5649,6 +5724,19 @@ void FluidSimulation::_applyBodyForcesToVelocityField(double dt) {
     #. Viscosity Solve
 ********************************************************************************/
 
+// With warm start and cold reference solves enabled, the first substep of a
+// frame is periodically solved starting from zero. Its iteration count is the
+// reference that the iterations saved by warm started solves are measured against.
+bool FluidSimulation::_isSolverColdReferenceSolve(int referenceFrame) {
+    if (!_isSolverWarmStartEnabled || !_isSolverColdReferenceSolvesEnabled || 
+            _currentFrameTimeStepNumber != 0) {
+        return false;
+    }
+
+    return referenceFrame < 0 || _currentFrame < referenceFrame || 
+           _currentFrame - referenceFrame >= _solverColdReferenceFrameInterval;
+}
+
 void FluidSimulation::_applyViscosityToVelocityField(double dt) {
     _viscositySolverStatus = "";
 
@@ -5687,6 +5775,7 @@ void FluidSimulation::_applyViscosityToVelocityField(double dt) {
 
     _logfile.logString(_logfile.getTime() + " BEGIN       Apply Viscosity");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Apply Viscosity", "step");
     StopWatch t;
     t.start();
 
@@ -5705,6 +5794,7 @@ void FluidSimulation::_applyViscosityToVelocityField(double dt) {
     _viscositySolver = ViscositySolver();
     bool success = _viscositySolver.applyViscosityToVelocityField(params);
     _viscositySolverStatus = _viscositySolver.getSolverStatus();
+    _viscositySolverTotalIterations += _viscositySolver.getIterations();
 
     if (_currentFrameTimeStepNumber == 0) {
         _viscositySolverSuccess = success;
@@ -5762,18 +5852,9 @@ void FluidSimulation::_updateWeightGridMT(int dir) {
         gridsize = _isize * _jsize * _ksize;
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_updateWeightGridThread, this,
-                                 intervals[i], intervals[i + 1], dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _updateWeightGridThread(startidx, endidx, dir);
+    });
 }
 
 void FluidSimulation::_updateWeightGridThread(int startidx, int endidx, int dir) {
@@ -5820,6 +5901,7 @@ void FluidSimulation::_updateWeightGridThread(int startidx, int endidx, int dir)
 
 void FluidSimulation::_pressureSolve(double dt) {
     _logfile.logString(_logfile.getTime() + " BEGIN       Solve Pressure System");
+    StageProfiler::Scope stage(&_stageProfiler, "Solve Pressure System", "step");
     StopWatch t;
     t.start();
 
@@ -5880,9 +5962,27 @@ void FluidSimulation::_pressureSolve(double dt) {
         }
         */
 
-        Array3d<float> pressureGrid(_isize, _jsize, _ksize, 0.0f);
+        // With warm start enabled, the pressure grid is kept between substeps and 
+        // the previous solution is used as the initial guess. Cells that were 
+        // not fluid in the previous solve start from zero (air pressure).
+        Array3d<float> pressureGrid;
+        Array3d<float> *pressureGridPtr = &pressureGrid;
+        bool isColdReferenceSolve = _isSolverColdReferenceSolve(_pressureSolverColdReferenceFrame);
+        if (_isSolverWarmStartEnabled) {
+            if (_pressureGrid.width != _isize || _pressureGrid.height != _jsize || 
+                    _pressureGrid.depth != _ksize) {
+                _pressureGrid = Array3d<float>(_isize, _jsize, _ksize, 0.0f);
+            } else if (isColdReferenceSolve) {
+                _pressureGrid.fill(0.0f);
+            }
+            pressureGridPtr = &_pressureGrid;
+        } else {
+            _pressureGrid = Array3d<float>();
+            pressureGrid = Array3d<float>(_isize, _jsize, _ksize, 0.0f);
+        }
 
         PressureSolverParameters params;
+        params.solverMethod = _pressureSolverMethod;
         params.cellwidth = _dx;
         params.deltaTime = dt;
         params.tolerance = _pressureSolveTolerance;
@@ -5894,21 +5994,33 @@ void FluidSimulation::_pressureSolve(double dt) {
         params.validVelocities = &_validVelocities;
         params.liquidSDF = _liquidSDF.getPhiGrid();
         params.weightGrid = &_weightGrid;
-        params.pressureGrid = &pressureGrid;
+        params.pressureGrid = pressureGridPtr;
 
         params.isSurfaceTensionEnabled = _isSurfaceTensionEnabled;
         if (_isSurfaceTensionEnabled) {
             params.surfaceTensionConstant = _surfaceTensionConstant;
             params.curvatureGrid = &_fluidCurvatureGrid;
         }
+        params.coldReferenceIterations = _pressureSolverColdReferenceIterations;
 
         PressureSolver psolver;
         bool success = psolver.solve(params);
         if (success) {
             psolver.applySolutionToVelocityField();
+        } else if (_isSolverWarmStartEnabled) {
+            // Do not start the next solve from a failed solution
+            _pressureGrid.fill(0.0f);
+        }
+
+        if (isColdReferenceSolve && success && psolver.getIterations() > 0) {
+            _pressureSolverColdReferenceIterations = psolver.getIterations();
+            _pressureSolverColdReferenceFrame = _currentFrame;
         }
 
         _pressureSolverStatus = psolver.getSolverStatus();
+        _pressureSolverTotalIterations += psolver.getIterations();
+        _pressureSolverTime += psolver.getSolverTime();
+        _pressureSolverIterationsSaved += psolver.getEstimatedIterationsSaved();
         if (_currentFrameTimeStepNumber == 0) {
             _pressureSolverSuccess = success;
             _pressureSolverIterations = psolver.getIterations();
@@ -6034,18 +6146,9 @@ void FluidSimulation::_constrainVelocityFieldMT(MACVelocityField &MACGrid, int d
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_constrainVelocityFieldThread, this,
-                                 intervals[i], intervals[i + 1], &MACGrid, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _constrainVelocityFieldThread(startidx, endidx, &MACGrid, dir);
+    });
 }
 
 void FluidSimulation::_constrainVelocityFieldThread(int startidx, int endidx, 
@@ -6104,6 +6207,7 @@ void FluidSimulation::_constrainVelocityFieldThread(int startidx, int endidx,
 void FluidSimulation::_constrainVelocityFields() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Constrain Velocity Field");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Constrain Velocity Fields", "step");
     StopWatch t;
     t.start();
 
@@ -6129,6 +6233,7 @@ void FluidSimulation::_updateDiffuseMaterial(double dt) {
 
     _logfile.logString(_logfile.getTime() + " BEGIN       Simulate Diffuse Material");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Simulate Diffuse Material", "step");
     StopWatch t;
     t.start();
 
@@ -6200,6 +6305,7 @@ void FluidSimulation::_updateSheetSeeding() {
 
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Sheet Seeding");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Sheet Seeding", "step");
     StopWatch t;
     t.start();
 
@@ -6477,23 +6583,13 @@ void FluidSimulation::_updatePICAPICMarkerParticleVelocitiesThread(int startidx,
 }
 
 void FluidSimulation::_updateMarkerParticleVelocitiesThread() {
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _markerParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _markerParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
+    ThreadUtils::parallelFor(0, _markerParticles.size(), [&](int startidx, int endidx) {
         if (_velocityTransferMethod == VelocityTransferMethod::FLIP) {
-            threads[i] = std::thread(&FluidSimulation::_updatePICFLIPMarkerParticleVelocitiesThread, this,
-                                     intervals[i], intervals[i + 1]);
+            _updatePICFLIPMarkerParticleVelocitiesThread(startidx, endidx);
         } else if (_velocityTransferMethod == VelocityTransferMethod::APIC) {
-            threads[i] = std::thread(&FluidSimulation::_updatePICAPICMarkerParticleVelocitiesThread, this,
-                                     intervals[i], intervals[i + 1]);
+            _updatePICAPICMarkerParticleVelocitiesThread(startidx, endidx);
         }
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    });
 }
 
 void FluidSimulation::_constrainMarkerParticleVelocities(MeshFluidSource *inflow) {
@@ -6566,6 +6662,7 @@ void FluidSimulation::_constrainMarkerParticleVelocities() {
 void FluidSimulation::_updateMarkerParticleVelocities() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Marker Particle Velocities");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Marker Particle Velocities", "step");
     StopWatch t;
     t.start();
 
@@ -6812,19 +6909,10 @@ void FluidSimulation::_updateMarkerParticleColorAttributeMixing(double dt) {
     std::vector<vmath::vec3> colorsNew(colors->size(), vmath::vec3(0.0f, 0.0f, 0.0f));
     std::vector<bool> colorsNewValid(colors->size(), false);
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, positions->size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, positions->size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_updateMarkerParticleColorAttributeMixingThread, this,
-                                 intervals[i], intervals[i + 1], dt, &pointGrid,
-                                 colors, &colorsNew, &colorsNewValid);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, positions->size(), [&](int startidx, int endidx) {
+        _updateMarkerParticleColorAttributeMixingThread(startidx, endidx, dt, &pointGrid, 
+                                                        colors, &colorsNew, &colorsNewValid);
+    });
 
     for (size_t i = 0; i < colors->size(); i++) {
         if (colorsNewValid[i]) {
@@ -7100,6 +7188,7 @@ void FluidSimulation::_updateMarkerParticleColorAttribute(double dt) {
 void FluidSimulation::_updateMarkerParticleAttributes(double dt) {
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Marker Particle Attributes");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Marker Particle Attributes", "step");
     StopWatch t;
     t.start();
 
@@ -7361,6 +7450,7 @@ void FluidSimulation::_removeMarkerParticles(double dt) {
 void FluidSimulation::_advanceMarkerParticles(double dt) {
     _logfile.logString(_logfile.getTime() + " BEGIN       Advect Marker Particles");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Advance Marker Particles", "step");
     StopWatch t;
     t.start();
 
@@ -7372,19 +7462,10 @@ void FluidSimulation::_advanceMarkerParticles(double dt) {
         
         std::vector<vmath::vec3> positionsCopy = *positions;
 
-        int numCPU = ThreadUtils::getMaxThreadCount();
-        int numthreads = (int)fmin(numCPU, positionsCopy.size());
-        std::vector<std::thread> threads(numthreads);
         std::vector<vmath::vec3> output(positionsCopy.size());
-        std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, positionsCopy.size(), numthreads);
-        for (int i = 0; i < numthreads; i++) {
-            threads[i] = std::thread(&FluidSimulation::_advanceMarkerParticlesThread, this,
-                                     dt, intervals[i], intervals[i + 1], &positionsCopy, &output);
-        }
-
-        for (int i = 0; i < numthreads; i++) {
-            threads[i].join();
-        }
+        ThreadUtils::parallelFor(0, positionsCopy.size(), [&](int startidx, int endidx) {
+            _advanceMarkerParticlesThread(dt, startidx, endidx, &positionsCopy, &output);
+        });
 
         for (size_t i = 0; i < _markerParticles.size(); i++) {
             float distanceTravelled = vmath::length(positions->at(i) - output[i]);
@@ -7420,19 +7501,12 @@ void FluidSimulation::_addNewFluidCells(std::vector<GridIndex> &cells,
 
     int numCPU = ThreadUtils::getMaxThreadCount();
     int numthreads = (int)fmin(numCPU, cells.size());
-    std::vector<std::thread> threads(numthreads);
     std::vector<std::vector<vmath::vec3> > particleVectors(numthreads);
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, cells.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_addNewFluidCellsThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &cells, &meshSDF, sdfoffset, 
-                                 &(particleVectors[i]));
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelForIntervals(intervals, [&](int i, int startidx, int endidx) {
+        _addNewFluidCellsThread(startidx, endidx, &cells, &meshSDF, sdfoffset, 
+                                &(particleVectors[i]));
+    });
 
     std::vector<MarkerParticle> newParticles;
     for (size_t vidx = 0; vidx < particleVectors.size(); vidx++) {
@@ -7460,19 +7534,12 @@ void FluidSimulation::_addNewFluidCells(std::vector<GridIndex> &cells,
 
     int numCPU = ThreadUtils::getMaxThreadCount();
     int numthreads = (int)fmin(numCPU, cells.size());
-    std::vector<std::thread> threads(numthreads);
     std::vector<std::vector<vmath::vec3> > particleVectors(numthreads);
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, cells.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_addNewFluidCellsThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &cells, &meshSDF, sdfoffset, 
-                                 &(particleVectors[i]));
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelForIntervals(intervals, [&](int i, int startidx, int endidx) {
+        _addNewFluidCellsThread(startidx, endidx, &cells, &meshSDF, sdfoffset, 
+                                &(particleVectors[i]));
+    });
 
     std::vector<MarkerParticle> newParticles;
     for (size_t vidx = 0; vidx < particleVectors.size(); vidx++) {
@@ -7965,6 +8032,7 @@ int FluidSimulation::_getNumFluidCells() {
 void FluidSimulation::_updateFluidObjects() {
     _logfile.logString(_logfile.getTime() + " BEGIN       Update Fluid Objects");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Update Fluid Objects", "step");
     StopWatch t;
     t.start();
     _updateAddedFluidMeshObjectQueue();
@@ -8691,6 +8759,7 @@ void FluidSimulation::_outputSurfaceMeshThread(std::vector<vmath::vec3> *particl
 
     _logfile.logString(_logfile.getTime() + " BEGIN       Generate Surface Mesh");
 
+    StageProfiler::Scope stage(&_stageProfiler, "Generate Surface Mesh", "output");
     StopWatch t;
     t.start();
 
@@ -8699,11 +8768,23 @@ void FluidSimulation::_outputSurfaceMeshThread(std::vector<vmath::vec3> *particl
         particlesCopy = *particles;
     }
 
+    StopWatch reconstructionTimer;
+    reconstructionTimer.start();
+    _stageProfiler.beginStage("Reconstruct Surface", "output");
+
     TriangleMesh surfacemesh, previewmesh;
     _generateOutputSurface(surfacemesh, previewmesh, particles, solidSDF);
     delete particles;
     delete solidSDF;
 
+    _stageProfiler.endStage();
+    reconstructionTimer.stop();
+    _timingData.outputSurfaceReconstruction += reconstructionTimer.getTime();
+
+    StopWatch attributeTimer;
+    attributeTimer.start();
+    _stageProfiler.beginStage("Generate Surface Attributes", "output");
+
     _generateSurfaceMotionBlurData(surfacemesh, vfield);
     _generateSurfaceVelocityAttributeData(surfacemesh, vfield);
     delete vfield;
@@ -8722,6 +8803,10 @@ void FluidSimulation::_outputSurfaceMeshThread(std::vector<vmath::vec3> *particl
     _generateSurfaceWhitewaterProximityAttributeData(surfacemesh);
     _generateSurfaceColorAttributeData(surfacemesh);
 
+    _stageProfiler.endStage();
+    attributeTimer.stop();
+    _timingData.outputSurfaceAttributes += attributeTimer.getTime();
+
     _smoothSurfaceMesh(surfacemesh);
     _invertContactNormals(surfacemesh);
 
@@ -8976,21 +9061,11 @@ void FluidSimulation::_classifyFluidParticleTypes(ParticleSystem &fluidParticles
         }
     }
 
-    int particlesPerThread = 100000;
-    int workerThreads = (_markerParticles.size() / particlesPerThread) + 1;
-    int numCPU = std::min(ThreadUtils::getMaxThreadCount(), workerThreads);
-    int numthreads = (int)fmin(numCPU, _markerParticles.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _markerParticles.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&FluidSimulation::_classifyFluidParticleTypesThread, this,
-                                 intervals[i], intervals[i + 1],
-                                 positions, &isBoundaryCell, &fluidParticleTypes);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    int particlesPerChunk = 100000;
+    ThreadUtils::parallelFor(0, _markerParticles.size(), [&](int startidx, int endidx) {
+        _classifyFluidParticleTypesThread(startidx, endidx, positions, 
+                                          &isBoundaryCell, &fluidParticleTypes);
+    }, particlesPerChunk);
 }
 
 void FluidSimulation::_classifyFluidParticleTypesThread(int startidx, int endidx,
@@ -9177,7 +9252,9 @@ void FluidSimulation::_outputFluidParticles() {
         Fluid Particle Positions
     */
     FluidParticleDataFFP3 dataFFP3;
+    _stageProfiler.beginStage("Build FFP3 Data", "output");
     _generateFluidParticleDataFFP3(_markerParticles, dataFFP3);
+    _stageProfiler.endStage();
     std::vector<vmath::vec3> *positions;
     _markerParticles.getAttributeValues("POSITION", positions);
 
@@ -9495,14 +9572,32 @@ void FluidSimulation::_outputSimulationData() {
     if (_currentFrameTimeStepNumber == 0) {
         _logfile.logString(_logfile.getTime() + " BEGIN       Generate Output Data");
 
+        StageProfiler::Scope stage(&_stageProfiler, "Generate Output Data", "output");
         StopWatch t;
         t.start();
         _launchOutputSurfaceMeshThread();
+
+        StopWatch diffuseTimer;
+        diffuseTimer.start();
+        _stageProfiler.beginStage("Output Diffuse Material", "output");
         _outputDiffuseMaterial();
+        _stageProfiler.endStage();
+        diffuseTimer.stop();
+        _timingData.outputDiffuseMaterial += diffuseTimer.getTime();
+
+        StopWatch fluidParticlesTimer;
+        fluidParticlesTimer.start();
+        _stageProfiler.beginStage("Output Fluid Particles", "output");
         _outputFluidParticles();
+        _stageProfiler.endStage();
+        fluidParticlesTimer.stop();
+        _timingData.outputFluidParticles += fluidParticlesTimer.getTime();
+
+        _stageProfiler.beginStage("Output Debug Data", "output");
         _outputFluidParticleDebug();
         _outputInternalObstacleMesh();
         _outputForceFieldDebugData();
+        _stageProfiler.endStage();
         t.stop();
 
         _timingData.outputNonMeshSimulationData += t.getTime();
@@ -9715,8 +9810,41 @@ void FluidSimulation::_updateTimingData() {
         diffuseCurvatureTimeFactor = 1.0;
     }
 
-    _timingData.normalizeTimes();
     TimingData tdata = _timingData;
+    FluidSimulationStageTimingStats sstats;
+    sstats.updateObstacleObjects = tdata.updateObstacleObjects;
+    sstats.updateLiquidLevelSet = tdata.updateLiquidLevelSet;
+    sstats.advectVelocityField = tdata.advectVelocityField;
+    sstats.saveVelocityField = tdata.saveVelocityField;
+    sstats.calculateFluidCurvatureGrid = tdata.calculateFluidCurvatureGrid;
+    sstats.applyBodyForcesToVelocityField = tdata.applyBodyForcesToVelocityField;
+    sstats.applyViscosityToVelocityField = tdata.applyViscosityToVelocityField;
+    sstats.pressureSolve = tdata.pressureSolve;
+    sstats.constrainVelocityFields = tdata.constrainVelocityFields;
+    sstats.updateDiffuseMaterial = tdata.updateDiffuseMaterial;
+    sstats.updateSheetSeeding = tdata.updateSheetSeeding;
+    sstats.updateMarkerParticleVelocities = tdata.updateMarkerParticleVelocities;
+    sstats.deleteSavedVelocityField = tdata.deleteSavedVelocityField;
+    sstats.advanceMarkerParticles = tdata.advanceMarkerParticles;
+    sstats.updateFluidObjects = tdata.updateFluidObjects;
+    sstats.outputNonMeshSimulationData = tdata.outputNonMeshSimulationData;
+    sstats.outputDiffuseMaterial = tdata.outputDiffuseMaterial;
+    sstats.outputFluidParticles = tdata.outputFluidParticles;
+    sstats.outputMeshSimulationData = tdata.outputMeshSimulationData;
+    sstats.outputSurfaceReconstruction = tdata.outputSurfaceReconstruction;
+    sstats.outputSurfaceAttributes = tdata.outputSurfaceAttributes;
+    sstats.minSubstepTime = tdata.minSubstepTime;
+    sstats.maxSubstepTime = tdata.maxSubstepTime;
+
+    int numThreads = ThreadUtils::getMaxThreadCount();
+    if (tdata.frameTime > 0.0 && numThreads > 0) {
+        double busyTime = tdata.frameTime + tdata.workerBusyTime;
+        sstats.threadUtilization = std::min(busyTime / (tdata.frameTime * numThreads), 1.0);
+    }
+    _outputData.frameData.stages = sstats;
+
+    _timingData.normalizeTimes();
+    tdata = _timingData;
     FluidSimulationTimingStats tstats;
     tstats.total = tdata.frameTime;
     tstats.mesh = tdata.outputNonMeshSimulationData + tdata.outputMeshSimulationData;
@@ -9858,6 +9986,10 @@ void FluidSimulation::update(double dt) {
     }
 
     _timingData = TimingData();
+    double workerBusyTimeStart = ThreadUtils::getWorkerBusyTime();
+
+    _stageProfiler.beginFrame(_currentFrame);
+    _stageProfiler.beginStage("Frame", "frame");
 
     StopWatch frameTimer;
     frameTimer.start();
@@ -9880,9 +10012,13 @@ void FluidSimulation::update(double dt) {
     _pressureSolverSuccess = true;
     _pressureSolverIterations = 0;
     _pressureSolverError = 0.0f;
+    _pressureSolverTotalIterations = 0;
+    _pressureSolverTime = 0.0;
+    _pressureSolverIterationsSaved = 0;
     _viscositySolverSuccess = true;
     _viscositySolverIterations = 0;
     _viscositySolverError = 0.0f;
+    _viscositySolverTotalIterations = 0;
 
     size_t totalFluidParticlesProcessed = 0;
     double totalFluidParticlesProcessedTime = 0.0f;
@@ -9923,8 +10059,11 @@ void FluidSimulation::update(double dt) {
         _logfile.log(ss);
         _logfile.newline();
 
+        _stageProfiler.setSubstep(_currentFrameTimeStepNumber);
+        _stageProfiler.beginStage("Substep", "substep");
         _stepFluid(_currentFrameTimeStep);
         _currentNumFluidCells = _getNumFluidCells();
+        _stageProfiler.endStage();
 
         _logStepInfo();
 
@@ -9932,6 +10071,11 @@ void FluidSimulation::update(double dt) {
         _logfile.log("Step Update Time:   ", stepTimer.getTime(), 3);
         _logfile.newline();
 
+        if (_currentFrameTimeStepNumber == 0 || stepTimer.getTime() < _timingData.minSubstepTime) {
+            _timingData.minSubstepTime = stepTimer.getTime();
+        }
+        _timingData.maxSubstepTime = std::max(_timingData.maxSubstepTime, stepTimer.getTime());
+
         totalFluidParticlesProcessed += _markerParticles.size();
         totalFluidParticlesProcessedTime += stepTimer.getTime();
 
@@ -9940,8 +10084,14 @@ void FluidSimulation::update(double dt) {
 
     frameTimer.stop();
     _timingData.frameTime = frameTimer.getTime();
+    _timingData.workerBusyTime = ThreadUtils::getWorkerBusyTime() - workerBusyTimeStart;
     _totalSimulationTime += frameTimer.getTime();
 
+    _stageProfiler.endStage();
+    if (_stageProfiler.isEnabled()) {
+        _stageProfiler.getChromeTraceData(_outputData.frameTraceData);
+    }
+
     if (totalFluidParticlesProcessed == 0 || totalFluidParticlesProcessedTime < 1e-9) {
         _currentPerformanceScore = -1;
     } else {
@@ -9964,12 +10114,17 @@ void FluidSimulation::update(double dt) {
     _outputData.frameData.pressureSolverError = (double)_pressureSolverError;
     _outputData.frameData.pressureSolverIterations = _pressureSolverIterations;
     _outputData.frameData.pressureSolverMaxIterations = getPressureSolverMaxIterations();
+    _outputData.frameData.pressureSolverMethod = (int)_pressureSolverMethod;
+    _outputData.frameData.pressureSolverTotalIterations = _pressureSolverTotalIterations;
+    _outputData.frameData.pressureSolverTime = _pressureSolverTime;
+    _outputData.frameData.pressureSolverIterationsSaved = _pressureSolverIterationsSaved;
 
     _outputData.frameData.viscositySolverEnabled = (int)_isViscosityEnabled;
     _outputData.frameData.viscositySolverSuccess = (int)_viscositySolverSuccess;
     _outputData.frameData.viscositySolverError = (double)_viscositySolverError;
     _outputData.frameData.viscositySolverIterations = _viscositySolverIterations;
     _outputData.frameData.viscositySolverMaxIterations = getViscositySolverMaxIterations();
+    _outputData.frameData.viscositySolverTotalIterations = _viscositySolverTotalIterations;
 
     _outputData.isInitialized = true;
 
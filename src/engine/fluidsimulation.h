@@ -53,6 +53,7 @@ SOFTWARE.
 #include "markerparticle.h"
 #include "viscositysolver.h"
 #include "spatialpointgrid.h"
+#include "stageprofiler.h"
 
 class AABB;
 class MeshFluidSource;
@@ -80,6 +81,43 @@ struct FluidSimulationTimingStats {
     double objects = 0.0;
 };
 
+/*
+    Measured times of the individual simulation stages in seconds, summed over
+    all substeps of the frame. Unlike FluidSimulationTimingStats, the times
+    are not scaled to add up to the frame time. The output stages run on the
+    mesher thread and may overlap the simulation stages.
+
+    threadUtilization is the fraction of the available thread time that was
+    in use, counting the simulation thread as busy and adding the time thread
+    pool workers spent running parallelFor chunks.
+*/
+struct FluidSimulationStageTimingStats {
+    double updateObstacleObjects = 0.0;
+    double updateLiquidLevelSet = 0.0;
+    double advectVelocityField = 0.0;
+    double saveVelocityField = 0.0;
+    double calculateFluidCurvatureGrid = 0.0;
+    double applyBodyForcesToVelocityField = 0.0;
+    double applyViscosityToVelocityField = 0.0;
+    double pressureSolve = 0.0;
+    double constrainVelocityFields = 0.0;
+    double updateDiffuseMaterial = 0.0;
+    double updateSheetSeeding = 0.0;
+    double updateMarkerParticleVelocities = 0.0;
+    double deleteSavedVelocityField = 0.0;
+    double advanceMarkerParticles = 0.0;
+    double updateFluidObjects = 0.0;
+    double outputNonMeshSimulationData = 0.0;
+    double outputDiffuseMaterial = 0.0;
+    double outputFluidParticles = 0.0;
+    double outputMeshSimulationData = 0.0;
+    double outputSurfaceReconstruction = 0.0;
+    double outputSurfaceAttributes = 0.0;
+    double minSubstepTime = 0.0;
+    double maxSubstepTime = 0.0;
+    double threadUtilization = 0.0;
+};
+
 struct FluidSimulationFrameStats {
     int frame = 0;
     int substeps = 0;
@@ -93,12 +131,17 @@ struct FluidSimulationFrameStats {
     double pressureSolverError = 0.0;
     int pressureSolverIterations = 0;
     int pressureSolverMaxIterations = 0;
+    int pressureSolverMethod = 0;
+    int pressureSolverTotalIterations = 0;
+    double pressureSolverTime = 0.0;
+    int pressureSolverIterationsSaved = 0;
 
     int viscositySolverEnabled = 1;
     int viscositySolverSuccess = 0;
     double viscositySolverError = 0.0;
     int viscositySolverIterations = 0;
     int viscositySolverMaxIterations = 0;
+    int viscositySolverTotalIterations = 0;
 
     FluidSimulationMeshStats surface;
     FluidSimulationMeshStats preview;
@@ -147,6 +190,7 @@ struct FluidSimulationFrameStats {
     FluidSimulationMeshStats obstacle;
     FluidSimulationMeshStats forcefield;
     FluidSimulationTimingStats timing;
+    FluidSimulationStageTimingStats stages;
 };
 
 struct FluidSimulationMarkerParticleData {
@@ -336,6 +380,47 @@ public:
     int getPressureSolverMaxIterations();
     void setPressureSolverMaxIterations(int n);
 
+    /*
+        Set the linear solver used for the pressure system: conjugate gradient
+        with a modified incomplete Cholesky preconditioner (PCG) or with a 
+        multithreaded multigrid preconditioner (MGPCG). MGPCG generally requires 
+        far fewer iterations on high resolution domains.
+
+        ParallelPCG uses the same preconditioner as PCG, but factors and applies
+        it on multiple threads using level scheduling. The solution and number
+        of iterations are identical to PCG.
+    */
+    void setPressureSolverMethodPCG();
+    void setPressureSolverMethodMGPCG();
+    void setPressureSolverMethodParallelPCG();
+    bool isPressureSolverMethodPCG();
+    bool isPressureSolverMethodMGPCG();
+    bool isPressureSolverMethodParallelPCG();
+
+    /*
+        Enable/Disable warm started pressure solves
+
+        If enabled, the pressure solve starts from the pressure of the
+        previous substep instead of starting from zero.
+    */
+    void enableSolverWarmStart();
+    void disableSolverWarmStart();
+    bool isSolverWarmStartEnabled();
+
+    /*
+        Enable/Disable cold reference pressure solves. For benchmarking and
+        debugging only. Disabled by default.
+
+        If enabled together with warm start, the first substep of every 10th
+        frame is solved starting from zero. Its iteration count is used as the 
+        reference for the iterations saved by warm starting in the frame stats.
+        Otherwise the iterations saved are extrapolated from the convergence
+        rate of each solve.
+    */
+    void enableSolverColdReferenceSolves();
+    void disableSolverColdReferenceSolves();
+    bool isSolverColdReferenceSolvesEnabled();
+
     int getViscositySolverMaxIterations();
     void setViscositySolverMaxIterations(int n);
 
@@ -693,6 +778,17 @@ public:
     void disableForceFieldDebugOutput();
     bool isForceFieldDebugOutputEnabled();
 
+    /*
+        Enable/disable recording a timeline of the simulation stages of
+        each frame. The timeline is output in the Chrome trace event JSON
+        format and can be retrieved with getFrameTraceData().
+
+        Disabled by default.
+    */
+    void enableFrameTraceOutput();
+    void disableFrameTraceOutput();
+    bool isFrameTraceOutputEnabled();
+
     /*
         Enable/disable the simulation from simulating diffuse 
         material (spray/bubble/foam particles), and saving diffuse mesh data to disk.
@@ -1472,6 +1568,7 @@ public:
     std::vector<char>* getInternalObstacleMeshData();
     std::vector<char>* getForceFieldDebugData();
     std::vector<char>* getLogFileData();
+    std::vector<char>* getFrameTraceData();
     FluidSimulationFrameStats getFrameStatsData();
 
     void getMarkerParticlePositionDataRange(int start_idx, int end_idx, char *data);
@@ -1595,6 +1692,7 @@ private:
         std::vector<char> internalObstacleMeshData;
         std::vector<char> forceFieldDebugData;
         std::vector<char> logfileData;
+        std::vector<char> frameTraceData;
         FluidSimulationFrameStats frameData;
         bool isInitialized = false;
     };
@@ -1664,6 +1762,16 @@ private:
         double outputMeshSimulationData = 0.0;
         double frameTime = 0.0;
 
+        // Parts of the output stages above. Not included in normalizeTimes().
+        double outputDiffuseMaterial = 0.0;
+        double outputFluidParticles = 0.0;
+        double outputSurfaceReconstruction = 0.0;
+        double outputSurfaceAttributes = 0.0;
+
+        double minSubstepTime = 0.0;
+        double maxSubstepTime = 0.0;
+        double workerBusyTime = 0.0;
+
         void normalizeTimes() {
             double total = updateObstacleObjects +
                            updateLiquidLevelSet +
@@ -1826,6 +1934,7 @@ private:
     /*
         Viscosity Solve
     */
+    bool _isSolverColdReferenceSolve(int referenceFrame);
     void _applyViscosityToVelocityField(double dt);
 
     /*
@@ -2256,6 +2365,7 @@ private:
     TriangleMeshFormat _meshOutputFormat = TriangleMeshFormat::ply;
     FluidSimulationOutputData _outputData;
     TimingData _timingData;
+    StageProfiler _stageProfiler;
 
     MeshObject *_meshingVolume = NULL;
     MeshLevelSet _meshingVolumeSDF;
@@ -2296,6 +2406,9 @@ private:
     bool _pressureSolverSuccess = true;
     int _pressureSolverIterations = 0;
     float _pressureSolverError = 0.0f;
+    int _pressureSolverTotalIterations = 0;
+    double _pressureSolverTime = 0.0;
+    int _pressureSolverIterationsSaved = 0;
 
     // Pressure solve
     WeightGrid _weightGrid;
@@ -2307,10 +2420,18 @@ private:
     double _pressureSolveTolerance = 1e-9;
     double _pressureSolveAcceptableTolerance = 1.0;
     double _maxPressureSolveIterations = 900;
+    PressureSolverMethod _pressureSolverMethod = PressureSolverMethod::PCG;
+    bool _isSolverWarmStartEnabled = false;
+    bool _isSolverColdReferenceSolvesEnabled = false;
+    int _solverColdReferenceFrameInterval = 10;
+    int _pressureSolverColdReferenceIterations = -1;
+    int _pressureSolverColdReferenceFrame = -1;
+    Array3d<float> _pressureGrid;
     std::string _pressureSolverStatus;
     bool _viscositySolverSuccess = true;
     int _viscositySolverIterations = 0;
     float _viscositySolverError = 0.0f;
+    int _viscositySolverTotalIterations = 0;
 
     // Extrapolate fluid velocities
     ValidVelocityComponentGrid _validVelocities;
@@ -266,18 +266,9 @@ void MeshLevelSet::trilinearInterpolatePoints(std::vector<vmath::vec3> &points,
                                               std::vector<float> &results) {
     results = std::vector<float>(points.size(), 0.0f);
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, points.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, points.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_trilinearInterpolatePointsThread, this,
-                                 intervals[i], intervals[i + 1], &points, &results);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, points.size(), [&](int startidx, int endidx) {
+        _trilinearInterpolatePointsThread(startidx, endidx, &points, &results);
+    });
 }
 
 void MeshLevelSet::_trilinearInterpolatePointsThread(int startidx, int endidx,
@@ -292,18 +283,9 @@ void MeshLevelSet::trilinearInterpolateSolidGridPoints(vmath::vec3 offset, doubl
                                                        Array3d<bool> &grid) {
 
     size_t gridsize = grid.width * grid.height * grid.depth;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_trilinearInterpolateSolidGridPointsThread, this,
-                                 intervals[i], intervals[i + 1], offset, dx, &grid);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _trilinearInterpolateSolidGridPointsThread(startidx, endidx, offset, dx, &grid);
+    });
 }
 
 void MeshLevelSet::_trilinearInterpolateSolidGridPointsThread(int startidx, int endidx, 
@@ -621,20 +603,9 @@ void MeshLevelSet::calculateUnion(MeshLevelSet &levelset) {
     levelset.getGridDimensions(&isizeOther, &jsizeOther, &ksizeOther);
 
     size_t gridsize = (isizeOther + 1) * (jsizeOther + 1) * (ksizeOther + 1);
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_calculateUnionThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 triIndexOffset, meshObjectIndexOffset, 
-                                 &levelset);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _calculateUnionThread(startidx, endidx, triIndexOffset, meshObjectIndexOffset, &levelset);
+    });
 }
 
 void MeshLevelSet::normalizeVelocityGrid() {
@@ -643,56 +614,28 @@ void MeshLevelSet::normalizeVelocityGrid() {
     ValidVelocityComponentGrid validVelocities(_isize, _jsize, _ksize);
 
     size_t gridsize = (_isize + 1) * _jsize * _ksize;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_normalizeVelocityGridThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 _velocityData.field.getArray3dU(), 
-                                 &(_velocityData.weightU),
-                                 &(validVelocities.validU)
-                                 );
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _normalizeVelocityGridThread(startidx, endidx, 
+                                     _velocityData.field.getArray3dU(), 
+                                     &(_velocityData.weightU),
+                                     &(validVelocities.validU));
+    });
 
     gridsize = _isize * (_jsize + 1) * _ksize;
-    numthreads = (int)std::min(numCPU, gridsize);
-    threads = std::vector<std::thread>(numthreads);
-    intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_normalizeVelocityGridThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 _velocityData.field.getArray3dV(), 
-                                 &(_velocityData.weightV),
-                                 &(validVelocities.validV)
-                                 );
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _normalizeVelocityGridThread(startidx, endidx, 
+                                     _velocityData.field.getArray3dV(), 
+                                     &(_velocityData.weightV),
+                                     &(validVelocities.validV));
+    });
 
     gridsize = _isize * _jsize * (_ksize + 1);
-    numthreads = (int)std::min(numCPU, gridsize);
-    threads = std::vector<std::thread>(numthreads);
-    intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_normalizeVelocityGridThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 _velocityData.field.getArray3dW(), 
-                                 &(_velocityData.weightW),
-                                 &(validVelocities.validW)
-                                 );
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _normalizeVelocityGridThread(startidx, endidx, 
+                                     _velocityData.field.getArray3dW(), 
+                                     &(_velocityData.weightW),
+                                     &(validVelocities.validW));
+    });
 
     _velocityData.field.extrapolateVelocityField(
             validVelocities, _numVelocityExtrapolationLayers
@@ -929,19 +872,9 @@ void MeshLevelSet::_initializeBlockGrid(std::vector<TriangleData> &triangleData,
 
     Array3d<bool> activeBlocks(dims.i, dims.j, dims.k, false);
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, triangleData.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, triangleData.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_initializeActiveBlocksThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &triangleData, bandwidth, &activeBlocks);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, triangleData.size(), [&](int startidx, int endidx) {
+        _initializeActiveBlocksThread(startidx, endidx, &triangleData, bandwidth, &activeBlocks);
+    });
 
     for (int k = 0; k < dims.k; k++) {
         for (int j = 0; j < dims.j; j++) {
@@ -991,19 +924,11 @@ void MeshLevelSet::_computeGridCountData(std::vector<TriangleData> &triangledata
     _initializeGridCountData(triangledata, blockphi, countdata);
 
     int numthreads = countdata.numthreads;
-    std::vector<std::thread> threads(numthreads);
     std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, triangledata.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_computeGridCountDataThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &triangledata, 
-                                 &blockphi, 
-                                 &(countdata.threadGridCountData[i]));
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelForIntervals(intervals, [&](int i, int startidx, int endidx) {
+        _computeGridCountDataThread(startidx, endidx, &triangledata, &blockphi, 
+                                    &(countdata.threadGridCountData[i]));
+    });
 
     for (int tidx = 0; tidx < countdata.numthreads; tidx++) {
         std::vector<int> *threadGridCount = &(countdata.threadGridCountData[tidx].gridCount);
@@ -1384,18 +1309,9 @@ void MeshLevelSet::_computeVelocityGridMT(bool isStatic, int dir) {
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&MeshLevelSet::_computeVelocityGridThread, this,
-                                 intervals[i], intervals[i + 1], isStatic, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _computeVelocityGridThread(startidx, endidx, isStatic, dir);
+    });
 }
 
 void MeshLevelSet::_computeVelocityGrids() {
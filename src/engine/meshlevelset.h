@@ -186,36 +186,18 @@ public:
     void trilinearInterpolateSolidPoints(FragmentedVector<T> &points, 
                                          std::vector<bool> &isSolid) {
         isSolid = std::vector<bool>(points.size());
-        int numCPU = ThreadUtils::getMaxThreadCount();
-        int numthreads = (int)fmin(numCPU, points.size());
-        std::vector<std::thread> threads(numthreads);
-        std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, points.size(), numthreads);
-        for (int i = 0; i < numthreads; i++) {
-            threads[i] = std::thread(&MeshLevelSet::_trilinearInterpolateSolidPointsThread<T>, this,
-                                     intervals[i], intervals[i + 1], &points, &isSolid);
-        }
-
-        for (int i = 0; i < numthreads; i++) {
-            threads[i].join();
-        }
+        ThreadUtils::parallelFor(0, points.size(), [&](int startidx, int endidx) {
+            _trilinearInterpolateSolidPointsThread<T>(startidx, endidx, &points, &isSolid);
+        });
     }
 
     template<class T>
     void trilinearInterpolateSolidPoints(std::vector<T> &points, 
                                          std::vector<bool> &isSolid) {
         isSolid = std::vector<bool>(points.size());
-        int numCPU = ThreadUtils::getMaxThreadCount();
-        int numthreads = (int)fmin(numCPU, points.size());
-        std::vector<std::thread> threads(numthreads);
-        std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, points.size(), numthreads);
-        for (int i = 0; i < numthreads; i++) {
-            threads[i] = std::thread(&MeshLevelSet::_trilinearInterpolateSolidPointsVectorThread<T>, this,
-                                     intervals[i], intervals[i + 1], &points, &isSolid);
-        }
-
-        for (int i = 0; i < numthreads; i++) {
-            threads[i].join();
-        }
+        ThreadUtils::parallelFor(0, points.size(), [&](int startidx, int endidx) {
+            _trilinearInterpolateSolidPointsVectorThread<T>(startidx, endidx, &points, &isSolid);
+        });
     }
     
 private:
@@ -0,0 +1,448 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "mgpcgsolver.h"
+
+#include <cmath>
+#include <algorithm>
+
+#include "gridindexkeymap.h"
+#include "threadutils.h"
+#include "fluidsimassert.h"
+
+
+MGPCGSolver::MGPCGSolver() {
+}
+
+MGPCGSolver::~MGPCGSolver() {
+}
+
+void MGPCGSolver::setSolverParameters(double tolerance, int maxIterations) {
+    _tolerance = std::max(tolerance, 1e-30);
+    _maxIterations = maxIterations;
+}
+
+bool MGPCGSolver::solve(SparseMatrixd &matrix, GridIndexVector &cells,
+                        std::vector<double> &rhs, std::vector<double> &result, 
+                        double &residualOut, int &iterationsOut) {
+    FLUIDSIM_ASSERT(matrix.n == cells.size());
+    FLUIDSIM_ASSERT(matrix.n == rhs.size());
+    FLUIDSIM_ASSERT(matrix.n == result.size());
+
+    int n = (int)matrix.n;
+    iterationsOut = 0;
+    residualOut = 0.0;
+    _initialResidual = 0.0;
+    if (n == 0) {
+        return true;
+    }
+
+    _initializeFineLevel(matrix, cells);
+    _initializeCoarseLevels();
+
+    _r.resize(n);
+    _z.resize(n);
+    _s.resize(n);
+    _q.resize(n);
+
+    // r = rhs - A * result
+    _multiply(_levels[0], result, _q);
+    ThreadUtils::parallelFor(0, n, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            _r[i] = rhs[i] - _q[i];
+        }
+    }, _getChunkSize(n));
+
+    double tol = std::min(_tolerance * _absMax(rhs), _maxErrorTolerance);
+    residualOut = _absMax(_r);
+    _initialResidual = residualOut;
+    if (residualOut <= tol) {
+        return true;
+    }
+
+    _applyPreconditioner(_r, _z);
+    double rho = _dot(_z, _r);
+    if (rho == 0 || rho != rho) {
+        return false;
+    }
+
+    _s = _z;
+
+    int iteration;
+    for (iteration = 0; iteration < _maxIterations; iteration++) {
+        _multiply(_levels[0], _s, _q);
+        double alpha = rho / _dot(_s, _q);
+        _addScaled(alpha, _s, result);
+        _addScaled(-alpha, _q, _r);
+
+        residualOut = _absMax(_r);
+        if (residualOut <= tol) {
+            iterationsOut = iteration + 1;
+            return true;
+        }
+
+        _applyPreconditioner(_r, _z);
+        double rhoNew = _dot(_z, _r);
+        double beta = rhoNew / rho;
+        _addScaled(beta, _s, _z);
+        _s.swap(_z);    // s = beta * s + z
+        rho = rhoNew;
+    }
+
+    iterationsOut = iteration;
+    return false;
+}
+
+void MGPCGSolver::_initializeFineLevel(SparseMatrixd &matrix, GridIndexVector &cells) {
+    _levels.clear();
+    _levels.push_back(Level());
+
+    Level *level = &(_levels[0]);
+    level->isize = cells.width;
+    level->jsize = cells.height;
+    level->ksize = cells.depth;
+    level->cells = cells.getVector();
+
+    int n = level->size();
+    level->diag = std::vector<double>(n, 0.0);
+    level->invdiag = std::vector<double>(n, 0.0);
+    level->neighbours = std::vector<int>(_stencilSize * n, -1);
+    level->coefficients = std::vector<double>(_stencilSize * n, 0.0);
+
+    ThreadUtils::parallelFor(0, n, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            int slot = 0;
+            for (size_t idx = 0; idx < matrix.index[i].size(); idx++) {
+                int j = (int)matrix.index[i][idx];
+                double value = matrix.value[i][idx];
+                if (j == i) {
+                    level->diag[i] = value;
+                    continue;
+                }
+                if (value == 0.0) {
+                    continue;
+                }
+
+                FLUIDSIM_ASSERT(slot < _stencilSize);
+                level->neighbours[_stencilSize * i + slot] = j;
+                level->coefficients[_stencilSize * i + slot] = value;
+                slot++;
+            }
+
+            if (level->diag[i] > _eps) {
+                level->invdiag[i] = 1.0 / level->diag[i];
+            }
+        }
+    }, _getChunkSize(n));
+
+    _initializeColours(*level);
+}
+
+void MGPCGSolver::_initializeCoarseLevels() {
+    while ((int)_levels.size() < _maxLevels && !_isCoarsestLevel(_levels.back())) {
+        Level coarse;
+        _generateCoarseLevel(_levels.back(), coarse);
+        if (coarse.size() == _levels.back().size()) {
+            _levels.back().parents.clear();
+            break;
+        }
+        _levels.push_back(std::move(coarse));
+    }
+
+    for (size_t i = 0; i < _levels.size(); i++) {
+        int n = _levels[i].size();
+        _levels[i].x = std::vector<double>(n, 0.0);
+        _levels[i].b = std::vector<double>(n, 0.0);
+        _levels[i].r = std::vector<double>(n, 0.0);
+    }
+}
+
+bool MGPCGSolver::_isCoarsestLevel(Level &level) {
+    return level.size() <= _minCoarseCells || 
+           level.isize <= 2 || level.jsize <= 2 || level.ksize <= 2;
+}
+
+void MGPCGSolver::_generateCoarseLevel(Level &fine, Level &coarse) {
+    coarse.isize = (fine.isize + 1) / 2;
+    coarse.jsize = (fine.jsize + 1) / 2;
+    coarse.ksize = (fine.ksize + 1) / 2;
+
+    // Each 2x2x2 block of fine cells containing at least one cell is 
+    // merged into a single coarse cell
+    GridIndexKeyMap keymap(coarse.isize, coarse.jsize, coarse.ksize);
+    int nfine = fine.size();
+    fine.parents = std::vector<int>(nfine, -1);
+    for (int i = 0; i < nfine; i++) {
+        GridIndex g = fine.cells[i];
+        GridIndex cg(g.i / 2, g.j / 2, g.k / 2);
+        int cidx = keymap.find(cg);
+        if (cidx == -1) {
+            cidx = (int)coarse.cells.size();
+            keymap.insert(cg, cidx);
+            coarse.cells.push_back(cg);
+        }
+        fine.parents[i] = cidx;
+    }
+
+    int ncoarse = coarse.size();
+    coarse.childStart = std::vector<int>(ncoarse + 1, 0);
+    for (int i = 0; i < nfine; i++) {
+        coarse.childStart[fine.parents[i] + 1]++;
+    }
+    for (int i = 0; i < ncoarse; i++) {
+        coarse.childStart[i + 1] += coarse.childStart[i];
+    }
+
+    std::vector<int> childCount(ncoarse, 0);
+    coarse.children = std::vector<int>(nfine);
+    for (int i = 0; i < nfine; i++) {
+        int cidx = fine.parents[i];
+        coarse.children[coarse.childStart[cidx] + childCount[cidx]] = i;
+        childCount[cidx]++;
+    }
+
+    coarse.diag = std::vector<double>(ncoarse, 0.0);
+    coarse.invdiag = std::vector<double>(ncoarse, 0.0);
+    coarse.neighbours = std::vector<int>(_stencilSize * ncoarse, -1);
+    coarse.coefficients = std::vector<double>(_stencilSize * ncoarse, 0.0);
+    ThreadUtils::parallelFor(0, ncoarse, [&](int startidx, int endidx) {
+        _computeCoarseStencilThread(startidx, endidx, &fine, &coarse);
+    }, _getChunkSize(ncoarse));
+
+    _initializeColours(coarse);
+}
+
+void MGPCGSolver::_computeCoarseStencilThread(int startidx, int endidx, 
+                                              Level *fine, Level *coarse) {
+    // Coarse operator P^T * A * P where P maps each coarse cell value onto 
+    // its child cells
+    for (int cidx = startidx; cidx < endidx; cidx++) {
+        double diag = 0.0;
+        int *neighbours = &(coarse->neighbours[_stencilSize * cidx]);
+        double *coefficients = &(coarse->coefficients[_stencilSize * cidx]);
+
+        for (int cpos = coarse->childStart[cidx]; cpos < coarse->childStart[cidx + 1]; cpos++) {
+            int i = coarse->children[cpos];
+            diag += fine->diag[i];
+
+            for (int slot = 0; slot < _stencilSize; slot++) {
+                int j = fine->neighbours[_stencilSize * i + slot];
+                if (j == -1) {
+                    continue;
+                }
+
+                double value = fine->coefficients[_stencilSize * i + slot];
+                int parent = fine->parents[j];
+                if (parent == cidx) {
+                    diag += value;
+                    continue;
+                }
+
+                for (int cslot = 0; cslot < _stencilSize; cslot++) {
+                    if (neighbours[cslot] == parent) {
+                        coefficients[cslot] += value;
+                        break;
+                    } else if (neighbours[cslot] == -1) {
+                        neighbours[cslot] = parent;
+                        coefficients[cslot] = value;
+                        break;
+                    }
+                }
+            }
+        }
+
+        coarse->diag[cidx] = diag;
+        if (diag > _eps) {
+            coarse->invdiag[cidx] = 1.0 / diag;
+        }
+    }
+}
+
+void MGPCGSolver::_initializeColours(Level &level) {
+    level.colourCells[0].clear();
+    level.colourCells[1].clear();
+    for (int i = 0; i < level.size(); i++) {
+        GridIndex g = level.cells[i];
+        level.colourCells[(g.i + g.j + g.k) & 1].push_back(i);
+    }
+}
+
+void MGPCGSolver::_applyPreconditioner(std::vector<double> &r, std::vector<double> &z) {
+    Level &fine = _levels[0];
+    std::copy(r.begin(), r.end(), fine.b.begin());
+    _vcycle(0);
+    fine.x.swap(z);
+}
+
+void MGPCGSolver::_vcycle(int levelidx) {
+    // The post-smoothing sweeps are run in the reverse colour order of the 
+    // pre-smoothing sweeps so that the V-cycle is a symmetric preconditioner
+    Level &level = _levels[levelidx];
+    std::fill(level.x.begin(), level.x.end(), 0.0);
+
+    if (levelidx == (int)_levels.size() - 1) {
+        _smooth(level, _numCoarsestSmoothIterations, false);
+        _smooth(level, _numCoarsestSmoothIterations, true);
+        return;
+    }
+
+    Level &coarse = _levels[levelidx + 1];
+    _smooth(level, _numPreSmoothIterations, false);
+    _computeResidual(level);
+    _restrict(level, coarse);
+    _vcycle(levelidx + 1);
+    _prolongate(coarse, level);
+    _smooth(level, _numPostSmoothIterations, true);
+}
+
+void MGPCGSolver::_smooth(Level &level, int numIterations, bool isReversed) {
+    int first = isReversed ? 1 : 0;
+    for (int n = 0; n < numIterations; n++) {
+        _smoothColour(level, first);
+        _smoothColour(level, 1 - first);
+    }
+}
+
+void MGPCGSolver::_smoothColour(Level &level, int colour) {
+    // Cells only neighbour cells of the other colour, so all cells of a 
+    // colour can be updated in parallel
+    std::vector<int> &cells = level.colourCells[colour];
+    ThreadUtils::parallelFor(0, cells.size(), [&](int startidx, int endidx) {
+        for (int idx = startidx; idx < endidx; idx++) {
+            int i = cells[idx];
+            double sum = level.b[i];
+            for (int slot = 0; slot < _stencilSize; slot++) {
+                int j = level.neighbours[_stencilSize * i + slot];
+                if (j != -1) {
+                    sum -= level.coefficients[_stencilSize * i + slot] * level.x[j];
+                }
+            }
+            level.x[i] = sum * level.invdiag[i];
+        }
+    }, _getChunkSize(cells.size()));
+}
+
+void MGPCGSolver::_computeResidual(Level &level) {
+    _multiply(level, level.x, level.r);
+    ThreadUtils::parallelFor(0, level.size(), [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            level.r[i] = level.b[i] - level.r[i];
+        }
+    }, _getChunkSize(level.size()));
+}
+
+void MGPCGSolver::_restrict(Level &fine, Level &coarse) {
+    ThreadUtils::parallelFor(0, coarse.size(), [&](int startidx, int endidx) {
+        for (int cidx = startidx; cidx < endidx; cidx++) {
+            double sum = 0.0;
+            for (int cpos = coarse.childStart[cidx]; cpos < coarse.childStart[cidx + 1]; cpos++) {
+                sum += fine.r[coarse.children[cpos]];
+            }
+            coarse.b[cidx] = sum;
+        }
+    }, _getChunkSize(coarse.size()));
+}
+
+void MGPCGSolver::_prolongate(Level &coarse, Level &fine) {
+    double weight = _coarseCorrectionWeight;
+    ThreadUtils::parallelFor(0, fine.size(), [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            fine.x[i] += weight * coarse.x[fine.parents[i]];
+        }
+    }, _getChunkSize(fine.size()));
+}
+
+void MGPCGSolver::_multiply(Level &level, std::vector<double> &x, std::vector<double> &result) {
+    ThreadUtils::parallelFor(0, level.size(), [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            double sum = level.diag[i] * x[i];
+            for (int slot = 0; slot < _stencilSize; slot++) {
+                int j = level.neighbours[_stencilSize * i + slot];
+                if (j != -1) {
+                    sum += level.coefficients[_stencilSize * i + slot] * x[j];
+                }
+            }
+            result[i] = sum;
+        }
+    }, _getChunkSize(level.size()));
+}
+
+double MGPCGSolver::_dot(std::vector<double> &a, std::vector<double> &b) {
+    std::vector<int> intervals = _getReductionIntervals(a.size());
+    std::vector<double> results(intervals.size() - 1, 0.0);
+    ThreadUtils::parallelForIntervals(intervals, [&](int idx, int startidx, int endidx) {
+        double sum = 0.0;
+        for (int i = startidx; i < endidx; i++) {
+            sum += a[i] * b[i];
+        }
+        results[idx] = sum;
+    });
+
+    double sum = 0.0;
+    for (size_t i = 0; i < results.size(); i++) {
+        sum += results[i];
+    }
+    return sum;
+}
+
+double MGPCGSolver::_absMax(std::vector<double> &a) {
+    std::vector<int> intervals = _getReductionIntervals(a.size());
+    std::vector<double> results(intervals.size() - 1, 0.0);
+    ThreadUtils::parallelForIntervals(intervals, [&](int idx, int startidx, int endidx) {
+        double maxval = 0.0;
+        for (int i = startidx; i < endidx; i++) {
+            maxval = std::max(maxval, std::fabs(a[i]));
+        }
+        results[idx] = maxval;
+    });
+
+    double maxval = 0.0;
+    for (size_t i = 0; i < results.size(); i++) {
+        maxval = std::max(maxval, results[i]);
+    }
+    return maxval;
+}
+
+void MGPCGSolver::_addScaled(double alpha, std::vector<double> &x, std::vector<double> &y) {
+    // y = y + alpha * x
+    ThreadUtils::parallelFor(0, x.size(), [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            y[i] += alpha * x[i];
+        }
+    }, _getChunkSize(x.size()));
+}
+
+int MGPCGSolver::_getChunkSize(int n) {
+    // Coarse levels and short loops are not worth splitting into small chunks
+    int numthreads = ThreadUtils::getMaxThreadCount();
+    int chunksize = (int)std::ceil((double)n / (double)(4 * numthreads));
+    return std::max(chunksize, _minChunkSize);
+}
+
+std::vector<int> MGPCGSolver::_getReductionIntervals(int n) {
+    int numthreads = ThreadUtils::getMaxThreadCount();
+    int maxIntervals = (int)std::ceil((double)n / (double)_minChunkSize);
+    int numIntervals = std::max(std::min(numthreads, maxIntervals), 1);
+    return ThreadUtils::splitRangeIntoIntervals(0, n, numIntervals);
+}
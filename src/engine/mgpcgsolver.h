@@ -0,0 +1,151 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+/*
+    Conjugate gradient solver preconditioned with a geometric multigrid
+    V-cycle for the pressure system of the PressureSolver.
+
+    Based on the MGPCG method described in:
+    A parallel multigrid Poisson solver for fluids simulation on large grids
+     - A. McAdams, E. Sifakis, J. Teran
+
+    Coarse levels are generated by grouping 2x2x2 blocks of cells and the coarse
+    operators are computed from the finer level matrix (Galerkin coarsening with 
+    piecewise constant transfer operators). This keeps the fractional solid 
+    weights and ghost fluid air boundary terms of the fine matrix on all levels.
+    The 7-point stencil is preserved under this coarsening, so red-black 
+    Gauss-Seidel can be used as a parallel smoother on every level.
+*/
+
+#ifndef FLUIDENGINE_MGPCGSOLVER_H
+#define FLUIDENGINE_MGPCGSOLVER_H
+
+#include <vector>
+
+#include "pcgsolver/sparsematrix.h"
+#include "gridindexvector.h"
+
+class MGPCGSolver
+{
+public:
+    MGPCGSolver();
+    ~MGPCGSolver();
+
+    void setSolverParameters(double tolerance, int maxIterations);
+
+    /*
+        Solves matrix * result = rhs. Matrix row n corresponds to grid cell 
+        cells[n] and may only contain entries for the six face neighbours 
+        of the cell. The initial value of result is used as the starting guess.
+    */
+    bool solve(SparseMatrixd &matrix, GridIndexVector &cells,
+               std::vector<double> &rhs, std::vector<double> &result, 
+               double &residualOut, int &iterationsOut);
+
+    int getNumLevels() { return (int)_levels.size(); }
+
+    // Residual of the initial guess from the last solve
+    double getInitialResidual() { return _initialResidual; }
+
+private:
+
+    struct Level {
+        int isize = 0;
+        int jsize = 0;
+        int ksize = 0;
+        std::vector<GridIndex> cells;
+
+        // Stencil of each cell: diagonal and up to 6 neighbours. Unused
+        // neighbour slots have an index of -1.
+        std::vector<double> diag;
+        std::vector<double> invdiag;
+        std::vector<int> neighbours;
+        std::vector<double> coefficients;
+
+        // Cell indices of each red-black colour
+        std::vector<int> colourCells[2];
+
+        // Index of the coarse level cell that contains each cell
+        std::vector<int> parents;
+
+        // Child cells of each coarse cell in the finer level
+        std::vector<int> childStart;
+        std::vector<int> children;
+
+        std::vector<double> x;
+        std::vector<double> b;
+        std::vector<double> r;
+
+        int size() { return (int)cells.size(); }
+    };
+
+    void _initializeFineLevel(SparseMatrixd &matrix, GridIndexVector &cells);
+    void _initializeCoarseLevels();
+    bool _isCoarsestLevel(Level &level);
+    void _generateCoarseLevel(Level &fine, Level &coarse);
+    void _computeCoarseStencilThread(int startidx, int endidx, 
+                                     Level *fine, Level *coarse);
+    void _initializeColours(Level &level);
+
+    void _applyPreconditioner(std::vector<double> &r, std::vector<double> &z);
+    void _vcycle(int levelidx);
+    void _smooth(Level &level, int numIterations, bool isReversed);
+    void _smoothColour(Level &level, int colour);
+    void _computeResidual(Level &level);
+    void _restrict(Level &fine, Level &coarse);
+    void _prolongate(Level &coarse, Level &fine);
+
+    void _multiply(Level &level, std::vector<double> &x, std::vector<double> &result);
+    double _dot(std::vector<double> &a, std::vector<double> &b);
+    double _absMax(std::vector<double> &a);
+    void _addScaled(double alpha, std::vector<double> &x, std::vector<double> &y);
+    int _getChunkSize(int n);
+    std::vector<int> _getReductionIntervals(int n);
+
+    static const int _stencilSize = 6;
+
+    double _tolerance = 1e-9;
+    double _maxErrorTolerance = 1.0;
+    int _maxIterations = 200;
+
+    int _maxLevels = 16;
+    int _minCoarseCells = 512;
+    int _numPreSmoothIterations = 2;
+    int _numPostSmoothIterations = 2;
+    int _numCoarsestSmoothIterations = 30;
+
+    // Piecewise constant coarsening produces coarse operators that are too 
+    // stiff, so the coarse grid correction is scaled up. Values must stay 
+    // below 2.0 for the preconditioner to remain positive definite.
+    double _coarseCorrectionWeight = 1.5;
+    int _minChunkSize = 4096;
+    double _eps = 1e-12;
+
+    double _initialResidual = 0.0;
+
+    std::vector<Level> _levels;
+    std::vector<double> _r, _z, _s, _q;
+};
+
+#endif
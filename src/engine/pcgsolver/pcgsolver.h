@@ -20,8 +20,10 @@ purposes, all without asking permission. See Other Information below.
 // non-positive, and row sums are non-negative).
 
 #include <cmath>
+#include <algorithm>
 #include "sparsematrix.h"
 #include "blaswrapper.h"
+#include "../threadutils.h"
 #include "../fluidsimassert.h"
 
 //============================================================================
@@ -66,13 +68,12 @@ struct SparseColumnLowerFactor {
 // problems in factorization: if a pivot is this much less than the diagonal
 // entry from the original matrix, the original matrix entry is used instead.
 
+// Copies the lower triangle of the matrix into the factor
 template<class T>
-void factorModifiedIncompleteColesky0(const SparseMatrix<T> &matrix, 
-                                      SparseColumnLowerFactor<T> &factor,
-                                      T modificationParameter = 0.97, 
-                                      T minDiagonalRatio = 0.25) {
+void initializeIncompleteColesky0Factor(const SparseMatrix<T> &matrix, 
+                                        SparseColumnLowerFactor<T> &factor) {
 
-    // first copy lower triangle of matrix into factor (Note: assuming A is symmetric of course!)
+    // copy lower triangle of matrix into factor (Note: assuming A is symmetric of course!)
     factor.resize(matrix.n);
     std::fill(factor.invdiag.begin(), factor.invdiag.end(), 0); // important: eliminate old values from previous solves!
     factor.value.resize(0);
@@ -111,6 +112,95 @@ void factorModifiedIncompleteColesky0(const SparseMatrix<T> &matrix,
         }
     }
     factor.colstart[matrix.n] = (unsigned int)factor.rowindex.size();
+}
+
+// Computes the final L(k,k) entry and finalizes the k'th column L(:,k)
+template<class T>
+void finalizeIncompleteColesky0Column(SparseColumnLowerFactor<T> &factor, 
+                                      unsigned int k, 
+                                      T minDiagonalRatio) {
+    // figure out the final L(k,k) entry
+    if (factor.invdiag[k] < minDiagonalRatio * factor.adiag[k]) {
+        // drop to Gauss-Seidel here if the pivot looks dangerously small
+        factor.invdiag[k] = 1 / sqrt(factor.adiag[k]);
+    } else {
+        factor.invdiag[k] = 1 / sqrt(factor.invdiag[k]);
+    }
+
+    // finalize the k'th column L(:,k)
+    for (unsigned int p = factor.colstart[k]; p < factor.colstart[k + 1]; p++){
+        factor.value[p] *= factor.invdiag[k];
+    }
+}
+
+// Incompletely eliminates the finalized column L(:,k) from column j, where j is
+// the row of the entry at position p in column k. Only column j is modified.
+template<class T>
+void eliminateIncompleteColesky0Column(const SparseMatrix<T> &matrix, 
+                                       SparseColumnLowerFactor<T> &factor, 
+                                       unsigned int k, 
+                                       unsigned int p, 
+                                       T modificationParameter) {
+    unsigned int j = factor.rowindex[p]; // work on column j
+    T multiplier = factor.value[p];
+    T missing = 0;
+    unsigned int a = factor.colstart[k];
+    // first look for contributions to missing from dropped entries above the diagonal in column j
+    unsigned int b = 0;
+    while (a < factor.colstart[k + 1] && factor.rowindex[a] < j) {
+        // look for factor.rowindex[a] in matrix.index[j] starting at b
+        while (b < matrix.index[j].size()) {
+            if (matrix.index[j][b] < factor.rowindex[a]) {
+                b++;
+            } else if(matrix.index[j][b] == factor.rowindex[a]) {
+                break;
+            } else {
+                missing += factor.value[a];
+                break;
+            }
+        }
+        a++;
+    }
+
+    // adjust the diagonal j,j entry
+    if (a < factor.colstart[k + 1] && factor.rowindex[a] == j) {
+        factor.invdiag[j] -= multiplier * factor.value[a];
+    }
+    a++;
+
+    // and now eliminate from the nonzero entries below the diagonal in column j (or add to missing if we can't)
+    b = factor.colstart[j];
+    while (a < factor.colstart[k + 1] && b < factor.colstart[j + 1]) {
+        if (factor.rowindex[b] < factor.rowindex[a]) {
+            b++;
+        } else if (factor.rowindex[b] == factor.rowindex[a]) {
+            factor.value[b] -= multiplier * factor.value[a];
+            a++;
+            b++;
+        } else {
+            missing += factor.value[a];
+            a++;
+        }
+    }
+
+    // and if there's anything left to do, add it to missing
+    while (a < factor.colstart[k + 1]) {
+        missing += factor.value[a];
+        a++;
+    }
+
+    // and do the final diagonal adjustment from the missing entries
+    factor.invdiag[j] -= modificationParameter * multiplier * missing;
+}
+
+template<class T>
+void factorModifiedIncompleteColesky0(const SparseMatrix<T> &matrix, 
+                                      SparseColumnLowerFactor<T> &factor,
+                                      T modificationParameter = 0.97, 
+                                      T minDiagonalRatio = 0.25) {
+
+    // first copy lower triangle of matrix into factor (Note: assuming A is symmetric of course!)
+    initializeIncompleteColesky0Factor(matrix, factor);
 
     // now do the incomplete factorization (figure out numerical values)
 
@@ -136,71 +226,11 @@ void factorModifiedIncompleteColesky0(const SparseMatrix<T> &matrix,
             continue;
         }
 
-        // figure out the final L(k,k) entry
-        if (factor.invdiag[k] < minDiagonalRatio * factor.adiag[k]) {
-            // drop to Gauss-Seidel here if the pivot looks dangerously small
-            factor.invdiag[k] = 1 / sqrt(factor.adiag[k]);
-        } else {
-            factor.invdiag[k] = 1 / sqrt(factor.invdiag[k]);
-        }
-
-        // finalize the k'th column L(:,k)
-        for (unsigned int p = factor.colstart[k]; p < factor.colstart[k + 1]; p++){
-            factor.value[p] *= factor.invdiag[k];
-        }
+        finalizeIncompleteColesky0Column(factor, k, minDiagonalRatio);
 
         // incompletely eliminate L(:,k) from future columns, modifying diagonals
         for(unsigned int p = factor.colstart[k]; p < factor.colstart[k + 1]; p++) {
-            unsigned int j = factor.rowindex[p]; // work on column j
-            T multiplier = factor.value[p];
-            T missing = 0;
-            unsigned int a = factor.colstart[k];
-            // first look for contributions to missing from dropped entries above the diagonal in column j
-            unsigned int b = 0;
-            while (a < factor.colstart[k + 1] && factor.rowindex[a] < j) {
-                // look for factor.rowindex[a] in matrix.index[j] starting at b
-                while (b < matrix.index[j].size()) {
-                    if (matrix.index[j][b] < factor.rowindex[a]) {
-                        b++;
-                    } else if(matrix.index[j][b] == factor.rowindex[a]) {
-                        break;
-                    } else {
-                        missing += factor.value[a];
-                        break;
-                    }
-                }
-                a++;
-            }
-
-            // adjust the diagonal j,j entry
-            if (a < factor.colstart[k + 1] && factor.rowindex[a] == j) {
-                factor.invdiag[j] -= multiplier * factor.value[a];
-            }
-            a++;
-
-            // and now eliminate from the nonzero entries below the diagonal in column j (or add to missing if we can't)
-            b = factor.colstart[j];
-            while (a < factor.colstart[k + 1] && b < factor.colstart[j + 1]) {
-                if (factor.rowindex[b] < factor.rowindex[a]) {
-                    b++;
-                } else if (factor.rowindex[b] == factor.rowindex[a]) {
-                    factor.value[b] -= multiplier * factor.value[a];
-                    a++;
-                    b++;
-                } else {
-                    missing += factor.value[a];
-                    a++;
-                }
-            }
-
-            // and if there's anything left to do, add it to missing
-            while (a < factor.colstart[k + 1]) {
-                missing += factor.value[a];
-                a++;
-            }
-
-            // and do the final diagonal adjustment from the missing entries
-            factor.invdiag[j] -= modificationParameter * multiplier * missing;
+            eliminateIncompleteColesky0Column(matrix, factor, k, p, modificationParameter);
         }
     }
 }
@@ -241,6 +271,228 @@ void solveLowerTransposeInPlace(const SparseColumnLowerFactor<T> &factor, std::v
     } while(i != 0);
 }
 
+//============================================================================
+// Level scheduled (wavefront) versions of the factorization and triangular
+// solves for running on multiple threads.
+//
+// Column j of the factor depends on every column k < j where L(j,k) != 0. 
+// Consecutive columns where each column depends on the previous one are 
+// grouped into a block (for a 7-point stencil, a run of cells along the 
+// x-axis) and processed in order by a single thread, which keeps memory 
+// access contiguous. The level of a block is one more than the highest level 
+// of the blocks it depends on, so all blocks within a level are independent 
+// and can be processed in parallel. Each column pulls updates from its 
+// dependencies in the same order that the sequential routines push them, so 
+// the results are identical to the sequential factorization and solves.
+
+template<class T>
+struct LowerFactorLevelSchedule {
+
+    unsigned int n = 0;
+    std::vector<unsigned int> rowstart;     // where each row begins in rowcolumn/rowposition (plus an extra entry at the end)
+    std::vector<unsigned int> rowcolumn;    // column k of each entry L(j,k) below the diagonal, listed row by row
+    std::vector<unsigned int> rowposition;  // position of each entry L(j,k) in the factor's value array
+    std::vector<T> rowvalue;                // value of each entry L(j,k) after factorization, listed row by row
+    std::vector<unsigned int> blockstart;   // where each block of consecutive columns begins (plus an extra entry at the end, of n)
+    std::vector<unsigned int> levelstart;   // where each level begins in levelblocks (plus an extra entry at the end)
+    std::vector<unsigned int> levelblocks;  // a list of all block indices, for each level in turn
+
+    // levels with fewer columns than this are processed on the calling thread
+    int minParallelSize = 2048;
+
+    unsigned int getNumLevels() const {
+        return levelstart.empty() ? 0 : (unsigned int)levelstart.size() - 1;
+    }
+};
+
+template<class T>
+void initializeLevelSchedule(const SparseColumnLowerFactor<T> &factor, 
+                             LowerFactorLevelSchedule<T> &schedule) {
+    unsigned int n = factor.n;
+    schedule.n = n;
+
+    // transpose the column structure of the factor into rows
+    schedule.rowstart.assign(n + 1, 0);
+    for (unsigned int p = 0; p < factor.rowindex.size(); p++) {
+        schedule.rowstart[factor.rowindex[p] + 1]++;
+    }
+    for (unsigned int i = 0; i < n; i++) {
+        schedule.rowstart[i + 1] += schedule.rowstart[i];
+    }
+
+    std::vector<unsigned int> rowfill(schedule.rowstart.begin(), schedule.rowstart.end() - 1);
+    schedule.rowcolumn.resize(factor.rowindex.size());
+    schedule.rowposition.resize(factor.rowindex.size());
+    for (unsigned int k = 0; k < n; k++) {
+        for (unsigned int p = factor.colstart[k]; p < factor.colstart[k + 1]; p++) {
+            unsigned int q = rowfill[factor.rowindex[p]]++;
+            schedule.rowcolumn[q] = k;
+            schedule.rowposition[q] = p;
+        }
+    }
+
+    // a new block begins at each column that does not depend on the previous column
+    schedule.blockstart.clear();
+    for (unsigned int j = 0; j < n; j++) {
+        unsigned int rowend = schedule.rowstart[j + 1];
+        bool isChained = j > 0 && rowend > schedule.rowstart[j] && schedule.rowcolumn[rowend - 1] == j - 1;
+        if (!isChained) {
+            schedule.blockstart.push_back(j);
+        }
+    }
+    unsigned int numBlocks = (unsigned int)schedule.blockstart.size();
+    schedule.blockstart.push_back(n);
+
+    // dependencies always have a lower index, so levels can be found in one pass
+    std::vector<unsigned int> levels(numBlocks, 0);
+    std::vector<unsigned int> columnBlocks(n, 0);
+    unsigned int numLevels = numBlocks > 0 ? 1 : 0;
+    for (unsigned int b = 0; b < numBlocks; b++) {
+        unsigned int level = 0;
+        for (unsigned int j = schedule.blockstart[b]; j < schedule.blockstart[b + 1]; j++) {
+            columnBlocks[j] = b;
+            for (unsigned int q = schedule.rowstart[j]; q < schedule.rowstart[j + 1]; q++) {
+                unsigned int depblock = columnBlocks[schedule.rowcolumn[q]];
+                if (depblock != b) {
+                    level = std::max(level, levels[depblock] + 1);
+                }
+            }
+        }
+        levels[b] = level;
+        numLevels = std::max(numLevels, level + 1);
+    }
+
+    schedule.levelstart.assign(numLevels + 1, 0);
+    for (unsigned int b = 0; b < numBlocks; b++) {
+        schedule.levelstart[levels[b] + 1]++;
+    }
+    for (unsigned int i = 0; i < numLevels; i++) {
+        schedule.levelstart[i + 1] += schedule.levelstart[i];
+    }
+
+    std::vector<unsigned int> levelfill(schedule.levelstart.begin(), schedule.levelstart.end() - 1);
+    schedule.levelblocks.resize(numBlocks);
+    for (unsigned int b = 0; b < numBlocks; b++) {
+        schedule.levelblocks[levelfill[levels[b]]++] = b;
+    }
+}
+
+// Runs func(blockBegin, blockEnd) for each block of columns in the level
+template<class T, class Func>
+void parallelForLevel(const LowerFactorLevelSchedule<T> &schedule, unsigned int level, Func func) {
+    int levelBegin = (int)schedule.levelstart[level];
+    int levelEnd = (int)schedule.levelstart[level + 1];
+    auto runBlocks = [&](int startidx, int endidx) {
+        for (int idx = startidx; idx < endidx; idx++) {
+            unsigned int b = schedule.levelblocks[idx];
+            func(schedule.blockstart[b], schedule.blockstart[b + 1]);
+        }
+    };
+
+    int numBlocks = levelEnd - levelBegin;
+    unsigned int levelSize = 0;
+    for (int idx = levelBegin; idx < levelEnd; idx++) {
+        unsigned int b = schedule.levelblocks[idx];
+        levelSize += schedule.blockstart[b + 1] - schedule.blockstart[b];
+    }
+
+    int numThreads = ThreadUtils::getMaxThreadCount();
+    if (numThreads <= 1 || numBlocks <= 1 || levelSize < (unsigned int)schedule.minParallelSize) {
+        runBlocks(levelBegin, levelEnd);
+        return;
+    }
+
+    int numChunks = std::min(4 * numThreads, numBlocks);
+    int chunkSize = (numBlocks + numChunks - 1) / numChunks;
+    ThreadUtils::parallelFor(levelBegin, levelEnd, runBlocks, chunkSize);
+}
+
+template<class T>
+void factorModifiedIncompleteColesky0Parallel(const SparseMatrix<T> &matrix, 
+                                              SparseColumnLowerFactor<T> &factor,
+                                              LowerFactorLevelSchedule<T> &schedule,
+                                              T modificationParameter = 0.97, 
+                                              T minDiagonalRatio = 0.25) {
+
+    initializeIncompleteColesky0Factor(matrix, factor);
+    initializeLevelSchedule(factor, schedule);
+
+    for (unsigned int level = 0; level < schedule.getNumLevels(); level++) {
+        parallelForLevel(schedule, level, [&](unsigned int blockBegin, unsigned int blockEnd) {
+            for (unsigned int j = blockBegin; j < blockEnd; j++) {
+                // incompletely eliminate all finalized columns L(:,k) from column j
+                for (unsigned int q = schedule.rowstart[j]; q < schedule.rowstart[j + 1]; q++) {
+                    unsigned int k = schedule.rowcolumn[q];
+                    if (factor.adiag[k] == 0) {
+                        // null row/column
+                        continue;
+                    }
+                    eliminateIncompleteColesky0Column(matrix, factor, k, schedule.rowposition[q], modificationParameter);
+                }
+
+                if (factor.adiag[j] != 0) {
+                    finalizeIncompleteColesky0Column(factor, j, minDiagonalRatio);
+                }
+            }
+        });
+    }
+
+    // row ordered copy of the factor for contiguous access in the forward solve
+    schedule.rowvalue.resize(schedule.rowposition.size());
+    ThreadUtils::parallelFor(0, (int)schedule.rowposition.size(), [&](int startidx, int endidx) {
+        for (int q = startidx; q < endidx; q++) {
+            schedule.rowvalue[q] = factor.value[schedule.rowposition[q]];
+        }
+    });
+}
+
+// solve L*result=rhs
+template<class T>
+void solveLowerParallel(const SparseColumnLowerFactor<T> &factor, 
+                        const LowerFactorLevelSchedule<T> &schedule,
+                        const std::vector<T> &rhs, 
+                        std::vector<T> &result) {
+    FLUIDSIM_ASSERT(factor.n == rhs.size());
+    FLUIDSIM_ASSERT(factor.n == result.size());
+    FLUIDSIM_ASSERT(factor.n == schedule.n);
+
+    for (unsigned int level = 0; level < schedule.getNumLevels(); level++) {
+        parallelForLevel(schedule, level, [&](unsigned int blockBegin, unsigned int blockEnd) {
+            for (unsigned int i = blockBegin; i < blockEnd; i++) {
+                T value = rhs[i];
+                for (unsigned int q = schedule.rowstart[i]; q < schedule.rowstart[i + 1]; q++) {
+                    value -= schedule.rowvalue[q] * result[schedule.rowcolumn[q]];
+                }
+                result[i] = value * factor.invdiag[i];
+            }
+        });
+    }
+}
+
+// solve L^T*result=rhs
+template<class T>
+void solveLowerTransposeInPlaceParallel(const SparseColumnLowerFactor<T> &factor, 
+                                        const LowerFactorLevelSchedule<T> &schedule,
+                                        std::vector<T> &x) {
+    FLUIDSIM_ASSERT(factor.n == x.size());
+    FLUIDSIM_ASSERT(factor.n == schedule.n);
+
+    unsigned int level = schedule.getNumLevels();
+    while (level > 0) {
+        level--;
+        parallelForLevel(schedule, level, [&](unsigned int blockBegin, unsigned int blockEnd) {
+            unsigned int i = blockEnd;
+            while (i > blockBegin) {
+                i--;
+                for (unsigned int j = factor.colstart[i]; j < factor.colstart[i + 1]; j++){
+                    x[i] -= factor.value[j] * x[factor.rowindex[j]];
+                }
+                x[i] *= factor.invdiag[i];
+            }
+        });
+    }
+}
+
 //============================================================================
 // Encapsulates the Conjugate Gradient algorithm with incomplete Cholesky
 // factorization preconditioner.
@@ -266,6 +518,12 @@ struct PCGSolver {
         minDiagonalRatio = diagRatio;
     }
 
+    // Factor and apply the preconditioner on multiple threads using level
+    // scheduling. The solution is identical to the sequential preconditioner.
+    void setParallelPreconditioner(bool isEnabled) {
+        isParallelPreconditionerEnabled = isEnabled;
+    }
+
     bool solve(const SparseMatrix<T> &matrix, const std::vector<T> &rhs, 
                std::vector<T> &result, T &residualOut, int &iterationsOut) {
 
@@ -279,12 +537,26 @@ struct PCGSolver {
         //std::fill(result.begin(), result.end(), 0);
 
         r = rhs;
+        double rhsResidual = BLAS::absMax(r);
+        fixedMatrix.fromMatrix(matrix);
+
+        // A non-zero result is used as the initial guess (warm start)
+        if (BLAS::absMax(result) > 0) {
+            multiply(fixedMatrix, result, z);
+            BLAS::addScaled(-1.0, z, r);
+        }
+
         residualOut = BLAS::absMax(r);
+        initialResidual = residualOut;
         if(residualOut == 0) {
             iterationsOut = 0;
             return true;
         }
-        double tol = toleranceFactor * residualOut;
+        double tol = toleranceFactor * rhsResidual;
+        if (residualOut <= std::min(tol, (double)maxErrorTolerance)) {
+            iterationsOut = 0;
+            return true;
+        }
 
         formPreconditioner(matrix);
         applyPreconditioner(r, z);
@@ -295,7 +567,6 @@ struct PCGSolver {
         }
 
         s = z;
-        fixedMatrix.fromMatrix(matrix);
 
         int iteration;
         for (iteration = 0; iteration < maxIterations; iteration++){
@@ -322,29 +593,83 @@ struct PCGSolver {
         return false;
     }
 
+    // Residual of the initial guess from the last solve
+    T getInitialResidual() {
+        return initialResidual;
+    }
+
 protected:
 
     // internal structures
     SparseColumnLowerFactor<T> icfactor; // modified incomplete cholesky factor
+    LowerFactorLevelSchedule<T> icschedule; // level schedule of icfactor for the parallel preconditioner
     std::vector<T> m, z, s, r; // temporary vectors for PCG
     FixedSparseMatrix<T> fixedMatrix; // used within loop
 
     // parameters
     T toleranceFactor;
     T maxErrorTolerance = 1.0;
+    T initialResidual = 0;
     int maxIterations;
     T modifiedIncompleteCholeskyParameter;
     T minDiagonalRatio;
+    bool isParallelPreconditionerEnabled = false;
+    bool isParallelPreconditionerActive = false;
 
     void formPreconditioner(const SparseMatrix<T> &matrix) {
-        factorModifiedIncompleteColesky0(matrix, icfactor);
+        // Building the level schedule makes the parallel preconditioner slower
+        // than the sequential one when there is only one thread to run it on
+        isParallelPreconditionerActive = isParallelPreconditionerEnabled && 
+                                         ThreadUtils::getMaxThreadCount() > 1;
+        if (isParallelPreconditionerActive) {
+            factorModifiedIncompleteColesky0Parallel(matrix, icfactor, icschedule);
+        } else {
+            factorModifiedIncompleteColesky0(matrix, icfactor);
+        }
     }
 
     void applyPreconditioner(const std::vector<T> &x, std::vector<T> &result) {
-        solveLower(icfactor, x, result);
-        solveLowerTransposeInPlace(icfactor, result);
+        if (isParallelPreconditionerActive) {
+            solveLowerParallel(icfactor, icschedule, x, result);
+            solveLowerTransposeInPlaceParallel(icfactor, icschedule, result);
+        } else {
+            solveLower(icfactor, x, result);
+            solveLowerTransposeInPlace(icfactor, result);
+        }
     }
 
 };
 
+//============================================================================
+// Estimates how many iterations a warm started solve saved compared to a solve
+// starting from zero.
+//
+// If the iteration count of a recent solve of the system starting from zero is
+// known (coldIterations >= 0), it is used as the reference. Otherwise the cold
+// iteration count is extrapolated from the observed convergence rate, as the
+// iterations needed to reduce the residual from the rhs residual (the initial
+// residual of a solve starting from zero) down to the final residual. The
+// extrapolation does not detect savings if the warm start initial residual is
+// larger than the rhs residual, which is common for pressure solves, so a cold
+// reference should be provided where possible.
+
+inline int estimateWarmStartIterationsSaved(double rhsResidual, 
+                                            double initialResidual,
+                                            double finalResidual, 
+                                            int iterations,
+                                            int coldIterations = -1) {
+    if (coldIterations >= 0) {
+        return std::max(coldIterations - iterations, 0);
+    }
+
+    if (iterations <= 0 || rhsResidual <= 0 || finalResidual <= 0 || 
+            finalResidual >= initialResidual) {
+        return 0;
+    }
+
+    double reductionPerIteration = log(initialResidual / finalResidual) / (double)iterations;
+    int coldIterationsEstimate = (int)round(log(rhsResidual / finalResidual) / reductionPerIteration);
+    return std::max(coldIterationsEstimate - iterations, 0);
+}
+
 #endif
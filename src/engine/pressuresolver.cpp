@@ -31,6 +31,7 @@ SOFTWARE.
 #endif
 
 #include "pcgsolver/pcgsolver.h"
+#include "mgpcgsolver.h"
 #include "threadutils.h"
 #include "macvelocityfield.h"
 #include "particlelevelset.h"
@@ -69,6 +70,8 @@ bool PressureSolver::solve(PressureSolverParameters params) {
         _pressureGrid->fill(0.0f);
         _solverIterations = 0;
         _solverError = 0.0f;
+        _solverTime = 0.0;
+        _solverIterationsSaved = 0;
         _solverStatus = "Pressure Solver Iterations: 0\nEstimated Error: 0.0";
         return true;
     }
@@ -119,6 +122,7 @@ void PressureSolver::_initialize(PressureSolverParameters params) {
     params.velocityFieldFluid->getGridDimensions(&_isize, &_jsize, &_ksize);
     _dx = params.cellwidth;
     _deltaTime = params.deltaTime;
+    _solverMethod = params.solverMethod;
     _pressureSolveTolerance = params.tolerance;
     _pressureSolveAcceptableTolerance = params.acceptableTolerance;
     _maxCGIterations = params.maxIterations;
@@ -134,6 +138,8 @@ void PressureSolver::_initialize(PressureSolverParameters params) {
     _surfaceTensionConstant = params.surfaceTensionConstant;
     _curvatureGrid = params.curvatureGrid;
 
+    _coldReferenceIterations = params.coldReferenceIterations;
+
     _pressureCells = GridIndexVector(_isize, _jsize, _ksize);
     for(int k = 1; k < _ksize - 1; k++) {
         for(int j = 1; j < _jsize - 1; j++) {
@@ -163,20 +169,11 @@ void PressureSolver::_conditionSolidVelocityField() {
     // inconsistencies from the linear system.
 
     size_t gridsize = _isize * _jsize * _ksize;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
 
     Array3d<bool> bordersAir(_isize, _jsize, _ksize, false);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_computeBordersAirGridThread, this,
-                                 intervals[i], intervals[i + 1], &bordersAir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _computeBordersAirGridThread(startidx, endidx, &bordersAir);
+    });
 
     std::vector<GridIndex> group;
     Array3d<bool> isProcessed(_isize, _jsize, _ksize, false);
@@ -326,17 +323,9 @@ void PressureSolver::_initializeSurfaceTensionClusterData() {
     Array3d<char> blockstatus(bisize, bjsize, bksize, 0x00);
 
     size_t gridsize = bisize * bjsize * bksize;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_initializeBlockStatusGridThread, this,
-                                 intervals[i], intervals[i + 1], &blockstatus);
-    }
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _initializeBlockStatusGridThread(startidx, endidx, &blockstatus);
+    });
 
     /*
     char UNSET       = 0x00;
@@ -349,32 +338,23 @@ void PressureSolver::_initializeSurfaceTensionClusterData() {
     _surfaceTensionClusterStatus = Array3d<char>(_isize, _jsize, _ksize, 0x00);
 
     gridsize = _isize * _jsize * _ksize;
-    numthreads = (int)std::min(numCPU, gridsize);
-    threads = std::vector<std::thread>(numthreads);
-    intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_initializeCellStatusGridThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &blockstatus, &_surfaceTensionClusterStatus);
-    }
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _initializeCellStatusGridThread(startidx, endidx, 
+                                        &blockstatus, &_surfaceTensionClusterStatus);
+    });
 
-    gridsize = _isize * _jsize * _ksize;
-    numthreads = (int)std::min(numCPU, gridsize);
-    threads = std::vector<std::thread>(numthreads);
-    intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
+    size_t numCPU = ThreadUtils::getMaxThreadCount();
+    int numthreads = (int)std::min(numCPU, gridsize);
+    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
     std::vector<std::vector<GridIndex> > threadResults(numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_findSurfaceCellsThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &_surfaceTensionClusterStatus, &(threadResults[i]));
-    }
 
     int cellcount = 0;
+    ThreadUtils::parallelForIntervals(intervals, [&](int i, int startidx, int endidx) {
+        _findSurfaceCellsThread(startidx, endidx, 
+                                &_surfaceTensionClusterStatus, &(threadResults[i]));
+    });
+
     for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
         cellcount += threadResults[i].size();
     }
 
@@ -384,17 +364,10 @@ void PressureSolver::_initializeSurfaceTensionClusterData() {
         surfaceCells.insert(surfaceCells.end(), threadResults[i].begin(), threadResults[i].end());
     }
 
-    numthreads = (int)fmin(numCPU, surfaceCells.size());
-    threads = std::vector<std::thread>(numthreads);
-    intervals = ThreadUtils::splitRangeIntoIntervals(0, surfaceCells.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_calculateSurfaceCellStatusThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 &surfaceCells, &_surfaceTensionClusterStatus);
-    }
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, surfaceCells.size(), [&](int startidx, int endidx) {
+        _calculateSurfaceCellStatusThread(startidx, endidx, 
+                                          &surfaceCells, &_surfaceTensionClusterStatus);
+    });
 }
 
 void PressureSolver::_initializeBlockStatusGridThread(int startidx, int endidx,
@@ -605,19 +578,9 @@ void PressureSolver::_calculateSurfaceCellStatusThread(int startidx, int endidx,
 }
 
 void PressureSolver::_calculateNegativeDivergenceVector(std::vector<double> &rhs) {
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _pressureCells.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _pressureCells.size(), 
-                                                                      numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_calculateNegativeDivergenceVectorThread, this,
-                                 intervals[i], intervals[i + 1], &rhs);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _pressureCells.size(), [&](int startidx, int endidx) {
+        _calculateNegativeDivergenceVectorThread(startidx, endidx, &rhs);
+    });
 }
 
 void PressureSolver::_calculateNegativeDivergenceVectorThread(int startidx, 
@@ -748,19 +711,9 @@ double PressureSolver::_getSurfaceTensionTerm(GridIndex g1, GridIndex g2) {
 }
 
 void PressureSolver::_calculateMatrixCoefficients(SparseMatrixd &matrix) {
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, _pressureCells.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, _pressureCells.size(), 
-                                                                      numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_calculateMatrixCoefficientsThread, this,
-                                 intervals[i], intervals[i + 1], &matrix);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, _pressureCells.size(), [&](int startidx, int endidx) {
+        _calculateMatrixCoefficientsThread(startidx, endidx, &matrix);
+    });
 }
 
 void PressureSolver::_calculateMatrixCoefficientsThread(int startidx, int endidx,
@@ -854,17 +807,41 @@ bool PressureSolver::_solveLinearSystem(SparseMatrixd &matrix, std::vector<doubl
                                         std::vector<double> &soln) {
     bool success = true;
     double estimatedError = -1.0f;
+    double initialResidual = -1.0;
     int numIterations = 0;
+    bool isWarmStart = BLAS::absMax(soln) > 0;
+
+    StopWatch timer;
+    timer.start();
 
     bool useJacobiSolve = false;
     if (useJacobiSolve) {
         // Basic Jacobi Solve
         success = _solveLinearSystemJacobi(matrix, rhs, soln, &numIterations, &estimatedError);
+    } else if (_solverMethod == PressureSolverMethod::MGPCG) {
+        // Multigrid preconditioned CG Solve
+        MGPCGSolver solver;
+        solver.setSolverParameters(_pressureSolveTolerance, _maxCGIterations);
+        success = solver.solve(matrix, _pressureCells, rhs, soln, estimatedError, numIterations);
+        initialResidual = solver.getInitialResidual();
     } else {
-        // PCG Solve
+        // PCG Solve. The parallel method factors and applies the same MIC(0)
+        // preconditioner using level scheduling, or sequentially on one thread.
         PCGSolver<double> solver;
         solver.setSolverParameters(_pressureSolveTolerance, _maxCGIterations);
+        solver.setParallelPreconditioner(_solverMethod == PressureSolverMethod::ParallelPCG);
         success = solver.solve(matrix, rhs, soln, estimatedError, numIterations);
+        initialResidual = solver.getInitialResidual();
+    }
+
+    timer.stop();
+    _solverTime = timer.getTime();
+
+    _solverIterationsSaved = 0;
+    if (isWarmStart && initialResidual >= 0.0) {
+        _solverIterationsSaved = estimateWarmStartIterationsSaved(BLAS::absMax(rhs), initialResidual,
+                                                                  estimatedError, numIterations,
+                                                                  _coldReferenceIterations);
     }
 
     _pressureGrid->fill(0.0f);
@@ -1014,18 +991,9 @@ void PressureSolver::_applyPressureToVelocityFieldMT(FluidMaterialGrid &mgrid, i
         gridsize = _isize * _jsize * (_ksize + 1);
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&PressureSolver::_applyPressureToVelocityFieldThread, this,
-                                 intervals[i], intervals[i + 1], &mgrid, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _applyPressureToVelocityFieldThread(startidx, endidx, &mgrid, dir);
+    });
 }
 
 void PressureSolver::_applyPressureToVelocityFieldThread(int startidx, int endidx, 
@@ -96,7 +96,14 @@ struct WeightGrid {
 };
 
 
+enum class PressureSolverMethod : char { 
+    PCG         = 0x00, 
+    MGPCG       = 0x01,
+    ParallelPCG = 0x02
+};
+
 struct PressureSolverParameters {
+    PressureSolverMethod solverMethod = PressureSolverMethod::PCG;
     double cellwidth;
     double deltaTime;
     double tolerance;
@@ -113,6 +120,11 @@ struct PressureSolverParameters {
     bool isSurfaceTensionEnabled = false;
     double surfaceTensionConstant;
     Array3d<float> *curvatureGrid;
+
+    // Iterations of a recent solve that started from zero. Used as the 
+    // reference for the estimated iterations saved by a warm start, or -1
+    // if unknown.
+    int coldReferenceIterations = -1;
 };
 
 /********************************************************************************
@@ -135,6 +147,11 @@ public:
 
     int getIterations() { return _solverIterations; }
     float getError() { return _solverError; } 
+    double getSolverTime() { return _solverTime; }
+
+    // Estimated number of iterations saved by starting the solve from the 
+    // values in the pressure grid rather than from zero
+    int getEstimatedIterationsSaved() { return _solverIterationsSaved; }
 
 private:
 
@@ -201,6 +218,7 @@ private:
     int _ksize = 0;
     double _dx = 0;
     double _deltaTime = 0;
+    PressureSolverMethod _solverMethod = PressureSolverMethod::PCG;
 
     double _pressureSolveTolerance = 1e-9;
     double _pressureSolveAcceptableTolerance = 1.0;
@@ -228,6 +246,9 @@ private:
     std::string _solverStatus;
     int _solverIterations = 0;
     float _solverError = 0.0f;
+    double _solverTime = 0.0;
+    int _solverIterationsSaved = 0;
+    int _coldReferenceIterations = -1;
 
 };
 
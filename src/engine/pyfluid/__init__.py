@@ -25,6 +25,7 @@ from .aabb import AABB, AABB_t
 from .fluidsimulation import FluidSimulation, MarkerParticle_t, DiffuseParticle_t
 from .meshobject import MeshObject
 from .meshfluidsource import MeshFluidSource
+from .surfaceremesher import SurfaceRemesher
 from .forcefieldgrid import ForceFieldGrid
 from .forcefield import ForceField
 from .forcefieldpoint import ForceFieldPoint
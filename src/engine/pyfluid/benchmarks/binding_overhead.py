@@ -0,0 +1,153 @@
+# MIT License
+# 
+# Copyright (C) 2024 Ryan L. Guy
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Micro-benchmark of the per-call overhead of the pyfluid ctypes bindings.
+#
+# Compares FluidSimulation property getters through the bindings against a
+# direct call of the typed ctypes function, and against the previous binding
+# path (library lookup through PyFluidLib.__getattr__, per-argument conversion 
+# and error function lookup on every call).
+#
+# Usage, from the directory containing the built pyfluid package:
+#     python -m pyfluid.benchmarks.binding_overhead [num_calls]
+
+import sys, time
+from ctypes import c_void_p, c_char_p, c_int, c_double, byref
+
+from .. import pyfluid as pyfluid_lib
+from .. import pybindings as pb
+from ..fluidsimulation import FluidSimulation
+
+lib = pyfluid_lib.pyfluid
+
+
+def _legacy_getattr(name):
+    # Library lookup as done by PyFluidLib.__getattr__ before functions were cached
+    if lib.__dict__['_lib'] is None:
+        lib._lib = lib._load_library("pyfluid")
+    elif pyfluid_lib.DEBUG_MODE_ENABLED != pyfluid_lib.IS_DEBUG_MODE_LIBRARY_LOADED:
+        lib._lib = lib._load_library("pyfluid")
+    return getattr(lib._lib, name)
+
+
+def _legacy_check_success(success, errprefix):
+    libfunc = _legacy_getattr("CBindings_get_error_message")
+    pb.init_lib_func(libfunc, [], c_char_p)
+    if not success:
+        raise RuntimeError(errprefix + str(libfunc().decode("utf-8")))
+
+
+def _legacy_execute_lib_func(libfunc, params):
+    args = []
+    for idx, arg in enumerate(params):
+        try:
+            cval = libfunc.argtypes[idx](arg)
+        except:
+            cval = arg
+        args.append(cval)
+    success = c_int();
+    args.append(byref(success))
+
+    result = None
+    if libfunc.restype:
+        funcresult = libfunc(*args)
+        _legacy_check_success(success, libfunc.__name__ + " - ")
+        try:
+            return libfunc.restype(funcresult).value
+        except:
+            return funcresult
+    else:
+        libfunc(*args)
+
+    _legacy_check_success(success, libfunc.__name__ + " - ")
+    return result
+
+
+def _legacy_get_double(fluidsim):
+    libfunc = _legacy_getattr("FluidSimulation_get_diffuse_foam_preservation_rate")
+    pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_double)
+    return _legacy_execute_lib_func(libfunc, [fluidsim()])
+
+
+def _legacy_get_bool(fluidsim):
+    libfunc = _legacy_getattr("FluidSimulation_is_sheet_seeding_enabled")
+    pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+    return bool(_legacy_execute_lib_func(libfunc, [fluidsim()]))
+
+
+def _direct_get_double(fluidsim):
+    libfunc = lib._lib.FluidSimulation_get_diffuse_foam_preservation_rate
+    success = c_int()
+    return libfunc(fluidsim(), byref(success))
+
+
+def _direct_get_bool(fluidsim):
+    libfunc = lib._lib.FluidSimulation_is_sheet_seeding_enabled
+    success = c_int()
+    return bool(libfunc(fluidsim(), byref(success)))
+
+
+def _bindings_get_double(fluidsim):
+    return fluidsim.diffuse_foam_preservation_rate
+
+
+def _bindings_get_bool(fluidsim):
+    return fluidsim.enable_sheet_seeding
+
+
+def _time_per_call(func, num_calls):
+    t = time.perf_counter()
+    for _ in range(num_calls):
+        func()
+    return (time.perf_counter() - t) / num_calls
+
+
+# Setters are not measured since the engine logs every setter call, which
+# outweighs the binding overhead
+def run(num_calls=100000):
+    fluidsim = FluidSimulation(16, 16, 16, 0.1)
+
+    # Type all functions before timing
+    _bindings_get_double(fluidsim)
+    _bindings_get_bool(fluidsim)
+
+    cases = [
+        ("direct ctypes double",   lambda: _direct_get_double(fluidsim)),
+        ("direct ctypes bool",     lambda: _direct_get_bool(fluidsim)),
+        ("legacy bindings double", lambda: _legacy_get_double(fluidsim)),
+        ("legacy bindings bool",   lambda: _legacy_get_bool(fluidsim)),
+        ("bindings double",        lambda: _bindings_get_double(fluidsim)),
+        ("bindings bool",          lambda: _bindings_get_bool(fluidsim)),
+    ]
+
+    results = {}
+    for name, func in cases:
+        results[name] = _time_per_call(func, num_calls)
+    return results
+
+
+if __name__ == "__main__":
+    num_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    results = run(num_calls)
+    for name, seconds in results.items():
+        print("{:<24} {:>8.3f} us/call".format(name, 1e6 * seconds))
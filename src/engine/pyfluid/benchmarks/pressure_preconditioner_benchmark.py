@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (C) 2024 Ryan L. Guy
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+# Benchmark of the level scheduled parallel MIC(0) preconditioner.
+#
+# Each scene is simulated with the 'PCG' and 'Parallel PCG' pressure solver
+# methods at each thread count. The pressure solver time and iterations from
+# the frame stats are reported with the speedup of the parallel method. With
+# one thread the parallel method falls back to the sequential preconditioner.
+#
+# Both methods apply the same preconditioner, so the pressure solver iteration
+# counts must match. If they differ, the case is reported as a mismatch and the
+# process exits with a return code of 1.
+#
+# Usage, from the directory containing the built pyfluid package:
+#     python -m pyfluid.benchmarks.pressure_preconditioner_benchmark
+#         [--scenes dam_break ...] [--resolution 64] [--frames 10]
+#         [--threads 1 8 ...]
+
+import sys, os, argparse
+
+from . import reference_scenes
+
+FRAME_DELTA_TIME = 1.0 / 30.0
+
+
+def run_case(scene_name, resolution, num_frames, num_threads, is_parallel_preconditioner):
+    scene = reference_scenes.build_scene(scene_name, resolution)
+    fluidsim = scene.fluidsim
+    fluidsim.max_thread_count = num_threads
+    if is_parallel_preconditioner:
+        fluidsim.set_pressure_solver_method_parallel_PCG()
+    else:
+        fluidsim.set_pressure_solver_method_PCG()
+
+    pressure_time = 0.0
+    iterations = 0
+    for frameno in range(num_frames):
+        fluidsim.update(FRAME_DELTA_TIME)
+        stats = fluidsim.get_frame_stats_data()
+        pressure_time += stats.pressure_solver_time
+        iterations += stats.pressure_solver_total_iterations
+
+    return {"pressure_time": pressure_time, "iterations": iterations}
+
+
+def run(scene_names, resolution, num_frames, thread_counts, log_func=print):
+    results = []
+    for scene_name in scene_names:
+        for num_threads in thread_counts:
+            log_func("Running " + scene_name + " at resolution " + str(resolution) + 
+                     " with " + str(num_threads) + " thread(s)...")
+            sequential = run_case(scene_name, resolution, num_frames, num_threads, False)
+            parallel = run_case(scene_name, resolution, num_frames, num_threads, True)
+
+            speedup = None
+            if parallel["pressure_time"] > 0.0:
+                speedup = sequential["pressure_time"] / parallel["pressure_time"]
+
+            results.append({
+                "scene": scene_name,
+                "threads": num_threads,
+                "sequential_time": sequential["pressure_time"],
+                "parallel_time": parallel["pressure_time"],
+                "speedup": speedup,
+                "sequential_iterations": sequential["iterations"],
+                "parallel_iterations": parallel["iterations"],
+                "mismatch": sequential["iterations"] != parallel["iterations"],
+            })
+    return results
+
+
+def format_results(results):
+    header = "{:<18} {:>7} {:>10} {:>10} {:>8} {:>10} {:>10}  {}".format(
+            "scene", "threads", "pcg(s)", "ppcg(s)", "speedup", "pcg iters", "ppcg iters", "")
+    lines = [header]
+    for r in results:
+        speedup = "-" if r["speedup"] is None else "{:.3f}".format(r["speedup"])
+        lines.append("{:<18} {:>7} {:>10.3f} {:>10.3f} {:>8} {:>10} {:>10}  {}".format(
+                r["scene"], r["threads"], r["sequential_time"], r["parallel_time"], speedup,
+                r["sequential_iterations"], r["parallel_iterations"],
+                "ITERATION MISMATCH" if r["mismatch"] else ""))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FLIP Fluids parallel pressure preconditioner benchmark")
+    parser.add_argument("--scenes", nargs="+", default=["dam_break", "obstacle_field"],
+                        choices=reference_scenes.get_scene_names())
+    parser.add_argument("--resolution", type=int, default=64)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--threads", nargs="+", type=int, default=None,
+                        help="Thread counts to run, defaults to 1 and the CPU count")
+    args = parser.parse_args(argv)
+
+    thread_counts = args.threads
+    if thread_counts is None:
+        thread_counts = sorted(set([1, os.cpu_count() or 1]))
+
+    results = run(args.scenes, args.resolution, args.frames, thread_counts)
+    print(format_results(results))
+
+    num_mismatched = sum(1 for r in results if r["mismatch"])
+    if num_mismatched > 0:
+        print(str(num_mismatched) + " case(s) with different pressure solver iterations")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+# MIT License
+# 
+# Copyright (C) 2024 Ryan L. Guy
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Headless simulation benchmark of the reference scenes.
+#
+# Each scene and resolution is simulated in a separate process so that the
+# peak resident set size is measured per case. Results are written as JSON:
+#
+#     {"version": 2, "system": {...}, "settings": {...}, "results": [
+#         {"scene": "dam_break", "resolution": 64, "frames": 10,
+#          "timing": {"total": ..., "mesh": ..., ...},
+#          "stage_timing": {"advect_velocity_field": ..., ...},
+#          "particles_per_second": ..., "peak_rss_bytes": ...,
+#          "bytes_written": ..., "write_time": ..., ...}, ...]}
+#
+# Timings and stage timings are the sums of the per-frame timing and stage
+# timing stats reported by FluidSimulation.get_frame_stats_data(). Particles per
+# second is the number of fluid particles advanced per second of simulation
+# time, summed over all substeps. Each frame's output is written to a temporary
+# cache directory with the same file names as a bake, and bytes written is the
+# size of the files on disk.
+#
+# A result file can be compared against a saved baseline. Cases that are slower
+# than the baseline by more than the threshold in total or in any timing or
+# stage timing that takes a significant part of the total are reported as
+# regressions and the process exits with a return code of 1.
+#
+# Usage, from the directory containing the built pyfluid package:
+#     python -m pyfluid.benchmarks.simulation_benchmark [--scenes dam_break ...]
+#         [--resolutions 32 64 ...] [--frames 10] [--threads 0]
+#         [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+#     python -m pyfluid.benchmarks.simulation_benchmark --compare results.json --baseline baseline.json
+
+import sys, os, time, json, platform, argparse, tempfile
+import multiprocessing
+
+from . import reference_scenes
+from ..fluidsimulation import FluidSimulationStageTimingStats_t
+
+RESULT_FORMAT_VERSION = 2
+TIMING_STAGES = ["total", "mesh", "advection", "particles", "pressure", "diffuse", "viscosity", "objects"]
+STAGE_TIMING_STATS = [name for name, field_type in FluidSimulationStageTimingStats_t._fields_
+                      if name not in ("min_substep_time", "max_substep_time", "thread_utilization")]
+FRAME_DELTA_TIME = 1.0 / 30.0
+
+# Timings that take less than this fraction of the total time are compared but
+# not reported as regressions, as their ratios are dominated by noise
+MIN_REGRESSION_TIME_FRACTION = 0.05
+
+# Simulator output written for each frame, if enabled in the frame stats:
+# (frame stats name, FluidSimulation data method, file prefix, file extension)
+OUTPUT_FILES = [
+    ("surface",                           "get_surface_data",                                        "",                                  ".bobj"),
+    ("preview",                           "get_surface_preview_data",                                "preview",                           ".bobj"),
+    ("surfaceblur",                       "get_surface_blur_data",                                   "blur",                              ".bobj"),
+    ("surfacevelocity",                   "get_surface_velocity_attribute_data",                     "velocity",                          ".bobj"),
+    ("surfacevorticity",                  "get_surface_vorticity_attribute_data",                    "vorticity",                         ".bobj"),
+    ("surfacespeed",                      "get_surface_speed_attribute_data",                        "speed",                             ".data"),
+    ("surfaceage",                        "get_surface_age_attribute_data",                          "age",                               ".data"),
+    ("surfacelifetime",                   "get_surface_lifetime_attribute_data",                     "lifetime",                          ".data"),
+    ("surfacewhitewaterproximity",        "get_surface_whitewater_proximity_attribute_data",         "whitewaterproximity",               ".bobj"),
+    ("surfacecolor",                      "get_surface_color_attribute_data",                        "color",                             ".bobj"),
+    ("surfacesourceid",                   "get_surface_source_id_attribute_data",                    "sourceid",                          ".data"),
+    ("surfaceviscosity",                  "get_surface_viscosity_attribute_data",                    "viscosity",                         ".data"),
+    ("foam",                              "get_diffuse_foam_data",                                   "foam",                              ".wwp"),
+    ("bubble",                            "get_diffuse_bubble_data",                                 "bubble",                            ".wwp"),
+    ("spray",                             "get_diffuse_spray_data",                                  "spray",                             ".wwp"),
+    ("dust",                              "get_diffuse_dust_data",                                   "dust",                              ".wwp"),
+    ("foamblur",                          "get_diffuse_foam_blur_data",                              "blurfoam",                          ".wwp"),
+    ("bubbleblur",                        "get_diffuse_bubble_blur_data",                            "blurbubble",                        ".wwp"),
+    ("sprayblur",                         "get_diffuse_spray_blur_data",                             "blurspray",                         ".wwp"),
+    ("dustblur",                          "get_diffuse_dust_blur_data",                              "blurdust",                          ".wwp"),
+    ("foamvelocity",                      "get_whitewater_foam_velocity_attribute_data",             "velocityfoam",                      ".wwp"),
+    ("bubblevelocity",                    "get_whitewater_bubble_velocity_attribute_data",           "velocitybubble",                    ".wwp"),
+    ("sprayvelocity",                     "get_whitewater_spray_velocity_attribute_data",            "velocityspray",                     ".wwp"),
+    ("dustvelocity",                      "get_whitewater_dust_velocity_attribute_data",             "velocitydust",                      ".wwp"),
+    ("foamid",                            "get_whitewater_foam_id_attribute_data",                   "idfoam",                            ".wwi"),
+    ("bubbleid",                          "get_whitewater_bubble_id_attribute_data",                 "idbubble",                          ".wwi"),
+    ("sprayid",                           "get_whitewater_spray_id_attribute_data",                  "idspray",                           ".wwi"),
+    ("dustid",                            "get_whitewater_dust_id_attribute_data",                   "iddust",                            ".wwi"),
+    ("foamlifetime",                      "get_whitewater_foam_lifetime_attribute_data",             "lifetimefoam",                      ".wwf"),
+    ("bubblelifetime",                    "get_whitewater_bubble_lifetime_attribute_data",           "lifetimebubble",                    ".wwf"),
+    ("spraylifetime",                     "get_whitewater_spray_lifetime_attribute_data",            "lifetimespray",                     ".wwf"),
+    ("dustlifetime",                      "get_whitewater_dust_lifetime_attribute_data",             "lifetimedust",                      ".wwf"),
+    ("fluidparticles",                    "get_fluid_particle_data",                                 "fluidparticles",                    ".ffp3"),
+    ("fluidparticlesid",                  "get_fluid_particle_id_attribute_data",                    "fluidparticlesid",                  ".ffp3"),
+    ("fluidparticlesvelocity",            "get_fluid_particle_velocity_attribute_data",              "fluidparticlesvelocity",            ".ffp3"),
+    ("fluidparticlesspeed",               "get_fluid_particle_speed_attribute_data",                 "fluidparticlesspeed",               ".ffp3"),
+    ("fluidparticlesvorticity",           "get_fluid_particle_vorticity_attribute_data",             "fluidparticlesvorticity",           ".ffp3"),
+    ("fluidparticlescolor",               "get_fluid_particle_color_attribute_data",                 "fluidparticlescolor",               ".ffp3"),
+    ("fluidparticlesage",                 "get_fluid_particle_age_attribute_data",                   "fluidparticlesage",                 ".ffp3"),
+    ("fluidparticleslifetime",            "get_fluid_particle_lifetime_attribute_data",              "fluidparticleslifetime",            ".ffp3"),
+    ("fluidparticlesviscosity",           "get_fluid_particle_viscosity_attribute_data",             "fluidparticlesviscosity",           ".ffp3"),
+    ("fluidparticleswhitewaterproximity", "get_fluid_particle_whitewater_proximity_attribute_data",  "fluidparticleswhitewaterproximity", ".ffp3"),
+    ("fluidparticlessourceid",            "get_fluid_particle_source_id_attribute_data",             "fluidparticlessourceid",            ".ffp3"),
+    ("particles",                         "get_fluid_particle_debug_data",                           "particles",                         ".fpd"),
+    ("obstacle",                          "get_internal_obstacle_mesh_data",                         "obstacle",                          ".bobj"),
+    ("forcefield",                        "get_force_field_debug_data",                              "forcefield",                        ".ffd"),
+]
+
+
+def _get_peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_rss
+    return peak_rss * 1024
+
+
+def _write_frame_output(fluidsim, stats, output_directory, frameno):
+    fstring = str(frameno).zfill(6)
+    for stats_name, data_method, prefix, extension in OUTPUT_FILES:
+        if not getattr(stats, stats_name).enabled:
+            continue
+        filedata = getattr(fluidsim, data_method)(copy=False)
+        filepath = os.path.join(output_directory, prefix + fstring + extension)
+        with open(filepath, 'wb') as f:
+            f.write(filedata)
+
+
+def _get_directory_size(directory):
+    num_bytes = 0
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            num_bytes += entry.stat().st_size
+    return num_bytes
+
+
+def run_case(scene_name, resolution, num_frames, num_threads=0):
+    scene = reference_scenes.build_scene(scene_name, resolution)
+    fluidsim = scene.fluidsim
+    if num_threads > 0:
+        fluidsim.max_thread_count = num_threads
+
+    timing = {stage: 0.0 for stage in TIMING_STAGES}
+    stage_timing = {stage: 0.0 for stage in STAGE_TIMING_STATS}
+    num_substeps = 0
+    num_particle_steps = 0
+    pressure_iterations = 0
+    viscosity_iterations = 0
+    fluid_particles = 0
+    diffuse_particles = 0
+
+    # Wall time is the simulation time only, the time spent writing output
+    # is measured separately
+    wall_time = 0.0
+    write_time = 0.0
+    with tempfile.TemporaryDirectory(prefix="flip_fluids_benchmark_") as output_directory:
+        for frameno in range(num_frames):
+            time_start = time.perf_counter()
+            fluidsim.update(FRAME_DELTA_TIME)
+            wall_time += time.perf_counter() - time_start
+
+            stats = fluidsim.get_frame_stats_data()
+            for stage in TIMING_STAGES:
+                timing[stage] += getattr(stats.timing, stage)
+            for stage in STAGE_TIMING_STATS:
+                stage_timing[stage] += getattr(stats.stages, stage)
+            num_substeps += stats.substeps
+            num_particle_steps += stats.fluid_particles * stats.substeps
+            pressure_iterations += stats.pressure_solver_total_iterations
+            viscosity_iterations += stats.viscosity_solver_total_iterations
+            fluid_particles = stats.fluid_particles
+            diffuse_particles = stats.diffuse_particles
+
+            time_start = time.perf_counter()
+            _write_frame_output(fluidsim, stats, output_directory, frameno)
+            write_time += time.perf_counter() - time_start
+
+        num_bytes = _get_directory_size(output_directory)
+
+    particles_per_second = 0.0
+    if timing["total"] > 0.0:
+        particles_per_second = num_particle_steps / timing["total"]
+
+    isize, jsize, ksize = fluidsim.get_grid_dimensions()
+    return {
+        "scene": scene_name,
+        "resolution": resolution,
+        "grid_dimensions": [isize, jsize, ksize],
+        "frames": num_frames,
+        "threads": fluidsim.max_thread_count,
+        "wall_time": wall_time,
+        "timing": timing,
+        "stage_timing": stage_timing,
+        "substeps": num_substeps,
+        "fluid_particles": fluid_particles,
+        "diffuse_particles": diffuse_particles,
+        "particles_per_second": particles_per_second,
+        "pressure_solver_iterations": pressure_iterations,
+        "viscosity_solver_iterations": viscosity_iterations,
+        "peak_rss_bytes": _get_peak_rss_bytes(),
+        "bytes_written": num_bytes,
+        "write_time": write_time,
+    }
+
+
+def _run_case_worker(args):
+    return run_case(*args)
+
+
+def run(scene_names, resolutions, num_frames, num_threads=0, isolate_processes=True, log_func=print):
+    cases = [(name, res, num_frames, num_threads) for res in resolutions for name in scene_names]
+
+    results = []
+    if isolate_processes:
+        context = multiprocessing.get_context("spawn")
+        for case in cases:
+            log_func("Running " + case[0] + " at resolution " + str(case[1]) + "...")
+            with context.Pool(1) as pool:
+                results.append(pool.apply(_run_case_worker, (case,)))
+    else:
+        for case in cases:
+            log_func("Running " + case[0] + " at resolution " + str(case[1]) + "...")
+            results.append(run_case(*case))
+
+    return {
+        "version": RESULT_FORMAT_VERSION,
+        "system": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "frames": num_frames,
+            "threads": num_threads,
+            "isolate_processes": isolate_processes,
+        },
+        "results": results,
+    }
+
+
+def _get_case_key(result):
+    return (result["scene"], result["resolution"])
+
+
+# Returns the current / baseline ratio of each timing, and the names of the
+# timings that take a significant part of the baseline total time and are
+# slower than the baseline by more than the threshold
+def _compare_timings(current_timing, base_timing, base_total, threshold):
+    ratios = {}
+    regressions = []
+    for stage, t_base in base_timing.items():
+        t_current = current_timing.get(stage, 0.0)
+        ratios[stage] = t_current / t_base if t_base > 0.0 else None
+        if ratios[stage] is None or ratios[stage] <= 1.0 + threshold:
+            continue
+        if t_base >= MIN_REGRESSION_TIME_FRACTION * base_total:
+            regressions.append(stage)
+    return ratios, regressions
+
+
+# Returns a list of comparison dicts, one for each case that exists in both
+# result sets. Ratios are current / baseline. A case is a regression if its
+# total simulation time, its particle throughput, or any significant timing or
+# stage timing is worse than the baseline by more than the threshold.
+def compare_results(current, baseline, threshold=0.1):
+    baseline_cases = {_get_case_key(r): r for r in baseline["results"]}
+
+    comparisons = []
+    for result in current["results"]:
+        key = _get_case_key(result)
+        if key not in baseline_cases:
+            continue
+        base = baseline_cases[key]
+
+        base_total = base["timing"]["total"]
+        timing_ratios, timing_regressions = _compare_timings(
+                result["timing"], base["timing"], base_total, threshold)
+        stage_timing_ratios, stage_timing_regressions = _compare_timings(
+                result["stage_timing"], base["stage_timing"], base_total, threshold)
+
+        throughput_ratio = None
+        if base["particles_per_second"] > 0.0:
+            throughput_ratio = result["particles_per_second"] / base["particles_per_second"]
+
+        rss_ratio = None
+        if result["peak_rss_bytes"] and base["peak_rss_bytes"]:
+            rss_ratio = result["peak_rss_bytes"] / base["peak_rss_bytes"]
+
+        bytes_ratio = None
+        if base["bytes_written"] > 0:
+            bytes_ratio = result["bytes_written"] / base["bytes_written"]
+
+        regressions = timing_regressions + stage_timing_regressions
+        if throughput_ratio is not None and throughput_ratio < 1.0 / (1.0 + threshold):
+            regressions.append("particles_per_second")
+
+        comparisons.append({
+            "scene": result["scene"],
+            "resolution": result["resolution"],
+            "timing_ratios": timing_ratios,
+            "stage_timing_ratios": stage_timing_ratios,
+            "particles_per_second_ratio": throughput_ratio,
+            "peak_rss_ratio": rss_ratio,
+            "bytes_written_ratio": bytes_ratio,
+            "regressions": regressions,
+            "regression": len(regressions) > 0,
+        })
+
+    return comparisons
+
+
+def _format_ratio(ratio):
+    if ratio is None:
+        return "-"
+    return "{:.3f}".format(ratio)
+
+
+def _format_case_name(r):
+    return r["scene"] + " " + str(r["resolution"])
+
+
+def format_results(results):
+    header = "{:<18} {:>5}".format("scene", "res")
+    header += "".join(" {:>10}".format(stage + "(s)") for stage in TIMING_STAGES)
+    header += " {:>14} {:>10} {:>10} {:>9}".format("particles/s", "rss(MB)", "out(MB)", "write(s)")
+    lines = [header]
+    for r in results["results"]:
+        rss = r["peak_rss_bytes"] / 2**20 if r["peak_rss_bytes"] else 0.0
+        line = "{:<18} {:>5}".format(r["scene"], r["resolution"])
+        line += "".join(" {:>10.3f}".format(r["timing"][stage]) for stage in TIMING_STAGES)
+        line += " {:>14.0f} {:>10.1f} {:>10.2f} {:>9.3f}".format(
+                r["particles_per_second"], rss, r["bytes_written"] / 2**20, r["write_time"])
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# One row per stage timing and one column per case
+def format_stage_timings(results):
+    cases = results["results"]
+    header = "{:<36}".format("stage (s)")
+    header += "".join(" {:>22}".format(_format_case_name(r)) for r in cases)
+    lines = [header]
+    for stage in STAGE_TIMING_STATS:
+        line = "{:<36}".format(stage)
+        line += "".join(" {:>22.3f}".format(r["stage_timing"][stage]) for r in cases)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons):
+    header = "{:<18} {:>5}".format("scene", "res")
+    header += "".join(" {:>10}".format(stage) for stage in TIMING_STAGES)
+    header += " {:>11} {:>9} {:>9}  {}".format("particles/s", "rss", "out", "")
+    lines = [header]
+    for c in comparisons:
+        ratios = c["timing_ratios"]
+        line = "{:<18} {:>5}".format(c["scene"], c["resolution"])
+        line += "".join(" {:>10}".format(_format_ratio(ratios.get(stage))) for stage in TIMING_STAGES)
+        line += " {:>11} {:>9} {:>9}  {}".format(
+                _format_ratio(c["particles_per_second_ratio"]), _format_ratio(c["peak_rss_ratio"]),
+                _format_ratio(c["bytes_written_ratio"]), 
+                "REGRESSION: " + ", ".join(c["regressions"]) if c["regression"] else "")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_stage_timing_comparisons(comparisons):
+    header = "{:<36}".format("stage")
+    header += "".join(" {:>22}".format(_format_case_name(c)) for c in comparisons)
+    lines = [header]
+    for stage in STAGE_TIMING_STATS:
+        line = "{:<36}".format(stage)
+        line += "".join(" {:>22}".format(_format_ratio(c["stage_timing_ratios"].get(stage))) for c in comparisons)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_results(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get("version") != RESULT_FORMAT_VERSION:
+        raise ValueError("Unsupported benchmark result version in <" + filepath + ">")
+    return results
+
+
+def save_results(filepath, results):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FLIP Fluids headless simulation benchmark")
+    parser.add_argument("--scenes", nargs="+", default=reference_scenes.get_scene_names(),
+                        choices=reference_scenes.get_scene_names())
+    parser.add_argument("--resolutions", nargs="+", type=int, default=[32, 64, 96])
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Maximum simulation thread count, 0 uses the simulator default")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="Run all cases in this process. Peak RSS is then cumulative.")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare this result file instead of running the benchmark")
+    parser.add_argument("--baseline", help="Baseline result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown that is reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare requires --baseline")
+        results = load_results(args.compare)
+    else:
+        results = run(args.scenes, args.resolutions, args.frames,
+                      num_threads=args.threads, isolate_processes=not args.no_isolate)
+        print(format_results(results))
+        print()
+        print(format_stage_timings(results))
+        if args.output:
+            save_results(args.output, results)
+
+    if not args.baseline:
+        return 0
+
+    comparisons = compare_results(results, load_results(args.baseline), args.threshold)
+    print()
+    print("Ratios relative to baseline <" + args.baseline + ">:")
+    print(format_comparisons(comparisons))
+    print()
+    print(format_stage_timing_comparisons(comparisons))
+
+    num_regressions = sum(1 for c in comparisons if c["regression"])
+    if num_regressions > 0:
+        print(str(num_regressions) + " regression(s) above threshold " + str(args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
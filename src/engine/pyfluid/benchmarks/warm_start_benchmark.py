@@ -0,0 +1,117 @@
+# MIT License
+#
+# Copyright (C) 2024 Ryan L. Guy
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+# Benchmark of pressure solver warm starting.
+#
+# Each scene is simulated with solver warm start disabled and enabled. The
+# measured difference in pressure solver iterations is reported next to the
+# iterations saved that the simulator estimates in the frame stats. Cold
+# reference solves are enabled for the estimate unless --no-cold-reference
+# is given.
+#
+# If warm starting reduced the number of iterations but the estimated
+# iterations saved is zero, the estimate is reported as broken and the process
+# exits with a return code of 1.
+#
+# Usage, from the directory containing the built pyfluid package:
+#     python -m pyfluid.benchmarks.warm_start_benchmark [--scenes dam_break ...]
+#         [--resolution 32] [--frames 20] [--no-cold-reference]
+
+import sys, argparse
+
+from . import reference_scenes
+
+FRAME_DELTA_TIME = 1.0 / 30.0
+
+
+def run_case(scene_name, resolution, num_frames, is_warm_start_enabled, is_cold_reference_enabled=True):
+    scene = reference_scenes.build_scene(scene_name, resolution)
+    fluidsim = scene.fluidsim
+    fluidsim.enable_solver_warm_start = is_warm_start_enabled
+    fluidsim.enable_solver_cold_reference_solves = is_cold_reference_enabled
+
+    iterations = 0
+    iterations_saved = 0
+    for frameno in range(num_frames):
+        fluidsim.update(FRAME_DELTA_TIME)
+        stats = fluidsim.get_frame_stats_data()
+        iterations += stats.pressure_solver_total_iterations
+        iterations_saved += stats.pressure_solver_iterations_saved
+
+    return {"iterations": iterations, "iterations_saved": iterations_saved}
+
+
+def run(scene_names, resolution, num_frames, is_cold_reference_enabled=True, log_func=print):
+    results = []
+    for scene_name in scene_names:
+        log_func("Running " + scene_name + " at resolution " + str(resolution) + "...")
+        cold = run_case(scene_name, resolution, num_frames, False)
+        warm = run_case(scene_name, resolution, num_frames, True, is_cold_reference_enabled)
+        cold_iterations = cold["iterations"]
+        warm_iterations = warm["iterations"]
+        estimated_saved = warm["iterations_saved"]
+        results.append({
+            "scene": scene_name,
+            "cold_iterations": cold_iterations,
+            "warm_iterations": warm_iterations,
+            "measured_saved": cold_iterations - warm_iterations,
+            "estimated_saved": estimated_saved,
+            "broken": warm_iterations < cold_iterations and estimated_saved == 0,
+        })
+    return results
+
+
+def format_results(results):
+    header = "{:<18} {:>8} {:>8} {:>10} {:>10}  {}".format(
+            "scene", "cold", "warm", "measured", "estimated", "")
+    lines = [header]
+    for r in results:
+        lines.append("{:<18} {:>8} {:>8} {:>10} {:>10}  {}".format(
+                r["scene"], r["cold_iterations"], r["warm_iterations"],
+                r["measured_saved"], r["estimated_saved"], "BROKEN ESTIMATE" if r["broken"] else ""))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FLIP Fluids solver warm start benchmark")
+    parser.add_argument("--scenes", nargs="+", default=["dam_break", "viscous_pour"],
+                        choices=reference_scenes.get_scene_names())
+    parser.add_argument("--resolution", type=int, default=32)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--no-cold-reference", action="store_true",
+                        help="Estimate iterations saved without cold reference solves")
+    args = parser.parse_args(argv)
+
+    results = run(args.scenes, args.resolution, args.frames,
+                  is_cold_reference_enabled=not args.no_cold_reference)
+    print(format_results(results))
+
+    num_broken = sum(1 for r in results if r["broken"])
+    if num_broken > 0:
+        print(str(num_broken) + " scene(s) saved iterations with a zero estimate")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,7 +21,7 @@
 # SOFTWARE.
 
 import ctypes
-from ctypes import c_void_p, c_char_p, c_char, c_int, c_uint, c_float, c_double, byref
+from ctypes import c_void_p, c_char_p, c_char, c_ubyte, c_int, c_uint, c_float, c_double, c_ulonglong, byref
 import numbers
 
 from .pyfluid import pyfluid as lib
@@ -60,6 +60,7 @@ class FluidSimulation(object):
                                      isinstance(ksize, int) and
                                      isinstance(dx, numbers.Real))
 
+        self._applied_parameters = {}
         if is_empty_constructor:
             self._init_from_empty()
         elif is_dimensions_constructor:
@@ -97,6 +98,44 @@ class FluidSimulation(object):
     def __call__(self):
         return self._obj
 
+    # Sets properties from a dict of {property name: value}, in dict order.
+    #
+    # Values are compared against the last values applied through this method
+    # and only properties that have changed by more than eps are set, so 
+    # unchanged properties do not make any calls into the engine. The current 
+    # engine value is read the first time a property is applied. Properties set
+    # directly should be discarded with clear_applied_parameters() before they
+    # are applied again.
+    #
+    # Returns a list of the property names that were set.
+    def apply_parameters(self, parameters, eps=1e-6):
+        changed_parameters = []
+        for name, value in parameters.items():
+            if name in self._applied_parameters:
+                old_value = self._applied_parameters[name]
+            else:
+                old_value = getattr(self, name)
+                self._applied_parameters[name] = old_value
+
+            if isinstance(value, (list, tuple)):
+                is_changed = any(v != old_value[i] for i, v in enumerate(value))
+            else:
+                is_changed = abs(value - old_value) > eps
+
+            if is_changed:
+                setattr(self, name, value)
+                self._applied_parameters[name] = list(value) if isinstance(value, (list, tuple)) else value
+                changed_parameters.append(name)
+
+        return changed_parameters
+
+    def clear_applied_parameters(self, names=None):
+        if names is None:
+            self._applied_parameters = {}
+            return
+        for name in names:
+            self._applied_parameters.pop(name, None)
+
     def get_version(self):
         libfunc = lib.FluidSimulation_get_version
         pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_void_p, c_void_p, c_void_p], None)
@@ -332,6 +371,66 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_int, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), int(n)])
 
+    def set_pressure_solver_method_PCG(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_method_PCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_pressure_solver_method_MGPCG(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_method_MGPCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def set_pressure_solver_method_parallel_PCG(self):
+        libfunc = lib.FluidSimulation_set_pressure_solver_method_parallel_PCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    def is_pressure_solver_method_PCG(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_method_PCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    def is_pressure_solver_method_MGPCG(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_method_MGPCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    def is_pressure_solver_method_parallel_PCG(self):
+        libfunc = lib.FluidSimulation_is_pressure_solver_method_parallel_PCG
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @property
+    def enable_solver_warm_start(self):
+        libfunc = lib.FluidSimulation_is_solver_warm_start_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_solver_warm_start.setter
+    def enable_solver_warm_start(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_solver_warm_start
+        else:
+            libfunc = lib.FluidSimulation_disable_solver_warm_start
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
+    @property
+    def enable_solver_cold_reference_solves(self):
+        libfunc = lib.FluidSimulation_is_solver_cold_reference_solves_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_solver_cold_reference_solves.setter
+    def enable_solver_cold_reference_solves(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_solver_cold_reference_solves
+        else:
+            libfunc = lib.FluidSimulation_disable_solver_cold_reference_solves
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     @property
     def viscosity_solver_max_iterations(self):
         libfunc = lib.FluidSimulation_get_viscosity_solver_max_iterations
@@ -1178,6 +1277,21 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self()])
 
+    @property
+    def enable_frame_trace_output(self):
+        libfunc = lib.FluidSimulation_is_frame_trace_output_enabled
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return bool(pb.execute_lib_func(libfunc, [self()]))
+
+    @enable_frame_trace_output.setter
+    def enable_frame_trace_output(self, boolval):
+        if boolval:
+            libfunc = lib.FluidSimulation_enable_frame_trace_output
+        else:
+            libfunc = lib.FluidSimulation_disable_frame_trace_output
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+
     @property
     def enable_diffuse_material_output(self):
         libfunc = lib.FluidSimulation_is_diffuse_material_output_enabled
@@ -2668,198 +2782,154 @@ class FluidSimulation(object):
 
         return types
 
-    def get_surface_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_data_size,
-                                     lib.FluidSimulation_get_surface_data)
+    def get_surface_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_data_view, copy)
 
-    def get_surface_preview_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_preview_data_size,
-                                     lib.FluidSimulation_get_surface_preview_data)
+    def get_surface_preview_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_preview_data_view, copy)
 
-    def get_surface_blur_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_blur_data_size,
-                                     lib.FluidSimulation_get_surface_blur_data)
+    def get_surface_blur_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_blur_data_view, copy)
 
-    def get_surface_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_velocity_attribute_data)
+    def get_surface_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_velocity_attribute_data_view, copy)
 
-    def get_whitewater_foam_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_foam_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_foam_velocity_attribute_data)
+    def get_whitewater_foam_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_foam_velocity_attribute_data_view, copy)
 
-    def get_whitewater_bubble_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_bubble_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_bubble_velocity_attribute_data)
+    def get_whitewater_bubble_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_bubble_velocity_attribute_data_view, copy)
 
-    def get_whitewater_spray_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_spray_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_spray_velocity_attribute_data)
+    def get_whitewater_spray_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_spray_velocity_attribute_data_view, copy)
 
-    def get_whitewater_dust_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_dust_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_dust_velocity_attribute_data)
+    def get_whitewater_dust_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_dust_velocity_attribute_data_view, copy)
 
-    def get_surface_vorticity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_vorticity_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_vorticity_attribute_data)
+    def get_surface_vorticity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_vorticity_attribute_data_view, copy)
 
-    def get_surface_speed_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_speed_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_speed_attribute_data)
+    def get_surface_speed_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_speed_attribute_data_view, copy)
 
-    def get_surface_age_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_age_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_age_attribute_data)
+    def get_surface_age_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_age_attribute_data_view, copy)
 
-    def get_surface_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_lifetime_attribute_data)
+    def get_surface_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_lifetime_attribute_data_view, copy)
 
-    def get_surface_whitewater_proximity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_whitewater_proximity_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_whitewater_proximity_attribute_data)
+    def get_surface_whitewater_proximity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_whitewater_proximity_attribute_data_view, copy)
 
-    def get_surface_color_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_color_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_color_attribute_data)
+    def get_surface_color_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_color_attribute_data_view, copy)
 
-    def get_surface_source_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_source_id_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_source_id_attribute_data)
+    def get_surface_source_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_source_id_attribute_data_view, copy)
 
-    def get_surface_viscosity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_surface_viscosity_attribute_data_size,
-                                     lib.FluidSimulation_get_surface_viscosity_attribute_data)
+    def get_surface_viscosity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_surface_viscosity_attribute_data_view, copy)
 
-    def get_whitewater_foam_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_foam_id_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_foam_id_attribute_data)
+    def get_whitewater_foam_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_foam_id_attribute_data_view, copy)
 
-    def get_whitewater_bubble_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_bubble_id_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_bubble_id_attribute_data)
+    def get_whitewater_bubble_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_bubble_id_attribute_data_view, copy)
 
-    def get_whitewater_spray_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_spray_id_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_spray_id_attribute_data)
+    def get_whitewater_spray_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_spray_id_attribute_data_view, copy)
 
-    def get_whitewater_dust_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_dust_id_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_dust_id_attribute_data)
+    def get_whitewater_dust_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_dust_id_attribute_data_view, copy)
 
-    def get_whitewater_foam_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_foam_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_foam_lifetime_attribute_data)
+    def get_whitewater_foam_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_foam_lifetime_attribute_data_view, copy)
 
-    def get_whitewater_bubble_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_bubble_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_bubble_lifetime_attribute_data)
+    def get_whitewater_bubble_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_bubble_lifetime_attribute_data_view, copy)
 
-    def get_whitewater_spray_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_spray_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_spray_lifetime_attribute_data)
+    def get_whitewater_spray_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_spray_lifetime_attribute_data_view, copy)
 
-    def get_whitewater_dust_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_whitewater_dust_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_whitewater_dust_lifetime_attribute_data)
+    def get_whitewater_dust_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_whitewater_dust_lifetime_attribute_data_view, copy)
 
-    def get_diffuse_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_data_size,
-                                     lib.FluidSimulation_get_diffuse_data)
+    def get_diffuse_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_data_view, copy)
 
-    def get_diffuse_foam_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_foam_data_size,
-                                     lib.FluidSimulation_get_diffuse_foam_data)
+    def get_diffuse_foam_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_foam_data_view, copy)
 
-    def get_diffuse_bubble_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_bubble_data_size,
-                                     lib.FluidSimulation_get_diffuse_bubble_data)
+    def get_diffuse_bubble_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_bubble_data_view, copy)
 
-    def get_diffuse_spray_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_spray_data_size,
-                                     lib.FluidSimulation_get_diffuse_spray_data)
+    def get_diffuse_spray_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_spray_data_view, copy)
 
-    def get_diffuse_dust_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_dust_data_size,
-                                     lib.FluidSimulation_get_diffuse_dust_data)
+    def get_diffuse_dust_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_dust_data_view, copy)
 
-    def get_diffuse_foam_blur_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_foam_blur_data_size,
-                                     lib.FluidSimulation_get_diffuse_foam_blur_data)
+    def get_diffuse_foam_blur_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_foam_blur_data_view, copy)
 
-    def get_diffuse_bubble_blur_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_bubble_blur_data_size,
-                                     lib.FluidSimulation_get_diffuse_bubble_blur_data)
+    def get_diffuse_bubble_blur_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_bubble_blur_data_view, copy)
 
-    def get_diffuse_spray_blur_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_spray_blur_data_size,
-                                     lib.FluidSimulation_get_diffuse_spray_blur_data)
+    def get_diffuse_spray_blur_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_spray_blur_data_view, copy)
 
-    def get_diffuse_dust_blur_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_diffuse_dust_blur_data_size,
-                                     lib.FluidSimulation_get_diffuse_dust_blur_data)
+    def get_diffuse_dust_blur_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_diffuse_dust_blur_data_view, copy)
 
-    def get_fluid_particle_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_data)
+    def get_fluid_particle_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_data_view, copy)
 
-    def get_fluid_particle_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_id_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_id_attribute_data)
+    def get_fluid_particle_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_id_attribute_data_view, copy)
 
-    def get_fluid_particle_velocity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_velocity_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_velocity_attribute_data)
+    def get_fluid_particle_velocity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_velocity_attribute_data_view, copy)
 
-    def get_fluid_particle_speed_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_speed_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_speed_attribute_data)
+    def get_fluid_particle_speed_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_speed_attribute_data_view, copy)
 
-    def get_fluid_particle_vorticity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_vorticity_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_vorticity_attribute_data)
+    def get_fluid_particle_vorticity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_vorticity_attribute_data_view, copy)
 
-    def get_fluid_particle_color_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_color_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_color_attribute_data)
+    def get_fluid_particle_color_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_color_attribute_data_view, copy)
 
-    def get_fluid_particle_age_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_age_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_age_attribute_data)
+    def get_fluid_particle_age_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_age_attribute_data_view, copy)
 
-    def get_fluid_particle_lifetime_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_lifetime_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_lifetime_attribute_data)
+    def get_fluid_particle_lifetime_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_lifetime_attribute_data_view, copy)
 
-    def get_fluid_particle_viscosity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_viscosity_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_viscosity_attribute_data)
+    def get_fluid_particle_viscosity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_viscosity_attribute_data_view, copy)
 
-    def get_fluid_particle_whitewater_proximity_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_whitewater_proximity_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_whitewater_proximity_attribute_data)
+    def get_fluid_particle_whitewater_proximity_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_whitewater_proximity_attribute_data_view, copy)
 
-    def get_fluid_particle_source_id_attribute_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_source_id_attribute_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_source_id_attribute_data)
+    def get_fluid_particle_source_id_attribute_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_source_id_attribute_data_view, copy)
 
-    def get_fluid_particle_debug_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_fluid_particle_debug_data_size,
-                                     lib.FluidSimulation_get_fluid_particle_debug_data)
+    def get_fluid_particle_debug_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_fluid_particle_debug_data_view, copy)
 
-    def get_internal_obstacle_mesh_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_internal_obstacle_mesh_data_size,
-                                     lib.FluidSimulation_get_internal_obstacle_mesh_data)
+    def get_internal_obstacle_mesh_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_internal_obstacle_mesh_data_view, copy)
 
-    def get_force_field_debug_data(self):
-        return self._get_output_data(lib.FluidSimulation_get_force_field_debug_data_size,
-                                     lib.FluidSimulation_get_force_field_debug_data)
+    def get_force_field_debug_data(self, copy=True):
+        return self._get_output_data_view(lib.FluidSimulation_get_force_field_debug_data_view, copy)
 
     def get_logfile_data(self):
-        byte_str = self._get_output_data(lib.FluidSimulation_get_logfile_data_size,
-                                         lib.FluidSimulation_get_logfile_data)
-        return byte_str.decode("utf-8")
+        data_view = self._get_output_data_view(lib.FluidSimulation_get_logfile_data_view, copy=False)
+        return str(data_view, "utf-8")
+
+    def get_frame_trace_data(self):
+        data_view = self._get_output_data_view(lib.FluidSimulation_get_frame_trace_data_view, copy=False)
+        return str(data_view, "utf-8")
 
     def get_frame_stats_data(self):
         libfunc = lib.FluidSimulation_get_frame_stats_data
@@ -2900,13 +2970,32 @@ class FluidSimulation(object):
         pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_uint)
         data_size = pb.execute_lib_func(libfunc, [self()])
 
-        c_data = (c_char * data_size)()
+        # The engine copies directly into the returned bytearray
+        data = bytearray(data_size)
+        c_data = (c_char * data_size).from_buffer(data)
 
         libfunc = data_libfunc
         pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), c_data])
 
-        return bytes(c_data)
+        return data
+
+    # If copy is False, a read-only memoryview of the engine output buffer is
+    # returned without copying. The view is only valid until the simulation is
+    # next updated and must not be used after the FluidSimulation is destroyed.
+    def _get_output_data_view(self, view_libfunc, copy=True):
+        libfunc = view_libfunc
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_void_p], c_void_p)
+        data_size = c_ulonglong()
+        data_ptr = pb.execute_lib_func(libfunc, [self(), byref(data_size)])
+
+        data_size = data_size.value
+        if data_size == 0 or not data_ptr:
+            return b"" if copy else memoryview(b"")
+        if copy:
+            return ctypes.string_at(data_ptr, data_size)
+        c_data = (c_ubyte * data_size).from_address(data_ptr)
+        return memoryview(c_data).cast('B').toreadonly()
 
     def get_marker_particle_position_data_range(self, start_idx, end_idx):
         size_of_vector = 12
@@ -2990,13 +3079,14 @@ class FluidSimulation(object):
 
     def _get_output_data_range(self, data_libfunc, start_idx, end_idx, size_of_element):
         data_size = (end_idx - start_idx) * size_of_element
-        c_data = (c_char * data_size)()
+        data = bytearray(data_size)
+        c_data = (c_char * data_size).from_buffer(data)
 
         libfunc = data_libfunc
         pb.init_lib_func(libfunc, [c_void_p, c_int, c_int, c_void_p, c_void_p], None)
         pb.execute_lib_func(libfunc, [self(), start_idx, end_idx, c_data])
 
-        return bytes(c_data)
+        return data
 
     def _check_range(self, startidx, endidx, minidx, maxidx):
         if startidx is None:
@@ -3157,6 +3247,32 @@ class FluidSimulationTimingStats_t(ctypes.Structure):
                 ("viscosity", c_double),
                 ("objects", c_double)]
 
+class FluidSimulationStageTimingStats_t(ctypes.Structure):
+    _fields_ = [("update_obstacle_objects", c_double),
+                ("update_liquid_level_set", c_double),
+                ("advect_velocity_field", c_double),
+                ("save_velocity_field", c_double),
+                ("calculate_fluid_curvature_grid", c_double),
+                ("apply_body_forces_to_velocity_field", c_double),
+                ("apply_viscosity_to_velocity_field", c_double),
+                ("pressure_solve", c_double),
+                ("constrain_velocity_fields", c_double),
+                ("update_diffuse_material", c_double),
+                ("update_sheet_seeding", c_double),
+                ("update_marker_particle_velocities", c_double),
+                ("delete_saved_velocity_field", c_double),
+                ("advance_marker_particles", c_double),
+                ("update_fluid_objects", c_double),
+                ("output_non_mesh_simulation_data", c_double),
+                ("output_diffuse_material", c_double),
+                ("output_fluid_particles", c_double),
+                ("output_mesh_simulation_data", c_double),
+                ("output_surface_reconstruction", c_double),
+                ("output_surface_attributes", c_double),
+                ("min_substep_time", c_double),
+                ("max_substep_time", c_double),
+                ("thread_utilization", c_double)]
+
 class FluidSimulationFrameStats_t(ctypes.Structure):
     _fields_ = [("frame", c_int),
                 ("substeps", c_int),
@@ -3169,11 +3285,16 @@ class FluidSimulationFrameStats_t(ctypes.Structure):
                 ("pressure_solver_error", c_double),
                 ("pressure_solver_iterations", c_int),
                 ("pressure_solver_max_iterations", c_int),
+                ("pressure_solver_method", c_int),
+                ("pressure_solver_total_iterations", c_int),
+                ("pressure_solver_time", c_double),
+                ("pressure_solver_iterations_saved", c_int),
                 ("viscosity_solver_enabled", c_int),
                 ("viscosity_solver_success", c_int),
                 ("viscosity_solver_error", c_double),
                 ("viscosity_solver_iterations", c_int),
                 ("viscosity_solver_max_iterations", c_int),
+                ("viscosity_solver_total_iterations", c_int),
                 ("surface", FluidSimulationMeshStats_t),
                 ("preview", FluidSimulationMeshStats_t),
                 ("surfaceblur", FluidSimulationMeshStats_t),
@@ -3220,7 +3341,8 @@ class FluidSimulationFrameStats_t(ctypes.Structure):
                 ("particles", FluidSimulationMeshStats_t),
                 ("obstacle", FluidSimulationMeshStats_t),
                 ("forcefield", FluidSimulationMeshStats_t),
-                ("timing", FluidSimulationTimingStats_t)]
+                ("timing", FluidSimulationTimingStats_t),
+                ("stages", FluidSimulationStageTimingStats_t)]
 
 class FluidSimulationMarkerParticleData_t(ctypes.Structure):
     _fields_ = [("size", c_int),
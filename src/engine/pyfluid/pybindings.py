@@ -21,20 +21,24 @@
 # SOFTWARE.
 
 from .pyfluid import pyfluid as lib
-from ctypes import c_char_p, c_int, byref
+from ctypes import ArgumentError, c_char_p, c_int, byref
 
-def check_success(success, errprefix):
+def get_error_message():
     libfunc = lib.CBindings_get_error_message
     init_lib_func(libfunc, [], c_char_p)
+    return str(libfunc().decode("utf-8"))
+
+def check_success(success, errprefix):
+    # The error message function is only looked up when a call has failed
     if not success:
-        raise RuntimeError(errprefix + str(libfunc().decode("utf-8")))
+        raise RuntimeError(errprefix + get_error_message())
 
 def init_lib_func(libfunc, argtypes, restype):
     if libfunc.argtypes is None:
         libfunc.argtypes = argtypes
         libfunc.restype = restype
 
-def execute_lib_func(libfunc, params):
+def convert_lib_func_params(libfunc, params):
     args = []
     for idx, arg in enumerate(params):
         try:
@@ -42,19 +46,20 @@ def execute_lib_func(libfunc, params):
         except:
             cval = arg
         args.append(cval)
-    success = c_int();
-    args.append(byref(success))
+    return args
 
-    result = None
-    if libfunc.restype:
-        funcresult = libfunc(*args)
-        check_success(success, libfunc.__name__ + " - ")
-        try:
-            return libfunc.restype(funcresult).value
-        except:
-            return funcresult
-    else:
-        libfunc(*args)
+# Arguments are passed directly so that ctypes converts them using the argtypes
+# set in init_lib_func. Arguments that ctypes does not convert implicitly, such
+# as numpy integers, are converted to the argument types first. Results are
+# returned as converted by the restype.
+def execute_lib_func(libfunc, params):
+    success = c_int()
+    try:
+        result = libfunc(*params, byref(success))
+    except ArgumentError:
+        args = convert_lib_func_params(libfunc, params)
+        result = libfunc(*args, byref(success))
 
-    check_success(success, libfunc.__name__ + " - ")
-    return result
\ No newline at end of file
+    if not success:
+        raise RuntimeError(libfunc.__name__ + " - " + get_error_message())
+    return result
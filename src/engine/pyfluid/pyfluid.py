@@ -30,11 +30,13 @@ IS_DEBUG_MODE_LIBRARY_LOADED = False
 def enable_debug_mode():
     global DEBUG_MODE_ENABLED
     DEBUG_MODE_ENABLED = True
+    pyfluid.clear_function_table()
 
 
 def disable_debug_mode():
     global DEBUG_MODE_ENABLED
     DEBUG_MODE_ENABLED = False
+    pyfluid.clear_function_table()
 
 
 class LibraryLoadError(Exception):
@@ -57,6 +59,10 @@ class LibraryLoadError(Exception):
 # arguments passed to bake(...) are generated and formed in the addon within the Bake
 # Operators found in src/addon/operators/bake_operators.py as well as the Export
 # Operators found in src/addon/operators/export_operators.py.
+#
+# Library functions are resolved once and stored in the instance dict, so later
+# lookups do not go through __getattr__. The function table is cleared when the
+# debug mode is changed so that the next lookup loads the matching library.
 class PyFluidLib():
     def __init__(self):
         self._lib = None
@@ -70,7 +76,14 @@ class PyFluidLib():
         elif DEBUG_MODE_ENABLED != IS_DEBUG_MODE_LIBRARY_LOADED:
             self._lib = self._load_library("pyfluid")
 
-        return getattr(self._lib, name)
+        libfunc = getattr(self._lib, name)
+        self.__dict__[name] = libfunc
+        return libfunc
+
+    def clear_function_table(self):
+        for name in list(self.__dict__.keys()):
+            if name != '_lib':
+                del self.__dict__[name]
 
     def _load_library(self, name):
         libname_debug_prefix = "libblpyfluiddebug"
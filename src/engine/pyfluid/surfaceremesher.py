@@ -0,0 +1,172 @@
+# MIT License
+# 
+# Copyright (C) 2024 Ryan L. Guy
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import ctypes
+from ctypes import c_void_p, c_char_p, c_int, c_double, c_ulonglong, byref
+
+from .pyfluid import pyfluid as lib
+from .vector3 import Vector3_t
+from . import pybindings as pb
+
+
+class SurfaceRemesherParameters_t(ctypes.Structure):
+    _fields_ = [("subdivisions", c_int),
+                ("computechunks", c_int),
+                ("particle_scale", c_double),
+                ("smoothing_value", c_double),
+                ("smoothing_iterations", c_int),
+                ("minimum_polyhedron_triangle_count", c_int),
+                ("enable_preview_mesh", c_int),
+                ("preview_dx", c_double),
+                ("enable_remove_surface_near_domain", c_int),
+                ("remove_surface_near_domain_distance", c_int),
+                ("domain_scale", c_double),
+                ("domain_offset", Vector3_t)]
+
+
+# Generates the surface mesh of a single frame from cached fluid particle data.
+#
+# Particle and attribute data are bytes of packed float32 values in the layout
+# of the .ffp3 attribute data. Attributes must be transferred after
+# mesh_particles() and use the same particle order.
+class SurfaceRemesher():
+
+    def __init__(self, isize, jsize, ksize, dx):
+        libfunc = lib.SurfaceRemesher_new
+        args = [c_int, c_int, c_int, c_double, c_void_p]
+        pb.init_lib_func(libfunc, args, c_void_p)
+        self._obj = pb.execute_lib_func(libfunc, [isize, jsize, ksize, dx])
+
+        self.subdivisions = 1
+        self.compute_chunks = 1
+        self.particle_scale = 1.0
+        self.smoothing_value = 0.5
+        self.smoothing_iterations = 2
+        self.minimum_polyhedron_triangle_count = 0
+        self.enable_preview_mesh = False
+        self.preview_dx = 0.0
+        self.enable_remove_surface_near_domain = False
+        self.remove_surface_near_domain_distance = 0
+        self.domain_scale = 1.0
+        self.domain_offset = (0.0, 0.0, 0.0)
+
+    def __del__(self):
+        try:
+            libfunc = lib.SurfaceRemesher_destroy
+            pb.init_lib_func(libfunc, [c_void_p], None)
+            libfunc(self._obj)
+        except:
+            pass
+
+    def __call__(self):
+        return self._obj
+
+    def mesh_particles(self, position_data, num_particles):
+        self._set_parameters()
+        libfunc = lib.SurfaceRemesher_mesh_particles
+        pb.init_lib_func(libfunc, [c_void_p, c_char_p, c_int, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), self._to_bytes(position_data, num_particles * 12), num_particles])
+
+    def transfer_vector_attribute(self, attribute_data, num_values):
+        libfunc = lib.SurfaceRemesher_transfer_vector_attribute
+        pb.init_lib_func(libfunc, [c_void_p, c_char_p, c_int, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), self._to_bytes(attribute_data, num_values * 12), num_values])
+
+    def transfer_scalar_attribute(self, attribute_data, num_values):
+        libfunc = lib.SurfaceRemesher_transfer_scalar_attribute
+        pb.init_lib_func(libfunc, [c_void_p, c_char_p, c_int, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), self._to_bytes(attribute_data, num_values * 4), num_values])
+
+    # Returns the last transferred vector attribute multiplied by scale, in
+    # .bobj vertex format
+    def get_vector_attribute_data(self, scale=1.0):
+        libfunc = lib.SurfaceRemesher_generate_vector_attribute_data
+        pb.init_lib_func(libfunc, [c_void_p, c_double, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), scale])
+        return self._get_output_data_view(lib.SurfaceRemesher_get_attribute_data_view)
+
+    # Returns the length of the last transferred vector attribute as float32 values
+    def get_vector_magnitude_attribute_data(self):
+        libfunc = lib.SurfaceRemesher_generate_vector_magnitude_attribute_data
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+        return self._get_output_data_view(lib.SurfaceRemesher_get_attribute_data_view)
+
+    # Returns the last transferred scalar attribute as float32 values
+    def get_scalar_attribute_data(self):
+        libfunc = lib.SurfaceRemesher_generate_scalar_attribute_data
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self()])
+        return self._get_output_data_view(lib.SurfaceRemesher_get_attribute_data_view)
+
+    def get_num_surface_vertices(self):
+        libfunc = lib.SurfaceRemesher_get_num_surface_vertices
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    def get_num_surface_triangles(self):
+        libfunc = lib.SurfaceRemesher_get_num_surface_triangles
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p], c_int)
+        return pb.execute_lib_func(libfunc, [self()])
+
+    def get_surface_data(self):
+        return self._get_output_data_view(lib.SurfaceRemesher_get_surface_data_view)
+
+    def get_preview_data(self):
+        return self._get_output_data_view(lib.SurfaceRemesher_get_preview_data_view)
+
+    def _set_parameters(self):
+        params = SurfaceRemesherParameters_t()
+        params.subdivisions = self.subdivisions
+        params.computechunks = self.compute_chunks
+        params.particle_scale = self.particle_scale
+        params.smoothing_value = self.smoothing_value
+        params.smoothing_iterations = self.smoothing_iterations
+        params.minimum_polyhedron_triangle_count = self.minimum_polyhedron_triangle_count
+        params.enable_preview_mesh = int(self.enable_preview_mesh)
+        params.preview_dx = self.preview_dx
+        params.enable_remove_surface_near_domain = int(self.enable_remove_surface_near_domain)
+        params.remove_surface_near_domain_distance = self.remove_surface_near_domain_distance
+        params.domain_scale = self.domain_scale
+        params.domain_offset = Vector3_t(*self.domain_offset)
+
+        libfunc = lib.SurfaceRemesher_set_parameters
+        pb.init_lib_func(libfunc, [c_void_p, SurfaceRemesherParameters_t, c_void_p], None)
+        pb.execute_lib_func(libfunc, [self(), params])
+
+    def _to_bytes(self, data, num_bytes):
+        if len(data) < num_bytes:
+            raise ValueError("Data is too small: " + str(len(data)) + " bytes, expected " + str(num_bytes))
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return data
+
+    def _get_output_data_view(self, view_libfunc):
+        libfunc = view_libfunc
+        pb.init_lib_func(libfunc, [c_void_p, c_void_p, c_void_p], c_void_p)
+        data_size = c_ulonglong()
+        data_ptr = pb.execute_lib_func(libfunc, [self(), byref(data_size)])
+
+        data_size = data_size.value
+        if data_size == 0 or not data_ptr:
+            return b""
+        return ctypes.string_at(data_ptr, data_size)
@@ -24,12 +24,23 @@ import ctypes
 import array
 import struct
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class TriangleMesh_t(ctypes.Structure):
     _fields_ = [("vertices", ctypes.c_void_p),
                 ("triangles", ctypes.c_void_p),
                 ("num_vertices", ctypes.c_int),
                 ("num_triangles", ctypes.c_int)]
 
+# Vertex and triangle data are stored in contiguous array.array buffers. When
+# NumPy is available, transforms operate on NumPy views of these buffers.
+# Otherwise, transforms fall back to per-component array slices.
+#
+# Transforms are computed in double precision and then stored as float to
+# match the precision of the per-vertex implementation.
 class TriangleMesh(object):
     def __init__(self):
         self.vertices = array.array('f', [])
@@ -38,25 +49,23 @@ class TriangleMesh(object):
 
     @classmethod
     def from_bobj(cls, bobj_data):
-        int_data, bobj_data = bobj_data[:4], bobj_data[4:]
-        num_vertices = struct.unpack('i', int_data)[0]
+        bobj_data = memoryview(bobj_data).cast('B')
+        num_vertices = struct.unpack_from('i', bobj_data, 0)[0]
+        offset = 4
 
-        num_floats = 3 * num_vertices
-        num_bytes = 4 * num_floats
-        vertex_data, bobj_data = bobj_data[:num_bytes], bobj_data[num_bytes:]
-        vertices = list(struct.unpack('{0}f'.format(num_floats), vertex_data))
+        num_bytes = 4 * 3 * num_vertices
+        vertex_data = bobj_data[offset:offset + num_bytes]
+        offset += num_bytes
 
-        int_data, bobj_data = bobj_data[:4], bobj_data[4:]
-        num_triangles = struct.unpack('i', int_data)[0]
+        num_triangles = struct.unpack_from('i', bobj_data, offset)[0]
+        offset += 4
 
-        num_ints = 3 * num_triangles
-        num_bytes = 4 * num_ints
-        triangle_data, bobj_data = bobj_data[:num_bytes], bobj_data[num_bytes:]
-        triangles = list(struct.unpack('{0}i'.format(num_ints), triangle_data))
+        num_bytes = 4 * 3 * num_triangles
+        triangle_data = bobj_data[offset:offset + num_bytes]
 
         self = cls()
-        self.vertices = array.array('f', vertices)
-        self.triangles = array.array('i', triangles)
+        self.vertices.frombytes(vertex_data)
+        self.triangles.frombytes(triangle_data)
 
         return self
 
@@ -71,43 +80,71 @@ class TriangleMesh(object):
 
         return datastr
 
+    # The returned struct points directly into the vertex and triangle buffers
+    # of this mesh. The buffers are referenced by the struct so that they stay
+    # alive while the struct is in use, but the mesh must not be resized until
+    # the struct is no longer needed.
     def to_struct(self):
+        self._ensure_array_storage()
 
         num_vertices = len(self.vertices) // 3
         num_triangles = len(self.triangles) // 3
 
-        vertex_data = (ctypes.c_float * len(self.vertices))()
-        for i in range(len(self.vertices)):
-            vertex_data[i] = self.vertices[i]
-
-        triangle_data = (ctypes.c_int * len(self.triangles))()
-        for i in range(len(self.triangles)):
-            triangle_data[i] = self.triangles[i]
-
         struct = TriangleMesh_t()
-        struct.vertices = ctypes.cast(vertex_data, ctypes.c_void_p)
-        struct.triangles = ctypes.cast(triangle_data, ctypes.c_void_p)
+        struct.vertices = self.vertices.buffer_info()[0]
+        struct.triangles = self.triangles.buffer_info()[0]
         struct.num_vertices = num_vertices
         struct.num_triangles = num_triangles
+        struct._buffers = (self.vertices, self.triangles)
 
         return struct
 
     def apply_transform(self, matrix_world):
+        self._ensure_array_storage()
         m = matrix_world
-        for i in range(0, len(self.vertices), 3):
-            v = [self.vertices[i + 0], self.vertices[i + 1], self.vertices[i + 2], 1]
-            self.vertices[i + 0] = v[0]*m[0] + v[1]*m[1] + v[2]*m[2] + v[3]*m[3]
-            self.vertices[i + 1] = v[0]*m[4] + v[1]*m[5] + v[2]*m[6] + v[3]*m[7]
-            self.vertices[i + 2] = v[0]*m[8] + v[1]*m[9] + v[2]*m[10] + v[3]*m[11]
+        if numpy is not None:
+            vertex_view = self._get_vertex_view()
+            x, y, z = vertex_view.astype(numpy.float64).T
+            vertex_view[:, 0] = x*m[0] + y*m[1] + z*m[2] + m[3]
+            vertex_view[:, 1] = x*m[4] + y*m[5] + z*m[6] + m[7]
+            vertex_view[:, 2] = x*m[8] + y*m[9] + z*m[10] + m[11]
+            return
+
+        x, y, z = self.vertices[0::3], self.vertices[1::3], self.vertices[2::3]
+        self.vertices[0::3] = array.array('f', [vx*m[0] + vy*m[1] + vz*m[2] + m[3] for vx, vy, vz in zip(x, y, z)])
+        self.vertices[1::3] = array.array('f', [vx*m[4] + vy*m[5] + vz*m[6] + m[7] for vx, vy, vz in zip(x, y, z)])
+        self.vertices[2::3] = array.array('f', [vx*m[8] + vy*m[9] + vz*m[10] + m[11] for vx, vy, vz in zip(x, y, z)])
 
     def translate(self, tx, ty, tz):
-        for i in range(0, len(self.vertices), 3):
-            self.vertices[i + 0] += tx
-            self.vertices[i + 1] += ty
-            self.vertices[i + 2] += tz
+        self._ensure_array_storage()
+        if numpy is not None:
+            vertex_view = self._get_vertex_view()
+            vertex_view[:] = vertex_view + numpy.array([tx, ty, tz], dtype=numpy.float64)
+            return
+
+        self.vertices[0::3] = array.array('f', [v + tx for v in self.vertices[0::3]])
+        self.vertices[1::3] = array.array('f', [v + ty for v in self.vertices[1::3]])
+        self.vertices[2::3] = array.array('f', [v + tz for v in self.vertices[2::3]])
 
     def scale(self, scale):
-        for i in range(0, len(self.vertices), 3):
-            self.vertices[i + 0] *= scale
-            self.vertices[i + 1] *= scale
-            self.vertices[i + 2] *= scale
\ No newline at end of file
+        self._ensure_array_storage()
+        if numpy is not None:
+            vertex_view = self._get_vertex_view()
+            # Multiplied in double precision like the fallback. With numpy 1.x,
+            # a float32 array times a float64 scalar stays in single precision.
+            vertex_view[:] = (vertex_view.astype(numpy.float64) * scale).astype(numpy.float32)
+            return
+
+        self.vertices = array.array('f', [v * scale for v in self.vertices])
+
+    def _get_vertex_view(self):
+        num_vertices = len(self.vertices) // 3
+        vertex_view = numpy.frombuffer(self.vertices, dtype=numpy.float32, count=3 * num_vertices)
+        return vertex_view.reshape((num_vertices, 3))
+
+    # Vertices and triangles may be assigned as lists by callers
+    def _ensure_array_storage(self):
+        if not isinstance(self.vertices, array.array) or self.vertices.typecode != 'f':
+            self.vertices = array.array('f', self.vertices)
+        if not isinstance(self.triangles, array.array) or self.triangles.typecode != 'i':
+            self.triangles = array.array('i', self.triangles)
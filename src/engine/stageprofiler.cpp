@@ -0,0 +1,229 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "stageprofiler.h"
+
+#include <sstream>
+#include <iomanip>
+#include <algorithm>
+
+#include "threadutils.h"
+
+StageProfiler::StageProfiler() {
+}
+
+StageProfiler::Scope::Scope(StageProfiler *profiler, const char *name, const char *category) {
+    if (profiler->isEnabled()) {
+        _profiler = profiler;
+        _profiler->beginStage(name, category);
+    }
+}
+
+StageProfiler::Scope::~Scope() {
+    if (_profiler != nullptr) {
+        _profiler->endStage();
+    }
+}
+
+void StageProfiler::enable() {
+    _isEnabled = true;
+}
+
+void StageProfiler::disable() {
+    std::unique_lock<std::mutex> lock(_mutex);
+    _isEnabled = false;
+    _stages.clear();
+    _stages.shrink_to_fit();
+    _threadStacks.clear();
+}
+
+bool StageProfiler::isEnabled() {
+    return _isEnabled;
+}
+
+void StageProfiler::beginFrame(int frame) {
+    if (!_isEnabled) {
+        return;
+    }
+
+    std::unique_lock<std::mutex> lock(_mutex);
+    _frame = frame;
+    _substep = 0;
+    _numThreads = std::max(ThreadUtils::getMaxThreadCount(), 1);
+    _frameStartTime = std::chrono::steady_clock::now();
+    _stages.clear();
+
+    // The thread that begins the frame is always displayed first
+    _threadStacks.clear();
+    ThreadStack stack;
+    stack.threadID = std::this_thread::get_id();
+    _threadStacks.push_back(stack);
+}
+
+void StageProfiler::setSubstep(int substep) {
+    std::unique_lock<std::mutex> lock(_mutex);
+    _substep = substep;
+}
+
+void StageProfiler::beginStage(const char *name, const char *category) {
+    if (!_isEnabled) {
+        return;
+    }
+
+    double workerBusyTime = ThreadUtils::getWorkerBusyTime();
+
+    std::unique_lock<std::mutex> lock(_mutex);
+    ThreadStack *stack = _getThreadStack();
+
+    Stage stage;
+    stage.name = name;
+    stage.category = category;
+    stage.startTime = _getTime();
+    stage.workerBusyStartTime = workerBusyTime;
+    stage.threadIndex = (int)(stack - &_threadStacks[0]);
+    stage.substep = _substep;
+    stage.depth = (int)stack->openStages.size();
+
+    stack->openStages.push_back((int)_stages.size());
+    _stages.push_back(stage);
+}
+
+void StageProfiler::endStage() {
+    if (!_isEnabled) {
+        return;
+    }
+
+    double workerBusyTime = ThreadUtils::getWorkerBusyTime();
+
+    std::unique_lock<std::mutex> lock(_mutex);
+    ThreadStack *stack = _getThreadStack();
+    if (stack->openStages.empty()) {
+        // Stage was started before the frame began
+        return;
+    }
+
+    Stage *stage = &(_stages[stack->openStages.back()]);
+    stack->openStages.pop_back();
+    stage->duration = std::max(_getTime() - stage->startTime, 0.0);
+    stage->workerBusyTime = std::max(workerBusyTime - stage->workerBusyStartTime, 0.0);
+}
+
+int StageProfiler::getNumStages() {
+    std::unique_lock<std::mutex> lock(_mutex);
+    return (int)_stages.size();
+}
+
+/*
+    Writes the frame timeline as Chrome trace events. Each stage is written as a
+    complete event ("ph": "X") with timestamps in microseconds relative to the
+    start of the frame. Stages that have not ended are not written.
+*/
+void StageProfiler::getChromeTraceData(std::vector<char> &data) {
+    std::unique_lock<std::mutex> lock(_mutex);
+
+    std::ostringstream ss;
+    ss << std::fixed << std::setprecision(3);
+    ss << "{\"traceEvents\":[\n";
+
+    for (size_t i = 0; i < _threadStacks.size(); i++) {
+        std::string threadName = i == 0 ? "Simulation" : "Thread " + std::to_string(i);
+        if (i > 0) {
+            ss << ",\n";
+        }
+        ss << "{\"name\":\"thread_name\",\"ph\":\"M\",\"pid\":0,\"tid\":" << i <<
+              ",\"args\":{\"name\":\"" << threadName << "\"}}";
+    }
+
+    for (size_t i = 0; i < _stages.size(); i++) {
+        Stage *s = &(_stages[i]);
+        if (s->duration < 0.0) {
+            continue;
+        }
+
+        double utilization = 0.0;
+        if (s->duration > 0.0) {
+            utilization = (s->duration + s->workerBusyTime) / (s->duration * _numThreads);
+            utilization = std::min(utilization, 1.0);
+        }
+
+        ss << ",\n{\"name\":\"" << _escapeString(s->name) << 
+              "\",\"cat\":\"" << _escapeString(s->category) << 
+              "\",\"ph\":\"X\",\"ts\":" << 1e6 * s->startTime << 
+              ",\"dur\":" << 1e6 * s->duration << 
+              ",\"pid\":0,\"tid\":" << s->threadIndex << 
+              ",\"args\":{\"frame\":" << _frame << 
+              ",\"substep\":" << s->substep << 
+              ",\"depth\":" << s->depth << 
+              ",\"thread_utilization\":" << utilization << "}}";
+    }
+
+    ss << "\n],\"displayTimeUnit\":\"ms\",\"otherData\":{\"frame\":" << _frame << 
+          ",\"threads\":" << _numThreads << "}}\n";
+
+    std::string str = ss.str();
+    data.clear();
+    data.insert(data.end(), str.begin(), str.end());
+}
+
+double StageProfiler::_getTime() {
+    std::chrono::steady_clock::time_point t = std::chrono::steady_clock::now();
+    return std::chrono::duration<double>(t - _frameStartTime).count();
+}
+
+/*
+    Threads are displayed in rows. A thread with no open stages gives up its
+    row, which is then reused by the next new thread. This keeps the short 
+    lived threads that the simulator launches each substep on a few rows.
+*/
+StageProfiler::ThreadStack* StageProfiler::_getThreadStack() {
+    std::thread::id threadID = std::this_thread::get_id();
+    for (size_t i = 0; i < _threadStacks.size(); i++) {
+        if (_threadStacks[i].threadID == threadID) {
+            return &(_threadStacks[i]);
+        }
+    }
+
+    for (size_t i = 1; i < _threadStacks.size(); i++) {
+        if (_threadStacks[i].openStages.empty()) {
+            _threadStacks[i].threadID = threadID;
+            return &(_threadStacks[i]);
+        }
+    }
+
+    ThreadStack stack;
+    stack.threadID = threadID;
+    _threadStacks.push_back(stack);
+    return &(_threadStacks.back());
+}
+
+std::string StageProfiler::_escapeString(const char *s) {
+    std::string str;
+    for (const char *c = s; *c != '\0'; c++) {
+        if (*c == '"' || *c == '\\') {
+            str.push_back('\\');
+        }
+        str.push_back(*c);
+    }
+    return str;
+}
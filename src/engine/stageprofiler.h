@@ -0,0 +1,114 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#ifndef FLUIDENGINE_STAGEPROFILER_H
+#define FLUIDENGINE_STAGEPROFILER_H
+
+#if __MINGW32__ && !_WIN64
+    #include "mingw32_threads/mingw.thread.h"
+    #include "mingw32_threads/mingw.mutex.h"
+#else
+    #include <thread>
+    #include <mutex>
+#endif
+
+#include <vector>
+#include <string>
+#include <chrono>
+#include <atomic>
+
+/*
+    Records a timeline of named simulation stages for a single frame.
+
+    Stages are recorded from any thread and may be nested. Each thread keeps
+    its own stack of open stages, so nesting is tracked per thread. A stage
+    records the substep it was started in and the thread pool worker time
+    that was spent while it was open, which is used to estimate thread
+    utilization.
+
+    The timeline can be written in the Chrome trace event format and viewed
+    in chrome://tracing or Perfetto. Stages are only recorded while the
+    profiler is enabled.
+*/
+
+class StageProfiler
+{
+public:
+    StageProfiler();
+
+    class Scope {
+    public:
+        Scope(StageProfiler *profiler, const char *name, const char *category);
+        ~Scope();
+
+    private:
+        StageProfiler *_profiler = nullptr;
+    };
+
+    void enable();
+    void disable();
+    bool isEnabled();
+
+    void beginFrame(int frame);
+    void setSubstep(int substep);
+    void beginStage(const char *name, const char *category);
+    void endStage();
+
+    int getNumStages();
+    void getChromeTraceData(std::vector<char> &data);
+
+private:
+
+    struct Stage {
+        const char *name;
+        const char *category;
+        double startTime = 0.0;
+        double duration = -1.0;
+        double workerBusyStartTime = 0.0;
+        double workerBusyTime = 0.0;
+        int threadIndex = 0;
+        int substep = 0;
+        int depth = 0;
+    };
+
+    struct ThreadStack {
+        std::thread::id threadID;
+        std::vector<int> openStages;
+    };
+
+    double _getTime();
+    ThreadStack* _getThreadStack();
+    std::string _escapeString(const char *s);
+
+    std::atomic<bool> _isEnabled{false};
+    int _frame = 0;
+    int _substep = 0;
+    int _numThreads = 1;
+    std::chrono::steady_clock::time_point _frameStartTime;
+    std::vector<Stage> _stages;
+    std::vector<ThreadStack> _threadStacks;
+    std::mutex _mutex;
+};
+
+#endif
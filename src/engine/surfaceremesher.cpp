@@ -0,0 +1,321 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#include "surfaceremesher.h"
+
+#include <cstring>
+
+#include "particlemesher.h"
+#include "meshlevelset.h"
+#include "gridutils.h"
+#include "attributetogridtransfer.h"
+#include "interpolation.h"
+#include "grid3d.h"
+#include "aabb.h"
+
+SurfaceRemesher::SurfaceRemesher() {
+}
+
+SurfaceRemesher::SurfaceRemesher(int isize, int jsize, int ksize, double dx) :
+                                    _isize(isize), _jsize(jsize), _ksize(ksize), _dx(dx) {
+    // Matches the marker particle radius of the simulator
+    double volume = _dx*_dx*_dx / 8.0;
+    double pi = 3.141592653;
+    _particleRadius = pow(3*volume / (4*pi), 1.0/3.0);
+}
+
+SurfaceRemesher::~SurfaceRemesher() {
+}
+
+void SurfaceRemesher::setParameters(SurfaceRemesherParameters params) {
+    if (params.subdivisions < 1) {
+        std::string msg = "Error: subdivisions must be greater than or equal to 1.\n";
+        msg += "subdivisions: " + std::to_string(params.subdivisions) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    if (params.computechunks < 1) {
+        std::string msg = "Error: compute chunks must be greater than or equal to 1.\n";
+        msg += "computechunks: " + std::to_string(params.computechunks) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    if (params.domainScale <= 0.0) {
+        std::string msg = "Error: domain scale must be greater than 0.0.\n";
+        msg += "scale: " + std::to_string(params.domainScale) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    if (params.isPreviewMeshEnabled && params.previewdx <= 0.0) {
+        std::string msg = "Error: preview cell size must be greater than 0.0.\n";
+        msg += "cellsize: " + std::to_string(params.previewdx) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _params = params;
+}
+
+void SurfaceRemesher::meshParticles(std::vector<vmath::vec3> &particles) {
+    _particles.clear();
+    _particles.reserve(particles.size());
+    for (size_t i = 0; i < particles.size(); i++) {
+        _particles.push_back(_domainToGridPosition(particles[i]));
+    }
+
+    _surface = TriangleMesh();
+    _preview = TriangleMesh();
+    _attributeVertices.clear();
+    _vertexVectorValues.clear();
+    _vertexScalarValues.clear();
+    _surfaceData.clear();
+    _previewData.clear();
+    _attributeData.clear();
+
+    if (!_particles.empty()) {
+        MeshLevelSet solidSDF;
+        solidSDF.constructMinimalLevelSet(_isize, _jsize, _ksize, _dx);
+        float fillval = 3.0 * _dx;
+        for (int k = 0; k < _ksize + 1; k++) {
+            for (int j = 0; j < _jsize + 1; j++) {
+                for (int i = 0; i < _isize + 1; i++) {
+                    solidSDF.set(i, j, k, fillval);
+                }
+            }
+        }
+        _computeDomainBoundarySDF(solidSDF);
+
+        ParticleMesherParameters params;
+        params.isize = _isize;
+        params.jsize = _jsize;
+        params.ksize = _ksize;
+        params.dx = _dx;
+        params.subdivisions = _params.subdivisions;
+        params.computechunks = _params.computechunks;
+        params.radius = _particleRadius * _params.particleScale;
+        params.particles = &_particles;
+        params.solidSDF = &solidSDF;
+        params.isPreviewMesherEnabled = _params.isPreviewMeshEnabled;
+        if (_params.isPreviewMeshEnabled) {
+            params.previewdx = _params.previewdx;
+        }
+
+        ParticleMesher mesher;
+        _surface = mesher.meshParticles(params);
+        if (_params.isPreviewMeshEnabled) {
+            _preview = mesher.getPreviewMesh();
+        }
+
+        _surface.removeMinimumTriangleCountPolyhedra(_params.minimumPolyhedronTriangleCount);
+        _removeMeshNearDomain(_surface);
+        _removeMeshNearDomain(_preview);
+    }
+
+    // Attributes are sampled at the vertex positions before smoothing, as in 
+    // the simulator
+    _attributeVertices = _surface.vertices;
+
+    vmath::vec3 scale(_params.domainScale, _params.domainScale, _params.domainScale);
+    _surface.smooth(_params.smoothingValue, _params.smoothingIterations);
+    _surface.scale(scale);
+    _surface.translate(_params.domainOffset);
+    _surface.getMeshFileDataBOBJ(_surfaceData);
+
+    if (_params.isPreviewMeshEnabled) {
+        _preview.smooth(_params.smoothingValue, _params.smoothingIterations);
+        _preview.scale(scale);
+        _preview.translate(_params.domainOffset);
+        _preview.getMeshFileDataBOBJ(_previewData);
+    }
+}
+
+void SurfaceRemesher::transferVectorAttribute(std::vector<vmath::vec3> &values) {
+    if (values.size() != _particles.size()) {
+        std::string msg = "Error: number of attribute values must match the number of particles.\n";
+        msg += "values: " + std::to_string(values.size()) + "\n";
+        msg += "particles: " + std::to_string(_particles.size()) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _vertexVectorValues.clear();
+    if (_attributeVertices.empty()) {
+        return;
+    }
+
+    Array3d<vmath::vec3> attributeGrid(_isize, _jsize, _ksize, vmath::vec3());
+    Array3d<bool> validGrid(_isize, _jsize, _ksize, false);
+
+    AttributeTransferParameters<vmath::vec3> params;
+    params.positions = &_particles;
+    params.attributes = &values;
+    params.attributeGrid = &attributeGrid;
+    params.validGrid = &validGrid;
+    params.particleRadius = _attributeTransferRadius * _dx;
+    params.dx = _dx;
+
+    AttributeToGridTransfer<vmath::vec3> attributeTransfer;
+    attributeTransfer.transfer(params);
+    GridUtils::extrapolateGrid(&attributeGrid, &validGrid, _attributeExtrapolationLayers);
+
+    vmath::vec3 goffset(0.5f * _dx, 0.5f * _dx, 0.5f * _dx);
+    _vertexVectorValues.reserve(_attributeVertices.size());
+    for (size_t i = 0; i < _attributeVertices.size(); i++) {
+        vmath::vec3 p = _attributeVertices[i] - goffset;
+        _vertexVectorValues.push_back(Interpolation::trilinearInterpolate(p, _dx, attributeGrid));
+    }
+}
+
+void SurfaceRemesher::transferScalarAttribute(std::vector<float> &values) {
+    if (values.size() != _particles.size()) {
+        std::string msg = "Error: number of attribute values must match the number of particles.\n";
+        msg += "values: " + std::to_string(values.size()) + "\n";
+        msg += "particles: " + std::to_string(_particles.size()) + "\n";
+        throw std::domain_error(msg);
+    }
+
+    _vertexScalarValues.clear();
+    if (_attributeVertices.empty()) {
+        return;
+    }
+
+    Array3d<float> attributeGrid(_isize, _jsize, _ksize, 0.0f);
+    Array3d<bool> validGrid(_isize, _jsize, _ksize, false);
+
+    AttributeTransferParameters<float> params;
+    params.positions = &_particles;
+    params.attributes = &values;
+    params.attributeGrid = &attributeGrid;
+    params.validGrid = &validGrid;
+    params.particleRadius = _attributeTransferRadius * _dx;
+    params.dx = _dx;
+
+    AttributeToGridTransfer<float> attributeTransfer;
+    attributeTransfer.transfer(params);
+    GridUtils::extrapolateGrid(&attributeGrid, &validGrid, _attributeExtrapolationLayers);
+
+    vmath::vec3 goffset(0.5f * _dx, 0.5f * _dx, 0.5f * _dx);
+    _vertexScalarValues.reserve(_attributeVertices.size());
+    for (size_t i = 0; i < _attributeVertices.size(); i++) {
+        vmath::vec3 p = _attributeVertices[i] - goffset;
+        _vertexScalarValues.push_back((float)Interpolation::trilinearInterpolate(p, _dx, attributeGrid));
+    }
+}
+
+void SurfaceRemesher::generateVectorAttributeData(float scale) {
+    TriangleMesh vectorData;
+    vectorData.vertices.reserve(_vertexVectorValues.size());
+    for (size_t i = 0; i < _vertexVectorValues.size(); i++) {
+        vectorData.vertices.push_back(_vertexVectorValues[i] * scale);
+    }
+    vectorData.getMeshFileDataBOBJ(_attributeData);
+}
+
+void SurfaceRemesher::generateVectorMagnitudeAttributeData() {
+    std::vector<float> magnitudes;
+    magnitudes.reserve(_vertexVectorValues.size());
+    for (size_t i = 0; i < _vertexVectorValues.size(); i++) {
+        magnitudes.push_back(_vertexVectorValues[i].length());
+    }
+
+    size_t datasize = magnitudes.size() * sizeof(float);
+    _attributeData = std::vector<char>(datasize);
+    std::memcpy(_attributeData.data(), (char *)magnitudes.data(), datasize);
+}
+
+void SurfaceRemesher::generateScalarAttributeData() {
+    size_t datasize = _vertexScalarValues.size() * sizeof(float);
+    _attributeData = std::vector<char>(datasize);
+    std::memcpy(_attributeData.data(), (char *)_vertexScalarValues.data(), datasize);
+}
+
+int SurfaceRemesher::getNumSurfaceVertices() {
+    return (int)_surface.vertices.size();
+}
+
+int SurfaceRemesher::getNumSurfaceTriangles() {
+    return (int)_surface.triangles.size();
+}
+
+std::vector<char>* SurfaceRemesher::getSurfaceData() {
+    return &_surfaceData;
+}
+
+std::vector<char>* SurfaceRemesher::getPreviewData() {
+    return &_previewData;
+}
+
+std::vector<char>* SurfaceRemesher::getAttributeData() {
+    return &_attributeData;
+}
+
+vmath::vec3 SurfaceRemesher::_domainToGridPosition(vmath::vec3 p) {
+    return (p - _params.domainOffset) / _params.domainScale;
+}
+
+void SurfaceRemesher::_computeDomainBoundarySDF(MeshLevelSet &sdf) {
+    double eps = 1e-4;
+    AABB bbox(0.0, 0.0, 0.0, _isize * _dx, _jsize * _dx, _ksize * _dx);
+    bbox.expand(-3 * _dx - eps);
+    GridIndex gmin = Grid3d::positionToGridIndex(bbox.getMinPoint(), _dx);
+    GridIndex gmax = Grid3d::positionToGridIndex(bbox.getMaxPoint(), _dx);
+
+    for (int k = 0; k < _ksize + 1; k++) {
+        for (int j = 0; j < _jsize + 1; j++) {
+            for (int i = 0; i < _isize + 1; i++) {
+                bool isBorderNode = (i >= gmin.i && i <= gmin.i + 1) || (i >= gmax.i && i <= gmax.i + 1) ||
+                                    (j >= gmin.j && j <= gmin.j + 1) || (j >= gmax.j && j <= gmax.j + 1) ||
+                                    (k >= gmin.k && k <= gmin.k + 1) || (k >= gmax.k && k <= gmax.k + 1);
+                if (!isBorderNode) {
+                    continue;
+                }
+
+                vmath::vec3 p = Grid3d::GridIndexToPosition(i, j, k, _dx);
+                float d = std::max(bbox.getSignedDistance(p), 0.0f);
+                sdf.set(i, j, k, d);
+            }
+        }
+    }
+}
+
+void SurfaceRemesher::_removeMeshNearDomain(TriangleMesh &mesh) {
+    if (!_params.isRemoveSurfaceNearDomainEnabled) {
+        return;
+    }
+
+    int width = 2 + _params.removeSurfaceNearDomainDistance;
+    std::vector<int> removalTriangles;
+    for (size_t tidx = 0; tidx < mesh.triangles.size(); tidx++) {
+        Triangle t = mesh.triangles[tidx];
+        vmath::vec3 centroid = (mesh.vertices[t.tri[0]] + 
+                                mesh.vertices[t.tri[1]] + 
+                                mesh.vertices[t.tri[2]]) / 3.0;
+        GridIndex g = Grid3d::positionToGridIndex(centroid, _dx);
+        if (g.i < width || g.j < width || g.k < width ||
+                g.i >= _isize - width || g.j >= _jsize - width || g.k >= _ksize - width) {
+            removalTriangles.push_back(tidx);
+        }
+    }
+
+    mesh.removeTriangles(removalTriangles);
+    mesh.removeExtraneousVertices();
+}
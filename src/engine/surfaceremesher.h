@@ -0,0 +1,117 @@
+/*
+MIT License
+
+Copyright (C) 2024 Ryan L. Guy
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+*/
+
+#ifndef FLUIDENGINE_SURFACEREMESHER_H
+#define FLUIDENGINE_SURFACEREMESHER_H
+
+#include <vector>
+
+#include "vmath.h"
+#include "array3d.h"
+#include "trianglemesh.h"
+
+class MeshLevelSet;
+
+struct SurfaceRemesherParameters {
+    int subdivisions = 1;
+    int computechunks = 1;
+    double particleScale = 1.0;
+
+    double smoothingValue = 0.5;
+    int smoothingIterations = 2;
+    int minimumPolyhedronTriangleCount = 0;
+
+    bool isPreviewMeshEnabled = false;
+    double previewdx = 0.0;
+
+    bool isRemoveSurfaceNearDomainEnabled = false;
+    int removeSurfaceNearDomainDistance = 0;
+
+    double domainScale = 1.0;
+    vmath::vec3 domainOffset;
+};
+
+/*
+    Generates the fluid surface mesh of a single frame from cached fluid
+    particles. Used to re-mesh a baked simulation with new surface settings
+    without re-running the simulation.
+
+    Particle positions are given in domain (world) space, as stored in the
+    fluid particle cache files. Attributes are transferred from particles to
+    the unsmoothed surface vertices in the same way as the simulator surface 
+    attributes. Obstacles and the meshing volume are not available offline, so
+    the surface is only meshed against the domain boundary.
+*/
+class SurfaceRemesher {
+
+public:
+    SurfaceRemesher();
+    SurfaceRemesher(int isize, int jsize, int ksize, double dx);
+    ~SurfaceRemesher();
+
+    void setParameters(SurfaceRemesherParameters params);
+    void meshParticles(std::vector<vmath::vec3> &particles);
+
+    void transferVectorAttribute(std::vector<vmath::vec3> &values);
+    void transferScalarAttribute(std::vector<float> &values);
+    void generateVectorAttributeData(float scale);
+    void generateVectorMagnitudeAttributeData();
+    void generateScalarAttributeData();
+
+    int getNumSurfaceVertices();
+    int getNumSurfaceTriangles();
+    std::vector<char>* getSurfaceData();
+    std::vector<char>* getPreviewData();
+    std::vector<char>* getAttributeData();
+
+private:
+
+    vmath::vec3 _domainToGridPosition(vmath::vec3 p);
+    void _computeDomainBoundarySDF(MeshLevelSet &sdf);
+    void _removeMeshNearDomain(TriangleMesh &mesh);
+
+    int _isize = 0;
+    int _jsize = 0;
+    int _ksize = 0;
+    double _dx = 0.0;
+    double _particleRadius = 0.0;
+    double _attributeTransferRadius = 1.0;   // In # of voxels
+    int _attributeExtrapolationLayers = 5;
+
+    SurfaceRemesherParameters _params;
+
+    std::vector<vmath::vec3> _particles;
+    std::vector<vmath::vec3> _attributeVertices;
+    std::vector<vmath::vec3> _vertexVectorValues;
+    std::vector<float> _vertexScalarValues;
+    TriangleMesh _surface;
+    TriangleMesh _preview;
+
+    std::vector<char> _surfaceData;
+    std::vector<char> _previewData;
+    std::vector<char> _attributeData;
+
+};
+
+#endif
@@ -25,6 +25,8 @@ SOFTWARE.
 #include "threadutils.h"
 
 #include <cmath>
+#include <algorithm>
+#include <chrono>
 
 #include "fluidsimassert.h"
 
@@ -70,4 +72,208 @@ std::vector<int> ThreadUtils::splitRangeIntoIntervals(int rangeBegin, int rangeE
     }
 
     return intervals;
-}
\ No newline at end of file
+}
+
+ThreadUtils::ThreadPool* ThreadUtils::_getThreadPool() {
+    // Intentionally never destroyed. Joining threads from static destructors
+    // can deadlock when the library is unloaded.
+    static ThreadPool *pool = new ThreadPool();
+    return pool;
+}
+
+void ThreadUtils::parallelFor(int rangeBegin, int rangeEnd, 
+                              std::function<void(int, int)> func, 
+                              int chunkSize) {
+    if (rangeEnd <= rangeBegin) {
+        return;
+    }
+
+    int rangeSize = rangeEnd - rangeBegin;
+    int numThreads = getMaxThreadCount();
+    if (chunkSize <= 0) {
+        // Several chunks per thread so that uneven work can be balanced
+        int chunksPerThread = 4;
+        long long numChunks = (long long)numThreads * chunksPerThread;
+        chunkSize = (int)std::max((rangeSize + numChunks - 1) / numChunks, 1LL);
+    }
+
+    if (numThreads <= 1 || chunkSize >= rangeSize) {
+        func(rangeBegin, rangeEnd);
+        return;
+    }
+
+    _getThreadPool()->parallelFor(rangeBegin, rangeEnd, chunkSize, func);
+}
+
+void ThreadUtils::parallelForIntervals(std::vector<int> &intervals, 
+                                       std::function<void(int, int, int)> func) {
+    int numIntervals = (int)intervals.size() - 1;
+    parallelFor(0, numIntervals, [&](int startidx, int endidx) {
+        for (int i = startidx; i < endidx; i++) {
+            func(i, intervals[i], intervals[i + 1]);
+        }
+    }, 1);
+}
+
+double ThreadUtils::getWorkerBusyTime() {
+    return _getThreadPool()->getWorkerBusyTime();
+}
+
+ThreadUtils::ThreadPool::ThreadPool() : _workerBusyTimeNanoseconds(0) {
+}
+
+ThreadUtils::ThreadPool::~ThreadPool() {
+    _stopWorkers();
+}
+
+int ThreadUtils::ThreadPool::getNumWorkerThreads() {
+    std::unique_lock<std::mutex> lock(_mutex);
+    return (int)_workers.size();
+}
+
+double ThreadUtils::ThreadPool::getWorkerBusyTime() {
+    return 1e-9 * (double)_workerBusyTimeNanoseconds.load();
+}
+
+void ThreadUtils::ThreadPool::parallelFor(int rangeBegin, int rangeEnd, int chunkSize, 
+                                          std::function<void(int, int)> &func) {
+    // The calling thread also runs chunks, so the pool only needs
+    // maxThreadCount - 1 workers
+    _resizeWorkers(std::max(getMaxThreadCount() - 1, 0));
+
+    std::shared_ptr<Job> job = std::make_shared<Job>();
+    job->func = &func;
+    job->rangeEnd = rangeEnd;
+    job->chunkSize = chunkSize;
+    job->numChunks = ((long long)(rangeEnd - rangeBegin) + chunkSize - 1) / chunkSize;
+    job->nextIndex = rangeBegin;
+    job->numCompletedChunks = 0;
+    job->isError = false;
+
+    {
+        std::unique_lock<std::mutex> lock(_mutex);
+        _jobs.push_back(job);
+        _numActiveJobs++;
+    }
+    _jobCondition.notify_all();
+
+    _runJobChunks(job.get());
+
+    {
+        std::unique_lock<std::mutex> lock(job->mutex);
+        while (job->numCompletedChunks.load() < job->numChunks) {
+            job->finishedCondition.wait(lock);
+        }
+    }
+
+    {
+        std::unique_lock<std::mutex> lock(_mutex);
+        for (size_t i = 0; i < _jobs.size(); i++) {
+            if (_jobs[i] == job) {
+                _jobs.erase(_jobs.begin() + i);
+                break;
+            }
+        }
+        _numActiveJobs--;
+    }
+
+    if (job->exception) {
+        std::rethrow_exception(job->exception);
+    }
+}
+
+void ThreadUtils::ThreadPool::_runJobChunks(Job *job) {
+    for (;;) {
+        long long startidx = job->nextIndex.fetch_add(job->chunkSize);
+        if (startidx >= job->rangeEnd) {
+            break;
+        }
+        long long endidx = std::min(startidx + job->chunkSize, job->rangeEnd);
+
+        if (!job->isError.load()) {
+            try {
+                (*(job->func))((int)startidx, (int)endidx);
+            } catch (...) {
+                std::unique_lock<std::mutex> lock(job->mutex);
+                if (!job->exception) {
+                    job->exception = std::current_exception();
+                }
+                job->isError = true;
+            }
+        }
+
+        long long numCompleted = job->numCompletedChunks.fetch_add(1) + 1;
+        if (numCompleted == job->numChunks) {
+            std::unique_lock<std::mutex> lock(job->mutex);
+            job->finishedCondition.notify_all();
+        }
+    }
+}
+
+bool ThreadUtils::ThreadPool::_isJobExhausted(Job *job) {
+    return job->nextIndex.load() >= job->rangeEnd;
+}
+
+void ThreadUtils::ThreadPool::_workerLoop() {
+    for (;;) {
+        std::shared_ptr<Job> job;
+        {
+            std::unique_lock<std::mutex> lock(_mutex);
+            for (;;) {
+                while (!_jobs.empty() && _isJobExhausted(_jobs.front().get())) {
+                    _jobs.pop_front();
+                }
+                if (_isStopping || !_jobs.empty()) {
+                    break;
+                }
+                _jobCondition.wait(lock);
+            }
+
+            if (_isStopping) {
+                return;
+            }
+            job = _jobs.front();
+        }
+
+        std::chrono::steady_clock::time_point startTime = std::chrono::steady_clock::now();
+        _runJobChunks(job.get());
+        std::chrono::steady_clock::time_point endTime = std::chrono::steady_clock::now();
+        long long duration = std::chrono::duration_cast<std::chrono::nanoseconds>(endTime - startTime).count();
+        _workerBusyTimeNanoseconds.fetch_add(duration);
+    }
+}
+
+void ThreadUtils::ThreadPool::_resizeWorkers(int numWorkers) {
+    std::unique_lock<std::mutex> resizeLock(_resizeMutex);
+    {
+        std::unique_lock<std::mutex> lock(_mutex);
+        if ((int)_workers.size() == numWorkers) {
+            return;
+        }
+        if (_numActiveJobs > 0 && (int)_workers.size() > 0) {
+            // Resized on a later call when the pool is idle
+            return;
+        }
+    }
+
+    _stopWorkers();
+
+    std::unique_lock<std::mutex> lock(_mutex);
+    _isStopping = false;
+    for (int i = 0; i < numWorkers; i++) {
+        _workers.push_back(std::thread(&ThreadPool::_workerLoop, this));
+    }
+}
+
+void ThreadUtils::ThreadPool::_stopWorkers() {
+    {
+        std::unique_lock<std::mutex> lock(_mutex);
+        _isStopping = true;
+    }
+    _jobCondition.notify_all();
+
+    for (size_t i = 0; i < _workers.size(); i++) {
+        _workers[i].join();
+    }
+    _workers.clear();
+}
@@ -38,6 +38,10 @@ SOFTWARE.
 
 #include <vector>
 #include <functional>
+#include <memory>
+#include <atomic>
+#include <deque>
+#include <exception>
 
 namespace ThreadUtils {
 
@@ -50,6 +54,79 @@ namespace ThreadUtils {
     extern std::vector<int> splitRangeIntoIntervals(int rangeBegin, 
                                                     int rangeEnd, 
                                                     int numIntervals);
+
+    /*
+        Runs func(chunkBegin, chunkEnd) over [rangeBegin, rangeEnd) on the
+        persistent thread pool. The range is split into chunks that are handed
+        out dynamically so that threads that finish early take more work. The
+        calling thread also processes chunks, which allows parallelFor to be
+        nested or called from several threads at once.
+
+        If chunkSize <= 0, a chunk size is chosen from the range size and
+        the max thread count. The first exception thrown by func is rethrown
+        on the calling thread after all chunks have completed.
+    */
+    extern void parallelFor(int rangeBegin, int rangeEnd, 
+                            std::function<void(int, int)> func, 
+                            int chunkSize = 0);
+
+    /*
+        Runs func(intervalIndex, intervalBegin, intervalEnd) for each interval
+        in intervals (as returned by splitRangeIntoIntervals) on the thread 
+        pool. Used where results are stored per interval.
+    */
+    extern void parallelForIntervals(std::vector<int> &intervals, 
+                                     std::function<void(int, int, int)> func);
+
+    /*
+        Total time in seconds that thread pool workers have spent running
+        parallelFor chunks. Time spent by the calling threads is not included.
+        Used to measure thread utilization over an interval.
+    */
+    extern double getWorkerBusyTime();
+
+    class ThreadPool {
+    public:
+        ThreadPool();
+        ~ThreadPool();
+
+        void parallelFor(int rangeBegin, int rangeEnd, int chunkSize, 
+                         std::function<void(int, int)> &func);
+        int getNumWorkerThreads();
+        double getWorkerBusyTime();
+
+    private:
+
+        struct Job {
+            std::function<void(int, int)> *func;
+            long long rangeEnd = 0;
+            long long chunkSize = 1;
+            long long numChunks = 0;
+            std::atomic<long long> nextIndex;
+            std::atomic<long long> numCompletedChunks;
+            std::atomic<bool> isError;
+            std::exception_ptr exception;
+            std::mutex mutex;
+            std::condition_variable finishedCondition;
+        };
+
+        void _runJobChunks(Job *job);
+        bool _isJobExhausted(Job *job);
+        void _workerLoop();
+        void _resizeWorkers(int numWorkers);
+        void _stopWorkers();
+
+        std::vector<std::thread> _workers;
+        std::deque<std::shared_ptr<Job> > _jobs;
+        std::mutex _mutex;
+        std::mutex _resizeMutex;
+        std::condition_variable _jobCondition;
+        bool _isStopping = false;
+        int _numActiveJobs = 0;
+        std::atomic<long long> _workerBusyTimeNanoseconds;
+    };
+
+    extern ThreadPool *_getThreadPool();
 }
 
 #endif
\ No newline at end of file
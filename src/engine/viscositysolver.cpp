@@ -123,18 +123,9 @@ void ViscositySolver::_computeFaceStateGridMT(Array3d<float> &solidCenterPhi, in
         gridsize = _state.W.width * _state.W.height * _state.W.depth;
     }
 
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_computeFaceStateGridThread, this,
-                                 intervals[i], intervals[i + 1], &solidCenterPhi, dir);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _computeFaceStateGridThread(startidx, endidx, &solidCenterPhi, dir);
+    });
 }
 
 void ViscositySolver::_computeFaceStateGridThread(int startidx, int endidx, 
@@ -182,18 +173,9 @@ void ViscositySolver::_computeFaceStateGridThread(int startidx, int endidx,
 
 void ViscositySolver::_computeSolidCenterPhi(Array3d<float> &solidCenterPhi) {
     size_t gridsize = solidCenterPhi.width * solidCenterPhi.height * solidCenterPhi.depth;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_computeSolidCenterPhiThread, this,
-                                 intervals[i], intervals[i + 1], &solidCenterPhi);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _computeSolidCenterPhiThread(startidx, endidx, &solidCenterPhi);
+    });
 }
 
 void ViscositySolver::_computeSolidCenterPhiThread(int startidx, int endidx, 
@@ -267,26 +249,13 @@ void ViscositySolver::_computeVolumeGrid() {
         WorkGroup(&(_volumes.edgeW),  GridIndex(-1, -1,  0))
     });
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, workqueue.size());
-    std::vector<std::thread> threads(numthreads);
-
-    while (!workqueue.empty()) {
-        
-        numthreads = (int)fmin(numCPU, workqueue.size());
-        for (int tidx = 0; tidx < numthreads; tidx++) {
-            WorkGroup workgroup = workqueue.back();
-            workqueue.pop_back();
-
-            threads[tidx] = std::thread(&ViscositySolver::_computeVolumeGridThread, this,
-                                        workgroup.grid, &validCells, &_subcellVolumeGrid, 
-                                        workgroup.gridOffset);
-        }
-
-        for (int tidx = 0; tidx < numthreads; tidx++) {
-            threads[tidx].join();
+    ThreadUtils::parallelFor(0, workqueue.size(), [&](int startidx, int endidx) {
+        for (int widx = startidx; widx < endidx; widx++) {
+            WorkGroup workgroup = workqueue[widx];
+            _computeVolumeGridThread(workgroup.grid, &validCells, &_subcellVolumeGrid, 
+                                     workgroup.gridOffset);
         }
-    }
+    }, 1);
 }
 
 void ViscositySolver::_estimateVolumeFractions(Array3d<float> *volumes, 
@@ -295,19 +264,9 @@ void ViscositySolver::_estimateVolumeFractions(Array3d<float> *volumes,
                                                float dx) {
 
     size_t gridsize = volumes->width * volumes->height * volumes->depth;
-    size_t numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)std::min(numCPU, gridsize);
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, gridsize, numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_estimateVolumeFractionsThread, this,
-                                 intervals[i], intervals[i + 1], 
-                                 volumes, validCells, centerStart, dx);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, gridsize, [&](int startidx, int endidx) {
+        _estimateVolumeFractionsThread(startidx, endidx, volumes, validCells, centerStart, dx);
+    });
 
 }
 
@@ -490,18 +449,9 @@ void ViscositySolver::_initializeLinearSystemU(SparseMatrixf &matrix, std::vecto
         }
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, indices.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadU, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, indices.size(), [&](int startidx, int endidx) {
+        _initializeLinearSystemThreadU(startidx, endidx, &indices, &matrix, &rhs);
+    });
 }
 
 void ViscositySolver::_initializeLinearSystemV(SparseMatrixf &matrix, std::vector<float> &rhs) {
@@ -516,18 +466,9 @@ void ViscositySolver::_initializeLinearSystemV(SparseMatrixf &matrix, std::vecto
         }
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, indices.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadV, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, indices.size(), [&](int startidx, int endidx) {
+        _initializeLinearSystemThreadV(startidx, endidx, &indices, &matrix, &rhs);
+    });
 }
 
 void ViscositySolver::_initializeLinearSystemW(SparseMatrixf &matrix, std::vector<float> &rhs) {
@@ -542,18 +483,9 @@ void ViscositySolver::_initializeLinearSystemW(SparseMatrixf &matrix, std::vecto
         }
     }
 
-    int numCPU = ThreadUtils::getMaxThreadCount();
-    int numthreads = (int)fmin(numCPU, indices.size());
-    std::vector<std::thread> threads(numthreads);
-    std::vector<int> intervals = ThreadUtils::splitRangeIntoIntervals(0, indices.size(), numthreads);
-    for (int i = 0; i < numthreads; i++) {
-        threads[i] = std::thread(&ViscositySolver::_initializeLinearSystemThreadW, this,
-                                 intervals[i], intervals[i + 1], &indices, &matrix, &rhs);
-    }
-
-    for (int i = 0; i < numthreads; i++) {
-        threads[i].join();
-    }
+    ThreadUtils::parallelFor(0, indices.size(), [&](int startidx, int endidx) {
+        _initializeLinearSystemThreadW(startidx, endidx, &indices, &matrix, &rhs);
+    });
 }
 
 void ViscositySolver::_initializeLinearSystemThreadU(int startidx, int endidx, 